@@ -0,0 +1,101 @@
+"""
+Commutative Matching Benchmark
+==============================
+
+Times matching patterns against the arguments of Orderless Plus and
+Times expressions with 10 to 1000 terms:
+
+    Plus[a_, b_, c__]                  split off two terms, the rest in c
+    Plus[x_Symbol, n_Integer, r__]     terms found by head
+    Times[k_Integer, f[x_], r__Symbol] one compound factor among symbols
+    Plus[x_Symbol, y_Symbol, r__Integer]
+                                       no match: too many symbols, which
+                                       only the single patterns could take
+
+Run with:
+    python benchmarks/bench_commutative.py [max_terms]
+"""
+
+import sys
+import time
+
+from minimatic import Expression, Symbol
+from minimatic.core.attributes import Flat, Orderless
+from minimatic.pattern import blank, blank_seq, match, pattern
+
+Plus = Symbol("Plus")
+Times = Symbol("Times")
+Integer = Symbol("Integer")
+Symbol_ = Symbol("Symbol")
+f = Symbol("f")
+a, b, c, k, n, r, x, y = (Symbol(name) for name in "abcknrxy")
+
+AC = frozenset({Flat, Orderless})
+
+
+def cases(terms):
+    symbols = [Symbol(f"s{i}") for i in range(terms - 1)]
+    integers = list(range(terms - 1))
+    return [
+        (
+            "Plus[a_, b_, c__]",
+            Expression(Plus, pattern(a), pattern(b), pattern(c, blank_seq())),
+            Expression(Plus, *symbols, 1),
+            True,
+        ),
+        (
+            "Plus[x_Symbol, n_Integer, r__]",
+            Expression(
+                Plus,
+                pattern(x, blank(Symbol_)),
+                pattern(n, blank(Integer)),
+                pattern(r, blank_seq()),
+            ),
+            Expression(Plus, *integers, Symbol("s")),
+            True,
+        ),
+        (
+            "Times[k_Integer, f[x_], r__Symbol]",
+            Expression(
+                Times,
+                pattern(k, blank(Integer)),
+                Expression(f, pattern(x)),
+                pattern(r, blank_seq(Symbol_)),
+            ),
+            Expression(Times, *symbols[:-1], Expression(f, 1), 2),
+            True,
+        ),
+        (
+            "Plus[x_Symbol, y_Symbol, r__Integer]",
+            Expression(
+                Plus,
+                pattern(x, blank(Symbol_)),
+                pattern(y, blank(Symbol_)),
+                pattern(r, blank_seq(Integer)),
+            ),
+            Expression(Plus, *symbols[:3], *integers),
+            False,
+        ),
+    ]
+
+
+def main():
+    max_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    sizes = [size for size in (10, 100, 1000) if size <= max_terms]
+    print("Orderless matching, milliseconds per match")
+    print("=" * 60)
+    print(f"{'pattern':<38}" + "".join(f"{size:>8}" for size in sizes))
+    rows = {}
+    for size in sizes:
+        for name, pat, expr, expected in cases(size):
+            start = time.perf_counter()
+            result = match(pat, expr, expr_attrs=AC)
+            elapsed = time.perf_counter() - start
+            assert result.success == expected, name
+            rows.setdefault(name, []).append(elapsed)
+    for name, times in rows.items():
+        print(f"{name:<38}" + "".join(f"{t * 1e3:>8.2f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
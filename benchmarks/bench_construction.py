@@ -0,0 +1,83 @@
+"""
+Expression Construction Benchmark
+=================================
+
+Times building expressions through the validating public constructor
+versus the trusted Expression._from_parts used on internal hot paths, and
+the end-to-end cost (time and allocated memory) of Table and Map, whose
+results are built that way.
+
+Run with:
+    python benchmarks/bench_construction.py [size]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from minimatic import Expression, GlobalContext, Symbol, evaluate
+from minimatic.eval.evaluator import set_iteration_limit
+
+f = Symbol("f")
+i = Symbol("i")
+List = Symbol("List")
+Table = Symbol("Table")
+Map = Symbol("Map")
+
+ctx = GlobalContext
+
+
+def best(fn, repeat=3):
+    """Best-of-repeat wall time of fn()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def allocated(fn):
+    """Peak traced memory (bytes) while running fn()."""
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    args = tuple(range(size))
+    pairs = [(k, k + 1) for k in range(size)]
+    attrs = frozenset()
+
+    print(f"Construction of {size} expressions")
+    print("=" * 60)
+    public_wide = best(lambda: Expression(List, *args))
+    trusted_wide = best(lambda: Expression._from_parts(List, args, attrs))
+    print(f"{'one node, wide':<28} {'public':>8} {public_wide * 1e3:>9.2f} ms")
+    print(f"{'':<28} {'trusted':>8} {trusted_wide * 1e3:>9.2f} ms")
+
+    public_small = best(lambda: [Expression(f, a, b, _attrs=attrs) for a, b in pairs])
+    trusted_small = best(lambda: [Expression._from_parts(f, pair, attrs) for pair in pairs])
+    print(f"{'many small nodes':<28} {'public':>8} {public_small * 1e3:>9.2f} ms")
+    print(f"{'':<28} {'trusted':>8} {trusted_small * 1e3:>9.2f} ms")
+
+    # Table and Map evaluate one f[...] per element
+    set_iteration_limit(10 * size)
+    table = Expression(Table, Expression(f, i), Expression(List, i, 1, size))
+    values = Expression(List, *args)
+    mapped = Expression(Map, f, values)
+
+    print()
+    print(f"Table and Map over {size} elements")
+    print("=" * 60)
+    for name, expr in (("Table", table), ("Map", mapped)):
+        seconds = best(lambda expr=expr: evaluate(expr, ctx))
+        peak = allocated(lambda expr=expr: evaluate(expr, ctx))
+        print(f"{name:<10} {seconds * 1e3:>10.2f} ms {peak / 2**20:>10.2f} MB peak allocated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Hash-Consing Benchmark
+======================
+
+Compares memory use and structural equality time with expression
+hash-consing off and on.
+
+The workload mimics a rule-heavy rewrite: the same polynomial terms are
+rebuilt over and over, producing many structurally identical subtrees.
+
+Run with:
+    python benchmarks/bench_hash_consing.py [copies]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from minimatic import Expression, Symbol
+from minimatic.core import hash_consing
+
+Plus = Symbol("Plus")
+Times = Symbol("Times")
+Power = Symbol("Power")
+List = Symbol("List")
+x = Symbol("x")
+y = Symbol("y")
+
+
+def term(k):
+    """(k mod 8) * x^2 + y^(k mod 4): a small subtree with few distinct shapes."""
+    return Expression(
+        Plus,
+        Expression(Times, k % 8, Expression(Power, x, 2)),
+        Expression(Power, y, k % 4),
+    )
+
+
+def build(copies):
+    """A list of `copies` terms, rebuilt from scratch each call."""
+    return Expression(List, *(term(k) for k in range(copies)))
+
+
+def nested(depth):
+    """A deep chain Plus[Plus[...Plus[x, 0]..., 1], 2] rebuilt from scratch each call."""
+    expr = x
+    for k in range(depth):
+        expr = Expression(Plus, expr, k % 3)
+    return expr
+
+
+def measure(copies, depth, repeat=20):
+    tracemalloc.start()
+    start = time.perf_counter()
+    trees = [build(copies) for _ in range(4)]
+    build_time = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    a, b = nested(depth), nested(depth)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        assert trees[0] == trees[1]
+        assert a == b
+    eq_time = (time.perf_counter() - start) / repeat
+    return build_time, memory, eq_time
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    depth = 500
+
+    print(f"Hash-consing: 4 x {copies} terms, equality on {copies} terms + depth {depth}")
+    print("=" * 70)
+    print(f"{'mode':<6} {'build (s)':>12} {'memory (MiB)':>14} {'equality (ms)':>15}")
+    for label, enabled in (("off", False), ("on", True)):
+        with hash_consing(enabled):
+            build_time, memory, eq_time = measure(copies, depth)
+        print(f"{label:<6} {build_time:>12.3f} {memory / 2**20:>14.2f} {eq_time * 1e3:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
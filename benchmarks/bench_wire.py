@@ -0,0 +1,78 @@
+"""
+Wire Format Benchmark
+=====================
+
+Compares the binary wire format with pickle on deep and wide trees:
+encoded size and encode/decode throughput.
+
+Run with:
+    python benchmarks/bench_wire.py [size]
+"""
+
+import pickle
+import sys
+import time
+
+from minimatic import Expression, Symbol
+from minimatic.core import wire
+
+f = Symbol("f")
+g = Symbol("g")
+x = Symbol("x")
+List = Symbol("List")
+
+
+def wide(size):
+    """List[f[x, i, 0.5 * i, "label"], ...]: many small, similar subtrees."""
+    return Expression(List, *(Expression(f, x, i, 0.5 * i, "label") for i in range(size)))
+
+
+def deep(size):
+    """f[g[f[g[...x...], 1], 2], ...]: a single chain `size` levels deep."""
+    expr = x
+    for i in range(size):
+        expr = Expression(f if i % 2 else g, expr, i)
+    return expr
+
+
+def throughput(encode, decode, tree, repeat=3):
+    """Best-of-repeat (size in bytes, encode MB/s, decode MB/s), or None on failure."""
+    try:
+        data = encode(tree)
+        decode(data)
+    except RecursionError:
+        return None
+    best_encode = best_decode = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(tree)
+        best_encode = min(best_encode, time.perf_counter() - start)
+        start = time.perf_counter()
+        decode(data)
+        best_decode = min(best_decode, time.perf_counter() - start)
+    megabytes = len(data) / 2**20
+    return len(data), megabytes / best_encode, megabytes / best_decode
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    formats = [
+        ("wire", wire.dumps, wire.loads),
+        ("pickle", lambda t: pickle.dumps(t, pickle.HIGHEST_PROTOCOL), pickle.loads),
+    ]
+
+    print(f"Serialization of trees with {size} nodes")
+    print("=" * 66)
+    print(f"{'tree':<6} {'format':<8} {'bytes':>12} {'encode MB/s':>14} {'decode MB/s':>14}")
+    for label, tree in (("wide", wide(size)), ("deep", deep(size))):
+        for name, encode, decode in formats:
+            result = throughput(encode, decode, tree)
+            if result is None:
+                print(f"{label:<6} {name:<8} {'RecursionError':>12}")
+                continue
+            nbytes, encode_rate, decode_rate = result
+            print(f"{label:<6} {name:<8} {nbytes:>12} {encode_rate:>14.2f} {decode_rate:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -72,14 +72,21 @@ from .registry import (
     builtin_attributes,
     clear_registry,
     get_builtin,
+    get_packed_kernel,
     has_builtin,
+    register_attributes,
     register_builtin,
+    register_packed,
 )
+from .structure import Cases, Count, FreeQ, MemberQ, Position
 
 __all__ = [
     # Registry
     "register_builtin",
+    "register_attributes",
+    "register_packed",
     "get_builtin",
+    "get_packed_kernel",
     "has_builtin",
     "builtin_attributes",
     "BuiltinFunction",
@@ -144,6 +151,12 @@ __all__ = [
     "StringQ",
     "IntegerQ",
     "RealQ",
+    # Structure
+    "Cases",
+    "Position",
+    "Count",
+    "FreeQ",
+    "MemberQ",
     # Web
     "Request",
 ]
@@ -6,14 +6,17 @@ Wolfram Language semantics with proper attribute handling.
 """
 
 import cmath
+import itertools
 import math
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from minimatic.core import Expression, Symbol, is_expr
 from minimatic.core.attributes import Flat, HoldRest, Listable, NumericFunction, Orderless
+from minimatic.core.packed import is_packed, pack_values
 from minimatic.eval.context import EvaluationContext
 
-from .registry import register_builtin
+from .registry import register_builtin, register_packed
 
 
 # Numeric type checking
@@ -142,7 +145,7 @@ def plus_builtin(expr: Expression, context: EvaluationContext) -> Any:
     if len(result_args) == 1:
         return result_args[0]
 
-    return Expression(Plus, *result_args)
+    return Expression._from_parts(Plus, tuple(result_args))
 
 
 def extract_numeric_coefficient(expr: Expression) -> tuple:
@@ -242,7 +245,7 @@ def times_builtin(expr: Expression, context: EvaluationContext) -> Any:
     if len(result_args) == 1:
         return result_args[0]
 
-    return Expression(Times, *result_args)
+    return Expression._from_parts(Times, tuple(result_args))
 
 
 # ----- Power (^) -----
@@ -274,26 +277,10 @@ def power_builtin(expr: Expression, context: EvaluationContext) -> Any:
 
     # Numeric evaluation
     if is_number(base) and is_number(exp):
-        try:
-            # Handle special cases
-            if base == 0 and exp > 0:
-                return 0
-            # 0^0 or 0^negative is undefined or infinity
-            if base == 1:
-                return 1
-            if exp == 0:
-                return 1
-            if exp == 1:
-                return base
-
-            result = base**exp
-
-            # Convert to int if it's a whole number
-            if isinstance(result, float) and result.is_integer():
-                return int(result)
-            return result
-        except (OverflowError, ZeroDivisionError):
+        result = numeric_power(base, exp)
+        if result is None:
             return Expression(Power, base, exp)
+        return result
 
     # Symbolic simplifications
     if exp == 0:
@@ -308,6 +295,30 @@ def power_builtin(expr: Expression, context: EvaluationContext) -> Any:
     return Expression(Power, base, exp)
 
 
+def numeric_power(base: Any, exp: Any) -> Any:
+    """Numeric value of Power[base, exp], or None if it overflows or divides by zero."""
+    try:
+        # Handle special cases
+        if base == 0 and exp > 0:
+            return 0
+        # 0^0 or 0^negative is undefined or infinity
+        if base == 1:
+            return 1
+        if exp == 0:
+            return 1
+        if exp == 1:
+            return base
+
+        result = base**exp
+
+        # Convert to int if it's a whole number
+        if isinstance(result, float) and result.is_integer():
+            return int(result)
+        return result
+    except (OverflowError, ZeroDivisionError):
+        return None
+
+
 # ----- Minus -----
 
 Minus = Symbol("Minus")
@@ -415,18 +426,23 @@ def sqrt_builtin(expr: Expression, context: EvaluationContext) -> Any:
     arg = args[0]
 
     if is_number(arg):
-        if arg >= 0:
-            result = math.sqrt(arg)
-            # Return int if perfect square
-            if result == int(result):
-                return int(result)
-            return result
-        # Negative: complex result
-        return complex(arg) ** 0.5
+        return numeric_sqrt(arg)
 
     return Expression(Power, arg, 0.5)
 
 
+def numeric_sqrt(x: Any) -> Any:
+    """Numeric value of Sqrt[x]."""
+    if x >= 0:
+        result = math.sqrt(x)
+        # Return int if perfect square
+        if result == int(result):
+            return int(result)
+        return result
+    # Negative: complex result
+    return complex(x) ** 0.5
+
+
 # ----- Exp -----
 
 Exp = Symbol("Exp")
@@ -505,8 +521,6 @@ def sum_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Summation: Sum[expr, {i, imin, imax}] or Sum[expr, {i, imax}].
     """
-    from minimatic.eval import evaluate
-
     args = list(expr.args)
     if len(args) < 1:
         return expr
@@ -530,37 +544,37 @@ def sum_builtin(expr: Expression, context: EvaluationContext) -> Any:
 
         if len(iter_args) == 2:
             # {i, imax} form - starts at 1
-            imax = evaluate(iter_args[1], context)
+            imax = yield iter_args[1]
             if is_integer(imax) and imax > 0:
                 for i in range(1, imax + 1):
                     from minimatic.pattern import replace_with_bindings
 
                     substituted = replace_with_bindings(summand, {var: i})
-                    result += evaluate(substituted, context)
+                    result += yield substituted
                 return result
         elif len(iter_args) == 3:
             # {i, imin, imax} form
-            imin = evaluate(iter_args[1], context)
-            imax = evaluate(iter_args[2], context)
+            imin = yield iter_args[1]
+            imax = yield iter_args[2]
             if is_integer(imin) and is_integer(imax):
                 for i in range(imin, imax + 1):
                     from minimatic.pattern import replace_with_bindings
 
                     substituted = replace_with_bindings(summand, {var: i})
-                    result += evaluate(substituted, context)
+                    result += yield substituted
                 return result
         elif len(iter_args) == 4:
             # {i, imin, imax, step} form
-            imin = evaluate(iter_args[1], context)
-            imax = evaluate(iter_args[2], context)
-            step = evaluate(iter_args[3], context)
+            imin = yield iter_args[1]
+            imax = yield iter_args[2]
+            step = yield iter_args[3]
             if is_integer(imin) and is_integer(imax) and is_integer(step) and step != 0:
                 i = imin
                 while (step > 0 and i <= imax) or (step < 0 and i >= imax):
                     from minimatic.pattern import replace_with_bindings
 
                     substituted = replace_with_bindings(summand, {var: i})
-                    result += evaluate(substituted, context)
+                    result += yield substituted
                     i += step
                 return result
 
@@ -576,8 +590,6 @@ Product = Symbol("Product")
 @register_builtin(Product, attributes={HoldRest}, auto_evaluate=False)
 def product_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """Product: Product[expr, {i, imin, imax}]."""
-    from minimatic.eval import evaluate
-
     args = list(expr.args)
     if len(args) < 1:
         return expr
@@ -599,38 +611,182 @@ def product_builtin(expr: Expression, context: EvaluationContext) -> Any:
         var = iter_args[0]
 
         if len(iter_args) == 2:
-            imax = evaluate(iter_args[1], context)
+            imax = yield iter_args[1]
             if is_integer(imax) and imax > 0:
                 for i in range(1, imax + 1):
                     from minimatic.pattern import replace_with_bindings
 
                     substituted = replace_with_bindings(factor, {var: i})
-                    result *= evaluate(substituted, context)
+                    result *= yield substituted
                 return result
         elif len(iter_args) == 3:
             # {i, imin, imax} form
-            imin = evaluate(iter_args[1], context)
-            imax = evaluate(iter_args[2], context)
+            imin = yield iter_args[1]
+            imax = yield iter_args[2]
             if is_integer(imin) and is_integer(imax):
                 for i in range(imin, imax + 1):
                     from minimatic.pattern import replace_with_bindings
 
                     substituted = replace_with_bindings(factor, {var: i})
-                    result *= evaluate(substituted, context)
+                    result *= yield substituted
                 return result
         elif len(iter_args) == 4:
             # {i, imin, imax, step} form
-            imin = evaluate(iter_args[1], context)
-            imax = evaluate(iter_args[2], context)
-            step = evaluate(iter_args[3], context)
+            imin = yield iter_args[1]
+            imax = yield iter_args[2]
+            step = yield iter_args[3]
             if is_integer(imin) and is_integer(imax) and is_integer(step) and step != 0:
                 i = imin
                 while (step > 0 and i <= imax) or (step < 0 and i >= imax):
                     from minimatic.pattern import replace_with_bindings
 
                     substituted = replace_with_bindings(factor, {var: i})
-                    result *= evaluate(substituted, context)
+                    result *= yield substituted
                     i += step
                 return result
 
     return Expression(Product, factor, *iterators)
+
+
+# ----- Packed array kernels -----
+#
+# Bulk versions of the Listable arithmetic built-ins. They run when at least
+# one argument is a PackedArray and all others are packed arrays of the same
+# length or real scalars, and the head has no DownValues that could apply
+# to the elements. Each element goes through the same numeric rule as the
+# scalar built-in (Plus and Times in canonical argument order, Power and
+# Sqrt returning integers for whole results, a zero product as the integer
+# 0), so the result is exactly what threading element by element gives;
+# it is packed again when its elements allow it. Any other argument shape,
+# or an arithmetic error on some element, returns None so the evaluator
+# falls back to threading element by element.
+
+
+def packed_operands(args: tuple[Any, ...]) -> list[Iterable[Any]] | None:
+    """
+    Align the arguments of a Listable call as equal-length columns.
+
+    Packed arrays contribute their buffer; real scalars are repeated.
+    Returns None unless at least one argument is packed, all packed
+    arguments have the same length, and the rest are real numbers.
+    """
+    lengths = {len(arg) for arg in args if is_packed(arg)}
+    if len(lengths) != 1:
+        return None
+    (length,) = lengths
+    columns: list[Iterable[Any]] = []
+    for arg in args:
+        if is_packed(arg):
+            columns.append(arg.buffer)
+        elif is_real(arg):
+            columns.append(itertools.repeat(arg, length))
+        else:
+            return None
+    return columns
+
+
+def _bulk(results: Iterable[Any]) -> Any:
+    """Pack lazily computed results, or return None if any element fails."""
+    try:
+        return pack_values(results)
+    except (ArithmeticError, ValueError):
+        return None
+
+
+def _rows(columns: list[Iterable[Any]]) -> Iterable[tuple[Any, ...]]:
+    """
+    The operands of each element, in the order an Orderless head sorts them.
+
+    Two operands need no sorting: adding or multiplying them gives the same
+    result either way round.
+    """
+    rows = zip(*columns, strict=True)
+    if len(columns) <= 2:
+        return rows
+    return (tuple(sorted(row, key=_number_order)) for row in rows)
+
+
+def _number_order(value: Any) -> tuple:
+    """Canonical order of real numbers: by value, integers before reals."""
+    return (value, type(value) is float)
+
+
+def _sum(row: tuple[Any, ...]) -> Any:
+    """Numeric value of Plus over row, as plus_builtin computes it."""
+    total = 0
+    for value in row:
+        total += value
+    return total
+
+
+def _product(row: tuple[Any, ...]) -> Any:
+    """Numeric value of Times over row, as times_builtin computes it."""
+    product = 1
+    for value in row:
+        if value == 0:
+            return 0
+        product *= value
+    if product == 0:
+        return 0
+    if product == 1:
+        return 1
+    return product
+
+
+def _whole(results: Iterable[Any]) -> Iterable[Any]:
+    """Results of a numeric rule, failing on one the rule leaves symbolic."""
+    for result in results:
+        if result is None:
+            raise ArithmeticError("no numeric value")
+        yield result
+
+
+@register_packed(Plus)
+def plus_packed(args: tuple[Any, ...]) -> Any:
+    """Element-wise Plus over packed arrays."""
+    columns = packed_operands(args)
+    if columns is None:
+        return None
+    if len(columns) == 1:
+        # Plus[x] is x
+        return args[0]
+    return _bulk(map(_sum, _rows(columns)))
+
+
+@register_packed(Times)
+def times_packed(args: tuple[Any, ...]) -> Any:
+    """Element-wise Times over packed arrays."""
+    columns = packed_operands(args)
+    if columns is None:
+        return None
+    if len(columns) == 1:
+        # Times[x] is x
+        return args[0]
+    return _bulk(map(_product, _rows(columns)))
+
+
+@register_packed(Power)
+def power_packed(args: tuple[Any, ...]) -> Any:
+    """Element-wise Power over packed arrays."""
+    columns = packed_operands(args) if len(args) == 2 else None
+    if columns is None:
+        return None
+    return _bulk(_whole(itertools.starmap(numeric_power, zip(*columns, strict=True))))
+
+
+def _unary_kernel(fn: Callable[[Any], Any]) -> Callable[[tuple[Any, ...]], Any]:
+    """Build a packed kernel for a one-argument numeric function."""
+
+    def kernel(args: tuple[Any, ...]) -> Any:
+        columns = packed_operands(args) if len(args) == 1 else None
+        if columns is None:
+            return None
+        return _bulk(map(fn, columns[0]))
+
+    return kernel
+
+
+register_packed(Abs)(_unary_kernel(abs))
+register_packed(Sqrt)(_unary_kernel(numeric_sqrt))
+register_packed(Exp)(_unary_kernel(math.exp))
+register_packed(Log)(_unary_kernel(math.log))
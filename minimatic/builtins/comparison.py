@@ -140,14 +140,12 @@ And = Symbol("And")
 @register_builtin(And, attributes={HoldAll}, auto_evaluate=False)
 def and_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """And[a, b, ...]. Short-circuit AND. Returns False on first False."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) == 0:
         return True
 
     for arg in args:
-        val = evaluate(arg, context)
+        val = yield arg
         if val is False or val is Symbol("False"):
             return False
         if val is not True and val is not Symbol("True"):
@@ -161,14 +159,12 @@ Or = Symbol("Or")
 @register_builtin(Or, attributes={HoldAll}, auto_evaluate=False)
 def or_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """Or[a, b, ...]. Short-circuit OR. Returns True on first True."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) == 0:
         return False
 
     for arg in args:
-        val = evaluate(arg, context)
+        val = yield arg
         if val is True or val is Symbol("True"):
             return True
         if val is not False and val is not Symbol("False"):
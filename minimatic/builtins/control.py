@@ -3,7 +3,8 @@ Control flow built-in functions.
 
 Implements conditional, looping, scoping, and evaluation control
 following Wolfram Language semantics. All constructs use Hold attributes
-to receive unevaluated expressions and selectively evaluate them.
+to receive unevaluated expressions and selectively evaluate them, by
+yielding them to the evaluator (see InContext in minimatic.eval).
 """
 
 from typing import Any
@@ -12,6 +13,7 @@ from minimatic.core import (
     Expression,
     HoldAll,
     HoldFirst,
+    Protected,
     Symbol,
     gensym,
     is_expr,
@@ -21,10 +23,20 @@ from minimatic.core import (
     is_string,
     is_symbol,
 )
+from minimatic.core.symbol import _collect_temporaries, _temporaries_due
 from minimatic.eval.context import EvaluationContext, with_context
-from minimatic.pattern import replace_with_bindings
+from minimatic.pattern import (
+    collect_pattern_names,
+    get_condition_pattern,
+    get_condition_test,
+    is_condition,
+    is_hold_pattern,
+    is_pattern_construct,
+    replace_with_bindings,
+    unwrap_hold_pattern,
+)
 
-from .registry import register_builtin
+from .registry import builtin_attributes, register_attributes, register_builtin
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ASSIGNMENT
@@ -38,20 +50,25 @@ def set_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Set[sym, value] (x = value). Assign value to sym, returning the value.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
 
     sym = args[0]
-    value = evaluate(args[1], context)
+    value = yield args[1]
 
     # Set OwnValue on the symbol
     if is_symbol(sym):
         context.set_own_values(sym, [(sym, value, None)])
         return value
 
+    # f[args] = value and f[args1][args2] = value, keyed on the evaluated
+    # arguments (f[1 + 1] = 3 defines f[2])
+    if is_expr(sym):
+        sym = yield from _evaluate_lhs(sym)
+    if _add_definition(sym, value, context):
+        return value
+
     return expr
 
 
@@ -62,6 +79,10 @@ SetDelayed = Symbol("SetDelayed")
 def set_delayed_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     SetDelayed[sym, body] (x := body). Assign unevaluated body as DownValue.
+
+    SetDelayed[f[args], body] adds a DownValue to f, and
+    SetDelayed[f[args1][args2], body] a SubValue, replacing an existing
+    definition with the same left-hand side.
     """
     args = expr.args
     if len(args) < 2:
@@ -77,9 +98,66 @@ def set_delayed_builtin(expr: Expression, context: EvaluationContext) -> Any:
         context.set_down_values(sym, existing)
         return Symbol("Null")
 
+    if _add_definition(sym, body, context):
+        return Symbol("Null")
+
     return expr
 
 
+def _evaluate_lhs(lhs: Expression) -> Any:
+    """
+    Evaluate the arguments of a Set left-hand side f[args] or f[args1][args2],
+    leaving those with patterns, and HoldPattern or Condition forms, as they
+    are.
+    """
+    if is_hold_pattern(lhs) or is_condition(lhs):
+        return lhs
+    head = lhs.head
+    if is_expr(head):
+        head = yield from _evaluate_lhs(head)
+    args = []
+    for arg in lhs.args:
+        if not is_pattern_construct(arg) and not collect_pattern_names(arg):
+            arg = yield arg
+        args.append(arg)
+    return Expression(head, *args)
+
+
+def _add_definition(lhs: Any, rhs: Any, context: EvaluationContext) -> bool:
+    """
+    Store lhs -> rhs as a DownValue (f[...]) or SubValue (f[...][...]).
+    A condition lhs /; test becomes the definition's condition.
+
+    Returns False if lhs has neither form, or its symbol is Protected
+    (as List and every other built-in is).
+    """
+    condition = None
+    if is_condition(lhs):
+        condition = get_condition_test(lhs)
+        lhs = get_condition_pattern(lhs)
+    if not is_expr(lhs):
+        return False
+    target = unwrap_hold_pattern(lhs)
+    if not is_expr(target):
+        return False
+    if is_symbol(target.head):
+        sym, add = target.head, context.add_down_value
+    elif is_expr(target.head) and is_symbol(target.head.head):
+        sym, add = target.head.head, context.add_sub_value
+    else:
+        return False
+    if Protected in context.get_attributes(sym) | builtin_attributes(sym):
+        return False
+    add(sym, lhs, rhs, condition)
+    return True
+
+
+List = Symbol("List")
+
+# List has no implementation (it evaluates to itself), only its attributes
+register_attributes(List)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONDITIONALS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -92,19 +170,19 @@ def if_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Conditional: If[condition, then] or If[condition, then, else].
     Returns Null if condition is not True and no else branch.
+    The chosen branch is returned unevaluated, for the evaluator to
+    evaluate in place of the If.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
 
-    condition = evaluate(args[0], context)
+    condition = yield args[0]
 
     if condition is True or condition is Symbol("True"):
-        return evaluate(args[1], context)
+        return args[1]
     elif len(args) >= 3:
-        return evaluate(args[2], context)
+        return args[2]
     else:
         return Symbol("Null")
 
@@ -118,16 +196,14 @@ def which_builtin(expr: Expression, context: EvaluationContext) -> Any:
     Which[test1, val1, test2, val2, ...].
     Evaluates tests in order, returns the value for the first True test.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
 
     for i in range(0, len(args) - 1, 2):
-        condition = evaluate(args[i], context)
+        condition = yield args[i]
         if condition is True or condition is Symbol("True"):
-            return evaluate(args[i + 1], context)
+            return args[i + 1]
 
     return Symbol("Null")
 
@@ -141,24 +217,23 @@ def switch_builtin(expr: Expression, context: EvaluationContext) -> Any:
     Switch[expr, pat1, val1, pat2, val2, ..., default].
     Evaluates expr, then matches against patterns.
     """
-    from minimatic.eval import evaluate
     from minimatic.pattern import match
 
     args = expr.args
     if len(args) < 2:
         return expr
 
-    evaluated = evaluate(args[0], context)
+    evaluated = yield args[0]
 
     for i in range(1, len(args) - 1, 2):
         pattern = args[i]
         result = match(pattern, evaluated)
         if result.success:
-            return evaluate(args[i + 1], context)
+            return args[i + 1]
 
     # If odd number of args after expr, last one is default
     if len(args) % 2 == 0:
-        return evaluate(args[-1], context)
+        return args[-1]
 
     return Symbol("Null")
 
@@ -173,17 +248,15 @@ CompoundExpression = Symbol("CompoundExpression")
 @register_builtin(CompoundExpression, attributes={HoldAll}, auto_evaluate=False)
 def compound_expression_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
-    CompoundExpression[a, b, ..., c]. Evaluate all, return last.
+    CompoundExpression[a, b, ..., c]. Evaluate all, return last
+    (returned unevaluated, for the evaluator to evaluate in place).
     """
-    from minimatic.eval import evaluate
-
     if not expr.args:
         return Symbol("Null")
 
-    result = Symbol("Null")
-    for arg in expr.args:
-        result = evaluate(arg, context)
-    return result
+    for arg in expr.args[:-1]:
+        _ = yield arg
+    return expr.args[-1]
 
 
 Evaluate = Symbol("Evaluate")
@@ -194,11 +267,9 @@ def evaluate_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Evaluate[expr]. Force evaluation of a held expression.
     """
-    from minimatic.eval import evaluate
-
     if not expr.args:
         return expr
-    return evaluate(expr.args[0], context)
+    return (yield expr.args[0])
 
 
 ReleaseHold = Symbol("ReleaseHold")
@@ -210,15 +281,13 @@ def release_hold_builtin(expr: Expression, context: EvaluationContext) -> Any:
     ReleaseHold[expr]. Unwrap a held expression and evaluate it.
     If expr is Hold[inner], evaluates inner directly.
     """
-    from minimatic.eval import evaluate
-
     if not expr.args:
         return expr
     inner = expr.args[0]
     # If it's Hold[...], unwrap and evaluate the inner expression
     if is_expr(inner) and is_symbol(inner.head) and inner.head.name == "Hold" and inner.args:
-        return evaluate(inner.args[0], context)
-    return evaluate(inner, context)
+        return (yield inner.args[0])
+    return (yield inner)
 
 
 Hold = Symbol("Hold")
@@ -256,8 +325,6 @@ def do_builtin(expr: Expression, context: EvaluationContext) -> Any:
     Do[body, {i, imin, imax}] or Do[body, {i, imin, imax, step}] or Do[body, {i, list}].
     Iterate for side effects, return Null.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
@@ -273,24 +340,24 @@ def do_builtin(expr: Expression, context: EvaluationContext) -> Any:
 
     if len(iter_args) == 1:
         # {i, list} form - iterate over list
-        lst = evaluate(iter_args[0], context)
+        lst = yield iter_args[0]
         if is_expr(lst) and is_symbol(lst.head) and lst.head.name == "List":
             for item in lst.args:
                 substituted = replace_with_bindings(body, {var: item})
-                evaluate(substituted, context)
+                yield substituted
         return Symbol("Null")
 
     elif len(iter_args) >= 2:
         # {i, imin, imax} or {i, imin, imax, step}
-        imin = evaluate(iter_args[0], context)
-        imax = evaluate(iter_args[1], context)
-        step = evaluate(iter_args[2], context) if len(iter_args) > 2 else 1
+        imin = yield iter_args[0]
+        imax = yield iter_args[1]
+        step = (yield iter_args[2]) if len(iter_args) > 2 else 1
 
         if is_integer(imin) and is_integer(imax) and is_integer(step) and step != 0:
             i = imin
             while (step > 0 and i <= imax) or (step < 0 and i >= imax):
                 substituted = replace_with_bindings(body, {var: i})
-                evaluate(substituted, context)
+                yield substituted
                 i += step
         return Symbol("Null")
 
@@ -305,17 +372,15 @@ def while_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     While[test, body]. Loop while test is True, return Null.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
 
     while True:
-        condition = evaluate(args[0], context)
+        condition = yield args[0]
         if condition is not True and condition is not Symbol("True"):
             break
-        evaluate(args[1], context)
+        yield args[1]
     return Symbol("Null")
 
 
@@ -327,8 +392,6 @@ def for_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     For[start, test, incr, body]. C-style for loop, return Null.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 4:
         return expr
@@ -336,19 +399,19 @@ def for_builtin(expr: Expression, context: EvaluationContext) -> Any:
     start, test, incr, body = args[0], args[1], args[2], args[3]
 
     # Evaluate start
-    evaluate(start, context)
+    yield start
 
     while True:
         # Check test
-        condition = evaluate(test, context)
+        condition = yield test
         if condition is not True and condition is not Symbol("True"):
             break
 
         # Execute body
-        evaluate(body, context)
+        yield body
 
         # Execute increment
-        evaluate(incr, context)
+        yield incr
 
     return Symbol("Null")
 
@@ -362,8 +425,6 @@ def table_builtin(expr: Expression, context: EvaluationContext) -> Any:
     Table[expr, {i, imin, imax}] or Table[expr, {i, list}].
     Collect results into a List.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
@@ -380,26 +441,26 @@ def table_builtin(expr: Expression, context: EvaluationContext) -> Any:
 
     if len(iter_args) == 1:
         # {i, list} form
-        lst = evaluate(iter_args[0], context)
+        lst = yield iter_args[0]
         if is_expr(lst) and is_symbol(lst.head) and lst.head.name == "List":
             for item in lst.args:
                 substituted = replace_with_bindings(body, {var: item})
-                results.append(evaluate(substituted, context))
+                results.append((yield substituted))
 
     elif len(iter_args) >= 2:
         # {i, imin, imax} or {i, imin, imax, step}
-        imin = evaluate(iter_args[0], context)
-        imax = evaluate(iter_args[1], context)
-        step = evaluate(iter_args[2], context) if len(iter_args) > 2 else 1
+        imin = yield iter_args[0]
+        imax = yield iter_args[1]
+        step = (yield iter_args[2]) if len(iter_args) > 2 else 1
 
         if is_integer(imin) and is_integer(imax) and is_integer(step) and step != 0:
             i = imin
             while (step > 0 and i <= imax) or (step < 0 and i >= imax):
                 substituted = replace_with_bindings(body, {var: i})
-                results.append(evaluate(substituted, context))
+                results.append((yield substituted))
                 i += step
 
-    return Expression(Symbol("List"), *results)
+    return Expression._from_parts(Symbol("List"), tuple(results))
 
 
 Nest = Symbol("Nest")
@@ -410,21 +471,19 @@ def nest_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Nest[f, expr, n]. Apply f to expr n times.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 3:
         return expr
 
     f, x, n = args[0], args[1], args[2]
-    n_val = evaluate(n, context)
+    n_val = yield n
 
     if not is_integer(n_val) or n_val < 0:
         return expr
 
-    result = evaluate(x, context)
+    result = yield x
     for _ in range(n_val):
-        result = evaluate(Expression(f, result), context)
+        result = yield Expression(f, result)
     return result
 
 
@@ -436,25 +495,23 @@ def nest_list_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     NestList[f, expr, n]. Apply f to expr n times, collecting intermediate results.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 3:
         return expr
 
     f, x, n = args[0], args[1], args[2]
-    n_val = evaluate(n, context)
+    n_val = yield n
 
     if not is_integer(n_val) or n_val < 0:
         return expr
 
-    results = [evaluate(x, context)]
-    result = results[0]
+    result = yield x
+    results = [result]
     for _ in range(n_val):
-        result = evaluate(Expression(f, result), context)
+        result = yield Expression(f, result)
         results.append(result)
 
-    return Expression(Symbol("List"), *results)
+    return Expression._from_parts(Symbol("List"), tuple(results))
 
 
 Fold = Symbol("Fold")
@@ -465,19 +522,17 @@ def fold_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Fold[f, expr, list]. Left fold: f[f[f[expr, x1], x2], x3]...
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 3:
         return expr
 
     f, init, lst = args[0], args[1], args[2]
-    result = evaluate(init, context)
-    lst_val = evaluate(lst, context)
+    result = yield init
+    lst_val = yield lst
 
     if is_expr(lst_val) and is_symbol(lst_val.head) and lst_val.head.name == "List":
         for item in lst_val.args:
-            result = evaluate(Expression(f, result, item), context)
+            result = yield Expression(f, result, item)
 
     return result
 
@@ -490,18 +545,18 @@ def map_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Map[f, expr]. Apply f to each element of expr (must have List head).
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
 
     f, lst = args[0], args[1]
-    lst_val = evaluate(lst, context)
+    lst_val = yield lst
 
     if is_expr(lst_val) and is_symbol(lst_val.head) and lst_val.head.name == "List":
-        results = [evaluate(Expression(f, item), context) for item in lst_val.args]
-        return Expression(Symbol("List"), *results)
+        results = []
+        for item in lst_val.args:
+            results.append((yield Expression(f, item)))
+        return Expression._from_parts(Symbol("List"), tuple(results))
 
     return expr
 
@@ -513,14 +568,21 @@ def map_builtin(expr: Expression, context: EvaluationContext) -> Any:
 Module = Symbol("Module")
 
 
+def _module_local(name: str, context: EvaluationContext, value: Any = None) -> Symbol:
+    """Create a Module local: a gensym'd symbol with the Temporary attribute (and a value)."""
+    local_sym = gensym(name)
+    context.set_temporary(local_sym, value)
+    return local_sym
+
+
 @register_builtin(Module, attributes={HoldAll}, auto_evaluate=False)
 def module_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     Module[{x=1, y=2}, body]. Lexical scoping with unique local variables.
     Each variable gets a gensym'd name, values are substituted into body.
+    Locals are Temporary: they and their values are collected once nothing
+    refers to them any more.
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
@@ -528,30 +590,33 @@ def module_builtin(expr: Expression, context: EvaluationContext) -> Any:
     locals_spec = args[0]
     body = args[1]
 
+    if _temporaries_due():
+        # Collect the locals of earlier Modules that nothing refers to any
+        # more, so that a Module in a long loop or recursion runs in bounded
+        # memory; the caches of the evaluation in progress are kept
+        _collect_temporaries(keep_caches=True)
+
     # Parse local variable specifications
     bindings = {}
     if is_expr(locals_spec) and is_symbol(locals_spec.head) and locals_spec.head.name == "List":
         for item in locals_spec.args:
             if is_symbol(item):
                 # {x} form - local with no initial value
-                local_sym = gensym(item.name)
+                local_sym = _module_local(item.name, context)
                 bindings[item] = local_sym
             elif is_expr(item) and is_symbol(item.head) and item.head.name == "Set" and len(item.args) == 2:
                 # {x = val} form
-                local_sym = gensym(item.args[0].name)
-                val = evaluate(item.args[1], context)
-                context.set_own_values(local_sym, [(local_sym, val, None)])
+                val = yield item.args[1]
+                local_sym = _module_local(item.args[0].name, context, val)
                 bindings[item.args[0]] = local_sym
             elif is_expr(item) and is_symbol(item.head) and item.head.name == "Rule" and len(item.args) == 2:
                 # {x -> val} form
-                local_sym = gensym(item.args[0].name)
-                val = evaluate(item.args[1], context)
-                context.set_own_values(local_sym, [(local_sym, val, None)])
+                val = yield item.args[1]
+                local_sym = _module_local(item.args[0].name, context, val)
                 bindings[item.args[0]] = local_sym
 
-    # Substitute and evaluate body
-    substituted = replace_with_bindings(body, bindings, flatten_lists=False)
-    return evaluate(substituted, context)
+    # Substitute; the evaluator evaluates the body in place of the Module
+    return replace_with_bindings(body, bindings, flatten_lists=False)
 
 
 Block = Symbol("Block")
@@ -563,7 +628,7 @@ def block_builtin(expr: Expression, context: EvaluationContext) -> Any:
     Block[{x=1, y=2}, body]. Dynamic scoping.
     Temporarily sets OwnValues, evaluates body, then restores.
     """
-    from minimatic.eval import evaluate
+    from minimatic.eval import InContext
 
     args = expr.args
     if len(args) < 2:
@@ -585,23 +650,24 @@ def block_builtin(expr: Expression, context: EvaluationContext) -> Any:
             elif is_expr(item) and is_symbol(item.head) and item.head.name == "Set" and len(item.args) == 2:
                 # {x = val} form
                 var = item.args[0]
-                val = evaluate(item.args[1], context)
+                val = yield item.args[1]
                 saved[var] = context.get_own_values(var)
                 new_ctx.set_own_values(var, [(var, val, None)])
             elif is_expr(item) and is_symbol(item.head) and item.head.name == "Rule" and len(item.args) == 2:
                 # {x -> val} form
                 var = item.args[0]
-                val = evaluate(item.args[1], context)
+                val = yield item.args[1]
                 saved[var] = context.get_own_values(var)
                 new_ctx.set_own_values(var, [(var, val, None)])
 
-    # Evaluate body in new context
-    with with_context(new_ctx):
-        result = evaluate(body, new_ctx)
-
-    # Restore original values
-    for sym, values in saved.items():
-        context.set_own_values(sym, values)
+    # Evaluate body in new context, on the evaluator's stack
+    try:
+        with with_context(new_ctx):
+            result = yield InContext(body, new_ctx)
+    finally:
+        # Restore original values
+        for sym, values in saved.items():
+            context.set_own_values(sym, values)
 
     return result
 
@@ -614,8 +680,6 @@ def with_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """
     With[{x=val}, body]. Constant substitution (like Module but values are pre-evaluated).
     """
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
@@ -629,14 +693,13 @@ def with_builtin(expr: Expression, context: EvaluationContext) -> Any:
         for item in locals_spec.args:
             if is_expr(item) and is_symbol(item.head) and item.head.name == "Set" and len(item.args) == 2:
                 # {x = val} form
-                bindings[item.args[0]] = evaluate(item.args[1], context)
+                bindings[item.args[0]] = yield item.args[1]
             elif is_expr(item) and is_symbol(item.head) and item.head.name == "Rule" and len(item.args) == 2:
                 # {x -> val} form
-                bindings[item.args[0]] = evaluate(item.args[1], context)
+                bindings[item.args[0]] = yield item.args[1]
 
-    # Substitute into body and evaluate
-    substituted = replace_with_bindings(body, bindings, flatten_lists=False)
-    return evaluate(substituted, context)
+    # Substitute into body; the evaluator evaluates it in place of the With
+    return replace_with_bindings(body, bindings, flatten_lists=False)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -649,12 +712,10 @@ TrueQ = Symbol("TrueQ")
 @register_builtin(TrueQ, auto_evaluate=True)
 def trueq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """TrueQ[expr]. Returns True if expr is True, else False."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return result is True or result is Symbol("True")
 
 
@@ -664,14 +725,13 @@ SameQ = Symbol("SameQ")
 @register_builtin(SameQ, auto_evaluate=True)
 def sameq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """SameQ[a, b]. Structural equality (===)."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
-    a = evaluate(args[0], context)
-    b = evaluate(args[1], context)
-    return a == b
+    a = yield args[0]
+    b = yield args[1]
+    # Shared (hash-consed) subtrees compare by identity
+    return a is b or a == b
 
 
 UnsameQ = Symbol("UnsameQ")
@@ -680,14 +740,12 @@ UnsameQ = Symbol("UnsameQ")
 @register_builtin(UnsameQ, auto_evaluate=True)
 def unsameq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """UnsameQ[a, b]. Structural inequality."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return expr
-    a = evaluate(args[0], context)
-    b = evaluate(args[1], context)
-    return a != b
+    a = yield args[0]
+    b = yield args[1]
+    return a is not b and a != b
 
 
 NumericQ = Symbol("NumericQ")
@@ -696,12 +754,10 @@ NumericQ = Symbol("NumericQ")
 @register_builtin(NumericQ, auto_evaluate=True)
 def numericq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """NumericQ[expr]. Returns True if expr is numeric."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return is_numeric(result) and not isinstance(result, bool)
 
 
@@ -711,12 +767,10 @@ AtomQ = Symbol("AtomQ")
 @register_builtin(AtomQ, auto_evaluate=True)
 def atomq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """AtomQ[expr]. Returns True if expr is atomic (not an Expression)."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return not is_expr(result)
 
 
@@ -726,13 +780,11 @@ HeadQ = Symbol("HeadQ")
 @register_builtin(HeadQ, auto_evaluate=True)
 def headq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """HeadQ[expr, head]. Returns True if head of expr is head."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 2:
         return False
-    obj = evaluate(args[0], context)
-    head = evaluate(args[1], context)
+    obj = yield args[0]
+    head = yield args[1]
     if is_expr(obj):
         return obj.head == head
     elif is_symbol(obj):
@@ -746,12 +798,10 @@ ListQ = Symbol("ListQ")
 @register_builtin(ListQ, auto_evaluate=True)
 def listq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """ListQ[expr]. Returns True if expr has List head."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return is_expr(result) and is_symbol(result.head) and result.head.name == "List"
 
 
@@ -761,12 +811,10 @@ StringQ = Symbol("StringQ")
 @register_builtin(StringQ, auto_evaluate=True)
 def stringq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """StringQ[expr]. Returns True if expr is a string."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return is_string(result)
 
 
@@ -776,12 +824,10 @@ IntegerQ = Symbol("IntegerQ")
 @register_builtin(IntegerQ, auto_evaluate=True)
 def integerq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """IntegerQ[expr]. Returns True if expr is an integer."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return is_integer(result)
 
 
@@ -791,10 +837,8 @@ RealQ = Symbol("RealQ")
 @register_builtin(RealQ, auto_evaluate=True)
 def realq_builtin(expr: Expression, context: EvaluationContext) -> Any:
     """RealQ[expr]. Returns True if expr is a real number."""
-    from minimatic.eval import evaluate
-
     args = expr.args
     if len(args) < 1:
         return False
-    result = evaluate(args[0], context)
+    result = yield args[0]
     return is_real(result)
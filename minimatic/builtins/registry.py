@@ -9,7 +9,8 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from minimatic.core import Expression, Symbol
+from minimatic.core import Expression, Protected, Symbol
+from minimatic.eval.context import attributes_changed
 
 if TYPE_CHECKING:
     from minimatic.eval.context import EvaluationContext
@@ -52,19 +53,76 @@ def register_builtin(
         def plus_impl(expr, context):
             # implementation
             return result
+
+    A built-in that evaluates expressions of its own (typically one with a
+    Hold attribute) is written as a generator: `value = yield e` has e
+    evaluated on the evaluator's explicit stack, and `yield InContext(e, ctx)`
+    evaluates it in another context. The generator's return value is the
+    result.
+
+    Built-ins are Protected: Set and SetDelayed do not add definitions to
+    them.
     """
-    attrs = frozenset(attributes) if attributes else frozenset()
+    attrs = frozenset(attributes or ()) | {Protected}
 
     def decorator(func: Callable[[Any, EvaluationContext], Any]) -> Callable:
         builtin = BuiltinFunction(
             symbol=sym, implementation=func, attributes=attrs, auto_evaluate=auto_evaluate
         )
         _registry[sym] = builtin
+        attributes_changed()
         return func
 
     return decorator
 
 
+# Global registry mapping Symbol -> attributes of a built-in without an
+# implementation
+_attributes_only: dict[Symbol, frozenset[Symbol]] = {}
+
+
+def register_attributes(sym: Symbol, attributes: set[Symbol] | None = None) -> None:
+    """
+    Register the attributes of a built-in symbol that has no implementation,
+    such as List, which evaluates to itself.
+
+    Like every built-in, the symbol is Protected.
+    """
+    _attributes_only[sym] = frozenset(attributes or ()) | {Protected}
+    attributes_changed()
+
+
+# Global registry mapping Symbol -> bulk kernel over packed arrays
+_packed_kernels: dict[Symbol, Callable[[tuple[Any, ...]], Any]] = {}
+
+
+def register_packed(sym: Symbol) -> Callable[[Callable], Callable]:
+    """
+    Decorator to register a bulk kernel for a Listable built-in.
+
+    The kernel receives the arguments of an expression in which at least
+    one argument is a PackedArray, and returns the threaded result, or
+    None to fall back to element-wise threading.
+
+    Usage:
+        @register_packed(Symbol("Plus"))
+        def plus_packed(args):
+            # operate on the packed buffers
+            return result
+    """
+
+    def decorator(func: Callable[[tuple[Any, ...]], Any]) -> Callable:
+        _packed_kernels[sym] = func
+        return func
+
+    return decorator
+
+
+def get_packed_kernel(sym: Symbol) -> Callable[[tuple[Any, ...]], Any] | None:
+    """Get the packed-array kernel for a symbol, if registered."""
+    return _packed_kernels.get(sym)
+
+
 def get_builtin(sym: Symbol) -> BuiltinFunction | None:
     """Get the built-in implementation for a symbol, if registered."""
     return _registry.get(sym)
@@ -80,12 +138,15 @@ def builtin_attributes(sym: Symbol) -> frozenset[Symbol]:
     builtin = _registry.get(sym)
     if builtin:
         return builtin.attributes
-    return frozenset()
+    return _attributes_only.get(sym, frozenset())
 
 
 def clear_registry() -> None:
     """Clear all registered built-ins (useful for testing)."""
     _registry.clear()
+    _attributes_only.clear()
+    _packed_kernels.clear()
+    attributes_changed()
 
 
 class BuiltinRegistry:
@@ -0,0 +1,274 @@
+"""
+Structure search built-in functions.
+
+Implements Cases, Position, Count, FreeQ and MemberQ following Wolfram
+Language semantics, with level specifications and the Heads option:
+
+    n           levels 1 through n
+    Infinity    levels 1 through Infinity
+    All         levels 0 through Infinity
+    {n}         level n only
+    {n1, n2}    levels n1 through n2 (negative levels count depth)
+
+All of them match the candidates of pattern.search, which skips subtrees
+that lack a symbol the pattern needs; the predicates test without
+building bindings. Conditions and PatternTests in the pattern, and the
+right-hand sides of Cases rules, are evaluated on the evaluator's
+explicit stack: the built-ins are generators that yield them.
+"""
+
+from collections.abc import Generator
+from typing import Any
+
+from minimatic.core import Expression, Symbol, is_integer
+from minimatic.eval.context import EvaluationContext
+from minimatic.pattern import Bindings, compile_pattern, replace_with_bindings
+from minimatic.pattern.search import ALL_LEVELS, INFINITY, candidates
+
+from .registry import register_builtin
+
+List = Symbol("List")
+Rule = Symbol("Rule")
+RuleDelayed = Symbol("RuleDelayed")
+Infinity = Symbol("Infinity")
+All = Symbol("All")
+Heads = Symbol("Heads")
+_True = Symbol("True")
+_False = Symbol("False")
+
+# Level bounds of {1}
+_FIRST_LEVEL = (1, 1)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CASES & POSITION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+Cases = Symbol("Cases")
+
+
+@register_builtin(Cases, auto_evaluate=True)
+def cases_builtin(expr: Expression, context: EvaluationContext) -> Any:
+    """
+    Cases[expr, pattern, levelspec, n]. List the parts of expr matching
+    pattern, at level 1 by default. With lhs -> rhs or lhs :> rhs, list
+    rhs for each part matching lhs. At most n parts if n is given.
+    """
+    parsed = _parse_search(expr, 4, _FIRST_LEVEL, False)
+    if parsed is None:
+        return expr
+    target, form, levels, heads, limit = parsed
+
+    rhs = None
+    if isinstance(form, Expression) and form.head in (Rule, RuleDelayed) and len(form.args) == 2:
+        form, rhs = form.args
+    matches = yield from _search(form, target, levels, heads, rhs is not None, limit)
+    results = []
+    for _, part, bindings in matches:
+        if rhs is not None:
+            part = yield rhs if bindings is None else replace_with_bindings(rhs, bindings)
+        results.append(part)
+    return Expression._from_parts(List, tuple(results))
+
+
+Position = Symbol("Position")
+
+
+@register_builtin(Position, auto_evaluate=True)
+def position_builtin(expr: Expression, context: EvaluationContext) -> Any:
+    """
+    Position[expr, pattern, levelspec, n]. List the positions of the parts
+    of expr matching pattern, at every level and in heads by default. At
+    most n positions if n is given.
+    """
+    parsed = _parse_search(expr, 4, ALL_LEVELS, True)
+    if parsed is None:
+        return expr
+    target, form, levels, heads, limit = parsed
+
+    matches = yield from _search(form, target, levels, heads, False, limit)
+    return Expression._from_parts(
+        List, tuple(Expression._from_parts(List, position) for position, _, _ in matches)
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COUNTING & MEMBERSHIP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+Count = Symbol("Count")
+
+
+@register_builtin(Count, auto_evaluate=True)
+def count_builtin(expr: Expression, context: EvaluationContext) -> Any:
+    """Count[expr, pattern, levelspec]. Count the parts of expr matching pattern."""
+    parsed = _parse_search(expr, 3, _FIRST_LEVEL, False)
+    if parsed is None:
+        return expr
+    target, form, levels, heads, _ = parsed
+    return len((yield from _search(form, target, levels, heads, False)))
+
+
+FreeQ = Symbol("FreeQ")
+
+
+@register_builtin(FreeQ, auto_evaluate=True)
+def free_q_builtin(expr: Expression, context: EvaluationContext) -> Any:
+    """
+    FreeQ[expr, form, levelspec]. True if no part of expr matches form,
+    searching every level and the heads by default.
+    """
+    parsed = _parse_search(expr, 3, ALL_LEVELS, True)
+    if parsed is None:
+        return expr
+    target, form, levels, heads, _ = parsed
+    return not (yield from _search(form, target, levels, heads, False, 1))
+
+
+MemberQ = Symbol("MemberQ")
+
+
+@register_builtin(MemberQ, auto_evaluate=True)
+def member_q_builtin(expr: Expression, context: EvaluationContext) -> Any:
+    """MemberQ[list, form, levelspec]. True if an element of list matches form."""
+    parsed = _parse_search(expr, 3, _FIRST_LEVEL, False)
+    if parsed is None:
+        return expr
+    target, form, levels, heads, _ = parsed
+    return bool((yield from _search(form, target, levels, heads, False, 1)))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _parse_search(
+    expr: Expression, max_args: int, default_levels: tuple, default_heads: bool
+) -> tuple[Any, Any, tuple, bool, int | float] | None:
+    """
+    Split f[expr, pattern, levelspec, n, Heads -> h] into
+    (expr, pattern, levels, heads, n), or None if the arguments are invalid.
+
+    The arguments were evaluated before the call (none of these functions
+    holds them), so they are used as they are.
+    """
+    args = expr.args
+    heads = default_heads
+    if args and _is_heads_option(args[-1]):
+        heads = args[-1].args[1] == _True or args[-1].args[1] is True
+        args = args[:-1]
+    if not 2 <= len(args) <= max_args:
+        return None
+
+    levels = default_levels
+    if len(args) >= 3:
+        levels = _parse_levels(args[2])
+        if levels is None:
+            return None
+    limit: int | float = INFINITY
+    if len(args) == 4:
+        limit = args[3]
+        if not (is_integer(limit) and limit >= 0 or limit == Infinity):
+            return None
+        if limit == Infinity:
+            limit = INFINITY
+    return args[0], args[1], levels, heads, limit
+
+
+def _is_heads_option(arg: Any) -> bool:
+    """Whether an argument is Heads -> True or Heads -> False."""
+    return (
+        isinstance(arg, Expression)
+        and arg.head == Rule
+        and len(arg.args) == 2
+        and arg.args[0] == Heads
+        and arg.args[1] in (_True, _False, True, False)
+    )
+
+
+def _parse_levels(spec: Any) -> tuple | None:
+    """(low, high) level bounds of a level specification, or None if invalid."""
+    if is_integer(spec):
+        return (1, spec)
+    if spec == Infinity:
+        return (1, INFINITY)
+    if spec == All:
+        return ALL_LEVELS
+    if isinstance(spec, Expression) and spec.head == List and 1 <= len(spec.args) <= 2:
+        bounds = []
+        for bound in spec.args:
+            if is_integer(bound):
+                bounds.append(bound)
+            elif bound == Infinity:
+                bounds.append(INFINITY)
+            else:
+                return None
+        return (bounds[0], bounds[-1])
+    return None
+
+
+class _Unknown(Exception):
+    """A test whose value _Replay does not have yet."""
+
+    def __init__(self, expr: Any) -> None:
+        super().__init__(expr)
+        self.expr = expr
+
+
+class _Replay:
+    """
+    The evaluator a part is matched with: it answers the Conditions and
+    PatternTests of the match with the values found so far, in the order
+    the matcher asks for them, and raises _Unknown for the next one.
+    """
+
+    __slots__ = ("values", "asked")
+
+    def __init__(self, values: list) -> None:
+        self.values = values
+        self.asked = 0
+
+    def __call__(self, expr: Any) -> Any:
+        if self.asked == len(self.values):
+            raise _Unknown(expr)
+        self.asked += 1
+        return self.values[self.asked - 1]
+
+
+def _search(
+    form: Any,
+    target: Any,
+    levels: tuple,
+    heads: bool,
+    bind: bool,
+    limit: int | float = INFINITY,
+) -> Generator[Any, Any, list[tuple[tuple[int, ...], Any, Bindings | None]]]:
+    """
+    The first limit matches of form in target, like pattern.search.
+
+    Matching a part stops at the first Condition or PatternTest whose value
+    is not known yet; the test is yielded to the evaluator and the part is
+    matched again with the values found so far, so every test is evaluated
+    once, on the explicit stack.
+    """
+    compiled = compile_pattern(form)
+    matches = []
+    for position, part in candidates(compiled, target, levels, heads):
+        if len(matches) >= limit:
+            break
+        values: list = []
+        while True:
+            replay = _Replay(values)
+            try:
+                if bind:
+                    result = compiled.match(part, evaluator=replay)
+                    found, bindings = result.success, result.bindings
+                else:
+                    found, bindings = compiled.matches(part, replay), None
+                break
+            except _Unknown as unknown:
+                values.append((yield unknown.expr))
+        if found:
+            matches.append((position, part, bindings))
+    return matches
@@ -5,6 +5,12 @@ This module provides the foundational types:
     - Symbol: Immutable symbolic identifiers
     - Expr: Immutable symbolic expressions (head + arguments + attributes)
     - Atoms: Numeric and string literals
+    - PackedArray: Numeric lists stored in a flat buffer
+    - Wire format: Compact binary serialization of element trees
+    - Store: Memory-mapped, lazily decoded on-disk expression trees
+    - Walk: Explicit-stack traversals of element trees
+    - Printer: Streaming FullForm/InputForm output with Short-style limits
+    - PMap: Persistent hash map with structure-sharing updates
 
 All core types are tuple-based for immutability, hashability, and efficiency.
 """
@@ -49,17 +55,67 @@ from .attributes import (
 from .expression import (
     Expression,
     attrs_of,
+    depth_of,
+    disable_hash_consing,
+    enable_hash_consing,
     has_attr,
+    hash_consing,
+    hash_consing_enabled,
     head_of,
+    interned_count,
     is_expr,
+    leaf_count_of,
+    node_count_of,
+    sweep_interned,
+    symbol_bit,
+    symbol_mask_of,
     tail_of,
 )
+from .packed import (
+    PackedArray,
+    is_packed,
+    pack,
+    pack_values,
+    unpack,
+)
+from .pmap import (
+    PMap,
+    pmap,
+)
+from .printer import (
+    format_expression,
+    write_expression,
+)
+from .store import (
+    ExpressionStore,
+    StoredExpression,
+    StoreFormatError,
+    open_store,
+    write_store,
+)
 from .symbol import (
     Symbol,
     clear_symbol_cache,
     gensym,
     is_symbol,
+    is_temporary,
+    sweep_temporaries,
     symbol,
+    symbol_count,
+    symbol_from_id,
+    temporary_count,
+)
+from .walk import (
+    fold,
+    postorder,
+    preorder,
+    rebuild,
+    rebuild_node,
+)
+from .wire import (
+    WireFormatError,
+    WireReader,
+    WireWriter,
 )
 
 __all__ = [
@@ -69,6 +125,11 @@ __all__ = [
     "is_symbol",
     "gensym",
     "clear_symbol_cache",
+    "symbol_from_id",
+    "symbol_count",
+    "is_temporary",
+    "temporary_count",
+    "sweep_temporaries",
     # Expression
     "Expression",
     "is_expr",
@@ -76,6 +137,45 @@ __all__ = [
     "tail_of",
     "attrs_of",
     "has_attr",
+    "depth_of",
+    "leaf_count_of",
+    "node_count_of",
+    "symbol_bit",
+    "symbol_mask_of",
+    "enable_hash_consing",
+    "disable_hash_consing",
+    "hash_consing_enabled",
+    "hash_consing",
+    "interned_count",
+    "sweep_interned",
+    # Packed arrays
+    "PackedArray",
+    "pack",
+    "pack_values",
+    "unpack",
+    "is_packed",
+    # Wire format
+    "WireReader",
+    "WireWriter",
+    "WireFormatError",
+    # Store
+    "ExpressionStore",
+    "StoredExpression",
+    "StoreFormatError",
+    "open_store",
+    "write_store",
+    # Persistent map
+    "PMap",
+    "pmap",
+    # Printer
+    "write_expression",
+    "format_expression",
+    # Walk
+    "preorder",
+    "postorder",
+    "fold",
+    "rebuild",
+    "rebuild_node",
     # Atoms
     "Atom",
     "Element",
@@ -7,8 +7,29 @@ Expressions are the compound structures of the language, consisting of:
     - attributes: Evaluation modifiers (frozenset of Symbols)
 
 Implementation:
-    Expressions are implemented as a tuple subclass: (head, tail, attributes)
+    Expressions are implemented as a tuple subclass:
+        (head, tail, attributes, hash, depth, leaf_count, node_count, symbols)
     This provides immutability, hashability, and memory efficiency.
+    The trailing metadata fields are computed once at construction from
+    the (already cached) metadata of the arguments, so hashing and size
+    queries never re-walk the subtree.
+
+Symbol masks:
+    symbols summarizes which symbols occur in a tree (heads included) as a
+    128-bit mask: each symbol sets bit (id % 128), and each number or string
+    sets the bit of its head (Integer, Real, Complex, String). A symbol
+    whose bit is clear cannot occur anywhere below, so searches for
+    patterns that need it skip the whole subtree. Set bits may be shared
+    by several symbols, so a set bit only means "may occur".
+
+Hash-consing:
+    When enabled with enable_hash_consing(), constructing an expression
+    returns the canonical instance for its (head, args, attributes), so
+    structurally identical subtrees are shared instead of duplicated.
+    Tuple subclasses cannot be weakly referenced, so the intern table
+    holds strong references and is swept whenever it doubles in size:
+    entries that nothing outside the table refers to are dropped, which
+    reclaims dead nodes (and, transitively, their dead children).
 
 Examples:
     Plus[1, 2, 3]  →  Expression(Plus, 1, 2, 3)
@@ -16,15 +37,37 @@ Examples:
     Hold[x + 1]   →  Expression(Hold, Expression(Plus, x, 1), _attrs={Hold})
 """
 
+import math
+import sys
 from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
     Any,
 )
 
+from .symbol import Symbol
+
 if TYPE_CHECKING:
     from .atoms import Element
-    from .symbol import Symbol
+
+_EMPTY_ATTRS: frozenset[Symbol] = frozenset()
+
+# Symbol mask of a tree that may contain any symbol (e.g. one not decoded yet)
+ALL_SYMBOLS = -1
+
+_MASK_BITS = 127
+
+# Mask bit of each atom type, from the symbol of its head
+_ATOM_BITS: dict[type, int] = {
+    atom_type: 1 << (tuple.__getitem__(Symbol(name), 1) & _MASK_BITS)
+    for atom_type, name in (
+        (int, "Integer"),
+        (float, "Real"),
+        (complex, "Complex"),
+        (str, "String"),
+    )
+}
 
 
 # EXPRESSION CLASS
@@ -34,10 +77,17 @@ class Expression(tuple):
     """
     Immutable symbolic expression.
 
-    Structure: (head, tail, attributes)
+    Structure: (head, tail, attributes, hash, depth, leaf_count, node_count, symbols)
         - head: Symbol | Expression — the function or operator
         - tail: tuple[Element, ...] — the arguments
         - attributes: frozenset[Symbol] — evaluation attributes
+        - hash: int | DeferredHash | None — structural hash; a DeferredHash
+          if an argument is hashed on demand (a stored record), filled in
+          on the first call to __hash__; None if an argument is unhashable
+        - depth: int — nesting depth of the argument tree
+        - leaf_count: int — number of leaves in the argument tree
+        - node_count: int — number of nodes (expressions and atoms) in the argument tree
+        - symbols: int — mask of the symbols occurring in the tree (heads included)
     """
 
     __slots__ = ()
@@ -69,9 +119,6 @@ class Expression(tuple):
             >>> Expression(f, x, y, _attrs={Hold})
             f[x, y]  # with Hold attribute
         """
-        # Validate head
-        from .symbol import Symbol  # Local import to avoid circularity
-
         if not isinstance(head, (Symbol, Expression)):
             raise TypeError(
                 f"Expression head must be Symbol or Expression, got {type(head).__name__}"
@@ -79,7 +126,7 @@ class Expression(tuple):
 
         # Normalize attributes to frozenset
         if _attrs is None:
-            attributes: frozenset[Symbol] = frozenset()
+            attributes: frozenset[Symbol] = _EMPTY_ATTRS
         elif isinstance(_attrs, frozenset):
             attributes = _attrs
         else:
@@ -90,9 +137,49 @@ class Expression(tuple):
             if not isinstance(attr, Symbol):
                 raise TypeError(f"Expression attributes must be Symbols, got {type(attr).__name__}")
 
-        # Create the tuple: (head, tail, attributes)
-        tail = tuple(args)
-        return super().__new__(cls, (head, tail, attributes))
+        return cls._from_parts(head, args, attributes)
+
+    @classmethod
+    def _from_parts(
+        cls,
+        head: Symbol | Expression,
+        tail: tuple[Element, ...],
+        attributes: frozenset[Symbol] = _EMPTY_ATTRS,
+    ) -> Expression:
+        """
+        Trusted constructor for internal hot paths.
+
+        Takes an existing args tuple and attributes frozenset as-is: the
+        head type and attribute symbols are not validated and the tail is
+        not copied. Callers must pass a Symbol or Expression head, a tuple
+        and a frozenset of Symbols (typically taken from an existing
+        expression); anything else produces a malformed expression.
+
+        Examples:
+            >>> Expression._from_parts(expr.head, new_args, expr.attributes)
+        """
+        # Hash-consing: return the canonical instance if one is alive
+        key = None
+        if _hash_consing and cls is Expression:
+            key = _intern_key(head, tail, attributes)
+            try:
+                cached = _intern_table.get(key)
+            except TypeError:
+                # An argument is unhashable; such nodes are never interned.
+                key = None
+            else:
+                if cached is not None:
+                    return cached
+
+        # Create the tuple: (head, tail, attributes, hash, depth, leaves, nodes, symbols)
+        instance = tuple.__new__(
+            cls, (head, tail, attributes, *_tree_metadata(head, tail, attributes))
+        )
+        if key is not None:
+            instance = _intern_table.setdefault(key, instance)
+            if len(_intern_table) >= _sweep_threshold:
+                _grow_intern_table()
+        return instance
 
     @property
     def head(self) -> Symbol | Expression:
@@ -114,6 +201,45 @@ class Expression(tuple):
         """The evaluation attributes of this expression."""
         return tuple.__getitem__(self, 2)
 
+    @property
+    def depth(self) -> int:
+        """
+        Nesting depth of the argument tree.
+
+        An expression without arguments has depth 1; otherwise the depth is
+        one more than the deepest argument (atoms and symbols have depth 0).
+        """
+        return tuple.__getitem__(self, 4)
+
+    @property
+    def leaf_count(self) -> int:
+        """
+        Number of leaves in the argument tree.
+
+        Atoms and symbols count as one leaf; an expression without
+        arguments counts as a single leaf.
+        """
+        return tuple.__getitem__(self, 5)
+
+    @property
+    def node_count(self) -> int:
+        """
+        Number of nodes in the argument tree, including this expression.
+
+        Every expression and every atom or symbol argument counts once.
+        Heads are not descended into, matching depth and leaf_count.
+        """
+        return tuple.__getitem__(self, 6)
+
+    @property
+    def symbol_mask(self) -> int:
+        """
+        Mask of the symbols that may occur in the tree, heads included.
+
+        A clear bit (see symbol_bit) means the symbol does not occur.
+        """
+        return tuple.__getitem__(self, 7)
+
     def __len__(self) -> int:
         """Number of arguments (tail length)."""
         return len(self.tail)
@@ -152,7 +278,7 @@ class Expression(tuple):
 
     def with_tail(self, *new_args: Element) -> Expression:
         """Return new expression with different arguments."""
-        return Expression(self.head, *new_args, _attrs=self.attributes)
+        return Expression._from_parts(self.head, new_args, self.attributes)
 
     def with_attrs(self, *attrs: Symbol) -> Expression:
         """Return new expression with additional attributes."""
@@ -160,7 +286,7 @@ class Expression(tuple):
 
     def without_attrs(self, *attrs: Symbol) -> Expression:
         """Return new expression with attributes removed."""
-        return Expression(self.head, *self.tail, _attrs=self.attributes - frozenset(attrs))
+        return Expression._from_parts(self.head, self.tail, self.attributes - frozenset(attrs))
 
     def with_only_attrs(self, *attrs: Symbol) -> Expression:
         """Return new expression with only the specified attributes."""
@@ -176,7 +302,9 @@ class Expression(tuple):
         Returns:
             New Expression with transformed arguments.
         """
-        return Expression(self.head, *(fn(arg) for arg in self.tail), _attrs=self.attributes)
+        return Expression._from_parts(
+            self.head, tuple([fn(arg) for arg in self.tail]), self.attributes
+        )
 
     def map_args_indexed(self, fn: Callable[[int, Element], Element]) -> Expression:
         """
@@ -188,38 +316,96 @@ class Expression(tuple):
         Returns:
             New Expression with transformed arguments.
         """
-        return Expression(
-            self.head, *(fn(i, arg) for i, arg in enumerate(self.tail)), _attrs=self.attributes
+        return Expression._from_parts(
+            self.head, tuple([fn(i, arg) for i, arg in enumerate(self.tail)]), self.attributes
         )
 
     def append(self, *new_args: Element) -> Expression:
         """Return new expression with arguments appended."""
-        return Expression(self.head, *self.tail, *new_args, _attrs=self.attributes)
+        return Expression._from_parts(self.head, self.tail + new_args, self.attributes)
 
     def prepend(self, *new_args: Element) -> Expression:
         """Return new expression with arguments prepended."""
-        return Expression(self.head, *new_args, *self.tail, _attrs=self.attributes)
+        return Expression._from_parts(self.head, new_args + self.tail, self.attributes)
 
     def __hash__(self) -> int:
-        """Hash based on structure."""
-        return hash(("Expression", self.head, self.tail, self.attributes))
+        """Hash based on structure (cached at construction, or on first use)."""
+        cached = tuple.__getitem__(self, 3)
+        if type(cached) is int:
+            return cached
+        if cached is None:
+            # An atom somewhere below is unhashable; find it without
+            # recursing so that hashing it raises the appropriate TypeError.
+            from .walk import preorder
+
+            for elem in preorder(self, heads=True, enter=_hash_unknown):
+                if not _hash_unknown(elem):
+                    hash(elem)
+            return hash(("Expression", self.head, self.tail, self.attributes))
+        value = cached.value
+        if value is None:
+            value = _resolve_hash(self)
+        return value
 
     def __eq__(self, other: object) -> bool:
         """
         Structural equality.
 
         Two expressions are equal if they have the same head, tail,
-        and attributes.
+        and attributes. Expressions whose cached hashes differ are
+        rejected without descending into their arguments.
         """
         if self is other:
             return True
         if not isinstance(other, Expression):
             return False
-        return (
-            self.head == other.head
-            and self.tail == other.tail
-            and self.attributes == other.attributes
-        )
+
+        own_hash = tuple.__getitem__(self, 3)
+        other_hash = tuple.__getitem__(other, 3)
+        if own_hash != other_hash and type(own_hash) is int and type(other_hash) is int:
+            return False
+        if tuple.__getitem__(self, 4) <= _RECURSIVE_DEPTH:
+            return (
+                self.head == other.head
+                and self.tail == other.tail
+                and self.attributes == other.attributes
+            )
+
+        # Deep trees: compare node pairs from an explicit stack, handing
+        # shallow pairs (and subclasses with their own __eq__) back to ==.
+        stack: list[tuple[Expression, Expression]] = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            a_tail = a.tail
+            b_tail = b.tail
+            if len(a_tail) != len(b_tail) or a.attributes != b.attributes:
+                return False
+            for x, y in zip((a.head, *a_tail), (b.head, *b_tail), strict=True):
+                if x is y:
+                    continue
+                if (
+                    isinstance(x, Expression)
+                    and isinstance(y, Expression)
+                    and tuple.__getitem__(x, 4) > _RECURSIVE_DEPTH
+                    and type(x).__eq__ is _expression_eq
+                    and type(y).__eq__ is _expression_eq
+                ):
+                    own_hash = tuple.__getitem__(x, 3)
+                    other_hash = tuple.__getitem__(y, 3)
+                    if own_hash != other_hash and type(own_hash) is int and type(other_hash) is int:
+                        return False
+                    stack.append((x, y))
+                elif not x == y:
+                    return False
+        return True
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as (head, tail, attributes); metadata is recomputed on load."""
+        return (_rebuild, (self.head, self.tail, self.attributes))
+
+    def __ne__(self, other: object) -> bool:
+        """Structural inequality (the negation of __eq__, not tuple comparison)."""
+        return not self.__eq__(other)
 
     def __repr__(self) -> str:
         """
@@ -227,9 +413,7 @@ class Expression(tuple):
 
         Format: Head[arg1, arg2, ...]  or  Head[arg1, arg2, ...] {attrs}
         """
-        head_str = str(self.head)
-        args_str = ", ".join(_format_element(arg) for arg in self.tail)
-        base = f"{head_str}[{args_str}]"
+        base = str(self)
 
         if self.attributes:
             attrs_str = ", ".join(str(a) for a in sorted(self.attributes, key=lambda s: str(s)))
@@ -238,14 +422,305 @@ class Expression(tuple):
 
     def __str__(self) -> str:
         """Human-readable representation."""
+        if tuple.__getitem__(self, 4) > _RECURSIVE_DEPTH:
+            from .printer import format_expression
+
+            return format_expression(self)
         head_str = str(self.head)
         args_str = ", ".join(_format_element(arg) for arg in self.tail)
         return f"{head_str}[{args_str}]"
 
 
+def _hash_unknown(elem: Any) -> bool:
+    """Whether elem is a plain expression with an unhashable argument below."""
+    return type(elem) is Expression and tuple.__getitem__(elem, 3) is None
+
+
+class DeferredHash:
+    """
+    Structural hash of an expression, computed on first use.
+
+    Held in slot 3 of an expression whose subtree contains a node that is
+    hashed on demand (a stored record, whose hash would decode it), so
+    that building the expression does not hash that node.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: int | None = None
+
+
+def _pending(elem: Any) -> bool:
+    """Whether elem is an expression whose deferred hash is not computed yet."""
+    if not isinstance(elem, Expression):
+        return False
+    cached = tuple.__getitem__(elem, 3)
+    return type(cached) is DeferredHash and cached.value is None
+
+
+def _resolve_hash(expr: Expression) -> int:
+    """
+    Compute the deferred hash of expr and of every pending node below it.
+
+    Nodes are hashed in postorder from an explicit stack, so each one only
+    combines the hashes of its (already resolved) children, and each hash
+    is stored in the node's DeferredHash for later calls.
+    """
+    stack: list[tuple[Expression, tuple | None]] = [(expr, None)]
+    while stack:
+        node, parts = stack.pop()
+        if parts is None:
+            if not _pending(node):
+                continue
+            # Keep the decoded parts: hashing them after the children uses
+            # the same child objects whose hashes were just cached
+            parts = (node.head, node.tail, node.attributes)
+            stack.append((node, parts))
+            stack.extend((child, None) for child in (parts[0], *parts[1]) if _pending(child))
+        else:
+            tuple.__getitem__(node, 3).value = hash(("Expression", *parts))
+    return tuple.__getitem__(expr, 3).value
+
+
+# Structural equality of plain nodes, compared pairwise by Expression.__eq__
+_expression_eq = Expression.__eq__
+
+# Trees at most this deep are compared and formatted by plain recursion,
+# which is cheaper per node; deeper trees use explicit-stack walks so
+# their depth is bounded by memory rather than the recursion limit.
+_RECURSIVE_DEPTH = 64
+
+
+# HASH-CONSING
+
+_hash_consing = False
+_intern_table: dict[tuple, Expression] = {}
+_MIN_SWEEP_THRESHOLD = 1 << 16
+_sweep_threshold = _MIN_SWEEP_THRESHOLD
+
+
+# The sweep relies on CPython reference counting: an entry whose count is
+# no higher than that of an object held only by a dict entry is referenced
+# by nothing but the table. The baseline is measured at every sweep along
+# the same call path, so references the interpreter adds while counting
+# are the same on both sides. A reference held elsewhere (a debugger or
+# tracer frame) keeps an entry alive longer; an entry dropped while still
+# in use only loses sharing, since a canonical node keeps alive the
+# children whose ids its key holds. Other implementations have no such
+# counts: there the table is never swept and is released only when
+# hash-consing is switched off.
+_SWEEP_BY_REFCOUNT = sys.implementation.name == "cpython"
+
+
+def _refcounts(table: dict) -> list[tuple[Any, int]]:
+    """Reference count of every value in table, as seen from here."""
+    return [(key, sys.getrefcount(value)) for key, value in table.items()]
+
+
+def _unreferenced_count() -> int:
+    """Count _refcounts() reports for a value referenced only by its table entry."""
+    return _refcounts({None: object()})[0][1]
+
+
+def _grow_intern_table() -> None:
+    """Sweep the intern table and move the next sweep out to twice its size."""
+    global _sweep_threshold
+    sweep_interned()
+    _sweep_threshold = max(_MIN_SWEEP_THRESHOLD, 2 * len(_intern_table))
+
+
+def _intern_key(
+    head: Symbol | Expression,
+    tail: tuple[Element, ...],
+    attributes: frozenset[Symbol],
+) -> tuple:
+    """
+    Build the intern table key for a new expression.
+
+    Expression children are keyed by identity: the canonical node keeps
+    its children alive, so their ids stay valid for as long as the entry
+    exists. Atoms are tagged with their type so that values which compare
+    equal across types (1, 1.0 and True; 0.0 and -0.0) are never merged.
+    """
+    return (_element_key(head), tuple(_element_key(arg) for arg in tail), attributes)
+
+
+def _element_key(elem: Any) -> Any:
+    """Intern table key for a single head or argument."""
+    if isinstance(elem, Expression):
+        return id(elem)
+    elem_type = type(elem)
+    if elem_type is float and elem == 0.0:
+        return (float, math.copysign(1.0, elem))
+    if elem_type is Symbol:
+        return elem
+    return (elem_type, elem)
+
+
+def enable_hash_consing() -> None:
+    """
+    Enable hash-consing of newly constructed expressions.
+
+    Expressions that already exist are unaffected; only nodes constructed
+    while the mode is on are shared.
+    """
+    global _hash_consing
+    _hash_consing = True
+
+
+def disable_hash_consing() -> None:
+    """Disable hash-consing and drop the intern table."""
+    global _hash_consing
+    _hash_consing = False
+    _intern_table.clear()
+
+
+def hash_consing_enabled() -> bool:
+    """Check whether hash-consing is currently enabled."""
+    return _hash_consing
+
+
+@contextmanager
+def hash_consing(enabled: bool = True) -> Iterator[None]:
+    """
+    Temporarily enable (or disable) hash-consing.
+
+    Examples:
+        >>> with hash_consing():
+        ...     Expression(f, x) is Expression(f, x)
+        True
+    """
+    global _hash_consing
+    previous = _hash_consing
+    _hash_consing = enabled
+    try:
+        yield
+    finally:
+        _hash_consing = previous
+        if not previous:
+            _intern_table.clear()
+
+
+def interned_count() -> int:
+    """Number of canonical expressions currently held by the intern table."""
+    return len(_intern_table)
+
+
+def sweep_interned() -> int:
+    """
+    Drop canonical expressions that are referenced only by the intern table.
+
+    Removing a node releases its children, so sweeping repeats until no
+    further entries become unreferenced. Only CPython can tell which
+    entries are unreferenced; elsewhere nothing is removed.
+
+    Returns:
+        The number of entries removed.
+    """
+    if not _SWEEP_BY_REFCOUNT:
+        return 0
+    removed = 0
+    while True:
+        unreferenced = _unreferenced_count()
+        dead = [key for key, count in _refcounts(_intern_table) if count <= unreferenced]
+        if not dead:
+            return removed
+        for key in dead:
+            del _intern_table[key]
+        removed += len(dead)
+
+
 # MODULE-LEVEL FUNCTIONS
 
 
+def _tree_metadata(
+    head: Symbol | Expression,
+    tail: tuple[Element, ...],
+    attributes: frozenset[Symbol],
+) -> tuple[int | DeferredHash | None, int, int, int, int]:
+    """
+    Compute (hash, depth, leaf_count, node_count, symbols) for a new expression.
+
+    Only the direct arguments are inspected: nested expressions already
+    carry their own metadata, so construction stays O(len(tail)).
+    """
+    if isinstance(head, Symbol):
+        symbols = 1 << (tuple.__getitem__(head, 1) & _MASK_BITS)
+        hashed = True
+    else:
+        symbols = tuple.__getitem__(head, 7)
+        hashed = type(tuple.__getitem__(head, 3)) is int
+    if not tail:
+        return _parent_hash(head, tail, attributes, hashed), 1, 1, 1, symbols
+
+    max_depth = 0
+    leaves = 0
+    nodes = 1
+    for arg in tail:
+        if isinstance(arg, Expression):
+            arg_depth = tuple.__getitem__(arg, 4)
+            if arg_depth > max_depth:
+                max_depth = arg_depth
+            leaves += tuple.__getitem__(arg, 5)
+            nodes += tuple.__getitem__(arg, 6)
+            symbols |= tuple.__getitem__(arg, 7)
+            if type(tuple.__getitem__(arg, 3)) is not int:
+                hashed = False
+        else:
+            leaves += 1
+            nodes += 1
+            if isinstance(arg, Symbol):
+                symbols |= 1 << (tuple.__getitem__(arg, 1) & _MASK_BITS)
+            else:
+                symbols |= _ATOM_BITS.get(type(arg), 0)
+    return _parent_hash(head, tail, attributes, hashed), max_depth + 1, leaves, nodes, symbols
+
+
+def _parent_hash(
+    head: Symbol | Expression,
+    tail: tuple[Element, ...],
+    attributes: frozenset[Symbol],
+    hashed: bool,
+) -> int | DeferredHash | None:
+    """
+    Hash of a new expression from those of its parts.
+
+    If hashed is False, some part's hash is not cached as an int: the
+    result is None if a part is unhashable, or a DeferredHash if a part's
+    hash is deferred (hashing it here would decode a stored record).
+    """
+    if not hashed:
+        deferred = False
+        for part in (head, *tail):
+            if isinstance(part, Expression):
+                cached = tuple.__getitem__(part, 3)
+                if cached is None:
+                    return None
+                if type(cached) is DeferredHash and cached.value is None:
+                    deferred = True
+        if deferred:
+            return DeferredHash()
+    return _structural_hash(head, tail, attributes)
+
+
+def _structural_hash(
+    head: Symbol | Expression, tail: tuple[Element, ...], attributes: frozenset[Symbol]
+) -> int | None:
+    """Structural hash of an expression, or None if an argument is unhashable."""
+    try:
+        return hash(("Expression", head, tail, attributes))
+    except TypeError:
+        return None
+
+
+def _rebuild(
+    head: Symbol | Expression, tail: tuple[Element, ...], attributes: frozenset[Symbol]
+) -> Expression:
+    """Reconstruct an expression from its parts (used by pickle)."""
+    return Expression(head, *tail, _attrs=attributes)
+
+
 def _format_element(elem: Any) -> str:
     """Format an element for display in expression representation."""
     if isinstance(elem, str):
@@ -285,6 +760,86 @@ def head_of(elem: Element) -> Symbol | Expression | type:
     return atom_head(elem)
 
 
+def depth_of(elem: Element) -> int:
+    """
+    Get the depth of any element.
+
+    - Expression: returns the cached depth of its argument tree
+    - Symbol/Atoms: returns 0
+
+    Args:
+        elem: Any element.
+
+    Returns:
+        The depth of the element.
+    """
+    if isinstance(elem, Expression):
+        return elem.depth
+    return 0
+
+
+def leaf_count_of(elem: Element) -> int:
+    """
+    Get the leaf count of any element.
+
+    - Expression: returns the cached leaf count of its argument tree
+    - Symbol/Atoms: returns 1
+
+    Args:
+        elem: Any element.
+
+    Returns:
+        The number of leaves in the element.
+    """
+    if isinstance(elem, Expression):
+        return elem.leaf_count
+    return 1
+
+
+def node_count_of(elem: Element) -> int:
+    """
+    Get the node count of any element.
+
+    - Expression: returns the cached node count of its argument tree
+    - Symbol/Atoms: returns 1
+
+    Args:
+        elem: Any element.
+
+    Returns:
+        The number of nodes in the element.
+    """
+    if isinstance(elem, Expression):
+        return elem.node_count
+    return 1
+
+
+def symbol_bit(sym: Symbol) -> int:
+    """The bit a symbol sets in the symbol masks of the trees it occurs in."""
+    return 1 << (tuple.__getitem__(sym, 1) & _MASK_BITS)
+
+
+def symbol_mask_of(elem: Element) -> int:
+    """
+    Get the symbol mask of any element.
+
+    - Expression: returns the cached mask of its tree
+    - Symbol: returns its own bit
+    - Numbers and strings: return the bit of their head (Integer, ...)
+
+    Args:
+        elem: Any element.
+
+    Returns:
+        The mask of the symbols that may occur in the element.
+    """
+    if isinstance(elem, Expression):
+        return tuple.__getitem__(elem, 7)
+    if isinstance(elem, Symbol):
+        return 1 << (tuple.__getitem__(elem, 1) & _MASK_BITS)
+    return _ATOM_BITS.get(type(elem), 0)
+
+
 def tail_of(elem: Element) -> tuple:
     """
     Get the tail (arguments) of any element.
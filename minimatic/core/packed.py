@@ -0,0 +1,234 @@
+"""
+Packed arrays - Homogeneous numeric lists backed by a flat buffer.
+
+A packed array is a List[...] whose elements are all machine integers or
+all reals, stored in an ``array.array`` instead of a tuple of boxed Python
+objects. It is a regular Expression as far as the rest of the system is
+concerned: head, args, matching, equality, hashing and printing all behave
+exactly as for the equivalent unpacked List.
+
+Implementation:
+    PackedArray extends the Expression tuple layout with two fields:
+        (List, None, attributes, hash, depth, leaf_count, node_count, buffer, cache)
+    The tail slot is left empty; ``args`` materializes a tuple from the
+    buffer on first access and keeps it in ``cache``. The structural hash
+    is computed from the buffer at construction, like that of any other
+    expression, so expressions containing packed arrays cache theirs too.
+
+Element types:
+    - 'q' (int64): every element is an int
+    - 'd' (float64): every element is a float
+    Lists with any other element, ints beyond 64 bits, or a mix of ints and
+    floats are not packed: packing {1, 2.5} would turn 1 into 1.0, which
+    no longer matches _Integer.
+
+Usage:
+    packed = pack_values([1.0, 2.0, 3.0])   # PackedArray
+    packed.buffer                           # read-only memoryview
+    unpack(packed)                          # plain Expression(List, ...)
+"""
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from .expression import Expression, symbol_bit
+from .symbol import Symbol
+
+if TYPE_CHECKING:
+    from .atoms import Element
+
+List = Symbol("List")
+
+_EMPTY_ATTRS: frozenset[Symbol] = frozenset()
+
+# Symbol mask of a packed array: List and the head of its elements
+_LIST_BIT = symbol_bit(List)
+_INTEGER_BIT = symbol_bit(Symbol("Integer"))
+_REAL_BIT = symbol_bit(Symbol("Real"))
+
+
+# PACKED ARRAY CLASS
+
+
+class PackedArray(Expression):
+    """
+    List expression whose numeric elements live in an array buffer.
+
+    Structure: (List, None, attributes, hash, depth, leaf_count, node_count, symbols,
+                buffer, cache)
+        - buffer: array.array — the elements ('q' for ints, 'd' for reals)
+        - cache: list — [materialized tail | None]
+
+    Instances are created with pack() or pack_values(); the buffer is owned
+    by the packed array and never exposed mutably.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, buffer: array) -> PackedArray:
+        """
+        Wrap an array buffer as a packed List.
+
+        Args:
+            buffer: A non-empty array with typecode 'q' or 'd'. The
+                packed array takes ownership; callers must not mutate it.
+
+        Raises:
+            TypeError: If buffer is not an int64 or float64 array.
+            ValueError: If buffer is empty.
+        """
+        if not isinstance(buffer, array) or buffer.typecode not in ("q", "d"):
+            raise TypeError("PackedArray buffer must be an array with typecode 'q' or 'd'")
+        if not buffer:
+            raise ValueError("PackedArray buffer cannot be empty")
+        n = len(buffer)
+        symbols = _LIST_BIT | (_INTEGER_BIT if buffer.typecode == "q" else _REAL_BIT)
+        # Hash equal to that of the equivalent unpacked List
+        structural_hash = hash(("Expression", List, tuple(buffer), _EMPTY_ATTRS))
+        return tuple.__new__(
+            cls, (List, None, _EMPTY_ATTRS, structural_hash, 1, n, n + 1, symbols, buffer, [None])
+        )
+
+    @property
+    def tail(self) -> tuple[Element, ...]:
+        """The elements as a tuple (materialized once, then cached)."""
+        cache = tuple.__getitem__(self, 9)
+        materialized = cache[0]
+        if materialized is None:
+            materialized = cache[0] = tuple(tuple.__getitem__(self, 8))
+        return materialized
+
+    @property
+    def args(self) -> tuple[Element, ...]:
+        """Alias for tail — the elements as a tuple."""
+        return self.tail
+
+    @property
+    def buffer(self) -> memoryview:
+        """Read-only view of the element buffer."""
+        return memoryview(tuple.__getitem__(self, 8)).toreadonly()
+
+    @property
+    def typecode(self) -> str:
+        """Element type of the buffer: 'q' (int64) or 'd' (float64)."""
+        return tuple.__getitem__(self, 8).typecode
+
+    def __len__(self) -> int:
+        """Number of elements."""
+        return len(tuple.__getitem__(self, 8))
+
+    def __iter__(self) -> Iterator[Element]:
+        """Iterate over elements without materializing the tail."""
+        return iter(tuple.__getitem__(self, 8))
+
+    def __contains__(self, item: object) -> bool:
+        """Check if item is one of the elements."""
+        return item in tuple.__getitem__(self, 8)
+
+    def with_tail(self, *new_args: Element) -> Expression:
+        """Return a List with different elements, packed if they allow it."""
+        return pack_values(new_args)
+
+    def map_args(self, fn: Callable[[Element], Element]) -> Expression:
+        """Apply function to each element; the result stays packed if numeric."""
+        return pack_values(map(fn, tuple.__getitem__(self, 8)))
+
+    def append(self, *new_args: Element) -> Expression:
+        """Return a List with elements appended, unpacked if any is not numeric."""
+        return pack_values((*tuple.__getitem__(self, 8), *new_args))
+
+    def prepend(self, *new_args: Element) -> Expression:
+        """Return a List with elements prepended, unpacked if any is not numeric."""
+        return pack_values((*new_args, *tuple.__getitem__(self, 8)))
+
+    def __eq__(self, other: object) -> bool:
+        """Structural equality; two packed arrays compare their buffers directly."""
+        if self is other:
+            return True
+        if isinstance(other, PackedArray):
+            return tuple.__getitem__(self, 8) == tuple.__getitem__(other, 8)
+        return super().__eq__(other)
+
+    # Defining __eq__ would otherwise reset __hash__; the hash is in slot 3
+    __hash__ = Expression.__hash__
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (PackedArray, (tuple.__getitem__(self, 8),))
+
+
+# MODULE-LEVEL FUNCTIONS
+
+
+def _pack_buffer(values: list[Any]) -> array | None:
+    """Pack a list of numbers into an array, or return None if not packable."""
+    if not values:
+        return None
+    types = set(map(type, values))
+    try:
+        if types == {int}:
+            return array("q", values)
+        if types == {float}:
+            return array("d", values)
+    except OverflowError:
+        return None
+    return None
+
+
+def pack_values(values: Iterable[Element]) -> Expression:
+    """
+    Build a List from values, packed when they are all machine numbers.
+
+    Args:
+        values: The list elements.
+
+    Returns:
+        A PackedArray if every element is an int (fitting in 64 bits) or
+        every element is a float; otherwise an ordinary List expression.
+    """
+    elements = list(values)
+    buffer = _pack_buffer(elements)
+    if buffer is None:
+        return Expression._from_parts(List, tuple(elements))
+    return PackedArray(buffer)
+
+
+def pack(expr: Element) -> Element:
+    """
+    Pack a List expression if its elements allow it.
+
+    Args:
+        expr: Any element.
+
+    Returns:
+        A PackedArray for numeric Lists without attributes; expr unchanged
+        otherwise (including when it is already packed).
+    """
+    if (
+        type(expr) is not Expression
+        or expr.head != List
+        or expr.attributes
+        or (buffer := _pack_buffer(list(expr.args))) is None
+    ):
+        return expr
+    return PackedArray(buffer)
+
+
+def unpack(expr: Element) -> Element:
+    """
+    Convert a packed array back to an ordinary List expression.
+
+    Args:
+        expr: Any element.
+
+    Returns:
+        An unpacked List for a PackedArray; expr unchanged otherwise.
+    """
+    if isinstance(expr, PackedArray):
+        return Expression._from_parts(List, expr.args)
+    return expr
+
+
+def is_packed(obj: object) -> bool:
+    """Check if an object is a PackedArray."""
+    return isinstance(obj, PackedArray)
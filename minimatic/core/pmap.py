@@ -0,0 +1,374 @@
+"""
+PMap - Persistent hash map.
+
+A PMap is an immutable mapping whose set() and delete() return a new map
+sharing all but O(log n) of its structure with the original, so a chain
+of maps each one binding more than the last (pattern bindings during
+backtracking, nested scopes) costs O(log n) per step instead of a full
+copy.
+
+The map is a hash array mapped trie (HAMT): each level consumes 5 bits
+of the key's hash and stores only the occupied slots of its 32, found
+through a bitmap. Nodes are plain tuples:
+
+    bitmap node     (bitmap, key0, value0, key1, value1, ...)
+                    a slot whose key is _BRANCH holds a child node
+    collision node  (_COLLISION, hash, key0, value0, ...)
+                    keys whose full hashes are equal
+
+Lookups, insertions and deletions touch one node per level, which for
+maps of up to a thousand keys is at most two levels. The hash of a PMap
+is computed from its items on first use and then cached.
+
+Usage:
+    from minimatic.core.pmap import PMap, pmap
+
+    m = pmap({x: 1})
+    m2 = m.set(y, 2)        # m is unchanged
+    m2[y], len(m2)          # 2, 2
+    m2.delete(x) == pmap({y: 2})
+"""
+
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, ValuesView
+from typing import Any
+
+# Bits of the hash consumed per trie level
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+
+
+class _Marker:
+    """Sentinel stored in node tuples."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+# Key of a slot holding a child node
+_BRANCH = _Marker("_BRANCH")
+# First element of a collision node
+_COLLISION = _Marker("_COLLISION")
+# Missing-value default
+_MISSING = _Marker("_MISSING")
+
+_EMPTY_NODE = (0,)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PMAP CLASS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class PMap(Mapping):
+    """
+    Immutable mapping with O(log n) structure-sharing updates.
+
+    Examples:
+        >>> m = PMap({"a": 1})
+        >>> m2 = m.set("b", 2)
+        >>> len(m), len(m2)
+        (1, 2)
+        >>> m2.delete("a")["b"]
+        2
+    """
+
+    __slots__ = ("_root", "_size", "_hash")
+
+    def __init__(self, data: Mapping | Iterable[tuple[Any, Any]] | None = None) -> None:
+        """
+        Create a PMap.
+
+        Args:
+            data: Initial items as a mapping or an iterable of (key, value)
+                pairs. If None, creates an empty map.
+        """
+        root: tuple = _EMPTY_NODE
+        size = 0
+        if isinstance(data, PMap):
+            root, size = data._root, data._size
+        elif data is not None:
+            items = data.items() if isinstance(data, Mapping) else data
+            for key, value in items:
+                root, added = _set(root, 0, hash(key), key, value)
+                size += added
+        self._root = root
+        self._size = size
+        self._hash: int | None = None
+
+    @classmethod
+    def _from_root(cls, root: tuple, size: int) -> PMap:
+        """Construct directly from a root node (internal use)."""
+        obj = object.__new__(cls)
+        obj._root = root
+        obj._size = size
+        obj._hash = None
+        return obj
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Mapping Protocol
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def __getitem__(self, key: Any) -> Any:
+        value = _get(self._root, hash(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = _get(self._root, hash(key), key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return _get(self._root, hash(key), key) is not _MISSING
+        except TypeError:
+            return False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        for key, _ in _entries(self._root):
+            yield key
+
+    def items(self) -> ItemsView:
+        return _PMapItems(self)
+
+    def values(self) -> ValuesView:
+        return _PMapValues(self)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Persistent Updates
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def set(self, key: Any, value: Any) -> PMap:
+        """Return a map with key bound to value (self if already so bound)."""
+        root, added = _set(self._root, 0, hash(key), key, value)
+        if root is self._root:
+            return self
+        return type(self)._from_root(root, self._size + added)
+
+    def delete(self, key: Any) -> PMap:
+        """Return a map without key (self if key is absent)."""
+        root = _delete(self._root, 0, hash(key), key)
+        if root is self._root:
+            return self
+        return type(self)._from_root(_EMPTY_NODE if root is None else root, self._size - 1)
+
+    def update(self, data: Mapping | Iterable[tuple[Any, Any]]) -> PMap:
+        """Return a map with every item of data set."""
+        root = self._root
+        size = self._size
+        items = data.items() if isinstance(data, Mapping) else data
+        for key, value in items:
+            root, added = _set(root, 0, hash(key), key, value)
+            size += added
+        if root is self._root:
+            return self
+        return type(self)._from_root(root, size)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Comparison & Hashing
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PMap):
+            if isinstance(other, Mapping):
+                return len(other) == self._size and dict(_entries(self._root)) == dict(other)
+            return NotImplemented
+        if self._size != other._size:
+            return False
+        if self._root is other._root:
+            return True
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
+        root = other._root
+        for key, value in _entries(self._root):
+            found = _get(root, hash(key), key)
+            if found is _MISSING or not (found is value or found == value):
+                return False
+        return True
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(_entries(self._root)))
+        return self._hash
+
+    def __repr__(self) -> str:
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in _entries(self._root))
+        return f"PMap({{{items}}})"
+
+
+class _PMapItems(ItemsView):
+    """Items view iterating the trie directly."""
+
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        return _entries(self._mapping._root)
+
+
+class _PMapValues(ValuesView):
+    """Values view iterating the trie directly."""
+
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator:
+        for _, value in _entries(self._mapping._root):
+            yield value
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FACTORY FUNCTIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_EMPTY_PMAP = PMap()
+
+
+def pmap(data: Mapping | Iterable[tuple[Any, Any]] | None = None) -> PMap:
+    """Create a PMap (the shared empty map if data is empty or None)."""
+    if not data:
+        return _EMPTY_PMAP
+    return PMap(data)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TRIE OPERATIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _get(node: tuple, key_hash: int, key: Any) -> Any:
+    """The value of key, or _MISSING."""
+    shift = 0
+    while True:
+        if node[0] is _COLLISION:
+            for i in range(2, len(node), 2):
+                if node[i] is key or node[i] == key:
+                    return node[i + 1]
+            return _MISSING
+        bitmap = node[0]
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not bitmap & bit:
+            return _MISSING
+        i = 1 + 2 * (bitmap & (bit - 1)).bit_count()
+        found = node[i]
+        if found is _BRANCH:
+            node = node[i + 1]
+            shift += _BITS
+        elif found is key or found == key:
+            return node[i + 1]
+        else:
+            return _MISSING
+
+
+def _set(node: tuple, shift: int, key_hash: int, key: Any, value: Any) -> tuple[tuple, bool]:
+    """The node with key set to value, and whether the key is new."""
+    if node[0] is _COLLISION:
+        if key_hash != node[1]:
+            # Push the collision node one level down under a bitmap node
+            bit = 1 << ((node[1] >> shift) & _MASK)
+            return _set((bit, _BRANCH, node), shift, key_hash, key, value)
+        for i in range(2, len(node), 2):
+            if node[i] is key or node[i] == key:
+                if node[i + 1] is value:
+                    return node, False
+                return node[: i + 1] + (value,) + node[i + 2 :], False
+        return node + (key, value), True
+
+    bitmap = node[0]
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    i = 1 + 2 * (bitmap & (bit - 1)).bit_count()
+    if not bitmap & bit:
+        return (bitmap | bit,) + node[1:i] + (key, value) + node[i:], True
+
+    found = node[i]
+    if found is _BRANCH:
+        child, added = _set(node[i + 1], shift + _BITS, key_hash, key, value)
+        if child is node[i + 1]:
+            return node, False
+        return node[: i + 1] + (child,) + node[i + 2 :], added
+    if found is key or found == key:
+        if node[i + 1] is value:
+            return node, False
+        return node[: i + 1] + (value,) + node[i + 2 :], False
+    child = _pair_node(shift + _BITS, found, node[i + 1], hash(found), key, value, key_hash)
+    return node[:i] + (_BRANCH, child) + node[i + 2 :], True
+
+
+def _pair_node(
+    shift: int, key1: Any, value1: Any, hash1: int, key2: Any, value2: Any, hash2: int
+) -> tuple:
+    """A node holding two keys whose hashes agree below shift."""
+    if hash1 == hash2:
+        return (_COLLISION, hash1, key1, value1, key2, value2)
+    slot1 = (hash1 >> shift) & _MASK
+    slot2 = (hash2 >> shift) & _MASK
+    if slot1 == slot2:
+        child = _pair_node(shift + _BITS, key1, value1, hash1, key2, value2, hash2)
+        return (1 << slot1, _BRANCH, child)
+    if slot1 < slot2:
+        return ((1 << slot1) | (1 << slot2), key1, value1, key2, value2)
+    return ((1 << slot1) | (1 << slot2), key2, value2, key1, value1)
+
+
+def _delete(node: tuple, shift: int, key_hash: int, key: Any) -> tuple | None:
+    """The node without key (the same node if absent, None if left empty)."""
+    if node[0] is _COLLISION:
+        for i in range(2, len(node), 2):
+            if node[i] is key or node[i] == key:
+                if len(node) == 4:
+                    return None
+                return node[:i] + node[i + 2 :]
+        return node
+
+    bitmap = node[0]
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not bitmap & bit:
+        return node
+    i = 1 + 2 * (bitmap & (bit - 1)).bit_count()
+    found = node[i]
+    if found is _BRANCH:
+        child = _delete(node[i + 1], shift + _BITS, key_hash, key)
+        if child is node[i + 1]:
+            return node
+        if child is not None:
+            single = _single_entry(child)
+            if single is None:
+                return node[: i + 1] + (child,) + node[i + 2 :]
+            # Pull a lone remaining entry up into this node
+            return node[:i] + single + node[i + 2 :]
+    elif not (found is key or found == key):
+        return node
+    if bitmap == bit:
+        return None
+    return (bitmap & ~bit,) + node[1:i] + node[i + 2 :]
+
+
+def _single_entry(node: tuple) -> tuple | None:
+    """(key, value) if node holds exactly one entry and no children."""
+    if node[0] is _COLLISION:
+        return node[2:] if len(node) == 4 else None
+    if len(node) == 3 and node[1] is not _BRANCH:
+        return node[1:]
+    return None
+
+
+def _entries(root: tuple) -> Iterator[tuple[Any, Any]]:
+    """Yield every (key, value) pair of a trie."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        start = 2 if node[0] is _COLLISION else 1
+        for i in range(start, len(node), 2):
+            key = node[i]
+            if key is _BRANCH:
+                stack.append(node[i + 1])
+            else:
+                yield key, node[i + 1]
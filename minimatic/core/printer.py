@@ -0,0 +1,271 @@
+"""
+Printer - Streaming text output of element trees.
+
+write_expression() writes an element to any text stream as it walks the
+tree, so printing a result with millions of nodes needs neither one
+string for the whole tree nor a frame per level: pending output is kept
+on an explicit stack and flushed to the stream in chunks.
+
+Forms:
+    FullForm   Head[arg1, arg2, ...] everywhere (the same text as str())
+    InputForm  Operators written infix where they have a syntax:
+               {a, b}, a + b, a*b, a^b, a -> b, a == b, ...
+
+Short-style limits:
+    max_depth     Expressions nested at least this deep are shown as
+                  head[<<n>>] (n omitted arguments)
+    max_elements  At most this many arguments per expression; the rest
+                  are shown as <<k>>
+    max_chars     Output stops after this many characters and ends
+                  with <<...>>
+
+Usage:
+    import sys
+    from minimatic.core.printer import format_expression, write_expression
+
+    write_expression(result, sys.stdout, form="InputForm")
+    format_expression(result, max_elements=5, max_chars=200)
+"""
+
+from io import StringIO
+from typing import TYPE_CHECKING, Any, TextIO
+
+from .expression import Expression, _format_element
+from .symbol import Symbol
+
+if TYPE_CHECKING:
+    from .atoms import Element
+
+
+FULL_FORM = "FullForm"
+INPUT_FORM = "InputForm"
+FORMS = (FULL_FORM, INPUT_FORM)
+
+# Marker ending output cut short by max_chars
+TRUNCATED = "<<...>>"
+
+# Pieces buffered before they are joined and written to the stream
+_CHUNK = 4096
+
+# InputForm operators: head name -> (text between operands, precedence,
+# whether the operator is binary and right-associative)
+_INFIX = {
+    "Set": (" = ", 40, True),
+    "SetDelayed": (" := ", 40, True),
+    "Rule": (" -> ", 120, True),
+    "RuleDelayed": (" :> ", 120, True),
+    "Or": (" || ", 215, False),
+    "And": (" && ", 215, False),
+    "Equal": (" == ", 290, False),
+    "Unequal": (" != ", 290, False),
+    "Less": (" < ", 290, False),
+    "LessEqual": (" <= ", 290, False),
+    "Greater": (" > ", 290, False),
+    "GreaterEqual": (" >= ", 290, False),
+    "Plus": (" + ", 310, False),
+    "Times": ("*", 400, False),
+    "Power": ("^", 590, True),
+}
+
+# Precedence above which a negative number operand is parenthesized
+_NEGATIVE_PRECEDENCE = _INFIX["Times"][1]
+
+_List = Symbol("List")
+
+
+# PUBLIC API
+
+
+def write_expression(
+    element: Element,
+    stream: TextIO,
+    form: str = FULL_FORM,
+    max_depth: int | None = None,
+    max_elements: int | None = None,
+    max_chars: int | None = None,
+) -> int:
+    """
+    Write an element to a text stream.
+
+    Args:
+        element: The element to print.
+        stream: Any object with a write(str) method.
+        form: FULL_FORM or INPUT_FORM.
+        max_depth: Elide expressions nested this deep (the element itself
+            is at depth 0); None for no limit.
+        max_elements: Show at most this many arguments per expression;
+            None for no limit.
+        max_chars: Stop after this many characters of output; None for no
+            limit.
+
+    Returns:
+        The number of characters written.
+
+    Raises:
+        ValueError: If form is unknown or a limit is negative.
+    """
+    if form not in FORMS:
+        raise ValueError(f"Unknown form {form!r}; expected one of {', '.join(FORMS)}")
+    for name, limit in (
+        ("max_depth", max_depth),
+        ("max_elements", max_elements),
+        ("max_chars", max_chars),
+    ):
+        if limit is not None and limit < 0:
+            raise ValueError(f"{name} must be non-negative, got {limit}")
+
+    input_form = form == INPUT_FORM
+    chunk = _CHUNK if max_chars is None else min(_CHUNK, max_chars + 1)
+    pieces: list[str] = []
+    written = 0
+
+    # One frame per expression whose arguments are being written:
+    # [args, next index, shown count, child depth, child precedence,
+    #  precedence of the last child, separator, closing text]
+    frames: list[list[Any]] = []
+    elem, depth, outer = element, 0, 0
+    while True:
+        # Write (the start of) the pending element
+        if not isinstance(elem, Expression):
+            text = _format_element(elem)
+            if input_form and outer > _NEGATIVE_PRECEDENCE and _is_negative(elem):
+                text = f"({text})"
+            pieces.append(text)
+        else:
+            _open(elem, depth, outer, input_form, max_depth, max_elements, pieces, frames)
+
+        if len(pieces) >= chunk:
+            written, done = _flush(stream, pieces, written, max_chars)
+            if done:
+                return written
+
+        # Find the next element: the next argument of the innermost open
+        # expression, closing every expression whose arguments are done
+        while frames:
+            frame = frames[-1]
+            index = frame[1]
+            if index < frame[2]:
+                if index:
+                    pieces.append(frame[6])
+                frame[1] = index + 1
+                elem = frame[0][index]
+                depth = frame[3]
+                outer = frame[5] if index == len(frame[0]) - 1 else frame[4]
+                break
+            pieces.append(frame[7])
+            frames.pop()
+        else:
+            break
+
+    written, _ = _flush(stream, pieces, written, max_chars)
+    return written
+
+
+def format_expression(
+    element: Element,
+    form: str = FULL_FORM,
+    max_depth: int | None = None,
+    max_elements: int | None = None,
+    max_chars: int | None = None,
+) -> str:
+    """
+    Format an element as a string (see write_expression for the arguments).
+
+    Examples:
+        >>> format_expression(Expression(List, *range(100)), max_elements=3)
+        'List[0, 1, 2, <<97>>]'
+    """
+    buffer = StringIO()
+    write_expression(element, buffer, form, max_depth, max_elements, max_chars)
+    return buffer.getvalue()
+
+
+# LAYOUT
+
+
+def _open(
+    expr: Expression,
+    depth: int,
+    outer: int,
+    input_form: bool,
+    max_depth: int | None,
+    max_elements: int | None,
+    pieces: list[str],
+    frames: list[list[Any]],
+) -> None:
+    """Write the opening of an expression and push the frame of its arguments."""
+    head = expr.head
+    args = expr.args
+    count = len(args)
+
+    if max_depth is not None and depth >= max_depth:
+        head_text = head.name if isinstance(head, Symbol) else "<<1>>"
+        pieces.append(f"{head_text}[<<{count}>>]" if count else f"{head_text}[]")
+        return
+
+    shown = count
+    if max_elements is not None and count > max_elements:
+        shown = max_elements
+    child = depth + 1
+
+    if input_form and isinstance(head, Symbol):
+        if head == _List:
+            pieces.append("{")
+            frames.append([args, 0, shown, child, 0, 0, ", ", _closing(shown, count, "}")])
+            return
+        infix = _INFIX.get(head.name)
+        # Right-associative operators only have a binary infix form
+        if infix is not None and shown == count and (count == 2 or count > 2 and not infix[2]):
+            operator, precedence, right_associative = infix
+            parenthesize = precedence < outer
+            if parenthesize:
+                pieces.append("(")
+            # The left operand of a right-associative operator binds
+            # tighter: a^b^c is a^(b^c)
+            operand = precedence + 1 if right_associative else precedence
+            closing = ")" if parenthesize else ""
+            frames.append([args, 0, count, child, operand, precedence, operator, closing])
+            return
+
+    frame = [args, 0, shown, child, 0, 0, ", ", _closing(shown, count, "]")]
+    if isinstance(head, Symbol):
+        pieces.append(head.name)
+        pieces.append("[")
+        frames.append(frame)
+    else:
+        # Write the head expression first; its frame closes with the "["
+        frames.append(frame)
+        frames.append([(head,), 0, 1, child, 0, 0, "", "["])
+
+
+def _closing(shown: int, count: int, bracket: str) -> str:
+    """Closing text of an argument list, with the marker for omitted arguments."""
+    omitted = count - shown
+    if not omitted:
+        return bracket
+    if shown:
+        return f", <<{omitted}>>{bracket}"
+    return f"<<{omitted}>>{bracket}"
+
+
+def _flush(stream: TextIO, pieces: list[str], written: int, limit: int | None) -> tuple[int, bool]:
+    """
+    Write buffered pieces to the stream.
+
+    Returns the new character count and whether the limit was reached (in
+    which case the output has been cut and marked as truncated).
+    """
+    text = "".join(pieces)
+    pieces.clear()
+    if limit is not None and written + len(text) > limit:
+        text = text[: limit - written] + TRUNCATED
+        stream.write(text)
+        return written + len(text), True
+    if text:
+        stream.write(text)
+    return written + len(text), False
+
+
+def _is_negative(elem: Any) -> bool:
+    """Whether elem is a real number below zero."""
+    return isinstance(elem, (int, float)) and not isinstance(elem, bool) and elem < 0
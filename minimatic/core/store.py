@@ -0,0 +1,482 @@
+"""
+Store - Read-only, memory-mapped on-disk expression store.
+
+Large definitions and datasets can be written once with write_store() and
+then opened with open_store() in any later process. Opening maps the file
+and decodes nothing: the root is returned as a StoredExpression, a lazy
+Expression whose head, arguments and attributes are decoded from the
+mapping only when they are accessed. Nested expressions are again lazy
+proxies, so startup time and resident memory depend on the parts of the
+tree that are actually touched, not on the size of the file.
+
+File layout:
+    header   b"MMS" + version byte
+    records  one record per expression (and packed array), children
+             before parents, each at a fixed file offset
+    symbols  varint count, then varint-length UTF-8 names
+    footer   offset of the symbol table and of the root value,
+             as two little-endian 64-bit integers
+
+Expression record:
+    varint depth, leaf_count, node_count   (tree metadata, no decoding needed)
+    varint argc, attribute bitmap          (same bitmap as the wire format)
+    varint count + symbol ids              (attributes outside the bitmap)
+    head value, then argc argument values
+
+Values are encoded inline as a tag byte and payload, as in the wire
+format, except that symbols are ids into the file's symbol table and
+nested expressions are references to the offset of their record.
+
+Decoded records are kept in a bounded least-recently-used cache, so a
+full traversal of a store (e.g. count_matches) runs in bounded memory.
+The structural hash of a stored expression decodes its whole subtree, as
+Python hashes cannot be persisted across processes. It is computed like
+that of any expression whose hash is deferred (see Expression.__hash__):
+without recursion, and kept by the proxy and each proxy below it.
+
+Usage:
+    write_store(expr, "data.mms")
+
+    with open_store("data.mms") as store:
+        root = store.root             # nothing decoded yet
+        root.node_count               # read from the record header
+        root.args[0].head             # decodes two records
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from .expression import ALL_SYMBOLS, DeferredHash, Expression
+from .packed import PackedArray
+from .symbol import Symbol
+from .wire import _ATTRIBUTE_BITS, _WIRE_ATTRIBUTES, _write_string, _write_varint
+
+if TYPE_CHECKING:
+    from .atoms import Element
+
+MAGIC = b"MMS"
+VERSION = 1
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Value tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_COMPLEX = 5
+_STRING = 6
+_SYMBOL = 7
+_NODE = 8
+_PACKED = 9
+
+_DOUBLE = struct.Struct("<d")
+_COMPLEX_DOUBLES = struct.Struct("<dd")
+_FOOTER = struct.Struct("<QQ")
+
+_HEADER_SIZE = len(MAGIC) + 1
+
+
+class StoreFormatError(ValueError):
+    """Raised when a file is not a valid expression store."""
+
+    pass
+
+
+# STORED EXPRESSION PROXY
+
+
+class StoredExpression(Expression):
+    """
+    Lazy Expression backed by a record in an ExpressionStore.
+
+    Structure: (None, None, None, hash, depth, leaf_count, node_count, symbols,
+                store, offset)
+        - hash: DeferredHash — computed on first use, as it decodes the subtree
+        - symbols: ALL_SYMBOLS — records do not store a symbol mask
+        - store: ExpressionStore — the store holding the record
+        - offset: int — file offset of the record
+
+    Tree metadata is read from the record header when the proxy is
+    created; head, args and attributes decode the record on access.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, store: ExpressionStore, offset: int) -> StoredExpression:
+        """Create a proxy for the record at offset (internal use)."""
+        depth, leaves, nodes = store._metadata(offset)
+        return tuple.__new__(
+            cls,
+            (None, None, None, DeferredHash(), depth, leaves, nodes, ALL_SYMBOLS, store, offset),
+        )
+
+    @property
+    def head(self) -> Symbol | Expression:
+        """The head, decoded from the store."""
+        return self._record()[0]
+
+    @property
+    def tail(self) -> tuple[Element, ...]:
+        """The arguments, decoded from the store (nested expressions stay lazy)."""
+        return self._record()[1]
+
+    @property
+    def args(self) -> tuple[Element, ...]:
+        """Alias for tail — the arguments, decoded from the store."""
+        return self._record()[1]
+
+    @property
+    def attributes(self) -> frozenset[Symbol]:
+        """The attributes, decoded from the store."""
+        return self._record()[2]
+
+    @property
+    def offset(self) -> int:
+        """File offset of the backing record."""
+        return tuple.__getitem__(self, 9)
+
+    def _record(self) -> tuple[Any, tuple[Element, ...], frozenset[Symbol]]:
+        """Decoded (head, args, attributes) of the backing record."""
+        return tuple.__getitem__(self, 8)._record(tuple.__getitem__(self, 9))
+
+
+
+# WRITING
+
+
+def write_store(element: Element, path: str | os.PathLike) -> None:
+    """
+    Write an element tree to a store file.
+
+    Subtrees shared by identity are written once. The tree is traversed
+    with an explicit stack, so any depth is supported.
+
+    Args:
+        element: The root element.
+        path: Destination file path (overwritten).
+
+    Raises:
+        TypeError: If the tree contains a value with no store encoding.
+    """
+    symbols: dict[str, int] = {}
+    offsets: dict[int, int] = {}
+
+    with open(path, "wb") as fp:
+        fp.write(MAGIC + bytes((VERSION,)))
+        position = _HEADER_SIZE
+
+        stack: list[tuple[Any, bool]] = [(element, False)]
+        while stack:
+            item, children_written = stack.pop()
+            if not isinstance(item, Expression) or id(item) in offsets:
+                continue
+
+            record = bytearray()
+            if isinstance(item, PackedArray):
+                _write_packed_record(record, item)
+            elif not children_written:
+                stack.append((item, True))
+                stack.extend((arg, False) for arg in reversed(item.args))
+                stack.append((item.head, False))
+                continue
+            else:
+                _write_expression_record(record, item, offsets, symbols)
+
+            offsets[id(item)] = position
+            fp.write(record)
+            position += len(record)
+
+        root = bytearray()
+        _write_value(root, element, offsets, symbols)
+        root_offset = position
+        fp.write(root)
+        position += len(root)
+
+        table = bytearray()
+        _write_varint(table, len(symbols))
+        for name in symbols:
+            _write_string(table, name)
+        fp.write(table)
+        fp.write(_FOOTER.pack(position, root_offset))
+
+
+def _symbol_id(sym: Symbol, symbols: dict[str, int]) -> int:
+    """Id of a symbol in the file's symbol table, adding it if new."""
+    name = sym.name
+    index = symbols.get(name)
+    if index is None:
+        index = symbols[name] = len(symbols)
+    return index
+
+
+def _write_value(
+    out: bytearray, value: Element, offsets: dict[int, int], symbols: dict[str, int]
+) -> None:
+    """Append an inline value (atom, symbol or record reference)."""
+    value_type = type(value)
+    if isinstance(value, Symbol):
+        out.append(_SYMBOL)
+        _write_varint(out, _symbol_id(value, symbols))
+    elif isinstance(value, Expression):
+        out.append(_PACKED if isinstance(value, PackedArray) else _NODE)
+        _write_varint(out, offsets[id(value)])
+    elif value_type is int:
+        out.append(_INT)
+        _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+    elif value_type is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif value_type is str:
+        out.append(_STRING)
+        _write_string(out, value)
+    elif value is None:
+        out.append(_NONE)
+    elif value_type is bool:
+        out.append(_TRUE if value else _FALSE)
+    elif value_type is complex:
+        out.append(_COMPLEX)
+        out += _COMPLEX_DOUBLES.pack(value.real, value.imag)
+    else:
+        raise TypeError(f"Cannot store {value_type.__name__}")
+
+
+def _write_expression_record(
+    out: bytearray, expr: Expression, offsets: dict[int, int], symbols: dict[str, int]
+) -> None:
+    """Append the record of an expression whose children are already written."""
+    _write_varint(out, expr.depth)
+    _write_varint(out, expr.leaf_count)
+    _write_varint(out, expr.node_count)
+
+    args = expr.args
+    bitmap = 0
+    extra = []
+    for attr in expr.attributes:
+        bit = _ATTRIBUTE_BITS.get(attr)
+        if bit is None:
+            extra.append(attr)
+        else:
+            bitmap |= bit
+    _write_varint(out, len(args))
+    _write_varint(out, bitmap)
+    _write_varint(out, len(extra))
+    for attr in sorted(extra, key=lambda s: s.name):
+        _write_varint(out, _symbol_id(attr, symbols))
+
+    _write_value(out, expr.head, offsets, symbols)
+    for arg in args:
+        _write_value(out, arg, offsets, symbols)
+
+
+def _write_packed_record(out: bytearray, packed: PackedArray) -> None:
+    """Append the record of a packed array: metadata, typecode, length, raw buffer."""
+    buffer = array(packed.typecode, packed.buffer)
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        buffer.byteswap()
+    _write_varint(out, packed.depth)
+    _write_varint(out, packed.leaf_count)
+    _write_varint(out, packed.node_count)
+    out += packed.typecode.encode("ascii")
+    _write_varint(out, len(buffer))
+    out += buffer.tobytes()
+
+
+# READING
+
+
+class ExpressionStore:
+    """
+    A store file opened for lazy, read-only access.
+
+    Examples:
+        >>> with open_store("data.mms") as store:
+        ...     store.root.node_count
+        1000001
+    """
+
+    def __init__(self, path: str | os.PathLike, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Open and map a store file.
+
+        Args:
+            path: Path of a file written by write_store().
+            cache_size: Maximum number of decoded records kept in memory.
+
+        Raises:
+            StoreFormatError: If the file is not a valid store.
+        """
+        with open(path, "rb") as fp:
+            try:
+                self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise StoreFormatError("Empty store file") from e
+        self._cache: OrderedDict[int, tuple[Any, tuple[Element, ...], frozenset[Symbol]]] = (
+            OrderedDict()
+        )
+        self._cache_size = cache_size
+
+        data = self._map
+        if len(data) < _HEADER_SIZE + _FOOTER.size or data[:3] != MAGIC:
+            self._map.close()
+            raise StoreFormatError("Not an expression store (bad magic)")
+        version = data[3]
+        if version != VERSION:
+            self._map.close()
+            raise StoreFormatError(f"Unsupported store version {version}")
+
+        table_offset, self._root_offset = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        count, pos = self._varint(table_offset)
+        names = []
+        for _ in range(count):
+            length, pos = self._varint(pos)
+            names.append(data[pos : pos + length].decode("utf-8", "surrogatepass"))
+            pos += length
+        self._names = names
+        self._symbols: list[Symbol | None] = [None] * count
+
+    @property
+    def root(self) -> Element:
+        """The root element (a lazy StoredExpression for expressions)."""
+        return self._value(self._root_offset)[0]
+
+    @property
+    def cached_records(self) -> int:
+        """Number of decoded records currently held in the cache."""
+        return len(self._cache)
+
+    def close(self) -> None:
+        """Unmap the file. Proxies from this store must not be used afterwards."""
+        self._cache.clear()
+        self._map.close()
+
+    def __enter__(self) -> ExpressionStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # Decoding
+
+    def _varint(self, pos: int) -> tuple[int, int]:
+        """Decode a varint at pos; return (value, next position)."""
+        data = self._map
+        result = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    def _symbol(self, index: int) -> Symbol:
+        """Symbol for an id in the symbol table, interned on first use."""
+        sym = self._symbols[index]
+        if sym is None:
+            sym = self._symbols[index] = Symbol(self._names[index])
+        return sym
+
+    def _metadata(self, offset: int) -> tuple[int, int, int]:
+        """(depth, leaf_count, node_count) from the header of a record."""
+        depth, pos = self._varint(offset)
+        leaves, pos = self._varint(pos)
+        nodes, _ = self._varint(pos)
+        return depth, leaves, nodes
+
+    def _value(self, pos: int) -> tuple[Element, int]:
+        """Decode an inline value at pos; return (value, next position)."""
+        data = self._map
+        tag = data[pos]
+        pos += 1
+        if tag == _SYMBOL:
+            index, pos = self._varint(pos)
+            return self._symbol(index), pos
+        if tag == _NODE:
+            offset, pos = self._varint(pos)
+            return StoredExpression(self, offset), pos
+        if tag == _INT:
+            z, pos = self._varint(pos)
+            return (-((z + 1) >> 1) if z & 1 else z >> 1), pos
+        if tag == _FLOAT:
+            return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+        if tag == _STRING:
+            length, pos = self._varint(pos)
+            return data[pos : pos + length].decode("utf-8", "surrogatepass"), pos + length
+        if tag == _PACKED:
+            offset, pos = self._varint(pos)
+            return self._packed(offset), pos
+        if tag == _NONE:
+            return None, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _COMPLEX:
+            real, imag = _COMPLEX_DOUBLES.unpack_from(data, pos)
+            return complex(real, imag), pos + 16
+        raise StoreFormatError(f"Unknown value tag {tag} at offset {pos - 1}")
+
+    def _record(self, offset: int) -> tuple[Any, tuple[Element, ...], frozenset[Symbol]]:
+        """Decoded (head, args, attributes) of the expression record at offset."""
+        cache = self._cache
+        record = cache.get(offset)
+        if record is not None:
+            cache.move_to_end(offset)
+            return record
+
+        _, pos = self._varint(offset)
+        _, pos = self._varint(pos)
+        _, pos = self._varint(pos)
+        argc, pos = self._varint(pos)
+        bitmap, pos = self._varint(pos)
+        extra, pos = self._varint(pos)
+        attrs = {attr for i, attr in enumerate(_WIRE_ATTRIBUTES) if bitmap >> i & 1}
+        for _ in range(extra):
+            index, pos = self._varint(pos)
+            attrs.add(self._symbol(index))
+
+        head, pos = self._value(pos)
+        args = []
+        for _ in range(argc):
+            value, pos = self._value(pos)
+            args.append(value)
+
+        record = (head, tuple(args), frozenset(attrs))
+        cache[offset] = record
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return record
+
+    def _packed(self, offset: int) -> PackedArray:
+        """Decode the packed array record at offset (copies the buffer)."""
+        _, pos = self._varint(offset)
+        _, pos = self._varint(pos)
+        _, pos = self._varint(pos)
+        typecode = chr(self._map[pos])
+        length, pos = self._varint(pos + 1)
+        buffer = array(typecode)
+        buffer.frombytes(self._map[pos : pos + length * buffer.itemsize])
+        if struct.pack("=H", 1) != struct.pack("<H", 1):
+            buffer.byteswap()
+        return PackedArray(buffer)
+
+
+def open_store(path: str | os.PathLike, cache_size: int = DEFAULT_CACHE_SIZE) -> ExpressionStore:
+    """
+    Open a store file for lazy, read-only access.
+
+    Args:
+        path: Path of a file written by write_store().
+        cache_size: Maximum number of decoded records kept in memory.
+
+    Returns:
+        An ExpressionStore; use it as a context manager or call close().
+    """
+    return ExpressionStore(path, cache_size=cache_size)
@@ -7,9 +7,25 @@ variables, function names, constants, and attributes.
 Implementation:
     Symbols are implemented as a tuple subclass for immutability and hashability.
     An interning cache ensures that symbols with the same name share identity.
+    Each name is also given a dense integer ID the first time it is seen;
+    IDs stay valid across clear_symbol_cache(); only the IDs of reclaimed
+    temporary symbols are reused.
+
+Temporary symbols:
+    Symbols made by gensym() are interned weakly: they live in a separate
+    table that is swept whenever it doubles in size, and a temporary that
+    nothing else refers to is dropped (its ID is recycled). The evaluation
+    layer installs a collector that also removes the context definitions
+    of unreachable temporaries, see minimatic.eval.context; that collector
+    runs between top-level evaluations and when a Module is evaluated,
+    never from gensym() itself.
 
 Structure:
-    Symbol = (name: str,)
+    Symbol = (name: str, id: int)
+
+    Hashing uses the C-level tuple hash of (name, id): the name's hash is
+    cached by the string, so hashing a symbol allocates nothing and never
+    enters Python code.
 
     Note: Symbol attributes (like Protected, Locked) are stored externally
     in the evaluation Context, not on the Symbol itself. This keeps Symbols
@@ -17,7 +33,10 @@ Structure:
 """
 
 import itertools
+import sys
+from collections.abc import Callable
 from threading import Lock
+from typing import Any
 
 
 class Symbol(tuple):
@@ -27,7 +46,7 @@ class Symbol(tuple):
     Symbols are interned: two symbols with the same name are the same object.
     This enables fast identity comparison and reduces memory usage.
 
-    Structure: (name: str,)
+    Structure: (name: str, id: int)
 
     Examples:
         >>> x = Symbol("x")
@@ -40,6 +59,7 @@ class Symbol(tuple):
 
     Attributes:
         name (str): The symbol's identifier string.
+        id (int): Dense integer ID of the name (0, 1, 2, ... in creation order).
 
     Note:
         Use the `symbol()` factory function for convenient creation with
@@ -74,13 +94,15 @@ class Symbol(tuple):
 
         # Create new symbol (slow path with lock)
         with _cache_lock:
-            # Double-check after acquiring lock
+            # Double-check after acquiring lock; gensym'd names stay temporary
             cached = _symbol_cache.get(name)
+            if cached is None:
+                cached = _temporary_symbols.get(name)
             if cached is not None:
                 return cached
 
             # Create and cache
-            instance = super().__new__(cls, (name,))
+            instance = _new_symbol(cls, name)
             _symbol_cache[name] = instance
             return instance
 
@@ -90,6 +112,21 @@ class Symbol(tuple):
         """The symbol's name string."""
         return self[0]
 
+    @property
+    def id(self) -> int:
+        """
+        Dense integer ID of the symbol's name.
+
+        The ID is valid only while the symbol is alive: the ID of a
+        temporary that has been collected is given to a later one, so
+        nothing may be keyed by an ID that outlives its symbol.
+        """
+        return self[1]
+
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        """Pickle by name so that unpickling interns the symbol."""
+        return (Symbol, (self.name,))
+
     # String Representations
     def __repr__(self) -> str:
         """Unambiguous representation: Symbol("name")"""
@@ -100,9 +137,8 @@ class Symbol(tuple):
         return self.name
 
     # Comparison & Hashing
-    def __hash__(self) -> int:
-        """Hash based on the symbol name."""
-        return hash(("Symbol", self.name))
+    # Hash of (name, id), computed by tuple's C implementation
+    __hash__ = tuple.__hash__
 
     def __eq__(self, other: object) -> bool:
         """
@@ -144,13 +180,126 @@ _symbol_cache: dict[str, Symbol] = {}
 _cache_lock = Lock()
 _gensym_counter = itertools.count(1)
 
+# Name <-> ID tables; unlike the interning cache these are never cleared,
+# only the entries of reclaimed temporaries are released for reuse
+_symbol_ids: dict[str, int] = {}
+_symbol_names: list[str | None] = []
+_free_ids: list[int] = []
+
+# Weakly interned gensym'd symbols, swept when the table doubles in size
+_temporary_symbols: dict[str, Symbol] = {}
+_MIN_COLLECT_THRESHOLD = 1 << 12
+_collect_threshold = _MIN_COLLECT_THRESHOLD
+_collector: Callable[[bool], int] | None = None
+
+
+def _new_symbol(cls: type[Symbol], name: str) -> Symbol:
+    """Create a symbol instance, assigning its name an ID if it has none (lock held)."""
+    symbol_id = _symbol_ids.get(name)
+    if symbol_id is None:
+        if _free_ids:
+            symbol_id = _free_ids.pop()
+            _symbol_names[symbol_id] = name
+        else:
+            symbol_id = len(_symbol_names)
+            _symbol_names.append(name)
+        _symbol_ids[name] = symbol_id
+    return tuple.__new__(cls, (name, symbol_id))
+
 
 def clear_symbol_cache() -> None:
     """Clear the symbol interning cache. Primarily for testing."""
-    global _symbol_cache, _gensym_counter
+    global _symbol_cache, _gensym_counter, _collect_threshold
     with _cache_lock:
         _symbol_cache.clear()
+        _temporary_symbols.clear()
         _gensym_counter = itertools.count(1)
+        _collect_threshold = _MIN_COLLECT_THRESHOLD
+
+
+def symbol_count() -> int:
+    """Upper bound of the symbol IDs assigned so far (IDs are below this count)."""
+    return len(_symbol_names)
+
+
+# TEMPORARY SYMBOLS
+
+
+def _refcounts(table: dict) -> list[tuple[Any, int]]:
+    """Reference count of every value in table, as seen from here."""
+    return [(key, sys.getrefcount(value)) for key, value in table.items()]
+
+
+# Count reported for a value referenced only by its table entry
+_UNREFERENCED = _refcounts({None: object()})[0][1]
+
+
+def is_temporary(sym: Symbol) -> bool:
+    """Check if a symbol was created by gensym() and is still interned weakly."""
+    return _temporary_symbols.get(sym.name) is sym
+
+
+def temporary_symbols() -> list[Symbol]:
+    """All temporary symbols that are currently interned."""
+    return list(_temporary_symbols.values())
+
+
+def temporary_count() -> int:
+    """Number of temporary symbols currently interned."""
+    return len(_temporary_symbols)
+
+
+def _release_temporary(sym: Symbol) -> None:
+    """Forget a temporary symbol and recycle its ID (it must be unreferenced)."""
+    name = sym.name
+    with _cache_lock:
+        if _temporary_symbols.get(name) is not sym:
+            return
+        del _temporary_symbols[name]
+        symbol_id = _symbol_ids.pop(name)
+        _symbol_names[symbol_id] = None
+        _free_ids.append(symbol_id)
+
+
+def sweep_temporaries() -> int:
+    """
+    Drop temporary symbols that are referenced only by their table entry.
+
+    Symbols with definitions in an evaluation context are referenced by
+    that context and survive; use the collector from minimatic.eval.context
+    to reclaim those.
+
+    Returns:
+        The number of symbols removed.
+    """
+    dead = [name for name, count in _refcounts(_temporary_symbols) if count <= _UNREFERENCED]
+    for name in dead:
+        _release_temporary(_temporary_symbols[name])
+    return len(dead)
+
+
+def _set_temporary_collector(collector: Callable[[bool], int] | None) -> None:
+    """Install the function run when the temporary table fills up (None: sweep only)."""
+    global _collector
+    _collector = collector
+
+
+def _temporaries_due() -> bool:
+    """Whether the temporary table has doubled in size since the last collection."""
+    return len(_temporary_symbols) >= _collect_threshold
+
+
+def _collect_temporaries(keep_caches: bool = False) -> int:
+    """
+    Run the installed collector (or sweep_temporaries) and reset the threshold.
+
+    keep_caches is passed on to the collector: True during an evaluation,
+    whose caches must stay as they are.
+    """
+    global _collect_threshold
+    removed = sweep_temporaries() if _collector is None else _collector(keep_caches)
+    _collect_threshold = max(_MIN_COLLECT_THRESHOLD, 2 * len(_temporary_symbols))
+    return removed
 
 
 # FACTORY FUNCTIONS
@@ -175,12 +324,40 @@ def symbol(name: str) -> Symbol:
     return Symbol(name)
 
 
+def symbol_from_id(symbol_id: int) -> Symbol:
+    """
+    Get the interned Symbol with a given ID.
+
+    Args:
+        symbol_id: An ID previously returned by Symbol.id, whose symbol
+            is still alive.
+
+    Returns:
+        The interned Symbol instance.
+
+    Raises:
+        IndexError: If no symbol has been given this ID.
+
+    Examples:
+        >>> symbol_from_id(Symbol("x").id)
+        Symbol("x")
+    """
+    name = _symbol_names[symbol_id] if symbol_id >= 0 else None
+    if name is None:
+        raise IndexError(f"Invalid symbol ID {symbol_id}")
+    return Symbol(name)
+
+
 def gensym(prefix: str = "G") -> Symbol:
     """
     Generate a unique symbol with an auto-incrementing suffix.
 
     Useful for creating temporary or internal symbols that won't
-    conflict with user-defined names.
+    conflict with user-defined names. The symbol is interned weakly: once
+    nothing refers to it, it is reclaimed by the next collection. Without
+    an installed collector the table is swept here when it fills up; an
+    installed one is left to the evaluator, which runs it between
+    top-level evaluations.
 
     Args:
         prefix: The prefix for the generated name (default: "G").
@@ -197,7 +374,17 @@ def gensym(prefix: str = "G") -> Symbol:
         Symbol("tmp3")
     """
     n = next(_gensym_counter)
-    return Symbol(f"{prefix}{n}")
+    name = f"{prefix}{n}"
+    with _cache_lock:
+        existing = _symbol_cache.get(name)
+        if existing is None:
+            existing = _temporary_symbols.get(name)
+        if existing is not None:
+            return existing
+        instance = _temporary_symbols[name] = _new_symbol(Symbol, name)
+    if _collector is None and _temporaries_due():
+        _collect_temporaries()
+    return instance
 
 
 # TYPE PREDICATES
@@ -0,0 +1,200 @@
+"""
+Walk - Explicit-stack traversals of element trees.
+
+Every traversal here keeps its pending work on a heap-allocated list
+instead of the Python call stack, so trees of any depth (long Nest
+chains, linked lists built with nested f[a, f[b, ...]]) are walked
+without hitting the recursion limit and without a frame per level.
+
+    preorder(expr)        nodes, parents before their arguments
+    postorder(expr)       nodes, arguments before their parents
+    fold(expr, leaf, node)
+                          bottom-up computation of a value per node
+    rebuild(expr, leaf)   bottom-up substitution that shares every
+                          subtree in which nothing changed
+
+The traversals read nodes through head, args and attributes, so lazy
+expressions (PackedArray, StoredExpression) are walked like any other.
+
+Usage:
+    from minimatic.core.walk import preorder, rebuild
+
+    [e for e in preorder(expr) if is_symbol(e)]
+    rebuild(expr, lambda atom: 0 if atom == x else atom)
+"""
+
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from .expression import Expression
+
+if TYPE_CHECKING:
+    from .atoms import Element
+
+
+# Frame marker: the node on the stack has not been expanded yet
+_EXPAND = -1
+
+
+# TRAVERSALS
+
+
+def preorder(
+    element: Element,
+    heads: bool = False,
+    enter: Callable[[Expression], bool] | None = None,
+) -> Iterator[Element]:
+    """
+    Yield the nodes of a tree, each before its arguments.
+
+    Args:
+        element: The root element.
+        heads: Also visit the heads of expressions (before their arguments).
+        enter: Predicate deciding whether the arguments of an expression are
+            visited; subtrees it rejects are yielded but not descended into.
+
+    Yields:
+        Every element of the tree, in depth-first left-to-right order.
+    """
+    stack = [element]
+    while stack:
+        item = stack.pop()
+        yield item
+        if isinstance(item, Expression) and (enter is None or enter(item)):
+            stack.extend(reversed(item.args))
+            if heads:
+                stack.append(item.head)
+
+
+def postorder(element: Element, heads: bool = False) -> Iterator[Element]:
+    """
+    Yield the nodes of a tree, each after its arguments.
+
+    Args:
+        element: The root element.
+        heads: Also visit the heads of expressions (before their arguments).
+
+    Yields:
+        Every element of the tree; the root comes last.
+    """
+    stack: list[tuple[Any, bool]] = [(element, False)]
+    while stack:
+        item, expanded = stack.pop()
+        if expanded or not isinstance(item, Expression):
+            yield item
+            continue
+        stack.append((item, True))
+        stack.extend((arg, False) for arg in reversed(item.args))
+        if heads:
+            stack.append((item.head, False))
+
+
+# BOTTOM-UP COMPUTATION
+
+
+def fold(
+    element: Element,
+    leaf: Callable[[Element], Any],
+    node: Callable[[Expression, Any, list[Any]], Any],
+    enter: Callable[[Expression], bool] | None = None,
+) -> Any:
+    """
+    Compute a value for a tree bottom-up.
+
+    Args:
+        element: The root element.
+        leaf: Value of an atom (heads included).
+        node: Value of an expression, called as node(expr, head_value,
+            arg_values) once the values of its head and arguments are known.
+        enter: Predicate deciding whether an expression is walked; the
+            value of a subtree it rejects is the subtree itself.
+
+    Returns:
+        The value of the root.
+
+    Usage:
+        # Number of atoms in argument positions
+        fold(expr, lambda atom: 1, lambda e, head, args: sum(args))
+    """
+    return _fold(element, leaf, node, enter)
+
+
+def rebuild(
+    element: Element,
+    leaf: Callable[[Element], Element],
+    enter: Callable[[Expression], bool] | None = None,
+    node: Callable[[Expression, Element, list[Element]], Element] | None = None,
+) -> Element:
+    """
+    Rebuild a tree bottom-up, substituting its atoms.
+
+    Expressions whose head and arguments all come back unchanged (by
+    identity) are reused as they are, so an untouched subtree costs no
+    allocation and the result shares it with the input.
+
+    Args:
+        element: The root element.
+        leaf: Replacement for an atom (heads included); return the atom
+            itself to keep it. Replacements are not walked again.
+        enter: Predicate deciding whether an expression is walked; subtrees
+            it rejects are kept unchanged.
+        node: Builds an expression from its original and its rebuilt head
+            and arguments. Defaults to rebuild_node.
+
+    Returns:
+        The rebuilt element (the input itself if nothing changed).
+    """
+    return _fold(element, leaf, rebuild_node if node is None else node, enter)
+
+
+def rebuild_node(expr: Expression, head: Element, args: list[Element]) -> Element:
+    """
+    Default node builder of rebuild().
+
+    Returns expr itself when head and args are identical to its own;
+    otherwise a new expression with expr's attributes. A substituted head
+    is validated like any user-built expression.
+    """
+    old_args = expr.args
+    if head is expr.head and len(args) == len(old_args):
+        for new, old in zip(args, old_args, strict=True):
+            if new is not old:
+                break
+        else:
+            return expr
+    if head is not expr.head:
+        return Expression(head, *args, _attrs=expr.attributes)
+    return Expression._from_parts(head, tuple(args), expr.attributes)
+
+
+def _fold(
+    element: Element,
+    leaf: Callable[[Element], Any],
+    node: Callable[[Expression, Any, list[Any]], Any],
+    enter: Callable[[Expression], bool] | None,
+) -> Any:
+    """Shared loop of fold() and rebuild(); rejected subtrees are their own value."""
+    if not isinstance(element, Expression):
+        return leaf(element)
+
+    values: list[Any] = []
+    # (item, _EXPAND) before expansion, (expr, argc) once its children are queued
+    stack: list[tuple[Any, int]] = [(element, _EXPAND)]
+    while stack:
+        item, argc = stack.pop()
+        if argc != _EXPAND:
+            start = len(values) - argc - 1
+            head_value = values[start]
+            arg_values = values[start + 1 :]
+            del values[start:]
+            values.append(node(item, head_value, arg_values))
+        elif not isinstance(item, Expression):
+            values.append(leaf(item))
+        elif enter is not None and not enter(item):
+            values.append(item)
+        else:
+            args = item.args
+            stack.append((item, len(args)))
+            stack.extend((arg, _EXPAND) for arg in reversed(args))
+            stack.append((item.head, _EXPAND))
+    return values[0]
@@ -0,0 +1,641 @@
+"""
+Wire - Compact binary serialization of Element trees.
+
+The wire format ships expressions between processes and services. It is
+streaming: a writer emits one message per element, a reader decodes them
+one at a time from any file-like object (including socket files) as they
+arrive, and neither side ever recurses, so arbitrarily deep trees are
+supported.
+
+Stream layout:
+    header   b"MMW" + version byte, written once per stream
+    message  varint byte length + one encoded element; messages follow
+             each other directly
+
+Element encoding (one tag byte, then a payload):
+    NONE, FALSE, TRUE       no payload
+    INT                     zigzag varint (arbitrary precision)
+    FLOAT                   8 bytes, little-endian IEEE 754 double
+    COMPLEX                 two FLOATs (real, imaginary)
+    STRING                  varint byte length + UTF-8 bytes
+    SYMBOL                  varint byte length + UTF-8 name; defines the
+                            next entry of the message's symbol table
+    SYMBOL_REF              varint index into the message's symbol table
+    EXPR                    varint argc + varint attribute bitmap, then the
+                            head and argc arguments
+    EXPR_EXT                as EXPR, followed by a varint count of extra
+                            attribute symbols (not in the bitmap) and those
+                            symbols, before the head
+    BACKREF                 varint index of an earlier expression in the
+                            message (expressions are numbered in the order
+                            their encoding completes)
+    PACKED                  typecode byte ('q' or 'd') + varint length +
+                            raw little-endian buffer
+
+Symbol tables and back-references are scoped to a single message, so each
+message can be decoded on its own once the header has been read. Shared
+subtrees are detected by identity, which makes hash-consed trees
+particularly compact. Symbols are interned on decode through Symbol().
+
+Usage:
+    data = dumps(expr)
+    loads(data) == expr                 # True
+
+    writer = WireWriter(sock.makefile("wb"))
+    writer.write(expr)                  # one message, flushed
+    reader = WireReader(sock.makefile("rb"))
+    reader.read()                       # next element
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from .attributes import (
+    Constant,
+    Flat,
+    Hold,
+    HoldAll,
+    HoldAllComplete,
+    HoldFirst,
+    HoldRest,
+    Listable,
+    Locked,
+    NumericFunction,
+    OneIdentity,
+    Orderless,
+    Protected,
+    ReadProtected,
+    SequenceHold,
+    Stub,
+    Temporary,
+)
+from .expression import Expression
+from .packed import PackedArray
+from .symbol import Symbol
+
+if TYPE_CHECKING:
+    from .atoms import Element
+
+MAGIC = b"MMW"
+VERSION = 1
+
+# Element tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_COMPLEX = 5
+_STRING = 6
+_SYMBOL = 7
+_SYMBOL_REF = 8
+_EXPR = 9
+_EXPR_EXT = 10
+_BACKREF = 11
+_PACKED = 12
+
+# Bit i of an attribute bitmap stands for _WIRE_ATTRIBUTES[i]. New
+# attributes must only ever be appended, or old messages change meaning.
+_WIRE_ATTRIBUTES = (
+    Protected,
+    ReadProtected,
+    Locked,
+    Constant,
+    Temporary,
+    Hold,
+    HoldAll,
+    HoldFirst,
+    HoldRest,
+    HoldAllComplete,
+    SequenceHold,
+    Flat,
+    Orderless,
+    OneIdentity,
+    Listable,
+    NumericFunction,
+    Stub,
+)
+_ATTRIBUTE_BITS = {attr: 1 << i for i, attr in enumerate(_WIRE_ATTRIBUTES)}
+_NO_ATTRIBUTES: frozenset[Symbol] = frozenset()
+
+_DOUBLE = struct.Struct("<d")
+_COMPLEX_DOUBLES = struct.Struct("<dd")
+
+_READ_SIZE = 1 << 16
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class WireFormatError(ValueError):
+    """Raised when a stream does not contain a valid wire encoding."""
+
+    pass
+
+
+# ENCODING
+
+
+class WireWriter:
+    """
+    Incremental encoder writing wire messages to a binary stream.
+
+    The stream header is written before the first message. Each call to
+    write() encodes one element as a self-contained, length-prefixed
+    message and flushes the stream.
+
+    Examples:
+        >>> buf = BytesIO()
+        >>> writer = WireWriter(buf)
+        >>> writer.write(Expression(f, x, 1))
+        >>> writer.write(Symbol("y"))
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """
+        Create a writer.
+
+        Args:
+            stream: Any object with a write(bytes) method, e.g. an open
+                    binary file or the result of socket.makefile("wb").
+        """
+        self._stream = stream
+        self._header_written = False
+
+    def write(self, element: Element) -> None:
+        """
+        Encode one element as a message.
+
+        Raises:
+            TypeError: If the tree contains a value with no wire encoding.
+        """
+        message = _encode(element)
+        prefix = bytearray()
+        if not self._header_written:
+            prefix += MAGIC
+            prefix.append(VERSION)
+        _write_varint(prefix, len(message))
+        self._stream.write(bytes(prefix))
+        self._stream.write(message)
+        self._header_written = True
+        flush = getattr(self._stream, "flush", None)
+        if flush is not None:
+            flush()
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    """Append a non-negative integer as a little-endian base-128 varint."""
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_string(out: bytearray, text: str) -> None:
+    """Append a length-prefixed UTF-8 string."""
+    data = text.encode("utf-8", "surrogatepass")
+    _write_varint(out, len(data))
+    out += data
+
+
+def _write_symbol(out: bytearray, sym: Symbol, symbols: dict[str, int]) -> None:
+    """Write a symbol, defining it in the message's symbol table on first use."""
+    name = sym.name
+    index = symbols.get(name)
+    if index is None:
+        symbols[name] = len(symbols)
+        out.append(_SYMBOL)
+        _write_string(out, name)
+    else:
+        out.append(_SYMBOL_REF)
+        _write_varint(out, index)
+
+
+_COMPLETE = object()
+
+
+def _encode(root: Element) -> bytearray:
+    """
+    Encode root as the body of one message.
+
+    Uses an explicit stack: an expression is expanded into its head and
+    arguments followed by a completion marker, at which point it becomes
+    available for back-references.
+    """
+    out = bytearray()
+    append = out.append
+    symbols: dict[str, int] = {}
+    nodes: dict[int, int] = {}
+    stack: list[Any] = [root]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        item = pop()
+        if item is _COMPLETE:
+            nodes[id(pop())] = len(nodes)
+            continue
+
+        item_type = type(item)
+        if item_type is Symbol:
+            _write_symbol(out, item, symbols)
+        elif item_type is int:
+            append(_INT)
+            z = item << 1 if item >= 0 else ((-item) << 1) - 1
+            if z < 0x80:
+                append(z)
+            else:
+                _write_varint(out, z)
+        elif item_type is float:
+            append(_FLOAT)
+            out += _DOUBLE.pack(item)
+        elif isinstance(item, Expression):
+            index = nodes.get(id(item))
+            if index is not None:
+                append(_BACKREF)
+                _write_varint(out, index)
+            elif isinstance(item, PackedArray):
+                _write_packed(out, item)
+                nodes[id(item)] = len(nodes)
+            else:
+                args = item.args
+                _write_expr_header(out, len(args), item.attributes, symbols)
+                push(item)
+                push(_COMPLETE)
+                stack.extend(reversed(args))
+                push(item.head)
+        elif item_type is str:
+            append(_STRING)
+            _write_string(out, item)
+        elif item is None:
+            append(_NONE)
+        elif item_type is bool:
+            append(_TRUE if item else _FALSE)
+        elif item_type is complex:
+            append(_COMPLEX)
+            out += _COMPLEX_DOUBLES.pack(item.real, item.imag)
+        elif isinstance(item, Symbol):
+            _write_symbol(out, item, symbols)
+        else:
+            raise TypeError(f"Cannot encode {type(item).__name__} in wire format")
+
+    return out
+
+
+def _write_expr_header(
+    out: bytearray, argc: int, attributes: frozenset[Symbol], symbols: dict[str, int]
+) -> None:
+    """Write the tag, argument count and attributes of an expression."""
+    if not attributes and argc < 0x80:
+        out += bytes((_EXPR, argc, 0))
+        return
+
+    bitmap = 0
+    extra = []
+    for attr in attributes:
+        bit = _ATTRIBUTE_BITS.get(attr)
+        if bit is None:
+            extra.append(attr)
+        else:
+            bitmap |= bit
+
+    out.append(_EXPR_EXT if extra else _EXPR)
+    _write_varint(out, argc)
+    _write_varint(out, bitmap)
+    if extra:
+        _write_varint(out, len(extra))
+        for attr in sorted(extra, key=lambda s: s.name):
+            _write_symbol(out, attr, symbols)
+
+
+def _write_packed(out: bytearray, packed: PackedArray) -> None:
+    """Write a packed array as its raw little-endian buffer."""
+    buffer = array(packed.typecode, packed.buffer)
+    if _BIG_ENDIAN:
+        buffer.byteswap()
+    out.append(_PACKED)
+    out += packed.typecode.encode("ascii")
+    _write_varint(out, len(buffer))
+    out += buffer.tobytes()
+
+
+# DECODING
+
+_MISSING = object()
+
+
+class WireReader:
+    """
+    Incremental decoder reading wire messages from a binary stream.
+
+    Each message is read from the stream as soon as it is complete, so
+    messages can be decoded while the rest of the stream is still arriving.
+
+    Examples:
+        >>> reader = WireReader(BytesIO(data))
+        >>> reader.read()
+        f[x, 1]
+        >>> list(reader)  # remaining messages
+        [Symbol("y")]
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """
+        Create a reader.
+
+        Args:
+            stream: Any object with a read(n) method, e.g. an open binary
+                    file or the result of socket.makefile("rb"). read1()
+                    is used when available so that partial data on a
+                    socket is consumed without waiting for a full chunk.
+        """
+        self._read = getattr(stream, "read1", None) or stream.read
+        self._buffer = b""
+        self._pos = 0
+        self._header_read = False
+
+    def read(self) -> Element:
+        """
+        Decode the next message.
+
+        Raises:
+            EOFError: If the stream ends cleanly before another message.
+            WireFormatError: If the data is malformed or truncated.
+        """
+        if not self._fill(1):
+            raise EOFError("End of wire stream")
+        if not self._header_read:
+            header = self._take(len(MAGIC) + 1)
+            if header[:3] != MAGIC:
+                raise WireFormatError("Not a wire stream (bad magic)")
+            if header[3] != VERSION:
+                raise WireFormatError(f"Unsupported wire format version {header[3]}")
+            self._header_read = True
+            if not self._fill(1):
+                raise EOFError("End of wire stream")
+        return _decode(self._take(self._varint()))
+
+    def __iter__(self) -> Iterator[Element]:
+        """Iterate over the remaining messages until the stream ends."""
+        while True:
+            try:
+                yield self.read()
+            except EOFError:
+                return
+
+    def _fill(self, n: int) -> bool:
+        """Ensure n unread bytes are buffered; False if the stream ends first."""
+        available = len(self._buffer) - self._pos
+        if available >= n:
+            return True
+        chunks = [self._buffer[self._pos :]]
+        while available < n:
+            chunk = self._read(max(n - available, _READ_SIZE))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            available += len(chunk)
+        self._buffer = b"".join(chunks)
+        self._pos = 0
+        return available >= n
+
+    def _take(self, n: int) -> bytes:
+        """Consume exactly n bytes."""
+        if not self._fill(n):
+            raise WireFormatError("Truncated wire message")
+        start = self._pos
+        self._pos = start + n
+        return self._buffer[start : start + n]
+
+    def _varint(self) -> int:
+        """Consume a base-128 varint."""
+        result = 0
+        shift = 0
+        while True:
+            byte = self._take(1)[0]
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+
+def _decode(data: bytes) -> Element:
+    """
+    Decode the body of one message.
+
+    Raises:
+        WireFormatError: If the body is truncated or malformed.
+    """
+    try:
+        value, pos = _decode_element(data)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise WireFormatError("Truncated or malformed wire message") from e
+    if pos != len(data):
+        raise WireFormatError("Trailing data after wire message")
+    return value
+
+
+def _decode_element(data: bytes) -> tuple[Element, int]:
+    """
+    Decode one element from data; return it and the position after it.
+
+    Pending expressions are kept on an explicit stack of frames
+    [head, argc, attributes, args]; a frame is completed, numbered and
+    attached to its parent once all of its arguments are in.
+    """
+    symbols: list[Symbol] = []
+    nodes: list[Expression] = []
+    frames: list[list[Any]] = []
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        result = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def string() -> str:
+        nonlocal pos
+        length = varint()
+        end = pos + length
+        if end > len(data):
+            raise IndexError("string runs past end of message")
+        text = data[pos:end].decode("utf-8", "surrogatepass")
+        pos = end
+        return text
+
+    def symbol(tag: int) -> Symbol:
+        if tag == _SYMBOL:
+            sym = Symbol(string())
+            symbols.append(sym)
+            return sym
+        if tag == _SYMBOL_REF:
+            index = varint()
+            if index >= len(symbols):
+                raise WireFormatError(f"Symbol reference {index} out of range")
+            return symbols[index]
+        raise WireFormatError(f"Expected a symbol, found tag {tag}")
+
+    while True:
+        tag = data[pos]
+        pos += 1
+        if tag == _SYMBOL_REF:
+            byte = data[pos]
+            if byte < 0x80 and byte < len(symbols):
+                pos += 1
+                value: Any = symbols[byte]
+            else:
+                value = symbol(tag)
+        elif tag == _INT:
+            z = data[pos]
+            if z < 0x80:
+                pos += 1
+            else:
+                z = varint()
+            value = -((z + 1) >> 1) if z & 1 else z >> 1
+        elif tag == _EXPR:
+            argc = data[pos]
+            bitmap = data[pos + 1]
+            if argc < 0x80 and bitmap == 0:
+                pos += 2
+                frames.append([_MISSING, argc, _NO_ATTRIBUTES, []])
+            else:
+                argc = varint()
+                frames.append([_MISSING, argc, frozenset(_attributes(varint())), []])
+            continue
+        elif tag == _FLOAT:
+            value = _DOUBLE.unpack_from(data, pos)[0]
+            pos += 8
+        elif tag == _SYMBOL:
+            value = symbol(tag)
+        elif tag == _STRING:
+            value = string()
+        elif tag == _BACKREF:
+            index = varint()
+            if index >= len(nodes):
+                raise WireFormatError(f"Back-reference {index} out of range")
+            value = nodes[index]
+        elif tag == _EXPR_EXT:
+            argc = varint()
+            attrs = _attributes(varint())
+            for _ in range(varint()):
+                tag = data[pos]
+                pos += 1
+                attrs.add(symbol(tag))
+            frames.append([_MISSING, argc, frozenset(attrs), []])
+            continue
+        elif tag == _NONE:
+            value = None
+        elif tag == _FALSE:
+            value = False
+        elif tag == _TRUE:
+            value = True
+        elif tag == _COMPLEX:
+            real, imag = _COMPLEX_DOUBLES.unpack_from(data, pos)
+            pos += 16
+            value = complex(real, imag)
+        elif tag == _PACKED:
+            typecode = chr(data[pos])
+            pos += 1
+            if typecode not in ("q", "d"):
+                raise WireFormatError(f"Invalid packed array typecode {typecode!r}")
+            buffer = array(typecode)
+            length = varint()
+            end = pos + length * buffer.itemsize
+            if end > len(data):
+                raise IndexError("packed array runs past end of message")
+            buffer.frombytes(data[pos:end])
+            pos = end
+            if _BIG_ENDIAN:
+                buffer.byteswap()
+            try:
+                value = PackedArray(buffer)
+            except ValueError as e:
+                raise WireFormatError(str(e)) from e
+            nodes.append(value)
+        else:
+            raise WireFormatError(f"Unknown wire tag {tag}")
+
+        # Attach the value to the innermost pending expression
+        while frames:
+            frame = frames[-1]
+            args = frame[3]
+            if frame[0] is _MISSING:
+                frame[0] = value
+            else:
+                args.append(value)
+            if len(args) < frame[1]:
+                break
+            frames.pop()
+            head = frame[0]
+            if not isinstance(head, (Symbol, Expression)):
+                raise WireFormatError(
+                    f"Expression head must be Symbol or Expression, got {type(head).__name__}"
+                )
+            value = Expression._from_parts(head, tuple(args), frame[2])
+            nodes.append(value)
+        else:
+            return value, pos
+
+
+def _attributes(bitmap: int) -> set[Symbol]:
+    """Decode an attribute bitmap."""
+    if bitmap >> len(_WIRE_ATTRIBUTES):
+        raise WireFormatError(f"Unknown attribute bits in {bitmap:#x}")
+    return {attr for i, attr in enumerate(_WIRE_ATTRIBUTES) if bitmap >> i & 1}
+
+
+# CONVENIENCE FUNCTIONS
+
+
+def dumps(element: Element) -> bytes:
+    """
+    Encode an element as a complete wire stream (header plus one message).
+
+    Examples:
+        >>> loads(dumps(Expression(f, x, 1.5)))
+        f[x, 1.5]
+    """
+    buffer = BytesIO()
+    WireWriter(buffer).write(element)
+    return buffer.getvalue()
+
+
+def loads(data: bytes) -> Element:
+    """
+    Decode the first message of a wire stream held in memory.
+
+    Raises:
+        WireFormatError: If the data is malformed or truncated.
+    """
+    try:
+        return WireReader(BytesIO(data)).read()
+    except EOFError as e:
+        raise WireFormatError("Empty wire stream") from e
+
+
+def dump(element: Element, fp: BinaryIO) -> None:
+    """Write an element to a binary file as a complete wire stream."""
+    WireWriter(fp).write(element)
+
+
+def load(fp: BinaryIO) -> Element:
+    """Read the first message of a wire stream from a binary file."""
+    try:
+        return WireReader(fp).read()
+    except EOFError as e:
+        raise WireFormatError("Empty wire stream") from e
+
+
+def iter_load(fp: BinaryIO) -> Iterator[Element]:
+    """Iterate over every message of a wire stream in a binary file."""
+    return iter(WireReader(fp))
@@ -9,16 +9,25 @@ from .context import (
     ContextChain,
     EvaluationContext,
     GlobalContext,
+    collect_temporaries,
     context_stack,
     get_current_context,
     with_context,
 )
-from .evaluator import FixedPoint, evaluate, evaluate_iterated, try_evaluate
+from .evaluator import FixedPoint, InContext, evaluate, evaluate_iterated, try_evaluate
+from .profile import (
+    RuleProfile,
+    RuleProfiler,
+    disable_profiling,
+    enable_profiling,
+    profiling,
+)
 from .rules import Rule, RuleDelayed, RuleType, apply_rule, is_rule, is_rule_delayed, try_rules
 from .transforms import (
     apply_flat,
     apply_listable,
     apply_orderless,
+    canonical_key,
     canonical_sort,
     flatten_sequences,
 )
@@ -43,6 +52,7 @@ __all__ = [
     "try_evaluate",
     "FixedPoint",
     "evaluate_iterated",
+    "InContext",
     # Rules
     "Rule",
     "RuleDelayed",
@@ -71,10 +81,18 @@ __all__ = [
     "get_current_context",
     "with_context",
     "context_stack",
+    "collect_temporaries",
+    # Profiling
+    "RuleProfile",
+    "RuleProfiler",
+    "enable_profiling",
+    "disable_profiling",
+    "profiling",
     # Transforms
     "flatten_sequences",
     "apply_flat",
     "apply_orderless",
     "apply_listable",
     "canonical_sort",
+    "canonical_key",
 ]
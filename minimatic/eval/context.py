@@ -3,13 +3,59 @@ Evaluation context/environment management.
 
 Provides symbol tables, attribute storage, and value storage
 with support for nested scopes and context chaining.
+
+Temporary symbols (made by gensym(), or carrying the Temporary
+attribute) are garbage collected together with their definitions:
+collect_temporaries() removes the attributes and values of every
+temporary that is no longer referenced from outside the definitions of
+other unreachable temporaries. It runs automatically once the table of
+gensym'd symbols has doubled in size: at the start of the next top-level
+evaluation, where it also empties the caches that could keep temporaries
+alive, or when a Module is evaluated, where it leaves the caches of the
+evaluation in progress alone.
 """
 
+import gc
 import threading
+import weakref
 from collections.abc import Mapping
 from typing import Any
 
-from minimatic.core import Symbol
+from minimatic.core import Expression, Symbol
+from minimatic.core.attributes import Flat, Orderless, Temporary
+from minimatic.core.pmap import PMap
+from minimatic.core.symbol import (
+    _UNREFERENCED,
+    _refcounts,
+    _release_temporary,
+    _set_temporary_collector,
+    _symbol_cache,
+    _temporary_symbols,
+    is_temporary,
+)
+from minimatic.pattern.compiler import clear_compiled_patterns
+from minimatic.pattern.matcher import clear_template_plans
+
+from .dispatch import (
+    add_definition,
+    build_index,
+    candidates,
+    exact_definition,
+    find_definition,
+)
+
+# Key suffix of the dispatch index stored next to a definition list
+_INDEX = "_index"
+
+# Key of a symbol's attributes in the flattened view of a chained context
+_ATTRIBUTES = "attributes"
+
+_EMPTY_SCOPE: PMap = PMap()
+
+# Attributes under which expression arguments are not matched positionally
+_UNORDERED_ATTRIBUTES = frozenset({Flat, Orderless})
+
+_TEMPORARY = frozenset({Temporary})
 
 
 class EvaluationContext:
@@ -19,13 +65,45 @@ class EvaluationContext:
     - Attribute storage (Symbol -> frozenset of Attributes)
     - Value storage (all value types: OwnValues, DownValues, etc.)
 
-    Contexts can be chained for nested scopes (local variables).
+    Contexts can be chained for nested scopes (local variables). A chained
+    context keeps its own definitions, plus a flattened view of the
+    definitions of every context between it and the root, so a lookup
+    costs the same at any nesting depth: one probe of the view, then one
+    of the root's tables. A new context shares its parent's view and
+    copies it on its first definition of a new symbol or value kind.
+
+    definitions_version is shared by all contexts and incremented by every
+    change to their values or attributes (see definitions_changed()), and
+    attributes_version by every change to their attributes or to the
+    built-in registry (see attributes_changed()).
     """
 
+    definitions_version = 0
+    attributes_version = 0
+
+    # Incremented when a context with children gains or loses definitions,
+    # which the flattened views of its descendants then no longer show
+    _scopes_version = 0
+
     def __init__(self, name: str = "Global", parent: EvaluationContext | None = None):
         self.name = name
         self.parent = parent
 
+        # The context at the end of the parent chain (None for a root)
+        self._root: EvaluationContext | None = None
+        if parent is not None:
+            self._root = parent if parent._root is None else parent._root
+            parent._has_children = True
+        self._has_children = False
+
+        # Flattened view of the definitions of this context and its
+        # ancestors below the root: (Symbol, key) -> the table holding them
+        # (_attributes for _ATTRIBUTES, else the symbol's value table),
+        # current while _scope_version equals _scopes_version; a persistent
+        # map, so a view is derived from its parent's in O(log n) per entry
+        self._scope: PMap = _EMPTY_SCOPE
+        self._scope_version = -1
+
         # Symbol name -> Symbol object mapping
         self._symbols: dict[str, Symbol] = {}
 
@@ -35,6 +113,19 @@ class EvaluationContext:
         # Consolidated value storage: Symbol -> {type_key: value}
         self._values: dict[Symbol, dict[str, Any]] = {}
 
+        # Head symbol -> attributes resolved by the evaluator, valid while
+        # attributes_version equals _attribute_cache_version
+        self._attribute_cache: dict[Symbol, frozenset[Symbol]] = {}
+        self._attribute_cache_version = EvaluationContext.attributes_version
+
+        # Expressions that reached a fixed point in this context, by
+        # identity (id -> expression), valid while definitions_version
+        # equals _evaluated_version
+        self._evaluated: dict[int, Expression] = {}
+        self._evaluated_version = EvaluationContext.definitions_version
+
+        _contexts.add(self)
+
     def get_symbol(self, name: str) -> Symbol | None:
         """Get symbol by name, checking parent contexts if not found."""
         if name in self._symbols:
@@ -50,50 +141,240 @@ class EvaluationContext:
 
     def get_attributes(self, sym: Symbol) -> frozenset[Symbol]:
         """Get attributes for a symbol."""
-        if sym in self._attributes:
-            return self._attributes[sym]
-        if self.parent is not None:
-            return self.parent.get_attributes(sym)
-        return frozenset()
+        root = self._root
+        if root is None:
+            root = self
+        else:
+            owner = self._scope_owner(sym, _ATTRIBUTES)
+            if owner is not None:
+                return owner[sym]
+        attrs = root._attributes.get(sym)
+        return frozenset() if attrs is None else attrs
 
     def set_attributes(self, sym: Symbol, attrs: frozenset[Symbol]) -> None:
         """Set attributes for a symbol."""
+        if sym not in self._attributes:
+            self._scope_add(sym, _ATTRIBUTES, self._attributes)
         self._attributes[sym] = frozenset(attrs)
+        attributes_changed()
+
+    def set_temporary(self, sym: Symbol, value: Any = None) -> None:
+        """
+        Give a symbol the Temporary attribute and, unless value is None,
+        that OwnValue.
+
+        A gensym without definitions (a fresh Module local, which no
+        evaluation has seen yet) gets them without a version change:
+        nothing cached can depend on them. Any other symbol goes through
+        set_attributes() and set_own_values().
+        """
+        attrs = self.get_attributes(sym)
+        if attrs or not is_temporary(sym) or self._value_owner(sym, "own") is not None:
+            self.set_attributes(sym, attrs | _TEMPORARY)
+            if value is not None:
+                self.set_own_values(sym, [(sym, value, None)])
+            return
+        self._scope_add(sym, _ATTRIBUTES, self._attributes)
+        self._attributes[sym] = _TEMPORARY
+        if value is not None:
+            sym_vals = self._values.setdefault(sym, {})
+            self._scope_add(sym, "own", sym_vals)
+            sym_vals["own"] = [(sym, value, None)]
 
     def clear_attributes(self, sym: Symbol) -> None:
         """Clear all attributes for a symbol."""
         if sym in self._attributes:
             del self._attributes[sym]
+            self._scope_removed()
+            attributes_changed()
 
     def has_attribute(self, sym: Symbol, attr: Symbol) -> bool:
         """Check if symbol has a specific attribute."""
         return attr in self.get_attributes(sym)
 
+    def attribute_cache(self) -> dict[Symbol, frozenset[Symbol]]:
+        """
+        A table for attribute sets resolved through this context, emptied
+        whenever attributes change in any context or a built-in is
+        registered.
+        """
+        if self._attribute_cache_version != EvaluationContext.attributes_version:
+            self._attribute_cache = {}
+            self._attribute_cache_version = EvaluationContext.attributes_version
+        return self._attribute_cache
+
+    def evaluated_marks(self) -> dict[int, Expression]:
+        """
+        The expressions marked as evaluated in this context, by id(),
+        emptied whenever a definition or attribute changes in any context.
+
+        The table holds its expressions (an id is only meaningful while
+        its object lives), so it is dropped with the context and released
+        as soon as a definition changes.
+        """
+        if self._evaluated_version != EvaluationContext.definitions_version:
+            self._evaluated = {}
+            self._evaluated_version = EvaluationContext.definitions_version
+        return self._evaluated
+
+    # Flattened view
+
+    def _scope_owner(self, sym: Symbol, key: str) -> dict | None:
+        """
+        The table holding sym's key entry in the nearest context below the
+        root that has one, or None (for a chained context).
+        """
+        if self._scope_version != EvaluationContext._scopes_version:
+            self._rebuild_scope()
+        return self._scope.get((sym, key))
+
+    def _rebuild_scope(self) -> None:
+        """
+        Rebuild the flattened view from the tables of this context and those
+        of its ancestors with stale views, outermost first.
+        """
+        version = EvaluationContext._scopes_version
+        stale = []
+        ctx: EvaluationContext = self
+        while ctx._root is not None and ctx._scope_version != version:
+            stale.append(ctx)
+            ctx = ctx.parent  # type: ignore[assignment]
+        scope = _EMPTY_SCOPE if ctx._root is None else ctx._scope
+        for ctx in reversed(stale):
+            if not (ctx._attributes or ctx._values):
+                # Shared until the context gains definitions of its own
+                ctx._scope = scope
+                ctx._scope_version = version
+                continue
+            attributes = ctx._attributes
+            scope = scope.update(((sym, _ATTRIBUTES), attributes) for sym in attributes)
+            scope = scope.update(
+                ((sym, key), sym_vals)
+                for sym, sym_vals in ctx._values.items()
+                for key in sym_vals
+                if not key.endswith(_INDEX)
+            )
+            ctx._scope = scope
+            ctx._scope_version = version
+
+    def _scope_add(self, sym: Symbol, key: str, table: dict) -> None:
+        """Show a new entry of this context's tables in the flattened view."""
+        if self._root is None:
+            # The root's tables are not part of any view
+            return
+        current = self._scope_version == EvaluationContext._scopes_version
+        if self._has_children:
+            # Descendants rebuild their views from this one
+            EvaluationContext._scopes_version += 1
+        if current:
+            # Only this view gains the entry; those of the ancestors stay valid
+            self._scope_version = EvaluationContext._scopes_version
+        else:
+            self._rebuild_scope()
+        # The parent's view, if shared, is left as it is
+        self._scope = self._scope.set((sym, key), table)
+
+    def _scope_removed(self) -> None:
+        """Rebuild the flattened view after an entry left this context's tables."""
+        if self._root is None:
+            return
+        if self._has_children:
+            EvaluationContext._scopes_version += 1
+        self._scope_version = -1
+
     # Value storage accessors
 
     def _get_value_list(self, sym: Symbol, key: str) -> list:
         """Get a value list for a symbol and key, checking parent contexts."""
-        sym_vals = self._values.get(sym)
-        if sym_vals is not None and key in sym_vals:
+        sym_vals = self._value_owner(sym, key)
+        if sym_vals is not None:
             return sym_vals[key]
-        if self.parent is not None:
-            return self.parent._get_value_list(sym, key)
         return []
 
     def _get_value_scalar(self, sym: Symbol, key: str) -> Any:
         """Get a scalar value for a symbol and key, checking parent contexts."""
-        sym_vals = self._values.get(sym)
-        if sym_vals is not None and key in sym_vals:
+        sym_vals = self._value_owner(sym, key)
+        if sym_vals is not None:
             return sym_vals[key]
-        if self.parent is not None:
-            return self.parent._get_value_scalar(sym, key)
         return None
 
     def _set_value(self, sym: Symbol, key: str, value: Any) -> None:
         """Set a value for a symbol and key."""
-        if sym not in self._values:
-            self._values[sym] = {}
-        self._values[sym][key] = value
+        sym_vals = self._values.get(sym)
+        if sym_vals is None:
+            sym_vals = self._values[sym] = {}
+        if key not in sym_vals:
+            self._scope_add(sym, key, sym_vals)
+        sym_vals[key] = value
+        # A replaced definition list is re-indexed on its next lookup
+        sym_vals.pop(key + _INDEX, None)
+        definitions_changed()
+
+    def _value_owner(self, sym: Symbol, key: str) -> dict[str, Any] | None:
+        """The value table of the nearest context defining sym's key values."""
+        root = self._root
+        if root is None:
+            root = self
+        else:
+            sym_vals = self._scope_owner(sym, key)
+            if sym_vals is not None:
+                return sym_vals
+        sym_vals = root._values.get(sym)
+        if sym_vals is not None and key in sym_vals:
+            return sym_vals
+        return None
+
+    def _value_index(self, sym_vals: dict[str, Any], key: str) -> list:
+        """The dispatch index of a definition list, brought up to date."""
+        entries = sym_vals[key]
+        index = sym_vals.get(key + _INDEX)
+        if index is None or index[1] > len(entries):
+            index = sym_vals[key + _INDEX] = build_index(entries)
+        else:
+            # Entries appended to the list directly
+            for entry in entries[index[1] :]:
+                add_definition(index, entry[0], entry[2])
+        return index
+
+    def _add_definition(self, sym: Symbol, key: str, entry: tuple) -> None:
+        """
+        Add a (pattern, replacement, condition) definition.
+
+        A definition with the same pattern and condition as an existing one
+        replaces it in place; otherwise it is appended. The list is updated
+        in the context that already holds it, or this one.
+        """
+        sym_vals = self._value_owner(sym, key)
+        if sym_vals is None:
+            self._set_value(sym, key, [entry])
+            return
+        entries = sym_vals[key]
+        index = self._value_index(sym_vals, key)
+        definitions_changed()
+        position = find_definition(index, entries, entry[0])
+        if position is not None and entries[position][2] == entry[2]:
+            entries[position] = entry
+            return
+        entries.append(entry)
+        add_definition(index, entry[0], entry[2])
+
+    def _definition_candidates(self, sym: Symbol, key: str, expr: Any) -> list:
+        """Definitions of sym that can match expr, in definition order."""
+        sym_vals = self._value_owner(sym, key)
+        if sym_vals is None:
+            return []
+        entries = sym_vals[key]
+        if len(entries) <= 1 or (
+            isinstance(expr, Expression) and not _UNORDERED_ATTRIBUTES.isdisjoint(expr.attributes)
+        ):
+            # Flat and Orderless arguments do not line up with pattern arguments
+            return entries
+        index = self._value_index(sym_vals, key)
+        position = exact_definition(index, expr)
+        if position is not None:
+            # A definition for expr itself applies before any pattern
+            return [entries[position]]
+        return [entries[position] for position in candidates(index, expr)]
 
     def get_own_values(self, sym: Symbol) -> list:
         return self._get_value_list(sym, "own")
@@ -107,6 +388,16 @@ class EvaluationContext:
     def set_down_values(self, sym: Symbol, values: list) -> None:
         self._set_value(sym, "down", values)
 
+    def add_down_value(
+        self, sym: Symbol, pattern_expr: Any, replacement: Any, condition: Any | None = None
+    ) -> None:
+        """Add (or replace, for an equal pattern) a DownValue, updating the index."""
+        self._add_definition(sym, "down", (pattern_expr, replacement, condition))
+
+    def get_down_value_candidates(self, sym: Symbol, expr: Any) -> list:
+        """DownValues of sym that can match expr, in definition order."""
+        return self._definition_candidates(sym, "down", expr)
+
     def get_up_values(self, sym: Symbol) -> list:
         return self._get_value_list(sym, "up")
 
@@ -119,6 +410,16 @@ class EvaluationContext:
     def set_sub_values(self, sym: Symbol, values: list) -> None:
         self._set_value(sym, "sub", values)
 
+    def add_sub_value(
+        self, sym: Symbol, pattern_expr: Any, replacement: Any, condition: Any | None = None
+    ) -> None:
+        """Add (or replace, for an equal pattern) a SubValue, updating the index."""
+        self._add_definition(sym, "sub", (pattern_expr, replacement, condition))
+
+    def get_sub_value_candidates(self, sym: Symbol, expr: Any) -> list:
+        """SubValues of sym that can match expr, in definition order."""
+        return self._definition_candidates(sym, "sub", expr)
+
     def get_n_values(self, sym: Symbol) -> list:
         return self._get_value_list(sym, "n")
 
@@ -141,15 +442,170 @@ class EvaluationContext:
         """Clear all values for a symbol."""
         if sym in self._values:
             del self._values[sym]
+            self._scope_removed()
+            definitions_changed()
 
     def __repr__(self) -> str:
         return f"EvaluationContext({self.name!r})"
 
 
+def definitions_changed() -> None:
+    """
+    Increment the definitions version, invalidating everything derived
+    from the definitions (such as expressions marked as evaluated).
+
+    The context methods call this themselves; call it after changing a
+    definition list in place.
+    """
+    EvaluationContext.definitions_version += 1
+
+
+def attributes_changed() -> None:
+    """
+    Increment the attributes version (and the definitions version),
+    emptying every context's attribute_cache().
+
+    The context methods call this themselves; the built-in registry calls
+    it when a built-in (and so its attributes) is registered.
+    """
+    EvaluationContext.attributes_version += 1
+    EvaluationContext.definitions_version += 1
+
+
+# Every live context, for the temporary symbol collector
+_contexts: weakref.WeakSet[EvaluationContext] = weakref.WeakSet()
+
+
 # Global context singleton
 GlobalContext = EvaluationContext("Global")
 
 
+# TEMPORARY SYMBOL COLLECTION
+
+# Objects whose references are followed when tracing definitions
+_CONTAINERS = (tuple, list, dict, frozenset)
+
+
+def _definition_graph(
+    contexts: list[EvaluationContext],
+) -> tuple[dict[int, Any], dict[int, int], dict[int, list[int]], list[int]]:
+    """
+    Trace the definitions of all temporary symbols.
+
+    Returns (objects, internal, children, candidates): every traced object
+    by id, the number of references to it from traced objects and from
+    the symbol and context tables, the traced objects each one refers to,
+    and the ids of the temporary symbols.
+    """
+    objects: dict[int, Any] = {}
+    internal: dict[int, int] = {}
+    children: dict[int, list[int]] = {}
+
+    for sym in _temporary_symbols.values():
+        objects[id(sym)] = sym
+    for ctx in contexts:
+        for sym, attrs in ctx._attributes.items():
+            if Temporary in attrs:
+                objects[id(sym)] = sym
+    candidates = list(objects)
+    for key in candidates:
+        sym = objects[key]
+        # Held by the interning table (permanent symbols can carry Temporary too)
+        interned = _temporary_symbols.get(sym.name) is sym or _symbol_cache.get(sym.name) is sym
+        internal[key] = 1 if interned else 0
+        children[key] = []
+
+    # A symbol keeps its definitions alive; the context tables hold both
+    stack: list[Any] = []
+    for ctx in contexts:
+        for table in (ctx._attributes, ctx._values):
+            for key in candidates:
+                sym = objects[key]
+                definitions = table.get(sym)
+                if definitions is None:
+                    continue
+                internal[key] += 1
+                definitions_key = id(definitions)
+                children[key].append(definitions_key)
+                if definitions_key not in objects:
+                    objects[definitions_key] = definitions
+                    internal[definitions_key] = 0
+                    stack.append(definitions)
+                internal[definitions_key] += 1
+
+    while stack:
+        container = stack.pop()
+        edges = children[id(container)] = []
+        for referent in gc.get_referents(container):
+            referent_key = id(referent)
+            if referent_key in internal:
+                internal[referent_key] += 1
+                edges.append(referent_key)
+            elif isinstance(referent, _CONTAINERS) and not isinstance(referent, Symbol):
+                objects[referent_key] = referent
+                internal[referent_key] = 1
+                edges.append(referent_key)
+                stack.append(referent)
+    return objects, internal, children, candidates
+
+
+def collect_temporaries(keep_caches: bool = False) -> int:
+    """
+    Remove unreachable temporary symbols and their definitions.
+
+    A temporary symbol is reachable if anything other than the symbol
+    table and the definitions of unreachable temporaries refers to it,
+    directly or through another reachable object: a live expression, a
+    definition of an ordinary symbol, a Python variable. Unreachable
+    temporaries lose their attributes and values in every context, and
+    gensym'd ones are dropped from the symbol table.
+
+    Args:
+        keep_caches: Leave compiled patterns, substitution plans and the
+            contexts' lookup caches as they are (as during an evaluation);
+            temporaries those caches mention then stay reachable.
+
+    Returns:
+        The number of temporary symbols removed.
+    """
+    contexts = list(_contexts)
+    if not keep_caches:
+        # Cached compilations and substitution plans hold their patterns and
+        # templates, which would keep every symbol they mention reachable;
+        # they are rebuilt on next use
+        clear_compiled_patterns()
+        clear_template_plans()
+        for ctx in contexts:
+            # So do the flattened views, attribute caches and evaluated marks
+            # of the contexts; they are rebuilt on next use
+            ctx._scope = _EMPTY_SCOPE
+            ctx._scope_version = -1
+            ctx._attribute_cache = {}
+            ctx._evaluated = {}
+    objects, internal, children, candidates = _definition_graph(contexts)
+
+    # Roots: objects with references from outside the traced graph
+    alive: set[int] = set()
+    stack = [key for key, count in _refcounts(objects) if count - _UNREFERENCED > internal[key]]
+    while stack:
+        key = stack.pop()
+        if key not in alive:
+            alive.add(key)
+            stack.extend(children[key])
+
+    dead = [objects[key] for key in candidates if key not in alive]
+    objects.clear()
+    for sym in dead:
+        for ctx in contexts:
+            ctx._attributes.pop(sym, None)
+            ctx._values.pop(sym, None)
+        _release_temporary(sym)
+    return len(dead)
+
+
+_set_temporary_collector(collect_temporaries)
+
+
 # Thread-local storage for current context stack
 _thread_local = threading.local()
 
@@ -0,0 +1,273 @@
+"""
+Discrimination-tree index over definitions.
+
+A symbol with hundreds of DownValues (a lookup table, a unit conversion
+table) would otherwise try every stored definition in order on each call.
+The index files each definition under a key path read off its left-hand
+side:
+
+    arity       the number of arguments, or VARIADIC when a sequence
+                pattern (__, ___, Optional, Repeated) makes it vary
+    arguments   one key per argument up to the first sequence pattern:
+                a literal atom (1, "s", x), a head (x_Integer, g[...]),
+                or a wildcard (x_, a | b, ...)
+
+Looking up an expression walks only the branches its arity and
+arguments can reach and returns the positions of the candidate
+definitions in definition order, so the first candidate that matches is
+the definition a linear scan would have picked.
+
+A definition for specific values, such as the f[5] = 120 that the
+memoization idiom f[n_] := f[n] = ... stores, has nothing to match: its
+left-hand side is the expression itself. Unless it has a condition, it is
+also filed in a hash table keyed by that expression, and
+exact_definition() finds it in one lookup, ahead of every pattern
+definition. Each new value adds one entry, so a table of thousands of
+memoized values costs no more per call than a single one.
+
+The index is built from plain lists and dicts so that the temporary
+symbol collector traces it like the definitions it belongs to.
+"""
+
+from typing import Any
+
+from minimatic.core import Expression, Symbol, head_of, is_atom
+from minimatic.pattern.blanks import Blank
+from minimatic.pattern.compiler import _is_literal, _needs_sequence_matching
+from minimatic.pattern.structural import (
+    Condition,
+    Pattern,
+    PatternTest,
+    Verbatim,
+    is_pattern_construct,
+    unwrap_hold_pattern,
+)
+
+# Arity key of definitions whose argument count is not fixed
+VARIADIC = -1
+
+# Argument key tags
+_LITERAL = 0
+_HEAD = 1
+
+# Node layout: [edges by key, wildcard child or None, definition positions]
+_EDGES = 0
+_WILD = 1
+_RULES = 2
+
+# Index layout: [root node, number of definitions indexed, exact table]
+_ROOT = 0
+_COUNT = 1
+_EXACT = 2
+
+
+def new_index() -> list:
+    """Create an empty index."""
+    return [_new_node(), 0, {}]
+
+
+def build_index(entries: list) -> list:
+    """Index a list of (pattern, replacement, condition) entries."""
+    index = new_index()
+    for entry in entries:
+        add_definition(index, entry[0], entry[2])
+    return index
+
+
+def add_definition(index: list, pattern: Any, condition: Any = None) -> None:
+    """
+    Index the next definition (at position index[_COUNT]) by its pattern,
+    and by its arguments too if it has no condition and a pattern-free
+    left-hand side.
+    """
+    node = index[_ROOT]
+    for key in key_path(pattern):
+        if key is None:
+            child = node[_WILD]
+            if child is None:
+                child = node[_WILD] = _new_node()
+        else:
+            child = node[_EDGES].get(key)
+            if child is None:
+                child = node[_EDGES][key] = _new_node()
+        node = child
+    position = index[_COUNT]
+    node[_RULES].append(position)
+    if condition is None:
+        key = exact_key(pattern)
+        if key is not None:
+            # The first definition of a value is the one that applies
+            index[_EXACT].setdefault(key, position)
+    index[_COUNT] = position + 1
+
+
+def find_definition(index: list, entries: list, pattern: Any) -> int | None:
+    """Position of the definition whose pattern equals pattern, if any."""
+    node = index[_ROOT]
+    for key in key_path(pattern):
+        node = node[_WILD] if key is None else node[_EDGES].get(key)
+        if node is None:
+            return None
+    for position in node[_RULES]:
+        if entries[position][0] == pattern:
+            return position
+    return None
+
+
+def exact_definition(index: list, expr: Any) -> int | None:
+    """
+    Position of the definition without a condition whose left-hand side
+    is expr itself, if any: it applies before every pattern definition.
+    """
+    exact = index[_EXACT]
+    if not exact or not isinstance(expr, Expression):
+        return None
+    try:
+        return exact.get(expr)
+    except TypeError:
+        return None
+
+
+def candidates(index: list, expr: Any) -> list[int]:
+    """
+    Positions of the definitions that can match expr, in definition order.
+
+    Definitions whose pattern the index cannot key (not an expression
+    pattern) are always candidates.
+    """
+    root = index[_ROOT]
+    positions = list(root[_RULES])
+    if not isinstance(expr, Expression):
+        return positions
+    args = expr.args
+    count = len(args)
+
+    stack = []
+    for arity in (count, VARIADIC):
+        node = root[_EDGES].get(arity)
+        if node is not None:
+            stack.append((node, 0))
+    while stack:
+        node, i = stack.pop()
+        positions.extend(node[_RULES])
+        if i == count:
+            continue
+        arg = args[i]
+        edges = node[_EDGES]
+        if edges:
+            if not isinstance(arg, Expression):
+                try:
+                    child = edges.get((_LITERAL, arg))
+                except TypeError:
+                    child = None
+                if child is not None:
+                    stack.append((child, i + 1))
+            child = edges.get((_HEAD, head_of(arg)))
+            if child is not None:
+                stack.append((child, i + 1))
+        if node[_WILD] is not None:
+            stack.append((node[_WILD], i + 1))
+
+    positions.sort()
+    return positions
+
+
+# KEYS
+
+
+def key_path(pattern: Any) -> list:
+    """
+    Keys a definition is filed under: its arity key, then one key per
+    argument (None for a wildcard). Empty if the pattern is not keyed.
+    """
+    top = _unwrap(pattern)
+    if not isinstance(top, Expression) or is_pattern_construct(top):
+        return []
+    keys: list = [len(top.args)]
+    for arg in top.args:
+        if _needs_sequence_matching(arg):
+            keys[0] = VARIADIC
+            break
+        keys.append(argument_key(arg))
+    return keys
+
+
+def argument_key(pattern: Any) -> tuple | None:
+    """
+    Key of an argument pattern: every element it matches has that literal
+    value or that head. None if the pattern is a wildcard.
+    """
+    while True:
+        pattern = unwrap_hold_pattern(pattern)
+        if not isinstance(pattern, Expression):
+            if is_atom(pattern) or isinstance(pattern, Symbol):
+                return _literal_key(pattern)
+            return None
+        head = pattern.head
+        args = pattern.args
+        if head == Pattern:
+            if len(args) < 2:
+                return None
+            pattern = args[1]
+        elif head in (Condition, PatternTest):
+            if not args:
+                return None
+            pattern = args[0]
+        elif head == Blank:
+            return (_HEAD, args[0]) if args else None
+        elif head == Verbatim:
+            if not args:
+                return None
+            if isinstance(args[0], Expression):
+                return (_HEAD, args[0].head)
+            return _literal_key(args[0])
+        elif is_pattern_construct(pattern) or not _is_literal(head):
+            return None
+        else:
+            return (_HEAD, head)
+
+
+def exact_key(pattern: Any) -> Any:
+    """
+    The expression a left-hand side without pattern constructs (under
+    HoldPattern) stands for, the key exact_definition() looks it up by.
+    None for any other pattern, or if the expression cannot be hashed.
+    """
+    top = unwrap_hold_pattern(pattern)
+    if not isinstance(top, Expression) or not _is_literal(top):
+        return None
+    try:
+        hash(top)
+    except TypeError:
+        return None
+    return top
+
+
+def _literal_key(atom: Any) -> tuple | None:
+    """Key of a literal atom (None if it cannot be hashed)."""
+    try:
+        hash(atom)
+    except TypeError:
+        return None
+    return (_LITERAL, atom)
+
+
+def _unwrap(pattern: Any) -> Any:
+    """The structural pattern under HoldPattern, Condition, PatternTest and Pattern."""
+    while isinstance(pattern, Expression):
+        pattern = unwrap_hold_pattern(pattern)
+        if not isinstance(pattern, Expression):
+            break
+        head = pattern.head
+        args = pattern.args
+        if head == Pattern and len(args) >= 2:
+            pattern = args[1]
+        elif head in (Condition, PatternTest) and args:
+            pattern = args[0]
+        else:
+            break
+    return pattern
+
+
+def _new_node() -> list:
+    return [{}, None, []]
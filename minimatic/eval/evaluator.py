@@ -4,7 +4,9 @@ standard evaluation procedure.
 """
 
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Generator
+from itertools import islice
+from types import GeneratorType
 from typing import Any
 
 from minimatic.core import (
@@ -16,20 +18,25 @@ from minimatic.core import (
     HoldRest,
     Listable,
     Orderless,
+    PackedArray,
     SequenceHold,
     Symbol,
     is_atom,
     is_expr,
     is_symbol,
 )
-from minimatic.pattern import match, replace_with_bindings
+from minimatic.core.symbol import _collect_temporaries, _temporaries_due
+from minimatic.pattern import compile_pattern, empty_bindings, replace_with_bindings
+from minimatic.pattern.compiler import _is_literal
 
-from .context import EvaluationContext, get_current_context
+from . import profile
+from .context import EvaluationContext, _contexts, get_current_context
 from .transforms import apply_flat, apply_listable, apply_orderless, flatten_sequences
 
 # Lazy import to avoid circular dependency
 _builtin_dispatch = None
 _builtin_attributes = None
+_packed_kernel = None
 
 
 def _get_builtin_dispatch():
@@ -52,10 +59,24 @@ def _get_builtin_attributes():
     return _builtin_attributes
 
 
+def _get_packed_kernel():
+    """Lazy import of packed-array kernel lookup."""
+    global _packed_kernel
+    if _packed_kernel is None:
+        from minimatic.builtins.registry import get_packed_kernel
+
+        _packed_kernel = get_packed_kernel
+    return _packed_kernel
+
+
 # System constants
-DEFAULT_RECURSION_LIMIT = 256
+DEFAULT_RECURSION_LIMIT = 1024
 DEFAULT_ITERATION_LIMIT = 1000
 
+MAX_EVALUATED_MARKS = 1 << 16
+"""Expressions marked as evaluated at once in one context; its marks are
+dropped when full."""
+
 
 class RecursionLimitError(Exception):
     """Raised when $RecursionLimit is exceeded."""
@@ -73,7 +94,6 @@ class IterationLimitError(Exception):
 class EvalState:
     def __init__(self):
         self.recursion_depth = 0
-        self.iteration_count = 0
         self.recursion_limit = DEFAULT_RECURSION_LIMIT
         self.iteration_limit = DEFAULT_ITERATION_LIMIT
         self.trace_enabled = False
@@ -84,9 +104,37 @@ _eval_thread_local = threading.local()
 
 def _get_eval_state() -> EvalState:
     """Get or create thread-local EvalState."""
-    if not hasattr(_eval_thread_local, "state"):
-        _eval_thread_local.state = EvalState()
-    return _eval_thread_local.state
+    try:
+        return _eval_thread_local.state
+    except AttributeError:
+        state = _eval_thread_local.state = EvalState()
+        return state
+
+
+# Returned by _settled() for an expression that needs a node of its own
+_PENDING = object()
+
+# The value of a condition that lets its definition apply
+_TRUE = Symbol("True")
+
+
+class InContext:
+    """
+    Yielded by a built-in to have an expression evaluated in another context.
+
+    A built-in that evaluates expressions itself is written as a generator:
+    it yields each expression and is sent its value, which the evaluator
+    computes on its explicit stack like any subexpression. Yielding
+    InContext(expr, ctx) evaluates expr in ctx, and so everything expr
+    evaluates in turn; the built-in's own context is current again once
+    the value is sent back.
+    """
+
+    __slots__ = ("expr", "context")
+
+    def __init__(self, expr: Any, context: EvaluationContext) -> None:
+        self.expr = expr
+        self.context = context
 
 
 def evaluate(expr: Any, context: EvaluationContext | None = None) -> Any:
@@ -104,135 +152,271 @@ def evaluate(expr: Any, context: EvaluationContext | None = None) -> Any:
        d. Flatten Sequences
        e. Apply Flat (associativity)
        f. Apply Orderless (commutativity)
-       g. Apply Listable (threading)
+       g. Apply Listable (threading; bulk kernels on packed arrays)
        h. Try rules (UpValues, DownValues, SubValues, NValues, Built-in)
        i. If changed, re-evaluate (check iteration limit)
-       j. Return stable expression
+       j. Return stable expression, marked as evaluated
+
+    An expression marked as evaluated in the same context is returned as
+    it is, without walking it, until a definition or attribute changes.
+
+    Subexpressions are evaluated on an explicit stack (see _run()), not by
+    recursive calls, and a rewritten expression is re-evaluated in place,
+    so nesting is bounded by $RecursionLimit rather than the Python stack.
     """
     if context is None:
         context = get_current_context()
 
     # Step 1: Check recursion limit
     state = _get_eval_state()
-    is_top_level = state.recursion_depth == 0
-    state.recursion_depth += 1
-    if is_top_level:
-        state.iteration_count = 0
-    if state.recursion_depth > state.recursion_limit:
-        state.recursion_depth -= 1
+    depth = state.recursion_depth
+    if depth >= state.recursion_limit:
         raise RecursionLimitError(f"Recursion depth of {state.recursion_limit} exceeded")
 
-    try:
-        # Step 1: Dispatch by expression type
-        if is_atom(expr):
-            # Atoms evaluate to themselves
-            return expr
-
-        if is_symbol(expr):
-            # Apply OwnValues to symbols
-            return _evaluate_symbol(expr, context)
-
-        # Expression evaluation
-        if not is_expr(expr):
-            # Unknown type, return as-is
-            return expr
+    if depth == 0 and _temporaries_due():
+        # Collect temporaries between top-level evaluations only: the
+        # collector empties caches an evaluation in progress relies on
+        _collect_temporaries()
 
-        return _evaluate_expression(expr, context)
+    value = _settled(expr, context)
+    if value is not _PENDING:
+        return value
 
+    state.recursion_depth = depth + 1
+    try:
+        return _run(expr, context, state)
     finally:
-        _get_eval_state().recursion_depth -= 1
-
-
-def _evaluate_symbol(sym: Symbol, context: EvaluationContext) -> Any:
-    """Evaluate a symbol by applying its OwnValues."""
-    own_values = context.get_own_values(sym)
-
-    if not own_values:
-        return sym  # No definitions
-
-    # Try each OwnValue rule
-    for pattern_expr, replacement, condition in own_values:
-        result, success = _try_definition(pattern_expr, replacement, condition, sym, context)
-        if success:
-            return evaluate(result, context)  # Re-evaluate result
-
-    return sym
-
-
-def _evaluate_expression(expr: Expression, context: EvaluationContext) -> Any:
-    """Evaluate a compound expression."""
+        state.recursion_depth = depth
 
-    # Step 3a: Evaluate head (unless HoldAllComplete)
-    head = expr.head
-    effective_attrs = _resolve_attributes(expr, context)
-
-    # Check for HoldAllComplete on effective attributes
-    has_hold_all_complete = HoldAllComplete in effective_attrs
-
-    if not has_hold_all_complete:
-        # Evaluate head
-        if is_symbol(head):
-            # Check OwnValues for head
-            head = _evaluate_symbol(head, context)
-        elif is_expr(head):
-            head = evaluate(head, context)
-
-        # If head changed, create new expression
-        if head != expr.head:
-            expr = Expression(head, *expr.args, _attrs=expr.attributes)
-
-    # Step 3b: Resolve attributes (already done above)
-    # effective_attrs computed from head + expression attributes
-
-    # Step 3c: Evaluate arguments (respecting Hold attributes)
-    evaluated_args = _evaluate_arguments(expr, context, effective_attrs)
 
-    # Check if any argument changed
-    args_changed = tuple(evaluated_args) != expr.args
-
-    if args_changed:
-        expr = Expression(expr.head, *evaluated_args, _attrs=expr.attributes)
-
-    # Step 3d: Flatten Sequences (unless SequenceHold or HoldAllComplete)
-    has_sequence_hold = SequenceHold in effective_attrs
-
-    if not has_hold_all_complete and not has_sequence_hold:
-        expr = flatten_sequences(expr, hold_sequence=False)
-
-    # Step 3e: Apply structural attributes
-    has_flat = Flat in effective_attrs
-    has_orderless = Orderless in effective_attrs
+def _settled(expr: Any, context: EvaluationContext) -> Any:
+    """
+    The value of expr if it evaluates to itself without a node of its own:
+    an atom, a symbol without OwnValues, a packed array or an expression
+    marked as evaluated. _PENDING for anything else.
+    """
+    if is_atom(expr):
+        # Atoms evaluate to themselves
+        return expr
 
-    if has_flat:
-        expr = apply_flat(expr, is_flat=True)
+    if is_symbol(expr):
+        return _PENDING if context.get_own_values(expr) else expr
 
-    if has_orderless:
-        expr = apply_orderless(expr, is_orderless=True)
+    if not is_expr(expr) or type(expr) is PackedArray:
+        # Unknown types are returned as-is; packed arrays hold only numbers
+        # and are already evaluated
+        return expr
 
-    # Step 3f: Apply Listable attribute
-    has_listable = Listable in effective_attrs
+    if context.evaluated_marks().get(id(expr)) is expr:
+        # A fixed point, and no definition changed since
+        return expr
 
-    if has_listable:
-        threaded = apply_listable(expr, is_listable=True)
-        if threaded != expr:
-            # If threading occurred, evaluate the result and return
-            return evaluate(threaded, context)
+    return _PENDING
 
-    # Step 3h: Try rules in priority order
-    new_expr = _apply_rules(expr, context)
 
-    # Step 3i: Check if changed and re-evaluate
-    if new_expr != expr:
-        state = _get_eval_state()
-        state.iteration_count += 1
-        if state.iteration_count > state.iteration_limit:
-            raise IterationLimitError(f"Iteration limit of {state.iteration_limit} exceeded")
+def _run(expr: Any, context: EvaluationContext, state: EvalState) -> Any:
+    """
+    Evaluate expr on an explicit stack.
 
-        # Re-evaluate from top (Step 1)
-        return evaluate(new_expr, context)
+    Each node (see _evaluate_node()) is a generator that yields the
+    subexpressions it needs evaluated and is sent their values. A yielded
+    subexpression gets a node of its own on top of the stack, one level
+    deeper; its value resumes the node below. A yielded InContext switches
+    the context until its value is sent back.
 
-    # Step 3j: Return stable expression
-    return expr
+    If evaluation fails, the nodes still waiting for a value are closed,
+    innermost first, so the built-ins among them can clean up.
+    """
+    depth = state.recursion_depth
+    stack: list[Generator] = []
+    # For each InContext being evaluated: the stack size once its node
+    # has returned, and the context to go back to then
+    frames: list[tuple[int, EvaluationContext]] = []
+    node = _evaluate_node(expr, context, state)
+    value = None
+    try:
+        while True:
+            try:
+                expr = node.send(value)
+            except StopIteration as stop:
+                if not stack:
+                    return stop.value
+                value = stop.value
+                node = stack.pop()
+                if frames and frames[-1][0] == len(stack):
+                    context = frames.pop()[1]
+                depth -= 1
+                state.recursion_depth = depth
+                continue
+
+            depth += 1
+            if depth > state.recursion_limit:
+                raise RecursionLimitError(f"Recursion depth of {state.recursion_limit} exceeded")
+            state.recursion_depth = depth
+            stack.append(node)
+            if type(expr) is InContext:
+                frames.append((len(stack) - 1, context))
+                context = expr.context
+                expr = expr.expr
+            node = _evaluate_node(expr, context, state)
+            value = None
+    except BaseException:
+        node.close()
+        while stack:
+            stack.pop().close()
+        raise
+
+
+def _evaluate_node(expr: Any, context: EvaluationContext, state: EvalState) -> Generator:
+    """
+    Evaluate one node: yield each subexpression that needs evaluating and
+    return the value. A rewritten expression is evaluated in place, and
+    $IterationLimit bounds the rewrites of one such chain.
+    """
+    iterations = 0
+    while True:
+        # Step 1: Dispatch by expression type
+        if is_symbol(expr):
+            # Apply OwnValues to symbols, then evaluate the result one level down
+            rewrite = _apply_own_values(expr, context)
+            if type(rewrite) is GeneratorType:
+                rewrite = yield from rewrite
+            result, success = rewrite
+            if not success:
+                return expr
+            value = _settled(result, context)
+            if value is _PENDING:
+                value = yield result
+            return value
+
+        value = _settled(expr, context)
+        if value is not _PENDING:
+            return value
+
+        version = EvaluationContext.definitions_version
+
+        # Step 3a: Evaluate head (unless HoldAllComplete)
+        head = expr.head
+        effective_attrs = _resolve_attributes(expr, context)
+
+        # Check for HoldAllComplete on effective attributes
+        has_hold_all_complete = HoldAllComplete in effective_attrs
+
+        if not has_hold_all_complete:
+            if is_symbol(head):
+                # Check OwnValues for head
+                rewrite = _apply_own_values(head, context)
+                if type(rewrite) is GeneratorType:
+                    rewrite = yield from rewrite
+                result, success = rewrite
+                if success:
+                    head = _settled(result, context)
+                    if head is _PENDING:
+                        head = yield result
+            elif is_expr(head):
+                value = _settled(head, context)
+                head = (yield head) if value is _PENDING else value
+
+            # If head changed, create new expression
+            if head != expr.head:
+                expr = Expression(head, *expr.args, _attrs=expr.attributes)
+
+        # Step 3b: Resolve attributes (already done above)
+        # effective_attrs computed from head + expression attributes
+
+        # Step 3c: Evaluate arguments (respecting Hold attributes)
+        args = expr.args
+        start, stop = _evaluated_span(args, effective_attrs)
+        if start < stop:
+            evaluated_args = list(args)
+            changed = False
+            for i in range(start, stop):
+                arg = args[i]
+                if isinstance(arg, Expression):
+                    value = _settled(arg, context)
+                    if value is _PENDING:
+                        value = yield arg
+                elif isinstance(arg, Symbol) and context.get_own_values(arg):
+                    value = yield arg
+                else:
+                    # Atoms and symbols without OwnValues evaluate to themselves
+                    continue
+                if value is not arg:
+                    evaluated_args[i] = value
+                    changed = True
+
+            # Check if any argument changed
+            if changed:
+                evaluated_args = tuple(evaluated_args)
+                if evaluated_args != args:
+                    expr = Expression._from_parts(expr.head, evaluated_args, expr.attributes)
+
+        # Step 3d: Flatten Sequences (unless SequenceHold or HoldAllComplete)
+        has_sequence_hold = SequenceHold in effective_attrs
+
+        if not has_hold_all_complete and not has_sequence_hold:
+            expr = flatten_sequences(expr, hold_sequence=False)
+
+        # Step 3e: Apply structural attributes
+        has_flat = Flat in effective_attrs
+        has_orderless = Orderless in effective_attrs
+
+        if has_flat:
+            expr = apply_flat(expr, is_flat=True)
+
+        if has_orderless:
+            expr = apply_orderless(expr, is_orderless=True)
+
+        # Step 3f: Apply Listable attribute
+        has_listable = Listable in effective_attrs
+
+        if has_listable:
+            # Listable numeric functions over packed arrays run in bulk,
+            # unless definitions of the head could apply to the elements
+            if (
+                is_symbol(expr.head)
+                and any(type(a) is PackedArray for a in expr.args)
+                and not context.get_down_values(expr.head)
+            ):
+                kernel = _get_packed_kernel()(expr.head)
+                if kernel is not None:
+                    result = kernel(expr.args)
+                    if result is not None:
+                        return result
+            threaded = apply_listable(expr, is_listable=True)
+            if threaded != expr:
+                # If threading occurred, evaluate the result in place
+                expr = threaded
+                continue
+
+        # Step 3h: Try rules in priority order
+        new_expr = _apply_rules(expr, context)
+        if type(new_expr) is GeneratorType:
+            # A built-in that evaluates expressions yields them (see InContext)
+            new_expr = yield from new_expr
+
+        # Step 3i: Check if changed and re-evaluate in place
+        if new_expr != expr:
+            iterations += 1
+            if iterations > state.iteration_limit:
+                raise IterationLimitError(f"Iteration limit of {state.iteration_limit} exceeded")
+            expr = new_expr
+            continue
+
+        # Step 3j: Return stable expression, marked as evaluated unless its
+        # evaluation changed a definition
+        if EvaluationContext.definitions_version == version:
+            marks = context.evaluated_marks()
+            if len(marks) >= MAX_EVALUATED_MARKS:
+                marks.clear()
+            marks[id(expr)] = expr
+        return expr
+
+
+def clear_evaluated_marks() -> None:
+    """Forget which expressions were evaluated (they are evaluated in full again)."""
+    for context in list(_contexts):
+        context.evaluated_marks().clear()
 
 
 def _resolve_attributes(expr: Expression, context: EvaluationContext) -> frozenset[Symbol]:
@@ -243,60 +427,45 @@ def _resolve_attributes(expr: Expression, context: EvaluationContext) -> frozens
     - Head symbol's attributes from the context (user-defined)
     - Built-in function's registered attributes
     - Expression's own attributes (take precedence)
+
+    The first two are resolved once per head and context, and kept in the
+    context's attribute_cache() until attributes change.
     """
-    head_attrs = frozenset()
-    if is_symbol(expr.head):
-        head_attrs = context.get_attributes(expr.head)
+    head = expr.head
+    if not is_symbol(head):
+        return expr.attributes
 
-    # Also check built-in registered attributes
-    builtin_attributes = _get_builtin_attributes()
-    builtin_attrs = builtin_attributes(expr.head) if is_symbol(expr.head) else frozenset()
+    cache = context.attribute_cache()
+    head_attrs = cache.get(head)
+    if head_attrs is None:
+        # Combine: head_ctx_attrs ∪ builtin_attrs
+        builtin_attributes = _get_builtin_attributes()
+        head_attrs = cache[head] = context.get_attributes(head) | builtin_attributes(head)
 
-    # Combine: head_ctx_attrs ∪ builtin_attrs ∪ expr_attrs
     # expr_attrs take precedence
-    return head_attrs | builtin_attrs | expr.attributes
+    if expr.attributes:
+        return head_attrs | expr.attributes
+    return head_attrs
 
 
-def _evaluate_arguments(
-    expr: Expression,
-    context: EvaluationContext,
-    effective_attrs: frozenset[Symbol],
-) -> list[Any]:
+def _evaluated_span(args: tuple, effective_attrs: frozenset[Symbol]) -> tuple[int, int]:
     """
-    Step 3c: Evaluate arguments respecting Hold attributes.
-
-    Hold attributes control which arguments are evaluated:
+    Step 3c: The arguments to evaluate, as a range, by Hold attributes:
     - HoldAllComplete or HoldAll: none evaluated
     - HoldFirst: first held, rest evaluated
     - HoldRest: first evaluated, rest held
     - Default (no Hold): all evaluated
     """
-    has_hold_all_complete = HoldAllComplete in effective_attrs
-    has_hold_all = HoldAll in effective_attrs
-    has_hold_first = HoldFirst in effective_attrs
-    has_hold_rest = HoldRest in effective_attrs
-
-    if has_hold_all_complete or has_hold_all:
-        # Hold all arguments
-        return list(expr.args)
-    elif has_hold_first:
-        # Hold first, evaluate rest
-        evaluated_args = [expr.args[0]] if expr.args else []
-        evaluated_args.extend(evaluate(arg, context) for arg in expr.args[1:])
-        return evaluated_args
-    elif has_hold_rest:
-        # Evaluate first, hold rest
-        if expr.args:
-            evaluated_args = [evaluate(expr.args[0], context)]
-            evaluated_args.extend(expr.args[1:])
-            return evaluated_args
-        return []
-    else:
-        # Evaluate all arguments
-        return [evaluate(arg, context) for arg in expr.args]
-
-
-def _apply_rules(expr: Expression, context: EvaluationContext) -> Any:
+    if HoldAllComplete in effective_attrs or HoldAll in effective_attrs:
+        return 0, 0
+    if HoldFirst in effective_attrs:
+        return 1, len(args)
+    if HoldRest in effective_attrs:
+        return 0, min(len(args), 1)
+    return 0, len(args)
+
+
+def _apply_rules(expr: Expression, context: EvaluationContext, start: int = 0) -> Any:
     """
     Step 3h: Apply rules in priority order:
     a. UpValues - check arguments left-to-right; first wins
@@ -304,39 +473,56 @@ def _apply_rules(expr: Expression, context: EvaluationContext) -> Any:
     c. SubValues - if head is Expression[sym, ...], check sym
     d. NValues - for numeric approximation (N[...])
     e. Built-in - native implementation of head
+
+    A definition with a condition makes the result a generator that
+    yields the condition to the evaluator (see _rules_after); start is the
+    step to resume from, step i < len(expr.args) being the UpValues of
+    argument i.
     """
+    args = expr.args
 
     # a. UpValues: check arguments left-to-right
-    for arg in expr.args:
+    for i in range(start, len(args)):
+        arg = args[i]
         if is_symbol(arg):
-            up_values = context.get_up_values(arg)
-            if up_values:
-                result = _try_value_rules(up_values, expr, context)
-                if result != expr:
-                    return result
+            owner = arg
         elif is_expr(arg) and is_symbol(arg.head):
-            up_values = context.get_up_values(arg.head)
-            if up_values:
-                result = _try_value_rules(up_values, expr, context)
-                if result != expr:
-                    return result
+            owner = arg.head
+        else:
+            continue
+        up_values = context.get_up_values(owner)
+        if up_values:
+            rewrite = _try_value_rules(up_values, expr, context, owner, "UpValues")
+            if type(rewrite) is GeneratorType:
+                return _rules_after(rewrite, expr, context, i + 1)
+            result, success = rewrite
+            if success and result != expr:
+                return result
+
+    step = len(args)
 
     # b. DownValues: check head's definitions
-    if is_symbol(expr.head):
-        down_values = context.get_down_values(expr.head)
+    if start <= step and is_symbol(expr.head):
+        down_values = context.get_down_value_candidates(expr.head, expr)
         if down_values:
-            result = _try_value_rules(down_values, expr, context)
-            if result != expr:
+            rewrite = _try_value_rules(down_values, expr, context, expr.head, "DownValues")
+            if type(rewrite) is GeneratorType:
+                return _rules_after(rewrite, expr, context, step + 1)
+            result, success = rewrite
+            if success and result != expr:
                 return result
 
     # c. SubValues: for f[a][b] patterns
-    if is_expr(expr.head):
+    if start <= step + 1 and is_expr(expr.head):
         sub_sym = expr.head.head if is_symbol(expr.head.head) else None
         if sub_sym is not None:
-            sub_values = context.get_sub_values(sub_sym)
+            sub_values = context.get_sub_value_candidates(sub_sym, expr)
             if sub_values:
-                result = _try_value_rules(sub_values, expr, context)
-                if result != expr:
+                rewrite = _try_value_rules(sub_values, expr, context, sub_sym, "SubValues")
+                if type(rewrite) is GeneratorType:
+                    return _rules_after(rewrite, expr, context, step + 2)
+                result, success = rewrite
+                if success and result != expr:
                     return result
 
     # d. NValues: for N[expr] numeric approximation
@@ -349,42 +535,135 @@ def _apply_rules(expr: Expression, context: EvaluationContext) -> Any:
     return result
 
 
-def _try_value_rules(rules_list: list, expr: Expression, context: EvaluationContext) -> Any:
-    """Try a list of value entries (pattern, replacement, condition) against expr."""
-    for pattern_expr, replacement, condition in rules_list:
-        result, success = _try_definition(pattern_expr, replacement, condition, expr, context)
-        if success:
-            return result
-    return expr
+def _rules_after(
+    rewrite: Generator, expr: Expression, context: EvaluationContext, start: int
+) -> Generator:
+    """
+    Finish a step of _apply_rules whose definitions have conditions, and
+    go on from step start if none of them applied.
+    """
+    result, success = yield from rewrite
+    if success and result != expr:
+        return result
+    result = _apply_rules(expr, context, start)
+    if type(result) is GeneratorType:
+        result = yield from result
+    return result
 
 
-def _try_definition(
-    pattern_expr: Any,
-    replacement: Any,
-    condition: Any | None,
+def _apply_own_values(sym: Symbol, context: EvaluationContext) -> Any:
+    """Rewrite a symbol by its OwnValues, like _try_value_rules."""
+    own_values = context.get_own_values(sym)
+    if not own_values:
+        return sym, False
+    return _try_value_rules(own_values, sym, context, sym, "OwnValues")
+
+
+def _try_value_rules(
+    rules_list: list,
     expr: Any,
     context: EvaluationContext,
-) -> tuple[Any, bool]:
-    """Try a single definition against an expression."""
-    # Match pattern
-    match_result = match(pattern_expr, expr)
+    owner: Symbol,
+    kind: str,
+) -> Any:
+    """
+    Try a list of value entries (pattern, replacement, condition) against
+    expr: (result, success), where result is expr if no entry applies.
 
-    if not match_result:
-        return expr, False
+    The condition of a matching entry is evaluated on the evaluator's
+    explicit stack: from the first such entry on, the result is a
+    generator that yields the condition and returns (result, success).
 
-    # Check condition if present
-    if condition is not None:
-        cond_substituted = replace_with_bindings(condition, match_result.bindings)
-        cond_result = evaluate(cond_substituted, context)
+    owner and kind (e.g. "DownValues") name the rules for the profiler;
+    the rules are only timed while profiling is enabled.
+    """
+    if profile.profiler is not None:
+        return _try_value_rules_profiled(rules_list, expr, context, owner, kind)
+    for index, (pattern_expr, replacement, condition) in enumerate(rules_list):
+        bindings = _match_definition(pattern_expr, expr)
+        if bindings is None:
+            continue
+        if condition is not None:
+            return _try_conditions(rules_list, index, bindings, expr)
+        return replace_with_bindings(replacement, bindings), True
+    return expr, False
+
+
+def _try_conditions(rules_list: list, index: int, bindings: Any, expr: Any) -> Generator:
+    """
+    Go on with _try_value_rules from entry index, which matched with
+    bindings: yield the condition of each matching entry that has one,
+    and return (result, success).
+    """
+    for pattern_expr, replacement, condition in islice(rules_list, index, None):
+        if bindings is None:
+            bindings = _match_definition(pattern_expr, expr)
+            if bindings is None:
+                continue
+        if condition is None:
+            return replace_with_bindings(replacement, bindings), True
+        cond_result = yield replace_with_bindings(condition, bindings)
+        if cond_result is True or cond_result == _TRUE:
+            return replace_with_bindings(replacement, bindings), True
+        bindings = None
+    return expr, False
+
+
+def _match_definition(pattern_expr: Any, expr: Any) -> Any:
+    """
+    Match a definition's pattern against an expression: the bindings, or
+    None if it does not match.
 
-        # Must be True to proceed
-        if cond_result is not True and cond_result != Symbol("True"):
-            return expr, False
+    A literal pattern equal to the expression (a memoized value like
+    f[5] = 120, or a symbol's OwnValue) matches without being compiled,
+    so these one-off patterns stay out of the compilation cache; every
+    other pattern is compiled once per definition.
+    """
+    if pattern_expr == expr and _is_literal(pattern_expr):
+        return empty_bindings()
+    match_result = compile_pattern(pattern_expr).match(expr)
+    if not match_result:
+        return None
+    return match_result.bindings
 
-    # Apply replacement
-    result = replace_with_bindings(replacement, match_result.bindings)
 
-    return result, True
+def _try_value_rules_profiled(
+    rules_list: list,
+    expr: Any,
+    context: EvaluationContext,
+    owner: Symbol,
+    kind: str,
+) -> Generator:
+    """
+    Try value entries like _try_value_rules, recording each definition's
+    counters and times: a generator that yields the conditions and returns
+    (result, success).
+    """
+    profiler, clock = profile.profiler, profile.clock
+    for pattern_expr, replacement, condition in rules_list:
+        record = profiler.profile(owner, kind, pattern_expr)
+        record.attempts += 1
+        start = clock()
+        bindings = _match_definition(pattern_expr, expr)
+        record.match_time += clock() - start
+        if bindings is None:
+            continue
+        record.matches += 1
+
+        if condition is not None:
+            start = clock()
+            cond_result = yield replace_with_bindings(condition, bindings)
+            record.condition_time += clock() - start
+            if cond_result is not True and cond_result != _TRUE:
+                record.condition_failures += 1
+                continue
+
+        start = clock()
+        result = replace_with_bindings(replacement, bindings)
+        record.substitution_time += clock() - start
+        record.fires += 1
+        return result, True
+    return expr, False
 
 
 def _try_builtin(expr: Expression, context: EvaluationContext) -> Any:
@@ -0,0 +1,251 @@
+"""
+Rule-level match profiling.
+
+With profiling enabled, every definition the evaluator tries (OwnValues,
+DownValues, UpValues, SubValues) and every Rule applied with apply_rule()
+gets a RuleProfile counting
+
+    attempts            times its left-hand side was matched
+    matches             times the left-hand side matched
+    condition_failures  matches rejected by the definition's condition
+    fires               times it rewrote the expression
+
+and the cumulative time spent matching, checking conditions and
+substituting into the right-hand side. Times are inclusive: a condition
+that evaluates other definitions counts their time as well.
+
+Profiling is off by default. The evaluator then checks one module
+attribute per definition list it tries, and records nothing.
+
+Definitions the dispatch index rules out for an expression are never
+tried, so they count no attempt.
+
+Usage:
+    from minimatic.eval.profile import profiling
+
+    with profiling() as profiler:
+        evaluate(expr, ctx)
+    print(profiler.format_table())      # every rule, slowest first
+    profiler.rules(f)                   # the RuleProfiles of f
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from minimatic.core import Symbol
+from minimatic.core.printer import INPUT_FORM, format_expression
+from minimatic.pattern import compile_pattern
+
+COLUMNS = (
+    "symbol",
+    "kind",
+    "lhs",
+    "attempts",
+    "matches",
+    "condition_failures",
+    "fires",
+    "match_time",
+    "condition_time",
+    "substitution_time",
+)
+"""Column names of RuleProfiler.table()."""
+
+# Characters of a left-hand side shown by format_table()
+_LHS_WIDTH = 40
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RULE PROFILE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class RuleProfile:
+    """
+    Counters and cumulative times of one rule.
+
+    Attributes:
+        owner: The symbol the rule is stored under (for a Rule, see
+            rule_owner()), or None.
+        kind: "OwnValues", "DownValues", "UpValues", "SubValues" or "Rule".
+        lhs: The left-hand side pattern.
+        attempts, matches, condition_failures, fires: See the module
+            docstring.
+        match_time, condition_time, substitution_time: Seconds spent
+            matching the left-hand side, evaluating the condition and
+            building the right-hand side (for an immediate Rule, this
+            includes evaluating it).
+    """
+
+    __slots__ = (
+        "owner",
+        "kind",
+        "lhs",
+        "attempts",
+        "matches",
+        "condition_failures",
+        "fires",
+        "match_time",
+        "condition_time",
+        "substitution_time",
+    )
+
+    def __init__(self, owner: Symbol | None, kind: str, lhs: Any) -> None:
+        self.owner = owner
+        self.kind = kind
+        self.lhs = lhs
+        self.attempts = 0
+        self.matches = 0
+        self.condition_failures = 0
+        self.fires = 0
+        self.match_time = 0.0
+        self.condition_time = 0.0
+        self.substitution_time = 0.0
+
+    @property
+    def total_time(self) -> float:
+        """Seconds spent on the rule in all."""
+        return self.match_time + self.condition_time + self.substitution_time
+
+    def row(self) -> tuple:
+        """The profile as a tuple of COLUMNS."""
+        return (
+            self.owner,
+            self.kind,
+            self.lhs,
+            self.attempts,
+            self.matches,
+            self.condition_failures,
+            self.fires,
+            self.match_time,
+            self.condition_time,
+            self.substitution_time,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"RuleProfile({self.kind} {_format_lhs(self.lhs)}: "
+            f"{self.fires}/{self.attempts} fired, {self.total_time * 1e3:.3f} ms)"
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROFILER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class RuleProfiler:
+    """
+    The RuleProfiles recorded while profiling is enabled.
+
+    Profiles are keyed by the identity of the rule's left-hand side, which
+    definitions and rules keep for their whole lifetime; each profile holds
+    on to its left-hand side, so a key always belongs to the object it was
+    made for.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: dict[int, RuleProfile] = {}
+
+    def profile(self, owner: Symbol | None, kind: str, lhs: Any) -> RuleProfile:
+        """The profile of a rule, created on first use."""
+        profile = self._profiles.get(id(lhs))
+        if profile is None or profile.lhs is not lhs:
+            profile = self._profiles[id(lhs)] = RuleProfile(owner, kind, lhs)
+        return profile
+
+    def rules(self, symbol: Symbol | None = None) -> list[RuleProfile]:
+        """The profiles of every rule, or of the rules of one symbol,
+        most expensive first."""
+        profiles = [
+            profile
+            for profile in self._profiles.values()
+            if symbol is None or profile.owner == symbol
+        ]
+        profiles.sort(key=lambda profile: profile.total_time, reverse=True)
+        return profiles
+
+    def table(self, symbol: Symbol | None = None) -> list[tuple]:
+        """The rows of rules() as tuples of COLUMNS, for export (e.g. csv)."""
+        return [profile.row() for profile in self.rules(symbol)]
+
+    def format_table(self, symbol: Symbol | None = None) -> str:
+        """rules() as a text table, times in milliseconds."""
+        header = (
+            f"{'symbol':<12} {'kind':<10} {'lhs':<{_LHS_WIDTH}} {'tried':>8} "
+            f"{'matched':>8} {'cond x':>7} {'fired':>8} {'match ms':>9} "
+            f"{'cond ms':>9} {'subst ms':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for profile in self.rules(symbol):
+            owner = "" if profile.owner is None else str(profile.owner)
+            lhs = _format_lhs(profile.lhs)
+            lines.append(
+                f"{owner:<12} {profile.kind:<10} {lhs:<{_LHS_WIDTH}} "
+                f"{profile.attempts:>8} {profile.matches:>8} "
+                f"{profile.condition_failures:>7} {profile.fires:>8} "
+                f"{profile.match_time * 1e3:>9.3f} {profile.condition_time * 1e3:>9.3f} "
+                f"{profile.substitution_time * 1e3:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Drop every profile."""
+        self._profiles.clear()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENABLING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+profiler: RuleProfiler | None = None
+"""The profiler recording rule attempts, or None when profiling is off."""
+
+
+def enable_profiling(target: RuleProfiler | None = None) -> RuleProfiler:
+    """Start recording into target (a new profiler if None) and return it."""
+    global profiler
+    profiler = RuleProfiler() if target is None else target
+    return profiler
+
+
+def disable_profiling() -> RuleProfiler | None:
+    """Stop recording; return the profiler that was recording, if any."""
+    global profiler
+    previous, profiler = profiler, None
+    return previous
+
+
+@contextmanager
+def profiling(target: RuleProfiler | None = None) -> Iterator[RuleProfiler]:
+    """Record rule attempts within a with block (restoring the previous profiler)."""
+    global profiler
+    previous = profiler
+    current = enable_profiling(target)
+    try:
+        yield current
+    finally:
+        profiler = previous
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RECORDING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+clock = time.perf_counter
+
+
+def rule_owner(lhs: Any) -> Symbol | None:
+    """The symbol a Rule with this left-hand side is listed under: the head
+    every expression it matches has, if that is a symbol."""
+    head = compile_pattern(lhs).head
+    return head if isinstance(head, Symbol) else None
+
+
+def _format_lhs(lhs: Any) -> str:
+    """A left-hand side as format_table() shows it."""
+    return format_expression(lhs, INPUT_FORM, max_chars=_LHS_WIDTH)
@@ -10,10 +10,12 @@ from enum import Enum, auto
 from typing import Any
 
 from minimatic.pattern import (
-    match,
+    compile_pattern,
     replace_with_bindings,
 )
 
+from . import profile
+
 
 class RuleType(Enum):
     """Types of rules."""
@@ -93,8 +95,11 @@ def apply_rule(rule: Rule, expr: Any, context: Any = None) -> tuple[Any, bool]:
         (result, success): result is the transformed expression or original,
                           success indicates if rule matched
     """
-    # Try to match lhs against expression
-    match_result = match(rule.lhs, expr)
+    if profile.profiler is not None:
+        return _apply_rule_profiled(rule, expr, context)
+
+    # Try to match lhs against expression (compiled once per pattern)
+    match_result = compile_pattern(rule.lhs).match(expr)
 
     if not match_result:
         return expr, False
@@ -131,6 +136,41 @@ def apply_rule(rule: Rule, expr: Any, context: Any = None) -> tuple[Any, bool]:
     return result, True
 
 
+def _apply_rule_profiled(rule: Rule, expr: Any, context: Any) -> tuple[Any, bool]:
+    """apply_rule recording the rule's counters and times."""
+    from .evaluator import evaluate  # Avoid circular import
+
+    clock = profile.clock
+    record = profile.profiler.profile(profile.rule_owner(rule.lhs), "Rule", rule.lhs)
+    record.attempts += 1
+    start = clock()
+    match_result = compile_pattern(rule.lhs).match(expr)
+    record.match_time += clock() - start
+    if not match_result:
+        return expr, False
+    record.matches += 1
+
+    if rule.condition is not None:
+        start = clock()
+        cond_expr = replace_with_bindings(rule.condition, match_result.bindings)
+        cond_result = evaluate(cond_expr, context)
+        record.condition_time += clock() - start
+        if not cond_result:
+            record.condition_failures += 1
+            return expr, False
+
+    start = clock()
+    if callable(rule.rhs):
+        result = rule.rhs(match_result.bindings)
+    else:
+        result = replace_with_bindings(rule.rhs, match_result.bindings)
+        if rule.is_immediate():
+            result = evaluate(result, context)
+    record.substitution_time += clock() - start
+    record.fires += 1
+    return result, True
+
+
 def try_rules(rules: list[Rule], expr: Any, context: Any = None) -> Any:
     """
     Try to apply rules in order until one succeeds.
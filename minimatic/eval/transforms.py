@@ -7,7 +7,8 @@ Orderless sorting, and Listable threading.
 
 from typing import Any
 
-from minimatic.core import Expression, Symbol, head_of, is_expr
+from minimatic.core import Expression, Symbol, depth_of, head_of, is_expr, leaf_count_of
+from minimatic.core.walk import preorder
 
 
 def flatten_sequences(expr: Expression, hold_sequence: bool = False) -> Expression:
@@ -42,7 +43,7 @@ def flatten_sequences(expr: Expression, hold_sequence: bool = False) -> Expressi
             new_args.append(arg)
 
     if changed:
-        return Expression(expr.head, *new_args, _attrs=expr.attributes)
+        return Expression._from_parts(expr.head, tuple(new_args), expr.attributes)
     return expr
 
 
@@ -64,29 +65,16 @@ def apply_flat(expr: Expression, is_flat: bool = True) -> Expression:
 
     head = expr.head
 
-    # Check if any argument has the same head
-    needs_flatten = False
-    flat_count = 0
-
-    for arg in expr.args:
-        if is_expr(arg) and arg.head == head:
-            needs_flatten = True
-            flat_count += 1
+    def same_head(elem: Any) -> bool:
+        return is_expr(elem) and elem.head == head
 
-    if not needs_flatten:
+    # Check if any argument has the same head
+    if not any(same_head(arg) for arg in expr.args):
         return expr
 
-    # Flatten nested expressions
-    new_args = []
-    for arg in expr.args:
-        if is_expr(arg) and arg.head == head:
-            # Recursively flatten nested
-            flattened = apply_flat(arg, True)
-            new_args.extend(flattened.args)
-        else:
-            new_args.append(arg)
-
-    return Expression(head, *new_args, _attrs=expr.attributes)
+    # Splice nested same-head expressions at any depth, in order
+    new_args = [arg for arg in preorder(expr, enter=same_head) if not same_head(arg)]
+    return Expression._from_parts(head, tuple(new_args), expr.attributes)
 
 
 def apply_orderless(expr: Expression, is_orderless: bool = True) -> Expression:
@@ -108,8 +96,8 @@ def apply_orderless(expr: Expression, is_orderless: bool = True) -> Expression:
     sorted_args = canonical_sort(expr.args)
 
     # Only create new expression if order changed
-    if tuple(sorted_args) != expr.args:
-        return Expression(expr.head, *sorted_args, _attrs=expr.attributes)
+    if sorted_args != expr.args:
+        return Expression._from_parts(expr.head, sorted_args, expr.attributes)
     return expr
 
 
@@ -117,49 +105,90 @@ def canonical_sort(elements: tuple[Any, ...]) -> tuple[Any, ...]:
     """
     Sort elements into canonical order for Orderless matching.
 
-    Ordering priority:
-    1. Atoms (numbers < strings < symbols < other)
-    2. Complexity (depth, leaf count)
-    3. Alphabetically by string representation
+    Ordering (see canonical_key):
+    1. Numbers, by value
+    2. Strings
+    3. Symbols, by name
+    4. Expressions, head first, then argument by argument
+    5. Other atoms (e.g. None), by type name
+
+    The key of each element is built once, in a single pass over its
+    tree, and then compared natively by the sort.
     """
+    return tuple(sorted(elements, key=canonical_key))
 
-    def sort_key(elem):
-        # Priority 1: Type
-        if isinstance(elem, (int, float, complex)):
-            type_order = 0
-            # For numbers, use numeric value
-            return (type_order, 0, 0, str(elem), elem)
-        elif isinstance(elem, str):
-            return (1, 0, 0, elem, 0)
-        elif isinstance(elem, Symbol):
-            return (2, 0, 0, elem.name, 0)
-        elif is_expr(elem):
-            # Expressions: sort by depth and complexity
-            depth = _get_depth(elem)
-            leaves = _leaf_count(elem)
-            return (3, depth, leaves, str(elem), 0)
-        else:
-            return (4, 0, 0, str(elem), 0)
 
-    return tuple(sorted(elements, key=sort_key))
+# Tie-break between numbers of equal value (1 < 1.0 < True)
+_NUMBER_RANKS = {int: 0, float: 1, complex: 2, bool: 3}
+
+# Closes an expression in a key; sorts before every element tag, so an
+# argument list that is a prefix of another orders first
+_END = -1
+
+
+def canonical_key(elem: Any) -> tuple:
+    """
+    Canonical ordering key of an element.
+
+    The key is a flat tuple: the preorder walk of the element's tree, with
+    each node written as a category tag followed by its value, and each
+    expression closed by an end tag. Two keys first differ at a tag or at
+    values of the same kind, so comparing them never formats anything as a
+    string and never compares a number with a name.
+
+    Examples:
+        >>> canonical_key(2) < canonical_key(10) < canonical_key(Symbol("a"))
+        True
+    """
+    out: list[Any] = []
+    _write_key(elem, out)
+    return tuple(out)
+
+
+def _write_key(elem: Any, out: list[Any]) -> None:
+    """Append the key of elem to out (see canonical_key)."""
+    elem_type = type(elem)
+    if elem_type is int:
+        out += (0, elem, 0, 0)
+    elif elem_type is Symbol:
+        out += (2, elem.name)
+    elif isinstance(elem, Expression):
+        out.append(3)
+        _write_key(elem.head, out)
+        for arg in elem.args:
+            # Atoms inline; only subexpressions recurse
+            arg_type = type(arg)
+            if arg_type is int:
+                out += (0, arg, 0, 0)
+            elif arg_type is Symbol:
+                out += (2, arg.name)
+            else:
+                _write_key(arg, out)
+        out.append(_END)
+    elif elem_type in _NUMBER_RANKS:
+        if elem_type is complex:
+            out += (0, elem.real, elem.imag, 2)
+        else:
+            out += (0, elem, 0, _NUMBER_RANKS[elem_type])
+    elif isinstance(elem, str):
+        out += (1, elem)
+    elif isinstance(elem, Symbol):
+        out += (2, elem.name)
+    elif isinstance(elem, (int, float, complex)):
+        # Subclasses of the numeric types
+        out += (0, elem.real, elem.imag, 4)
+    else:
+        out += (4, elem_type.__name__)
 
 
 def _get_depth(expr: Any) -> int:
-    """Get the depth of an expression."""
-    if is_expr(expr):
-        if not expr.args:
-            return 1
-        return 1 + max(_get_depth(arg) for arg in expr.args)
-    return 0
+    """Get the depth of an expression (read from the cached node metadata)."""
+    return depth_of(expr)
 
 
 def _leaf_count(expr: Any) -> int:
-    """Count the leaves of an expression."""
-    if is_expr(expr):
-        if not expr.args:
-            return 1
-        return sum(_leaf_count(arg) for arg in expr.args)
-    return 1
+    """Count the leaves of an expression (read from the cached node metadata)."""
+    return leaf_count_of(expr)
 
 
 def apply_listable(expr: Expression, is_listable: bool = True) -> Expression:
@@ -206,6 +235,6 @@ def apply_listable(expr: Expression, is_listable: bool = True) -> Expression:
         new_args = list(expr.args)
         for list_pos in list_positions:
             new_args[list_pos] = expr.args[list_pos].args[elem_idx]
-        results.append(Expression(expr.head, *new_args, _attrs=expr.attributes))
+        results.append(Expression._from_parts(expr.head, tuple(new_args), expr.attributes))
 
-    return Expression(List, *results)
+    return Expression._from_parts(List, tuple(results))
@@ -5,6 +5,9 @@ This module provides Wolfram Language-style pattern matching:
     - Blanks: Wildcard patterns (_, __, ___)
     - Structural: Named patterns, conditions, alternatives
     - Matcher: The pattern matching engine
+    - Compiler: Patterns compiled once into reusable matchers
+    - Commutative: Orderless argument matching without permutation search
+    - Search: Matching subexpressions by level, skipping subtrees that cannot match
     - Bindings: Match result management
 
 Pattern Syntax (conceptual):
@@ -45,9 +48,17 @@ from .blanks import (
     is_blank_sequence,
     is_sequence_blank,
 )
+from .commutative import match_commutative
+from .compiler import (
+    CompiledPattern,
+    clear_compiled_patterns,
+    compile_pattern,
+    compiled_pattern_count,
+)
 from .matcher import (
     NO_MATCH,
     MatchResult,
+    clear_template_plans,
     count_matches,
     find_all_matches,
     find_matches,
@@ -55,7 +66,9 @@ from .matcher import (
     match_sequence,
     matches,
     replace_with_bindings,
+    template_plan_count,
 )
+from .search import ALL_LEVELS, INFINITY, search
 from .structural import (
     Alternatives,
     Condition,
@@ -168,7 +181,20 @@ __all__ = [
     "MatchResult",
     "NO_MATCH",
     "replace_with_bindings",
+    "template_plan_count",
+    "clear_template_plans",
     "find_matches",
     "find_all_matches",
     "count_matches",
+    # Compiler
+    "compile_pattern",
+    "CompiledPattern",
+    "compiled_pattern_count",
+    "clear_compiled_patterns",
+    # Commutative
+    "match_commutative",
+    # Search
+    "search",
+    "ALL_LEVELS",
+    "INFINITY",
 ]
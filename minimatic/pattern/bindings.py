@@ -5,8 +5,11 @@ This module provides the Bindings class for managing pattern match results.
 Bindings map pattern variable names (Symbols) to matched values.
 
 Key Properties:
-    - Immutable: Backed by frozenset, all operations return new Bindings
-    - Hashable: Can be used in sets or as dict keys
+    - Immutable: Backed by a persistent hash map (PMap); bind() shares
+      structure with the original, so binding k names costs O(k log k)
+      rather than O(k^2)
+    - Hashable: Can be used in sets or as dict keys (hash computed on
+      first use)
     - Conflict Detection: Detects when same name matches different values
 
 Usage:
@@ -26,7 +29,7 @@ Usage:
 """
 
 # from __future__ import annotations
-from collections.abc import Iterator, Mapping
+from collections.abc import Mapping
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -35,14 +38,18 @@ from typing import (
 if TYPE_CHECKING:
     from minimatic.core.atoms import Element
 
+from minimatic.core.pmap import PMap
 from minimatic.core.symbol import Symbol
 
+# Marker for a name with no binding (None is a valid bound value)
+_UNBOUND = object()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # BINDINGS CLASS
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-class Bindings(Mapping[Symbol, "Element"]):
+class Bindings(PMap):
     """
     Immutable mapping from pattern variable names to matched values.
 
@@ -50,9 +57,10 @@ class Bindings(Mapping[Symbol, "Element"]):
     map Symbol names (from Pattern[name, _] constructs) to the actual
     expressions that matched.
 
-    Backed by a frozenset of (key, value) pairs for true immutability.
-    All modification operations return new Bindings objects, enabling
-    safe backtracking during matching.
+    Backed by a persistent hash map (PMap) for true immutability. All
+    modification operations return new Bindings objects sharing
+    structure with the original, enabling cheap, safe backtracking
+    during matching.
 
     Examples:
         >>> x, y = Symbol("x"), Symbol("y")
@@ -66,13 +74,9 @@ class Bindings(Mapping[Symbol, "Element"]):
         >>> b2 = b.bind(Symbol("z"), 3.14)  # Returns new Bindings
         >>> len(b)  # Original unchanged
         2
-
-    Attributes:
-        _pairs: Frozen set of (Symbol, Element) tuples.
-        _index: Dict for O(1) lookup (derived from _pairs).
     """
 
-    __slots__ = ("_pairs", "_index", "_hash")
+    __slots__ = ()
 
     def __init__(
         self,
@@ -88,66 +92,20 @@ class Bindings(Mapping[Symbol, "Element"]):
         Raises:
             TypeError: If keys are not Symbols.
         """
-        if data is None:
-            self._pairs: frozenset[tuple[Symbol, Element]] = frozenset()
-            self._index: dict[Symbol, Element] = {}
-        elif isinstance(data, Bindings):
-            self._pairs = data._pairs
-            self._index = dict(data._index)
+        if data is None or isinstance(data, Bindings):
+            super().__init__(data)
         elif isinstance(data, dict):
             for key in data:
                 if not isinstance(key, Symbol):
                     raise TypeError(f"Bindings keys must be Symbols, got {type(key).__name__}")
-            self._pairs = frozenset(data.items())
-            self._index = dict(data)
+            super().__init__(data)
         else:
             raise TypeError(f"Bindings data must be dict or Bindings, got {type(data).__name__}")
-        self._hash: int | None = None
 
     @classmethod
     def _from_parts(cls, pairs: frozenset[tuple[Symbol, Element]]) -> Bindings:
-        """Construct directly from frozenset (internal use)."""
-        obj = object.__new__(cls)
-        obj._pairs = pairs
-        obj._index = dict(pairs)
-        obj._hash = None
-        return obj
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Mapping Protocol
-    # ─────────────────────────────────────────────────────────────────────────
-
-    def __getitem__(self, key: Symbol) -> Element:
-        """Get the value bound to a symbol."""
-        return self._index[key]
-
-    def __len__(self) -> int:
-        """Number of bindings."""
-        return len(self._pairs)
-
-    def __iter__(self) -> Iterator[Symbol]:
-        """Iterate over bound symbols."""
-        return iter(self._index)
-
-    def __contains__(self, key: object) -> bool:
-        """Check if a symbol is bound."""
-        return key in self._index
-
-    def get(self, key: Symbol, default: Any = None) -> Any:
-        """Get value with optional default."""
-        return self._index.get(key, default)
-
-    def keys(self):
-        """View of bound symbols."""
-        return self._index.keys()
-
-    def values(self):
-        """View of bound values."""
-        return self._index.values()
-
-    def items(self):
-        """View of (symbol, value) pairs."""
-        return self._index.items()
+        """Construct directly from (key, value) pairs (internal use)."""
+        return cls(dict(pairs))
 
     # ─────────────────────────────────────────────────────────────────────────
     # Immutable Modification Operations
@@ -173,13 +131,13 @@ class Bindings(Mapping[Symbol, "Element"]):
         if not isinstance(name, Symbol):
             raise TypeError(f"Binding name must be Symbol, got {type(name).__name__}")
 
-        if name in self._index:
-            existing = self._index[name]
+        existing = self.get(name, _UNBOUND)
+        if existing is not _UNBOUND:
             if existing == value:
                 return self
             raise BindingConflict(name, existing, value)
 
-        return Bindings._from_parts(self._pairs | frozenset({(name, value)}))
+        return self.set(name, value)
 
     def bind_all(self, bindings: Mapping[Symbol, Element]) -> Bindings:
         """
@@ -209,11 +167,7 @@ class Bindings(Mapping[Symbol, "Element"]):
         Returns:
             New Bindings without the specified binding.
         """
-        if name not in self._index:
-            return self
-
-        new_pairs = frozenset((k, v) for k, v in self._pairs if k != name)
-        return Bindings._from_parts(new_pairs)
+        return self.delete(name)
 
     def merge(self, other: Bindings) -> Bindings:
         """
@@ -245,13 +199,11 @@ class Bindings(Mapping[Symbol, "Element"]):
             return True
         if not isinstance(other, Bindings):
             return False
-        return self._pairs == other._pairs
+        return super().__eq__(other)
 
     def __hash__(self) -> int:
-        """Hash for use in sets/dicts."""
-        if self._hash is None:
-            self._hash = hash(self._pairs)
-        return self._hash
+        """Hash for use in sets/dicts (computed once, on first use)."""
+        return super().__hash__()
 
     # ─────────────────────────────────────────────────────────────────────────
     # String Representations
@@ -259,16 +211,16 @@ class Bindings(Mapping[Symbol, "Element"]):
 
     def __repr__(self) -> str:
         """Detailed representation."""
-        if not self._pairs:
+        if not self:
             return "Bindings({})"
-        items = ", ".join(f"{k}: {v!r}" for k, v in sorted(self._pairs, key=lambda p: str(p[0])))
+        items = ", ".join(f"{k}: {v!r}" for k, v in sorted(self.items(), key=lambda p: str(p[0])))
         return f"Bindings({{{items}}})"
 
     def __str__(self) -> str:
         """Human-readable representation."""
-        if not self._pairs:
+        if not self:
             return "{}"
-        items = ", ".join(f"{k} → {v}" for k, v in sorted(self._pairs, key=lambda p: str(p[0])))
+        items = ", ".join(f"{k} → {v}" for k, v in sorted(self.items(), key=lambda p: str(p[0])))
         return f"{{{items}}}"
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -277,7 +229,7 @@ class Bindings(Mapping[Symbol, "Element"]):
 
     def __bool__(self) -> bool:
         """True if bindings is non-empty."""
-        return bool(self._pairs)
+        return self._size > 0
 
     # ─────────────────────────────────────────────────────────────────────────
     # Utility Methods
@@ -285,7 +237,7 @@ class Bindings(Mapping[Symbol, "Element"]):
 
     def to_dict(self) -> dict[Symbol, Element]:
         """Convert to a regular dictionary (copy)."""
-        return dict(self._index)
+        return dict(self.items())
 
     def is_compatible_with(self, other: Bindings) -> bool:
         """
@@ -298,7 +250,8 @@ class Bindings(Mapping[Symbol, "Element"]):
             True if merge would succeed without BindingConflict.
         """
         for name, value in other.items():
-            if name in self._index and self._index[name] != value:
+            existing = self.get(name, _UNBOUND)
+            if existing is not _UNBOUND and existing != value:
                 return False
         return True
 
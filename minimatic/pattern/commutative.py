@@ -0,0 +1,468 @@
+"""
+Commutative - Associative-commutative argument matching.
+
+Matching the arguments of an Orderless expression is a multiset problem:
+every single-argument pattern takes one argument of its own, sequence
+patterns share the rest, and the order of the arguments does not matter.
+Trying every argument for every pattern position backtracks
+combinatorially; match_commutative() instead works in stages:
+
+    1. Prefilter     argument counts against the patterns' minimums
+    2. Literals      each literal pattern takes an equal argument
+    3. Candidates    the arguments each remaining single pattern can
+                     take, filtered by its head constraint first
+    4. Assignment    a bipartite matching of single patterns to
+                     arguments proves an assignment exists (or fails
+                     at once)
+    5. Search        the patterns take arguments left to right: a single
+                     pattern its candidates in argument order, a
+                     sequence pattern (__, ___, Repeated) the fewest
+                     arguments first and, among as many, the leftmost;
+                     the assignment is checked again after every choice,
+                     so no branch that cannot succeed is entered
+
+Every solution is still generated, in this order, so callers that
+backtrack (conditions on shared names, nested sequences) see the same
+solutions a permutation search would produce, and the first one is the
+one the argument order suggests: g[z__, _] against Orderless g[1, 2, 3]
+binds z to {1, 2}.
+
+Usage:
+    from minimatic.pattern.commutative import match_commutative
+
+    for bindings in match_commutative(patterns, args, empty_bindings(), None):
+        ...
+"""
+
+from collections.abc import Callable, Iterator
+from itertools import combinations
+from typing import TYPE_CHECKING
+
+from minimatic.core.expression import Expression, head_of
+from minimatic.core.symbol import Symbol
+
+from .bindings import BindingConflict, Bindings
+from .blanks import Blank, blank_matches_head, is_blank, is_blank_null_sequence, is_sequence_blank
+from .compiler import _head_constraint, _is_literal
+from .matcher import _is_named_sequence_pattern, _match_impl
+from .structural import (
+    Condition,
+    Pattern,
+    get_default_value,
+    is_optional,
+    is_pattern,
+    is_repeated,
+    is_repeated_null,
+    pattern_blank,
+    pattern_name,
+)
+
+if TYPE_CHECKING:
+    from minimatic.core.atoms import Element
+
+Evaluator = Callable[["Element"], "Element"]
+
+_List = Symbol("List")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENTRY POINT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def match_commutative(
+    patterns: tuple[Element, ...],
+    exprs: tuple[Element, ...],
+    bindings: Bindings,
+    evaluator: Evaluator | None,
+    expr_attrs: frozenset | None = None,
+) -> Iterator[Bindings]:
+    """
+    Match argument patterns against the arguments of an Orderless expression.
+
+    Args:
+        patterns: The argument patterns.
+        exprs: The arguments (already flattened if the head is Flat).
+        bindings: Bindings made so far.
+        evaluator: Evaluator for Condition and PatternTest, or None.
+        expr_attrs: Attributes passed on to argument matching.
+
+    Yields:
+        Bindings for every way of matching.
+    """
+    # Optional patterns: present (as their inner pattern) or absent (bound
+    # to their default), present first
+    optional_at = [i for i, pat in enumerate(patterns) if is_optional(pat)]
+    if not optional_at:
+        yield from _match_multiset(patterns, exprs, bindings, evaluator, expr_attrs)
+        return
+
+    for absent_mask in range(1 << len(optional_at)):
+        current = list(patterns)
+        current_bindings: Bindings | None = bindings
+        for bit, i in enumerate(optional_at):
+            pat = patterns[i]
+            inner = pat.args[0] if pat.args else None
+            if not absent_mask >> bit & 1:
+                current[i] = inner
+                if inner is None:
+                    current_bindings = None
+                continue
+            current[i] = None
+            default = get_default_value(pat)
+            if default is None or current_bindings is None:
+                current_bindings = None
+            elif is_pattern(inner) and pattern_name(inner) is not None:
+                try:
+                    current_bindings = current_bindings.bind(pattern_name(inner), default)
+                except BindingConflict:
+                    current_bindings = None
+            elif not is_blank(inner):
+                current_bindings = None
+        if current_bindings is None:
+            continue
+        remaining = tuple(pat for pat in current if pat is not None)
+        yield from _match_multiset(remaining, exprs, current_bindings, evaluator, expr_attrs)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MULTISET MATCHING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class _Sequence:
+    """A pattern matching any number of arguments (at least min_count)."""
+
+    __slots__ = ("pattern", "name", "blank", "inner", "min_count", "accepts")
+
+    def __init__(self, pattern: Element) -> None:
+        self.pattern = pattern
+        self.accepts: list[bool] = []
+        self.name: Symbol | None = None
+        self.blank: Expression | None = None
+        self.inner: Element | None = None
+        if is_repeated(pattern) or is_repeated_null(pattern):
+            self.inner = pattern.args[0] if pattern.args else None
+            self.min_count = 0 if is_repeated_null(pattern) else 1
+        else:
+            if is_pattern(pattern):
+                self.name = pattern_name(pattern)
+                self.blank = pattern_blank(pattern)
+            else:
+                self.blank = pattern
+            self.min_count = 0 if is_blank_null_sequence(self.blank) else 1
+
+
+def _is_sequence(pattern: Element) -> bool:
+    """Whether a pattern matches a run of arguments instead of one."""
+    return (
+        is_sequence_blank(pattern)
+        or _is_named_sequence_pattern(pattern)
+        or is_repeated(pattern)
+        or is_repeated_null(pattern)
+    )
+
+
+def _match_multiset(
+    patterns: tuple[Element, ...],
+    exprs: tuple[Element, ...],
+    bindings: Bindings,
+    evaluator: Evaluator | None,
+    expr_attrs: frozenset | None,
+) -> Iterator[Bindings]:
+    """Match patterns (no Optional) against exprs in any order."""
+    singles = [pat for pat in patterns if not _is_sequence(pat)]
+    sequences = [_Sequence(pat) for pat in patterns if _is_sequence(pat)]
+    count = len(exprs)
+
+    # 1. Prefilter on counts
+    needed = len(singles) + sum(seq.min_count for seq in sequences)
+    if needed > count or (not sequences and len(singles) != count):
+        return
+    if any(seq.inner is None and seq.blank is None for seq in sequences):
+        return
+
+    # 2. Literal patterns take an equal argument (equal arguments are
+    # interchangeable, so the first free one is as good as any)
+    used = [False] * count
+    steps: list[_Single | _Sequence] = []
+    sequence_at = iter(sequences)
+    for pat in patterns:
+        if _is_sequence(pat):
+            steps.append(next(sequence_at))
+            continue
+        if isinstance(pat, Expression) and not _is_literal(pat):
+            steps.append(_Single(pat))
+            continue
+        for i, expr in enumerate(exprs):
+            if not used[i] and expr == pat:
+                used[i] = True
+                break
+        else:
+            return
+
+    # 3. Arguments each remaining pattern can take on its own
+    for step in steps:
+        if isinstance(step, _Single):
+            step.candidates = _candidates(
+                step.pattern, exprs, used, bindings, evaluator, expr_attrs
+            )
+            if not step.candidates:
+                return
+            step.accepts = [False] * count
+            for i in step.candidates:
+                step.accepts[i] = True
+        else:
+            step.accepts = [_sequence_accepts(step, expr, bindings, evaluator) for expr in exprs]
+
+    # 4. A matching of every single pattern that covers the arguments no
+    # sequence pattern can take, or no match at all
+    if not _feasible(steps, 0, used):
+        return
+
+    yield from _search(steps, 0, exprs, used, bindings, evaluator, expr_attrs)
+
+
+class _Single:
+    """A pattern matching exactly one argument."""
+
+    __slots__ = ("pattern", "candidates", "accepts")
+
+    def __init__(self, pattern: Element) -> None:
+        self.pattern = pattern
+        self.candidates: list[int] = []
+        self.accepts: list[bool] = []
+
+
+def _candidates(
+    pat: Element,
+    exprs: tuple[Element, ...],
+    used: list[bool],
+    bindings: Bindings,
+    evaluator: Evaluator | None,
+    expr_attrs: frozenset | None,
+) -> list[int]:
+    """Indices of the free arguments a single pattern can match on its own."""
+    head = _head_constraint(pat)
+    free = [
+        i for i, expr in enumerate(exprs) if not used[i] and (head is None or head_of(expr) == head)
+    ]
+    if _is_plain_blank(pat) or _has_condition(pat):
+        # The head was all there is to check, or the condition may refer
+        # to names other patterns bind: checked during the search
+        return free
+    return [i for i in free if _match_impl(pat, exprs[i], bindings, evaluator, expr_attrs).success]
+
+
+def _feasible(steps: list[_Single | _Sequence], k: int, used: list[bool]) -> bool:
+    """
+    Whether patterns k, k+1, ... can still take the free arguments: each
+    single pattern one of its candidates, and every argument no sequence
+    pattern accepts a single pattern.
+    """
+    later = steps[k:]
+    free = [i for i, taken in enumerate(used) if not taken]
+    singles = [step for step in later if isinstance(step, _Single)]
+    sequences = [step for step in later if isinstance(step, _Sequence)]
+    if len(singles) + sum(seq.min_count for seq in sequences) > len(free):
+        return False
+    required = [i for i in free if not any(seq.accepts[i] for seq in sequences)]
+    if len(required) > len(singles):
+        return False
+    candidates = [[i for i in single.candidates if not used[i]] for single in singles]
+    return _assign(candidates, required) is not None
+
+
+def _assign(candidates: list[list[int]], required: list[int]) -> list[int] | None:
+    """
+    A matching of patterns to distinct arguments covering every required
+    argument (augmenting paths), or None if there is none.
+
+    Free partners are taken before any path is augmented, so the matching
+    only departs from the natural one (each pattern its first free
+    candidate) where it has to.
+    """
+    owner: dict[int, int] = {}  # argument -> pattern
+    assigned: list[int | None] = [None] * len(candidates)
+    takers: dict[int, list[int]] = {}
+    for k, indices in enumerate(candidates):
+        for i in indices:
+            takers.setdefault(i, []).append(k)
+
+    def augment_pattern(k: int, seen: set[int]) -> bool:
+        for i in candidates[k]:
+            if i not in owner:
+                owner[i] = k
+                assigned[k] = i
+                return True
+        for i in candidates[k]:
+            if i in seen:
+                continue
+            seen.add(i)
+            holder = owner.get(i)
+            if holder is None or augment_pattern(holder, seen):
+                owner[i] = k
+                assigned[k] = i
+                return True
+        return False
+
+    def augment_argument(i: int, seen: set[int]) -> bool:
+        for k in takers.get(i, ()):
+            if assigned[k] is None:
+                assigned[k] = i
+                owner[i] = k
+                return True
+        for k in takers.get(i, ()):
+            if k in seen:
+                continue
+            seen.add(k)
+            held = assigned[k]
+            if held is None or augment_argument(held, seen):
+                assigned[k] = i
+                owner[i] = k
+                return True
+        return False
+
+    # Cover the required arguments first; augmenting from the pattern side
+    # afterwards never frees an argument that is already covered
+    for i in required:
+        if not augment_argument(i, set()):
+            return None
+    for k in range(len(candidates)):
+        if assigned[k] is None and not augment_pattern(k, set()):
+            return None
+    return assigned  # type: ignore[return-value]
+
+
+def _search(
+    steps: list[_Single | _Sequence],
+    k: int,
+    exprs: tuple[Element, ...],
+    used: list[bool],
+    bindings: Bindings,
+    evaluator: Evaluator | None,
+    expr_attrs: frozenset | None,
+) -> Iterator[Bindings]:
+    """
+    Let patterns k, k+1, ... take the free arguments, in pattern order:
+    a single pattern each candidate in argument order, a sequence pattern
+    the fewest arguments first and, among as many, the leftmost first.
+    """
+    if k == len(steps):
+        if all(used):
+            yield bindings
+        return
+
+    step = steps[k]
+    if isinstance(step, _Single):
+        for i in step.candidates:
+            if used[i]:
+                continue
+            result = _match_impl(step.pattern, exprs[i], bindings, evaluator, expr_attrs)
+            if not result.success:
+                continue
+            used[i] = True
+            if _feasible(steps, k + 1, used):
+                yield from _search(
+                    steps, k + 1, exprs, used, result.bindings, evaluator, expr_attrs
+                )
+            used[i] = False
+        return
+
+    # Arguments no later pattern can take go to this one; those a later one
+    # can take as well are chosen in every combination
+    later = steps[k + 1 :]
+    free = [i for i, taken in enumerate(used) if not taken]
+    forced = []
+    optional = []
+    for i in free:
+        shared = any(other.accepts[i] for other in later)
+        if step.accepts[i] and shared:
+            optional.append(i)
+        elif step.accepts[i]:
+            forced.append(i)
+        elif not shared:
+            return
+    later_min = sum(other.min_count if isinstance(other, _Sequence) else 1 for other in later)
+    only_singles_later = not any(isinstance(other, _Sequence) for other in later)
+    later_max = len(later) if only_singles_later else len(free)
+    smallest = max(step.min_count, len(forced), len(free) - later_max)
+    for size in range(smallest, len(free) - later_min + 1):
+        if size - len(forced) > len(optional):
+            break
+        for chosen in combinations(optional, size - len(forced)):
+            taken = sorted(forced + list(chosen))
+            result = _bind_sequence(step, taken, exprs, bindings, evaluator)
+            if result is None:
+                continue
+            for i in taken:
+                used[i] = True
+            if _feasible(steps, k + 1, used):
+                yield from _search(steps, k + 1, exprs, used, result, evaluator, expr_attrs)
+            for i in taken:
+                used[i] = False
+
+
+def _sequence_accepts(
+    seq: _Sequence,
+    expr: Element,
+    bindings: Bindings,
+    evaluator: Evaluator | None,
+) -> bool:
+    """Whether a sequence pattern can take an argument (on its own)."""
+    if seq.inner is not None:
+        return _match_impl(seq.inner, expr, bindings, evaluator).success
+    return blank_matches_head(seq.blank, expr)
+
+
+def _bind_sequence(
+    seq: _Sequence,
+    taken: list[int],
+    exprs: tuple[Element, ...],
+    bindings: Bindings,
+    evaluator: Evaluator | None,
+) -> Bindings | None:
+    """Bindings after a sequence pattern takes the given arguments, or None."""
+    if len(taken) < seq.min_count:
+        return None
+    if seq.inner is not None:
+        for i in taken:
+            result = _match_impl(seq.inner, exprs[i], bindings, evaluator)
+            if not result.success:
+                return None
+            bindings = result.bindings
+        return bindings
+    if not all(blank_matches_head(seq.blank, exprs[i]) for i in taken):
+        return None
+    if seq.name is None:
+        return bindings
+    value = Expression._from_parts(_List, tuple(exprs[i] for i in taken))
+    try:
+        return bindings.bind(seq.name, value)
+    except BindingConflict:
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PATTERN ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _is_plain_blank(pat: Element) -> bool:
+    """Whether a pattern is _, _h, x_ or x_h (fully decided by the head)."""
+    if isinstance(pat, Expression) and pat.head == Pattern and len(pat.args) == 2:
+        pat = pat.args[1]
+    return isinstance(pat, Expression) and pat.head == Blank and len(pat.args) <= 1
+
+
+def _has_condition(pat: Element) -> bool:
+    """Whether a pattern contains a Condition."""
+    stack = [pat]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Expression):
+            if item.head == Condition:
+                return True
+            stack.append(item.head)
+            stack.extend(item.args)
+    return False
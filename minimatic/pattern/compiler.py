@@ -0,0 +1,713 @@
+"""
+Compiler - Patterns analyzed once into reusable matcher objects.
+
+match() interprets a pattern on every call: at each node it runs the chain
+of is_hold_pattern/is_verbatim/is_blank/... predicates and re-derives names,
+blanks and head constraints. compile_pattern() does that analysis once and
+returns a CompiledPattern whose match() walks a tree of specialized node
+matchers instead:
+
+    literals        compared with == (hash-checked), no per-node dispatch
+    blanks          a precomputed head constraint, or nothing at all
+    x_, x_h         bind directly, without matching an inner Blank
+    a | b | c       a set lookup when every alternative is an atom
+    f[p1, ..., pn]  arity checked first, then arguments left to right
+
+Argument lists that need sequence matching (__, ___, Optional, Repeated)
+or whose expression is Flat or Orderless use the interpreter's sequence
+matcher, so compiled and interpreted matching always agree.
+
+Each compiled pattern also records the symbols every match must contain
+(see symbol_bit), so searches skip subtrees whose symbol mask lacks them,
+and a second node with the pattern names erased for yes/no matching that
+builds no bindings.
+
+Compiled patterns are cached by identity: definitions and rules keep their
+patterns for their whole lifetime, so the evaluator compiles each DownValue
+once. The cache is bounded and evicts the least recently used pattern; the
+evaluator matches literal definitions (memoized values, OwnValues) by
+equality and never compiles them, so they do not crowd the cache.
+
+Usage:
+    from minimatic.pattern import compile_pattern
+
+    compiled = compile_pattern(Expression(f, pattern(x, blank(Integer))))
+    compiled.head, compiled.min_arity, compiled.max_arity   # f, 1, 1
+    compiled.match(Expression(f, 3))[x]                     # 3
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from minimatic.core.atoms import is_atom
+from minimatic.core.attributes import Flat, Orderless
+from minimatic.core.expression import Expression, head_of, symbol_bit, symbol_mask_of
+from minimatic.core.symbol import Symbol, is_symbol
+
+from .bindings import BindingConflict, Bindings, empty_bindings
+from .blanks import (
+    Blank,
+    BlankNullSequence,
+    BlankSequence,
+    is_blank_null_sequence,
+    is_sequence_blank,
+)
+from .matcher import (
+    NO_MATCH,
+    MatchResult,
+    _flatten_args,
+    _is_named_null_sequence_pattern,
+    _is_named_sequence_pattern,
+    _match_impl,
+    _match_sequence_impl,
+    replace_with_bindings,
+    success,
+)
+from .structural import (
+    Alternatives,
+    Condition,
+    Except,
+    Optional,
+    Pattern,
+    PatternTest,
+    Repeated,
+    RepeatedNull,
+    Verbatim,
+    collect_pattern_names,
+    is_hold_pattern,
+    is_optional,
+    is_pattern,
+    is_pattern_construct,
+    is_repeated,
+    is_repeated_null,
+    unwrap_hold_pattern,
+)
+
+if TYPE_CHECKING:
+    from minimatic.core.atoms import Element
+
+# A compiled node: (expr, bindings, evaluator, expr_attrs) -> bindings or None
+Evaluator = Callable[["Element"], "Element"]
+Node = Callable[["Element", Bindings, "Evaluator | None", "frozenset | None"], "Bindings | None"]
+
+_True = Symbol("True")
+_Symbol = Symbol("Symbol")
+_BLANKS = (Blank, BlankSequence, BlankNullSequence)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MAX_COMPILED_PATTERNS = 1 << 12
+"""Compiled patterns kept in the cache; the least recently used entry is
+evicted first."""
+
+MAX_NODE_DEPTH = 128
+"""Pattern nesting compiled into nested node matchers; subpatterns nested
+deeper are matched by the interpreter, which has no depth limit."""
+
+_compiled: OrderedDict[int, CompiledPattern] = OrderedDict()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMPILED PATTERN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class CompiledPattern:
+    """
+    A pattern analyzed once for repeated matching.
+
+    Attributes:
+        pattern: The source pattern.
+        names: The names bound by the pattern.
+        head: The head every matching expression has (head_of), or None
+            if the pattern does not constrain it.
+        min_arity: Fewest arguments of a matching expression, before
+            Flat flattening (0 when the pattern is not an expression
+            pattern).
+        max_arity: Most arguments of a matching expression, before Flat
+            flattening, or None if unbounded.
+        literal: Whether the pattern contains no pattern constructs, so
+            that it only matches expressions equal to it.
+        symbols: Mask of the symbols every matching element contains
+            (see symbol_mask_of); an element whose mask lacks any of
+            these bits cannot match, and neither can its subtrees.
+    """
+
+    __slots__ = (
+        "pattern",
+        "names",
+        "head",
+        "min_arity",
+        "max_arity",
+        "literal",
+        "symbols",
+        "_node",
+        "_test",
+    )
+
+    def __init__(self, pattern: Element) -> None:
+        """Analyze and compile a pattern (use compile_pattern() for the cached form)."""
+        self.pattern = pattern
+        self.names: frozenset[Symbol] = frozenset(collect_pattern_names(pattern))
+        self.head = _head_constraint(pattern)
+        self.min_arity, self.max_arity = _arity(pattern)
+        self.literal = _is_literal(pattern)
+        self.symbols = _required_symbols(pattern, 0)
+        self._node = _compile(pattern, 0)
+        self._test: Node | None = None
+
+    def match(
+        self,
+        expr: Element,
+        bindings: Bindings | None = None,
+        evaluator: Evaluator | None = None,
+        expr_attrs: frozenset | None = None,
+    ) -> MatchResult:
+        """
+        Match the pattern against an expression.
+
+        Same arguments and result as match().
+        """
+        result = self._node(
+            expr, empty_bindings() if bindings is None else bindings, evaluator, expr_attrs
+        )
+        if result is None:
+            return NO_MATCH
+        return success(result)
+
+    def matches(self, expr: Element, evaluator: Evaluator | None = None) -> bool:
+        """
+        Check if the pattern matches an expression.
+
+        Uses a node with the pattern names erased where no name is used
+        twice or by a Condition, so a match binds nothing.
+        """
+        test = self._test
+        if test is None:
+            erased = _erase_names(self.pattern)
+            test = self._test = self._node if erased is None else _compile(erased, 0)
+        return test(expr, empty_bindings(), evaluator, None) is not None
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r})"
+
+
+def compile_pattern(pattern: Element) -> CompiledPattern:
+    """
+    Compile a pattern, reusing an earlier compilation of the same object.
+
+    The cache is keyed by identity and holds on to the pattern, so an
+    entry always belongs to the object it was compiled from; when it is
+    full, the pattern used least recently is dropped.
+
+    Examples:
+        >>> compiled = compile_pattern(pattern(x, blank(Integer)))
+        >>> compile_pattern(compiled.pattern) is compiled
+        True
+    """
+    key = id(pattern)
+    compiled = _compiled.get(key)
+    if compiled is not None and compiled.pattern is pattern:
+        _compiled.move_to_end(key)
+        return compiled
+    compiled = CompiledPattern(pattern)
+    if len(_compiled) >= MAX_COMPILED_PATTERNS:
+        _compiled.popitem(last=False)
+    _compiled[key] = compiled
+    return compiled
+
+
+def compiled_pattern_count() -> int:
+    """Number of patterns in the compilation cache."""
+    return len(_compiled)
+
+
+def clear_compiled_patterns() -> None:
+    """Empty the compilation cache."""
+    _compiled.clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _is_literal(pattern: Element) -> bool:
+    """Whether a pattern contains no pattern construct (heads included)."""
+    stack = [pattern]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Expression):
+            if is_pattern_construct(item):
+                return False
+            stack.append(item.head)
+            stack.extend(item.args)
+    return True
+
+
+def _head_constraint(pattern: Element) -> Element | None:
+    """The head_of every expression the pattern matches, if there is one."""
+    while isinstance(pattern, Expression):
+        pattern = unwrap_hold_pattern(pattern)
+        if not isinstance(pattern, Expression):
+            break
+        head = pattern.head
+        args = pattern.args
+        if head == Pattern:
+            if len(args) < 2:
+                return None
+            pattern = args[1]
+        elif head in (Condition, PatternTest, Repeated):
+            if not args:
+                return None
+            pattern = args[0]
+        elif head == Blank:
+            return args[0] if args else None
+        elif head == Verbatim:
+            return head_of(args[0]) if args else None
+        elif is_pattern_construct(pattern):
+            return None
+        else:
+            return head
+    return None
+
+
+def _arity(pattern: Element) -> tuple[int, int | None]:
+    """(min, max) argument count of a matching expression, before flattening."""
+    while isinstance(pattern, Expression):
+        pattern = unwrap_hold_pattern(pattern)
+        if not isinstance(pattern, Expression):
+            break
+        head = pattern.head
+        args = pattern.args
+        if head == Pattern and len(args) >= 2:
+            pattern = args[1]
+        elif head in (Condition, PatternTest, Repeated) and args:
+            pattern = args[0]
+        elif is_pattern_construct(pattern):
+            return 0, None
+        else:
+            minimum = 0
+            maximum: int | None = 0
+            for arg in args:
+                if is_optional(arg):
+                    pass
+                elif (
+                    is_blank_null_sequence(arg)
+                    or _is_named_null_sequence_pattern(arg)
+                    or is_repeated_null(arg)
+                ):
+                    maximum = None
+                    continue
+                elif is_sequence_blank(arg) or _is_named_sequence_pattern(arg) or is_repeated(arg):
+                    minimum += 1
+                    maximum = None
+                    continue
+                else:
+                    minimum += 1
+                if maximum is not None:
+                    maximum += 1
+            return minimum, maximum
+    return 0, None
+
+
+def _required_symbols(pattern: Element, depth: int) -> int:
+    """Mask of the symbols every element matching the pattern contains."""
+    if depth > MAX_NODE_DEPTH:
+        return 0
+    if isinstance(pattern, Symbol):
+        return symbol_bit(pattern)
+    if not isinstance(pattern, Expression):
+        # 1 == 1.0 == True, so a literal number says nothing about types
+        return 0
+    pattern = unwrap_hold_pattern(pattern)
+    if not isinstance(pattern, Expression):
+        return _required_symbols(pattern, depth + 1)
+    head = pattern.head
+    args = pattern.args
+    if head in (Blank, BlankSequence):
+        if not args or args[0] == _Symbol:
+            return 0
+        constraint = args[0]
+        if isinstance(constraint, Symbol):
+            return symbol_bit(constraint)
+        return symbol_mask_of(constraint) if isinstance(constraint, Expression) else 0
+    if head == Pattern:
+        return _required_symbols(args[1], depth + 1) if len(args) >= 2 else 0
+    if head in (Condition, PatternTest, Repeated):
+        return _required_symbols(args[0], depth + 1) if args else 0
+    if head == Except:
+        return _required_symbols(args[1], depth + 1) if len(args) >= 2 else 0
+    if head == Alternatives:
+        if not args:
+            return 0
+        required = -1
+        for alt in args:
+            required &= _required_symbols(alt, depth + 1)
+        return required
+    if head == Verbatim:
+        return symbol_mask_of(args[0]) if args else 0
+    if is_pattern_construct(pattern):
+        # BlankNullSequence, Optional and RepeatedNull can match nothing
+        return 0
+    required = _required_symbols(head, depth + 1)
+    for arg in args:
+        required |= _required_symbols(arg, depth + 1)
+    return required
+
+
+def _erase_names(pattern: Element) -> Element | None:
+    """
+    The pattern with x_, x__ and x___ replaced by _, __ and ___ where that
+    cannot change whether it matches, or None if no name can be erased.
+
+    A name can be erased when it occurs once and the pattern has no
+    Condition (which could refer to it), no Verbatim (whose contents
+    are literal) and no name wrapping another, as in y:(z:___): erasing
+    either name turns the pair into a plain sequence pattern, which
+    matches differently. Names under Optional and Repeated are kept:
+    their matching relies on the name.
+    """
+    seen: set[Symbol] = set()
+    stack = [pattern]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, Expression):
+            continue
+        head = item.head
+        if head in (Condition, Verbatim):
+            return None
+        if head == Pattern and item.args:
+            name = item.args[0]
+            if name in seen or (len(item.args) == 2 and is_pattern(item.args[1])):
+                return None
+            seen.add(name)
+        stack.append(head)
+        stack.extend(item.args)
+    if not seen:
+        return None
+    return _erase(pattern, 0)
+
+
+def _erase(pattern: Element, depth: int) -> Element:
+    if not isinstance(pattern, Expression) or depth > MAX_NODE_DEPTH:
+        return pattern
+    head = pattern.head
+    args = pattern.args
+    if head in (Optional, Repeated, RepeatedNull):
+        return pattern
+    if head == Pattern and len(args) == 2:
+        inner = args[1]
+        if isinstance(inner, Expression) and inner.head in _BLANKS:
+            return inner
+    new_head = _erase(head, depth + 1)
+    new_args = tuple(_erase(arg, depth + 1) for arg in args)
+    if new_head is head and all(new is old for new, old in zip(new_args, args, strict=True)):
+        return pattern
+    return Expression(new_head, *new_args, _attrs=pattern.attributes)
+
+
+def _needs_sequence_matching(pattern: Element) -> bool:
+    """Whether an argument pattern can match other than exactly one argument."""
+    return (
+        is_optional(pattern)
+        or is_sequence_blank(pattern)
+        or _is_named_sequence_pattern(pattern)
+        or is_repeated(pattern)
+        or is_repeated_null(pattern)
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NODE COMPILATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _never(
+    expr: Element, bindings: Bindings, evaluator: Evaluator | None, expr_attrs: frozenset | None
+) -> Bindings | None:
+    """Node of a pattern that cannot match."""
+    return None
+
+
+def _always(
+    expr: Element, bindings: Bindings, evaluator: Evaluator | None, expr_attrs: frozenset | None
+) -> Bindings | None:
+    """Node of a pattern that matches anything (Blank[])."""
+    return bindings
+
+
+def _compile(pattern: Element, depth: int) -> Node:
+    """Compile one pattern node (mirrors the cases of _match_impl)."""
+    if depth > MAX_NODE_DEPTH:
+        return _compile_interpreted(pattern)
+    if is_hold_pattern(pattern):
+        pattern = unwrap_hold_pattern(pattern)
+
+    if not isinstance(pattern, Expression):
+        if is_atom(pattern) or is_symbol(pattern):
+            return _compile_literal_atom(pattern)
+        return _never
+
+    compiler = _COMPILERS.get(pattern.head) if isinstance(pattern.head, Symbol) else None
+    if compiler is not None:
+        return compiler(pattern, depth)
+    return _compile_expression(pattern, depth)
+
+
+def _compile_interpreted(pattern: Element) -> Node:
+    def interpreted(expr, bindings, evaluator, expr_attrs):
+        result = _match_impl(pattern, expr, bindings, evaluator, expr_attrs)
+        return result.bindings if result.success else None
+
+    return interpreted
+
+
+def _compile_literal_atom(atom: Element) -> Node:
+    def literal_atom(expr, bindings, evaluator, expr_attrs):
+        return bindings if atom == expr else None
+
+    return literal_atom
+
+
+def _compile_verbatim(pattern: Expression, depth: int) -> Node:
+    if not pattern.args:
+        return _never
+    target = pattern.args[0]
+
+    def verbatim(expr, bindings, evaluator, expr_attrs):
+        return bindings if target == expr else None
+
+    return verbatim
+
+
+def _compile_blank(pattern: Expression, depth: int) -> Node:
+    if not pattern.args:
+        return _always
+    constraint = pattern.args[0]
+
+    def blank(expr, bindings, evaluator, expr_attrs):
+        return bindings if head_of(expr) == constraint else None
+
+    return blank
+
+
+def _compile_pattern(pattern: Expression, depth: int) -> Node:
+    args = pattern.args
+    name = args[0] if args else None
+    inner = args[1] if len(args) >= 2 else None
+
+    if isinstance(inner, Expression) and inner.head == Blank:
+        # x_ and x_h: check the head constraint inline
+        constraint = inner.args[0] if inner.args else None
+
+        def named_blank(expr, bindings, evaluator, expr_attrs):
+            if constraint is not None and head_of(expr) != constraint:
+                return None
+            if name is None:
+                return bindings
+            try:
+                return bindings.bind(name, expr)
+            except BindingConflict:
+                return None
+
+        return named_blank
+
+    inner_node = _compile(inner, depth + 1) if inner is not None else None
+
+    def named(expr, bindings, evaluator, expr_attrs):
+        if inner_node is not None:
+            bindings = inner_node(expr, bindings, evaluator, None)
+            if bindings is None:
+                return None
+        if name is None:
+            return bindings
+        try:
+            return bindings.bind(name, expr)
+        except BindingConflict:
+            return None
+
+    return named
+
+
+def _compile_condition(pattern: Expression, depth: int) -> Node:
+    args = pattern.args
+    if not args:
+        return _never
+    inner_node = _compile(args[0], depth + 1)
+    test = args[1] if len(args) >= 2 else None
+
+    def conditional(expr, bindings, evaluator, expr_attrs):
+        bindings = inner_node(expr, bindings, evaluator, expr_attrs)
+        if bindings is None:
+            return None
+        if test is not None:
+            if evaluator is None:
+                # Fail-safe: no evaluator means we can't check the condition
+                return None
+            result = evaluator(replace_with_bindings(test, bindings))
+            if result != _True and result is not True:
+                return None
+        return bindings
+
+    return conditional
+
+
+def _compile_alternatives(pattern: Expression, depth: int) -> Node:
+    alternatives = pattern.args
+
+    # Alternatives of atoms: one set lookup instead of a comparison each
+    if alternatives and all(
+        (is_atom(alt) or is_symbol(alt)) and not isinstance(alt, Expression) and alt == alt
+        for alt in alternatives
+    ):
+        try:
+            values = frozenset(alternatives)
+        except TypeError:
+            values = None
+        if values is not None:
+
+            def atom_alternatives(expr, bindings, evaluator, expr_attrs):
+                if isinstance(expr, Expression):
+                    return None
+                try:
+                    return bindings if expr in values else None
+                except TypeError:
+                    return None
+
+            return atom_alternatives
+
+    nodes = tuple(_compile(alt, depth + 1) for alt in alternatives)
+
+    def alternative(expr, bindings, evaluator, expr_attrs):
+        for node in nodes:
+            result = node(expr, bindings, evaluator, None)
+            if result is not None:
+                return result
+        return None
+
+    return alternative
+
+
+def _compile_pattern_test(pattern: Expression, depth: int) -> Node:
+    args = pattern.args
+    if len(args) < 2:
+        return _never
+    inner_node = _compile(args[0], depth + 1)
+    test_func = args[1]
+
+    def tested(expr, bindings, evaluator, expr_attrs):
+        bindings = inner_node(expr, bindings, evaluator, expr_attrs)
+        if bindings is None:
+            return None
+        if evaluator is None:
+            # Fail-safe: no evaluator means we can't run the test
+            return None
+        result = evaluator(Expression(test_func, expr))
+        if result != _True and result is not True:
+            return None
+        return bindings
+
+    return tested
+
+
+def _compile_except(pattern: Expression, depth: int) -> Node:
+    args = pattern.args
+    if not args:
+        return _never
+    excluded_node = _compile(args[0], depth + 1)
+    alternative_node = _compile(args[1], depth + 1) if len(args) >= 2 else None
+
+    def excepted(expr, bindings, evaluator, expr_attrs):
+        if excluded_node(expr, bindings, evaluator, expr_attrs) is not None:
+            return None
+        if alternative_node is not None:
+            return alternative_node(expr, bindings, evaluator, expr_attrs)
+        return bindings
+
+    return excepted
+
+
+def _compile_repeated(pattern: Expression, depth: int) -> Node:
+    # Outside a sequence, pat.. matches like pat
+    if not pattern.args:
+        return _never
+    return _compile(pattern.args[0], depth + 1)
+
+
+def _compile_repeated_null(pattern: Expression, depth: int) -> Node:
+    if not pattern.args:
+        return _never
+    inner_node = _compile(pattern.args[0], depth + 1)
+
+    def repeated_null(expr, bindings, evaluator, expr_attrs):
+        result = inner_node(expr, bindings, evaluator, expr_attrs)
+        return bindings if result is None else result
+
+    return repeated_null
+
+
+def _compile_expression(pattern: Expression, depth: int) -> Node:
+    """Compile a structural pattern: head and arguments."""
+    pattern_head = pattern.head
+    pattern_args = pattern.args
+    head_node = _compile(pattern_head, depth + 1)
+    arg_nodes = tuple(_compile(arg, depth + 1) for arg in pattern_args)
+    arity = len(pattern_args)
+    sequence = any(_needs_sequence_matching(arg) for arg in pattern_args)
+    # Deep patterns skip the equality shortcut rather than have every
+    # compiled level rescan their subtree
+    literal = pattern.depth <= MAX_NODE_DEPTH and _is_literal(pattern)
+
+    def structural(expr, bindings, evaluator, expr_attrs):
+        if not isinstance(expr, Expression):
+            return None
+        # An equal expression always matches a literal pattern
+        if literal and expr == pattern:
+            return bindings
+
+        bindings = head_node(expr.head, bindings, evaluator, expr_attrs)
+        if bindings is None:
+            return None
+
+        attrs = expr.attributes if expr_attrs is None else expr_attrs
+        flat = Flat in attrs
+        orderless = Orderless in attrs
+        expr_args = expr.args
+
+        if sequence or flat or orderless:
+            p_args = pattern_args
+            if flat:
+                p_args = _flatten_args(p_args, pattern_head)
+                expr_args = _flatten_args(expr_args, expr.head)
+            for matched in _match_sequence_impl(
+                p_args, expr_args, bindings, evaluator, flat, orderless
+            ):
+                return matched
+            return None
+
+        if len(expr_args) != arity:
+            return None
+        for node, arg in zip(arg_nodes, expr_args, strict=True):
+            bindings = node(arg, bindings, evaluator, None)
+            if bindings is None:
+                return None
+        return bindings
+
+    return structural
+
+
+_COMPILERS: dict[Symbol, Callable[[Expression, int], Node]] = {
+    Verbatim: _compile_verbatim,
+    Blank: _compile_blank,
+    Pattern: _compile_pattern,
+    Condition: _compile_condition,
+    Alternatives: _compile_alternatives,
+    PatternTest: _compile_pattern_test,
+    Except: _compile_except,
+    Repeated: _compile_repeated,
+    RepeatedNull: _compile_repeated_null,
+}
@@ -23,6 +23,10 @@ The matcher handles:
     - Orderless (commutative) matching
     - Sequence patterns (__, ___)
 
+Matching is iterative: patterns become goals proved by one loop over an
+explicit choice-point stack (see MATCHING MACHINE), so pattern nesting
+uses no Python stack and has no depth limit.
+
 Usage:
     from minimatic.pattern import match, matches, Bindings
 
@@ -35,6 +39,7 @@ Usage:
 """
 
 # from __future__ import annotations
+import warnings
 from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from typing import (
@@ -46,30 +51,36 @@ if TYPE_CHECKING:
 
 from minimatic.core.atoms import is_atom
 from minimatic.core.attributes import Flat, Orderless
-from minimatic.core.expression import Expression, is_expr
+from minimatic.core.expression import Expression, head_of, is_expr, symbol_bit, symbol_mask_of
 from minimatic.core.symbol import Symbol, is_symbol
+from minimatic.core.walk import fold, preorder
 
 from .bindings import BindingConflict, Bindings, empty_bindings
 from .blanks import (
+    Blank,
     blank_matches_head,
     is_blank,
     is_blank_null_sequence,
     is_sequence_blank,
 )
 from .structural import (
+    Alternatives,
+    Condition,
+    Except,
+    HoldPattern,
+    Pattern,
+    PatternTest,
+    Repeated,
+    RepeatedNull,
+    Verbatim,
     get_condition_pattern,
     get_condition_test,
     get_default_value,
-    is_alternatives,
-    is_condition,
-    is_except,
-    is_hold_pattern,
     is_optional,
     is_pattern,
-    is_pattern_test,
+    is_pattern_construct,
     is_repeated,
     is_repeated_null,
-    is_verbatim,
     pattern_blank,
     pattern_name,
     unwrap_hold_pattern,
@@ -79,8 +90,10 @@ from .structural import (
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_List = Symbol("List")
+
 DEFAULT_MAX_DEPTH = 128
-"""Maximum recursion depth for pattern matching."""
+"""Deprecated: matching no longer has a depth limit; kept for callers."""
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -135,7 +148,7 @@ def match(
     expr: Element,
     bindings: Bindings | None = None,
     evaluator: Callable[[Element], Element] | None = None,
-    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_depth: int | None = None,
     expr_attrs: frozenset | None = None,
 ) -> MatchResult:
     """
@@ -147,7 +160,8 @@ def match(
         bindings: Optional initial bindings (for nested matching).
         evaluator: Optional evaluator for Condition/PatternTest evaluation.
                    If None, Condition/PatternTest fail safely (no match).
-        max_depth: Maximum recursion depth.
+        max_depth: Deprecated and ignored: matching uses no Python stack
+                   and has no depth limit.
         expr_attrs: Optional resolved attributes for the expression's head.
                     Used for Flat/Orderless matching when the expression
                     itself doesn't carry attributes (e.g., head attrs from context).
@@ -156,10 +170,16 @@ def match(
         MatchResult with success=True and bindings if matched,
         or NO_MATCH (success=False) if not matched.
     """
+    if max_depth is not None:
+        warnings.warn(
+            "match(max_depth=...) is deprecated and ignored: matching has no depth limit",
+            DeprecationWarning,
+            stacklevel=2,
+        )
     if bindings is None:
         bindings = empty_bindings()
 
-    return _match_impl(pattern, expr, bindings, evaluator, max_depth, 0, expr_attrs)
+    return _match_impl(pattern, expr, bindings, evaluator, expr_attrs)
 
 
 def matches(
@@ -189,16 +209,7 @@ def match_sequence(
     if bindings is None:
         bindings = empty_bindings()
 
-    yield from _match_sequence_impl(
-        patterns,
-        exprs,
-        bindings,
-        evaluator,
-        flat,
-        orderless,
-        DEFAULT_MAX_DEPTH,
-        0,
-    )
+    yield from _match_sequence_impl(patterns, exprs, bindings, evaluator, flat, orderless)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -211,231 +222,13 @@ def _match_impl(
     expr: Element,
     bindings: Bindings,
     evaluator: Callable[[Element], Element] | None,
-    max_depth: int,
-    depth: int,
     expr_attrs: frozenset | None = None,
 ) -> MatchResult:
     """Internal implementation of pattern matching."""
-
-    if depth > max_depth:
-        return NO_MATCH
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle HoldPattern - unwrap and continue
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_hold_pattern(pattern):
-        pattern = unwrap_hold_pattern(pattern)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Verbatim - literal matching
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_verbatim(pattern):
-        if len(pattern.args) >= 1:
-            return success(bindings) if pattern.args[0] == expr else NO_MATCH
-        return NO_MATCH
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Blank patterns (_, _h)
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_blank(pattern):
-        if blank_matches_head(pattern, expr):
-            return success(bindings)
-        return NO_MATCH
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Named patterns (Pattern[name, blank])
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_pattern(pattern):
-        name = pattern_name(pattern)
-        inner = pattern_blank(pattern)
-
-        # First check if inner pattern matches
-        if inner is not None:
-            inner_result = _match_impl(inner, expr, bindings, evaluator, max_depth, depth + 1)
-            if not inner_result.success:
-                return NO_MATCH
-            bindings = inner_result.bindings
-
-        # Then try to bind the name
-        if name is not None:
-            try:
-                bindings = bindings.bind(name, expr)
-            except BindingConflict:
-                return NO_MATCH
-
-        return success(bindings)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Condition patterns (pat /; test)
-    # Fail-safe: if no evaluator, pattern does NOT match
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_condition(pattern):
-        inner_pat = get_condition_pattern(pattern)
-        test = get_condition_test(pattern)
-
-        if inner_pat is None:
-            return NO_MATCH
-
-        # First match the inner pattern
-        inner_result = _match_impl(
-            inner_pat, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs
-        )
-        if not inner_result.success:
-            return NO_MATCH
-
-        # Then evaluate the condition
-        if test is not None:
-            if evaluator is None:
-                # Fail-safe: no evaluator means we can't check the condition
-                return NO_MATCH
-            substituted = replace_with_bindings(test, inner_result.bindings)
-            result = evaluator(substituted)
-            if result != Symbol("True") and result is not True:
-                return NO_MATCH
-
-        return success(inner_result.bindings)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Alternatives (a | b | c)
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_alternatives(pattern):
-        for alt in pattern.args:
-            result = _match_impl(alt, expr, bindings, evaluator, max_depth, depth + 1)
-            if result.success:
-                return result
-        return NO_MATCH
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle PatternTest (pat?test)
-    # Fail-safe: if no evaluator, pattern does NOT match
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_pattern_test(pattern):
-        if len(pattern.args) < 2:
-            return NO_MATCH
-
-        inner_pat = pattern.args[0]
-        test_func = pattern.args[1]
-
-        # First match the inner pattern
-        inner_result = _match_impl(
-            inner_pat, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs
-        )
-        if not inner_result.success:
-            return NO_MATCH
-
-        # Then apply the test function
-        if evaluator is None:
-            # Fail-safe: no evaluator means we can't run the test
-            return NO_MATCH
-        test_expr = Expression(test_func, expr)
-        result = evaluator(test_expr)
-        if result != Symbol("True") and result is not True:
-            return NO_MATCH
-
-        return success(inner_result.bindings)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Except (Except[c] or Except[c, pat])
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_except(pattern):
-        if len(pattern.args) < 1:
-            return NO_MATCH
-
-        excluded = pattern.args[0]
-
-        # Check if excluded pattern matches
-        excluded_result = _match_impl(
-            excluded, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs
-        )
-        if excluded_result.success:
-            return NO_MATCH  # Excluded matched → fail
-
-        # If there's an alternative pattern, it must match
-        if len(pattern.args) >= 2:
-            alternative = pattern.args[1]
-            return _match_impl(
-                alternative, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs
-            )
-
-        # No alternative, just check that excluded didn't match
-        return success(bindings)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Repeated (pat..) - one or more
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_repeated(pattern):
-        inner_pat = pattern.args[0] if len(pattern.args) >= 1 else None
-        if inner_pat is None:
-            return NO_MATCH
-        return _match_impl(inner_pat, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle RepeatedNull (pat...) - zero or more
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_repeated_null(pattern):
-        inner_pat = pattern.args[0] if len(pattern.args) >= 1 else None
-        if inner_pat is None:
-            return NO_MATCH
-        result = _match_impl(inner_pat, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs)
-        if result.success:
-            return result
-        return success(bindings)
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle atoms and symbols - must be equal
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_atom(pattern) or is_symbol(pattern):
-        return success(bindings) if pattern == expr else NO_MATCH
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle expressions - match head and arguments
-    # ─────────────────────────────────────────────────────────────────────────
-    if is_expr(pattern) and is_expr(expr):
-        # Match heads
-        head_result = _match_impl(
-            pattern.head, expr.head, bindings, evaluator, max_depth, depth + 1, expr_attrs
-        )
-        if not head_result.success:
-            return NO_MATCH
-
-        # Check for Flat/Orderless attributes
-        # Priority: expr_attrs param > expression's own attributes
-        if expr_attrs is not None:
-            flat = Flat in expr_attrs
-            orderless = Orderless in expr_attrs
-        elif hasattr(expr, "has_attr"):
-            flat = expr.has_attr(Flat)
-            orderless = expr.has_attr(Orderless)
-        else:
-            flat = False
-            orderless = False
-
-        # If Flat, flatten nested same-head expressions in both pattern and expr
-        p_args = pattern.args
-        e_args = expr.args
-        if flat:
-            p_args = _flatten_args(p_args, pattern.head)
-            e_args = _flatten_args(e_args, expr.head)
-
-        # Match arguments
-        for matched_bindings in _match_sequence_impl(
-            p_args,
-            e_args,
-            head_result.bindings,
-            evaluator,
-            flat,
-            orderless,
-            max_depth,
-            depth + 1,
-        ):
-            return success(matched_bindings)
-
+    result = _run(((_MATCH, pattern, expr, expr_attrs), None), bindings, evaluator, [])
+    if result is None:
         return NO_MATCH
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # Default: no match
-    # ─────────────────────────────────────────────────────────────────────────
-    return NO_MATCH
+    return success(result)
 
 
 def _flatten_args(args: tuple, head: Element) -> tuple:
@@ -445,11 +238,15 @@ def _flatten_args(args: tuple, head: Element) -> tuple:
     Used for Flat attribute: Plus[Plus[a, b], c] → (a, b, c)
     """
     result = []
-    for arg in args:
-        if is_expr(arg) and arg.head == head:
-            result.extend(_flatten_args(arg.args, head))
-        else:
+    stack = [iter(args)]
+    while stack:
+        for arg in stack[-1]:
+            if is_expr(arg) and arg.head == head:
+                stack.append(iter(arg.args))
+                break
             result.append(arg)
+        else:
+            stack.pop()
     return tuple(result)
 
 
@@ -465,8 +262,6 @@ def _match_sequence_impl(
     evaluator: Callable[[Element], Element] | None,
     flat: bool,
     orderless: bool,
-    max_depth: int,
-    depth: int,
     expr_attrs: frozenset | None = None,
 ) -> Iterator[Bindings]:
     """
@@ -477,17 +272,231 @@ def _match_sequence_impl(
     - Repeated/RepeatedNull patterns in sequence position
     - Optional patterns in sequence position
     - Flat (associative) matching
-    - Orderless (commutative) matching
+    - Orderless (commutative) matching, by match_commutative()
+
+    Ordered sequences are matched position by position. Every state is
+    first checked against the length bounds and head constraints of the
+    patterns still to match, and states that produced no match are
+    remembered, so that a pattern like {___, x_, ___, x_, ___} explores
+    each (pattern, offset, relevant bindings) state at most once.
     """
+    if orderless:
+        from .commutative import match_commutative
 
-    # Base case: no patterns left
-    if not patterns:
-        if not exprs:
-            yield bindings
+        yield from match_commutative(patterns, exprs, bindings, evaluator, expr_attrs)
         return
 
-    pat = patterns[0]
-    rest_patterns = patterns[1:]
+    cont = _sequence_goals(patterns, exprs, expr_attrs, None, None)
+    if cont is None:
+        return
+    choices: list = []
+    result = _run(cont, bindings, evaluator, choices)
+    while result is not None:
+        yield result
+        result = _run(_RETRY, bindings, evaluator, choices)
+
+
+def _sequence_goals(
+    patterns: tuple[Element, ...],
+    exprs: tuple[Element, ...],
+    expr_attrs: frozenset | None,
+    cont: tuple | None,
+    height: int | None,
+) -> tuple | None:
+    """
+    The goals matching patterns against exprs, then cont; None if the
+    lengths rule out a match. With a height, the first match is committed
+    to: the choice points above height are cut once it is found.
+    """
+    bounds = [_length_bounds(pat) for pat in patterns]
+    if all(bound == (1, 1) for bound in bounds):
+        # One argument per pattern: a single way to match, if any
+        if len(exprs) != len(patterns):
+            return None
+        for i in range(len(patterns) - 1, -1, -1):
+            cont = ((_MATCH, patterns[i], exprs[i], expr_attrs), cont)
+        return cont if cont is not None else _DONE
+
+    plan = _SequencePlan(patterns, exprs, bounds, expr_attrs)
+    if height is not None:
+        cont = ((_CUT, height), cont)
+    return ((_SEQUENCE, plan, 0, 0, False), cont)
+
+
+_UNBOUNDED = float("inf")
+
+
+class _SequencePlan:
+    """
+    Facts about a pattern sequence used to prune matching states.
+
+    Attributes:
+        patterns, exprs: The sequences being matched.
+        expr_attrs: Attributes passed on to matching single arguments.
+        bounds: Fewest and most arguments each pattern can match.
+        variable: Number of patterns that can match other than one argument.
+        min_after, max_after: Fewest and most arguments the patterns from
+            index i on can match.
+        heads: For each head some single-argument patterns require, the
+            number of such patterns from index i on and the number of
+            arguments with that head from offset j on.
+        symbols_after: Symbols occurring in the patterns from index i on;
+            only their bindings can affect how those patterns match.
+        failed: Matching states known to produce no match (used when two
+            or more patterns have a variable length).
+        successes: Number of times the whole sequence has matched; a state
+            that sees no new success before it is backtracked out of failed.
+    """
+
+    __slots__ = (
+        "patterns",
+        "exprs",
+        "expr_attrs",
+        "bounds",
+        "variable",
+        "min_after",
+        "max_after",
+        "heads",
+        "symbols_after",
+        "failed",
+        "successes",
+    )
+
+    def __init__(
+        self,
+        patterns: tuple[Element, ...],
+        exprs: tuple[Element, ...],
+        bounds: list[tuple[int, float]],
+        expr_attrs: frozenset | None = None,
+    ) -> None:
+        self.patterns = patterns
+        self.exprs = exprs
+        self.expr_attrs = expr_attrs
+        self.bounds = bounds
+        self.successes = 0
+        count = len(patterns)
+        self.min_after = [0] * (count + 1)
+        self.max_after: list[float] = [0] * (count + 1)
+        self.variable = 0
+        required: dict[Element, list[int]] = {}
+        for i in range(count - 1, -1, -1):
+            low, high = bounds[i]
+            if (low, high) != (1, 1):
+                self.variable += 1
+            self.min_after[i] = self.min_after[i + 1] + low
+            self.max_after[i] = self.max_after[i + 1] + high
+            head = _single_head(patterns[i])
+            if head is not None:
+                required.setdefault(head, [0] * (count + 1))[i] = 1
+        self.heads: list[tuple[list[int], list[int]]] = []
+        for head, needed in required.items():
+            for i in range(count - 1, -1, -1):
+                needed[i] += needed[i + 1]
+            available = [0] * (len(exprs) + 1)
+            for j in range(len(exprs) - 1, -1, -1):
+                available[j] = available[j + 1] + (head_of(exprs[j]) == head)
+            self.heads.append((needed, available))
+        self.failed: set | None = None
+        if self.variable >= 2:
+            self.failed = set()
+            self.symbols_after = [frozenset()] * (count + 1)
+            for i in range(count - 1, -1, -1):
+                symbols = {node for node in preorder(patterns[i], heads=True) if is_symbol(node)}
+                self.symbols_after[i] = self.symbols_after[i + 1] | symbols
+
+    def state(self, index: int, offset: int, unwrapped: bool, bindings: Bindings) -> tuple:
+        """Memo key of a matching state, keeping only the bindings the
+        patterns from index on can see."""
+        symbols = self.symbols_after[index]
+        seen = frozenset(item for item in bindings.items() if item[0] in symbols)
+        return index, offset, unwrapped, seen
+
+    def known_failure(self, index: int, offset: int, bindings: Bindings) -> bool:
+        """Whether matching the patterns from index on at offset is known to fail."""
+        return self.state(index, offset, False, bindings) in self.failed
+
+    def feasible(self, index: int, offset: int, low: int, high: float) -> bool:
+        """Whether the arguments from offset on can still match the patterns
+        from index on, the one at index matching between low and high."""
+        remaining = len(self.exprs) - offset
+        if remaining < self.min_after[index + 1] + low:
+            return False
+        if remaining > self.max_after[index + 1] + high:
+            return False
+        return all(needed[index] <= available[offset] for needed, available in self.heads)
+
+
+def _length_bounds(pat: Element) -> tuple[int, float]:
+    """Fewest and most arguments a pattern matches in sequence position."""
+    if is_optional(pat):
+        inner = pat.args[0] if pat.args else None
+        return 0, (_length_bounds(inner)[1] if inner is not None else 0)
+    if is_sequence_blank(pat) or _is_named_sequence_pattern(pat):
+        blank = pattern_blank(pat) if is_pattern(pat) else pat
+        return (0 if blank is not None and is_blank_null_sequence(blank) else 1), _UNBOUNDED
+    if is_repeated(pat):
+        return 1, _UNBOUNDED
+    if is_repeated_null(pat):
+        return 0, _UNBOUNDED
+    return 1, 1
+
+
+def _single_head(pat: Element) -> Element | None:
+    """The head of the one argument a pattern (_h, x_h, h[...]) must match."""
+    if is_pattern(pat):
+        pat = pattern_blank(pat)
+    if is_blank(pat):
+        return pat.args[0] if pat.args else None
+    if is_expr(pat) and is_symbol(pat.head) and not is_pattern_construct(pat):
+        return pat.head
+    return None
+
+
+def _sequence_step(
+    plan: _SequencePlan,
+    index: int,
+    offset: int,
+    unwrapped: bool,
+    bindings: Bindings,
+    cont: tuple | None,
+    choices: list,
+) -> tuple | None:
+    """
+    The goals matching patterns[index:] against exprs[offset:], then cont;
+    None if the state cannot match.
+
+    unwrapped: The pattern at index is an Optional known to be present,
+    matched as its inner pattern.
+    """
+    patterns = plan.patterns
+    exprs = plan.exprs
+
+    # Base case: no patterns left
+    if index == len(patterns):
+        if offset != len(exprs):
+            return None
+        plan.successes += 1
+        return cont if cont is not None else _DONE
+
+    pat = patterns[index]
+    if unwrapped:
+        pat = pat.args[0]
+        low, high = _length_bounds(pat)
+    else:
+        low, high = plan.bounds[index]
+    if not plan.feasible(index, offset, low, high):
+        return None
+
+    failed = plan.failed
+    if failed is not None:
+        state = plan.state(index, offset, unwrapped, bindings)
+        if state in failed:
+            return None
+        # Popped with no new success: the state failed
+        choices.append((plan, state, plan.successes))
+
+    # Most arguments pat may take with enough left for the patterns after it
+    longest = min(high, len(exprs) - offset - plan.min_after[index + 1])
 
     # ─────────────────────────────────────────────────────────────────────────
     # Handle Optional in sequence position
@@ -496,54 +505,20 @@ def _match_sequence_impl(
     if is_optional(pat):
         inner = pat.args[0] if len(pat.args) >= 1 else None
         default = get_default_value(pat)
-
-        if inner is not None:
-            # Try matching with the inner pattern
-            yield from _match_sequence_impl(
-                (inner,) + rest_patterns,
-                exprs,
-                bindings,
-                evaluator,
-                flat,
-                orderless,
-                max_depth,
-                depth + 1,
-                expr_attrs,
-            )
-
-        # Try matching as absent: bind default, continue with rest
+        absent = None
         if default is not None and is_pattern(inner):
             name = pattern_name(inner)
             if name is not None:
-                try:
-                    new_bindings = bindings.bind(name, default)
-                    yield from _match_sequence_impl(
-                        rest_patterns,
-                        exprs,
-                        new_bindings,
-                        evaluator,
-                        flat,
-                        orderless,
-                        max_depth,
-                        depth + 1,
-                        expr_attrs,
-                    )
-                except BindingConflict:
-                    pass
+                absent = ((_ABSENT, plan, index, offset, name, default), cont)
         elif default is not None and is_blank(inner):
             # Unnamed optional: just skip
-            yield from _match_sequence_impl(
-                rest_patterns,
-                exprs,
-                bindings,
-                evaluator,
-                flat,
-                orderless,
-                max_depth,
-                depth + 1,
-                expr_attrs,
-            )
-        return
+            absent = ((_SEQUENCE, plan, index + 1, offset, False), cont)
+
+        if inner is None:
+            return None
+        if absent is not None:
+            choices.append((bindings, absent))
+        return ((_SEQUENCE, plan, index, offset, True), cont)
 
     # ─────────────────────────────────────────────────────────────────────────
     # Handle sequence blanks (__, ___) and named sequence patterns
@@ -557,51 +532,12 @@ def _match_sequence_impl(
             name = None
             blank_part = pat
 
-        is_null = is_blank_null_sequence(blank_part) if blank_part is not None else False
-        min_match = 0 if is_null else 1
-
-        # Compute minimum expressions needed by remaining patterns.
-        # BlankNullSequence needs 0, everything else needs at least 1.
-        min_needed_rest = sum(
-            1
-            for p in rest_patterns
-            if not (is_blank_null_sequence(p) or _is_named_null_sequence_pattern(p))
+        # A name the later patterns never see leaves their memo keys
+        # unchanged, so known failures are skipped before binding it
+        unseen = (
+            name is not None and failed is not None and name not in plan.symbols_after[index + 1]
         )
-
-        # Try matching different numbers of expressions
-        for match_count in range(min_match, len(exprs) - min_needed_rest + 1):
-            matched_exprs = exprs[:match_count]
-            remaining_exprs = exprs[match_count:]
-
-            # Check head constraints for each matched expression
-            if blank_part is not None:
-                all_match = all(blank_matches_head(blank_part, e) for e in matched_exprs)
-                if not all_match:
-                    continue
-
-            # Try to bind the sequence
-            new_bindings = bindings
-            if name is not None:
-                # Bind as List[...] (not Sequence[...])
-                seq_value = Expression(Symbol("List"), *matched_exprs)
-                try:
-                    new_bindings = bindings.bind(name, seq_value)
-                except BindingConflict:
-                    continue
-
-            # Continue matching rest of patterns
-            yield from _match_sequence_impl(
-                rest_patterns,
-                remaining_exprs,
-                new_bindings,
-                evaluator,
-                flat,
-                orderless,
-                max_depth,
-                depth + 1,
-                expr_attrs,
-            )
-        return
+        return ((_RUN, plan, index, offset, 0, name, blank_part, low, longest, unseen), cont)
 
     # ─────────────────────────────────────────────────────────────────────────
     # Handle Repeated (pat..) and RepeatedNull (pat...) in sequence position
@@ -609,85 +545,363 @@ def _match_sequence_impl(
     if is_repeated(pat) or is_repeated_null(pat):
         inner = pat.args[0] if len(pat.args) >= 1 else None
         if inner is None:
-            return
+            return None
+        return ((_REPEAT, plan, index, offset, 0, inner, low, longest, False), cont)
 
-        min_count = 0 if is_repeated_null(pat) else 1
-        min_needed_rest = _min_exprs_for_patterns(rest_patterns)
+    # ─────────────────────────────────────────────────────────────────────────
+    # Standard sequential matching
+    # ─────────────────────────────────────────────────────────────────────────
+    if offset >= len(exprs):
+        return None  # No expressions left to match
 
-        for match_count in range(min_count, len(exprs) - min_needed_rest + 1):
-            matched_exprs = exprs[:match_count]
-            remaining_exprs = exprs[match_count:]
+    return (
+        (_MATCH, pat, exprs[offset], plan.expr_attrs),
+        ((_SEQUENCE, plan, index + 1, offset + 1, False), cont),
+    )
 
-            all_ok = True
-            new_bindings = bindings
-            for e in matched_exprs:
-                result = _match_impl(
-                    inner, e, new_bindings, evaluator, max_depth, depth + 1, expr_attrs
-                )
-                if not result.success:
-                    all_ok = False
-                    break
-                new_bindings = result.bindings
-
-            if all_ok:
-                yield from _match_sequence_impl(
-                    rest_patterns,
-                    remaining_exprs,
-                    new_bindings,
-                    evaluator,
-                    flat,
-                    orderless,
-                    max_depth,
-                    depth + 1,
-                    expr_attrs,
-                )
-        return
 
-    # ─────────────────────────────────────────────────────────────────────────
-    # Handle Orderless (commutative) matching
-    # Try each remaining expression for the current pattern position
-    # ─────────────────────────────────────────────────────────────────────────
-    if orderless and len(exprs) > 0:
-        for i in range(len(exprs)):
-            expr = exprs[i]
-            result = _match_impl(pat, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs)
-            if result.success:
-                remaining = exprs[:i] + exprs[i + 1 :]
-                yield from _match_sequence_impl(
-                    rest_patterns,
-                    remaining,
-                    result.bindings,
-                    evaluator,
-                    flat,
-                    False,
-                    max_depth,
-                    depth + 1,
-                    expr_attrs,
+# ═══════════════════════════════════════════════════════════════════════════════
+# MATCHING MACHINE
+# ═══════════════════════════════════════════════════════════════════════════════
+#
+# Matching runs as one loop over goals, not as recursive calls, so nesting
+# costs no Python stack and has no depth limit. The goals still to prove
+# form a continuation: a linked list of (goal, rest) pairs that alternatives
+# share, so saving one is O(1). Bindings are persistent, so a choice point
+# is just the (bindings, continuation) pair to resume when what follows it
+# fails; no trail is needed to undo bindings.
+#
+# A single element commits to its first match, as the recursive matcher
+# did: a goal with several solutions (the arguments of an expression, an
+# Alternatives) is followed by a cut that drops the choice points pushed
+# since it started. Only the positions of a sequence stay choice points for
+# the goals after them.
+
+# Goals (first item of a goal tuple)
+_MATCH = 0  # (_MATCH, pattern, expr, expr_attrs): one element
+_ARGUMENTS = 1  # (_ARGUMENTS, pattern, expr, expr_attrs): arguments, heads matched
+_SEQUENCE = 2  # (_SEQUENCE, plan, index, offset, unwrapped): patterns[index:]
+_RUN = 3  # (_RUN, plan, index, offset, count, name, blank, low, longest, unseen)
+_REPEAT = 4  # (_REPEAT, plan, index, offset, count, inner, low, longest, grow)
+_ABSENT = 5  # (_ABSENT, plan, index, offset, name, default): Optional left out
+_BIND = 6  # (_BIND, name, value)
+_CONDITION = 7  # (_CONDITION, test)
+_TEST = 8  # (_TEST, test_func, expr)
+_ALTERNATIVE = 9  # (_ALTERNATIVE, alternatives, i, expr): alternatives[i:]
+_SOLUTIONS = 10  # (_SOLUTIONS, iterator): each bindings an iterator yields
+_CUT = 11  # (_CUT, height): drop the choice points above height
+_TRUE = 12  # (_TRUE,)
+_FAIL = 13  # (_FAIL,)
+
+_DONE = ((_TRUE,), None)
+_RETRY = ((_FAIL,), None)
+
+# How a pattern matches a single element, by head
+_STRUCTURE = 0
+_LITERAL = 1
+_NOTHING = 2
+_HOLD = 3
+_VERBATIM = 4
+_BLANK = 5
+_PATTERN = 6
+_CONDITIONAL = 7
+_ALTERNATIVES = 8
+_PATTERN_TEST = 9
+_EXCEPT = 10
+_REPEATED = 11
+_REPEATED_NULL = 12
+
+_KINDS: dict[Symbol, int] = {
+    HoldPattern: _HOLD,
+    Verbatim: _VERBATIM,
+    Blank: _BLANK,
+    Pattern: _PATTERN,
+    Condition: _CONDITIONAL,
+    Alternatives: _ALTERNATIVES,
+    PatternTest: _PATTERN_TEST,
+    Except: _EXCEPT,
+    Repeated: _REPEATED,
+    RepeatedNull: _REPEATED_NULL,
+}
+
+_True = Symbol("True")
+
+
+def _element_kind(pattern: Element) -> int:
+    """How a pattern matches a single element."""
+    if isinstance(pattern, Expression):
+        head = pattern.head
+        return _KINDS.get(head, _STRUCTURE) if isinstance(head, Symbol) else _STRUCTURE
+    if is_atom(pattern) or is_symbol(pattern):
+        return _LITERAL
+    return _NOTHING
+
+
+def _run(
+    cont: tuple | None,
+    bindings: Bindings,
+    evaluator: Callable[[Element], Element] | None,
+    choices: list,
+) -> Bindings | None:
+    """
+    Prove the goals of a continuation: the bindings of the first solution,
+    or None if there is none.
+
+    choices is the choice-point stack. It holds (bindings, continuation)
+    pairs to resume and (plan, state, successes) memo entries, which mark a
+    sequence state as failed when popped without a success since. It keeps
+    its choice points after a solution, so running _RETRY with it resumes
+    the search for the next one.
+    """
+    while True:
+        if cont is None:
+            return bindings
+        goal, cont = cont
+        op = goal[0]
+
+        if op == _MATCH:
+            _, pattern, expr, attrs = goal
+            kind = _element_kind(pattern)
+            if kind == _HOLD:
+                pattern = unwrap_hold_pattern(pattern)
+                kind = _element_kind(pattern)
+                if kind == _HOLD:
+                    kind = _STRUCTURE
+
+            if kind == _STRUCTURE:
+                # Match heads, then arguments
+                if isinstance(expr, Expression):
+                    pattern_head = pattern.head
+                    arguments = (_ARGUMENTS, pattern, expr, attrs)
+                    if isinstance(pattern_head, Symbol):
+                        if pattern_head == expr.head:
+                            cont = (arguments, cont)
+                            continue
+                    else:
+                        cont = ((_MATCH, pattern_head, expr.head, attrs), (arguments, cont))
+                        continue
+            elif kind == _LITERAL:
+                if pattern == expr:
+                    continue
+            elif kind == _BLANK:
+                if blank_matches_head(pattern, expr):
+                    continue
+            elif kind == _PATTERN:
+                name = pattern_name(pattern)
+                inner = pattern_blank(pattern)
+                if inner is not None and not is_blank(inner):
+                    if name is not None:
+                        cont = ((_BIND, name, expr), cont)
+                    cont = ((_MATCH, inner, expr, None), cont)
+                    continue
+                if inner is None or blank_matches_head(inner, expr):
+                    if name is None:
+                        continue
+                    try:
+                        bindings = bindings.bind(name, expr)
+                    except BindingConflict:
+                        pass
+                    else:
+                        continue
+            elif kind == _VERBATIM:
+                if len(pattern.args) >= 1 and pattern.args[0] == expr:
+                    continue
+            elif kind == _CONDITIONAL:
+                # Fail-safe: if no evaluator, pattern does NOT match
+                inner = get_condition_pattern(pattern)
+                if inner is not None:
+                    test = get_condition_test(pattern)
+                    if test is not None:
+                        cont = ((_CONDITION, test), cont)
+                    cont = ((_MATCH, inner, expr, attrs), cont)
+                    continue
+            elif kind == _ALTERNATIVES:
+                if pattern.args:
+                    cont = ((_ALTERNATIVE, pattern.args, 0, expr), cont)
+                    continue
+            elif kind == _PATTERN_TEST:
+                # Fail-safe: if no evaluator, pattern does NOT match
+                if len(pattern.args) >= 2:
+                    inner, test_func = pattern.args[0], pattern.args[1]
+                    cont = ((_MATCH, inner, expr, attrs), ((_TEST, test_func, expr), cont))
+                    continue
+            elif kind == _EXCEPT:
+                # Negation as failure: the alternative (or success) is the
+                # choice point a match of the excluded pattern cuts away
+                if len(pattern.args) >= 1:
+                    otherwise = cont
+                    if len(pattern.args) >= 2:
+                        otherwise = ((_MATCH, pattern.args[1], expr, attrs), cont)
+                    height = len(choices)
+                    choices.append((bindings, otherwise))
+                    cont = ((_MATCH, pattern.args[0], expr, attrs), ((_CUT, height), _RETRY))
+                    continue
+            elif kind == _REPEATED:
+                if len(pattern.args) >= 1:
+                    cont = ((_MATCH, pattern.args[0], expr, attrs), cont)
+                    continue
+            elif kind == _REPEATED_NULL and len(pattern.args) >= 1:
+                # Matches with the inner pattern's bindings if it can
+                height = len(choices)
+                choices.append((bindings, cont))
+                cont = ((_MATCH, pattern.args[0], expr, attrs), ((_CUT, height), cont))
+                continue
+
+        elif op == _SEQUENCE:
+            _, plan, index, offset, unwrapped = goal
+            cont = _sequence_step(plan, index, offset, unwrapped, bindings, cont, choices)
+            if cont is not None:
+                continue
+
+        elif op == _ARGUMENTS:
+            _, pattern, expr, attrs = goal
+            # Priority: expr_attrs param > expression's own attributes
+            if attrs is None:
+                attrs = expr.attributes
+            flat = Flat in attrs
+            p_args = pattern.args
+            e_args = expr.args
+            if flat:
+                # Flatten nested same-head expressions in both pattern and expr
+                p_args = _flatten_args(p_args, pattern.head)
+                e_args = _flatten_args(e_args, expr.head)
+            if Orderless in attrs:
+                from .commutative import match_commutative
+
+                solutions = match_commutative(p_args, e_args, bindings, evaluator)
+                cont = ((_SOLUTIONS, solutions), ((_CUT, len(choices)), cont))
+                continue
+            cont = _sequence_goals(p_args, e_args, None, cont, len(choices))
+            if cont is not None:
+                continue
+
+        elif op == _RUN:
+            step = _run_step(goal, bindings, cont, choices)
+            if step is not None:
+                bindings, cont = step
+                continue
+
+        elif op == _REPEAT:
+            # Each longer run extends the bindings of the shorter one
+            _, plan, index, offset, count, inner, low, longest, grow = goal
+            if grow:
+                longer = (_REPEAT, plan, index, offset, count + 1, inner, low, longest, False)
+                cont = (
+                    (_MATCH, inner, plan.exprs[offset + count], plan.expr_attrs),
+                    (longer, cont),
                 )
-        return
+                continue
+            if count >= low:
+                if count < longest:
+                    choices.append((bindings, ((*goal[:-1], True), cont)))
+                cont = ((_SEQUENCE, plan, index + 1, offset + count, False), cont)
+                continue
+            if count < longest:
+                cont = ((*goal[:-1], True), cont)
+                continue
+
+        elif op == _BIND:
+            try:
+                bindings = bindings.bind(goal[1], goal[2])
+            except BindingConflict:
+                pass
+            else:
+                continue
 
-    # ─────────────────────────────────────────────────────────────────────────
-    # Standard sequential matching
-    # ─────────────────────────────────────────────────────────────────────────
-    if not exprs:
-        return  # No expressions left to match
-
-    expr = exprs[0]
-    rest_exprs = exprs[1:]
-
-    result = _match_impl(pat, expr, bindings, evaluator, max_depth, depth + 1, expr_attrs)
-    if result.success:
-        yield from _match_sequence_impl(
-            rest_patterns,
-            rest_exprs,
-            result.bindings,
-            evaluator,
-            flat,
-            orderless,
-            max_depth,
-            depth + 1,
-            expr_attrs,
-        )
+        elif op == _CUT:
+            del choices[goal[1] :]
+            continue
+
+        elif op == _ALTERNATIVE:
+            # The first alternative that matches is committed to
+            _, alternatives, i, expr = goal
+            height = len(choices)
+            if i + 1 < len(alternatives):
+                choices.append((bindings, ((_ALTERNATIVE, alternatives, i + 1, expr), cont)))
+            cont = ((_MATCH, alternatives[i], expr, None), ((_CUT, height), cont))
+            continue
+
+        elif op == _CONDITION:
+            if evaluator is not None:
+                result = evaluator(replace_with_bindings(goal[1], bindings))
+                if result == _True or result is True:
+                    continue
+
+        elif op == _TEST:
+            if evaluator is not None:
+                result = evaluator(Expression(goal[1], goal[2]))
+                if result == _True or result is True:
+                    continue
+
+        elif op == _SOLUTIONS:
+            solution = next(goal[1], None)
+            if solution is not None:
+                choices.append((bindings, (goal, cont)))
+                bindings = solution
+                continue
+
+        elif op == _ABSENT:
+            _, plan, index, offset, name, default = goal
+            try:
+                bindings = bindings.bind(name, default)
+            except BindingConflict:
+                pass
+            else:
+                cont = ((_SEQUENCE, plan, index + 1, offset, False), cont)
+                continue
+
+        elif op == _TRUE:
+            continue
+
+        # Failure: resume the latest choice point
+        while True:
+            if not choices:
+                return None
+            entry = choices.pop()
+            if len(entry) == 2:
+                bindings, cont = entry
+                break
+            plan, state, successes = entry
+            if plan.successes == successes:
+                plan.failed.add(state)
+
+
+def _run_step(
+    goal: tuple, bindings: Bindings, cont: tuple | None, choices: list
+) -> tuple[Bindings, tuple] | None:
+    """
+    Prove a _RUN goal: a sequence blank taking count or more arguments,
+    fewest first. A run stops growing at the first argument failing the
+    head constraint. Returns the new bindings and continuation, or None.
+    """
+    _, plan, index, offset, count, name, blank_part, low, longest, unseen = goal
+    exprs = plan.exprs
+    while count <= longest:
+        if (
+            count
+            and blank_part is not None
+            and not blank_matches_head(blank_part, exprs[offset + count - 1])
+        ):
+            return None
+        if count < low or (unseen and plan.known_failure(index + 1, offset + count, bindings)):
+            count += 1
+            continue
+
+        # Try to bind the sequence, as List[...] (not Sequence[...])
+        new_bindings = bindings
+        if name is not None:
+            seq_value = Expression._from_parts(_List, exprs[offset : offset + count])
+            try:
+                new_bindings = bindings.bind(name, seq_value)
+            except BindingConflict:
+                count += 1
+                continue
+
+        if count < longest:
+            longer = (_RUN, plan, index, offset, count + 1, name, blank_part, low, longest, unseen)
+            choices.append((bindings, (longer, cont)))
+        return new_bindings, ((_SEQUENCE, plan, index + 1, offset + count, False), cont)
+    return None
 
 
 def _is_named_sequence_pattern(pattern: Element) -> bool:
@@ -706,25 +920,20 @@ def _is_named_null_sequence_pattern(pattern: Element) -> bool:
     return inner is not None and is_blank_null_sequence(inner)
 
 
-def _min_exprs_for_patterns(patterns: tuple) -> int:
-    """Compute minimum number of expressions needed to match a pattern tuple."""
-    count = 0
-    for p in patterns:
-        if is_blank_null_sequence(p):
-            continue
-        if _is_named_null_sequence_pattern(p):
-            continue
-        if is_repeated_null(p):
-            continue
-        count += 1
-    return count
-
-
 # ═══════════════════════════════════════════════════════════════════════════════
 # SUBSTITUTION
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+MAX_TEMPLATE_PLANS = 1 << 12
+"""Substitution plans kept in the cache; the oldest entry is evicted first."""
+
+_plans: dict[tuple[int, int], tuple[Element, object]] = {}
+
+# Plan of a subtree that substitution leaves as it is
+_UNTOUCHED = None
+
+
 def replace_with_bindings(
     expr: Element,
     bindings: Bindings,
@@ -737,6 +946,10 @@ def replace_with_bindings(
     When flatten_lists is True (default), bound sequences (List[...])
     are flattened into argument lists — needed for pattern matching.
     Set flatten_lists=False for simple symbol substitution (e.g., Module).
+
+    The paths of expr that can hold a bound symbol are found once per
+    expression and set of names (see template_plan) and only they are
+    rebuilt: every other subtree of the result is the original object.
     """
     if not bindings:
         return expr
@@ -744,41 +957,144 @@ def replace_with_bindings(
     return _replace_impl(expr, bindings, flatten_lists)
 
 
-def _replace_impl(expr: Element, bindings: Bindings, flatten_lists: bool = True) -> Element:
-    """Internal implementation of substitution."""
+def template_plan(expr: Element, names_mask: int) -> object:
+    """
+    The substitution plan of expr for names whose symbol bits are in
+    names_mask, cached by the identity of expr.
 
-    # Check if this is a bound symbol
-    if is_symbol(expr) and expr in bindings:
-        return bindings[expr]
+    A plan is _UNTOUCHED for a subtree whose symbol mask shares no bit
+    with names_mask, the symbol itself for a symbol that may be bound, and
+    (expr, head plan, ((index, argument plan), ...)) for an expression
+    with such subtrees.
+    """
+    key = (id(expr), names_mask)
+    cached = _plans.get(key)
+    if cached is not None and cached[0] is expr:
+        return cached[1]
+    plan = _build_plan(expr, names_mask)
+    if len(_plans) >= MAX_TEMPLATE_PLANS:
+        del _plans[next(iter(_plans))]
+    _plans[key] = (expr, plan)
+    return plan
 
-    # Atoms stay as-is
-    if is_atom(expr) or is_symbol(expr):
-        return expr
 
-    # Recursively process expressions
-    if is_expr(expr):
-        new_head = _replace_impl(expr.head, bindings, flatten_lists)
-        new_args = tuple(_replace_impl(arg, bindings, flatten_lists) for arg in expr.args)
-
-        if flatten_lists:
-            # Flatten List-bound sequences in arguments
-            flattened_args: list[Element] = []
-            for arg in new_args:
-                if is_expr(arg) and arg.head == Symbol("List"):
-                    # Flatten List[...] into argument list
-                    flattened_args.extend(arg.args)
-                else:
-                    flattened_args.append(arg)
-        else:
-            flattened_args = list(new_args)
+def template_plan_count() -> int:
+    """Number of substitution plans in the cache."""
+    return len(_plans)
 
-        # Only create new expression if something changed
-        if new_head == expr.head and tuple(flattened_args) == expr.args:
-            return expr
 
-        return Expression(new_head, *flattened_args, _attrs=expr.attributes)
+def clear_template_plans() -> None:
+    """Empty the substitution plan cache."""
+    _plans.clear()
+
+
+def _names_mask(bindings: Bindings) -> int:
+    """Mask of the symbol bits of the bound names."""
+    mask = 0
+    for name in bindings:
+        if isinstance(name, Symbol):
+            mask |= symbol_bit(name)
+    return mask
+
+
+def _build_plan(expr: Element, names_mask: int) -> object:
+    """Substitution plan of expr (see template_plan), built bottom-up."""
+
+    def leaf(atom: Element) -> object:
+        if isinstance(atom, Symbol) and symbol_bit(atom) & names_mask:
+            return atom
+        return _UNTOUCHED
+
+    def node(item: Expression, head_plan: object, arg_plans: list[object]) -> object:
+        touched = tuple(
+            (i, plan)
+            for i, plan in enumerate(arg_plans)
+            if plan is not _UNTOUCHED and not isinstance(plan, Expression)
+        )
+        if isinstance(head_plan, Expression):
+            head_plan = _UNTOUCHED
+        if head_plan is _UNTOUCHED and not touched:
+            return _UNTOUCHED
+        return (item, head_plan, touched)
+
+    # Subtrees without any of the bits are not entered and come back as
+    # themselves (an Expression), which node() reads as untouched
+    plan = fold(expr, leaf, node, enter=lambda e: e.symbol_mask & names_mask)
+    return _UNTOUCHED if isinstance(plan, Expression) else plan
+
 
-    return expr
+def _replace_impl(expr: Element, bindings: Bindings, flatten_lists: bool = True) -> Element:
+    """Internal implementation of substitution (bottom-up, without recursion)."""
+    plan = template_plan(expr, _names_mask(bindings))
+    if plan is _UNTOUCHED:
+        return expr
+    if isinstance(plan, Symbol):
+        return bindings.get(plan, plan)
+
+    values: list[Element] = []
+    stack: list[tuple[object, bool]] = [(plan, False)]
+    while stack:
+        step, expanded = stack.pop()
+        if isinstance(step, Symbol):
+            values.append(bindings.get(step, step))
+            continue
+        item, head_plan, touched = step
+        if not expanded:
+            stack.append((step, True))
+            stack.extend((arg_plan, False) for _, arg_plan in reversed(touched))
+            if head_plan is not _UNTOUCHED:
+                stack.append((head_plan, False))
+            continue
+
+        has_head = head_plan is not _UNTOUCHED
+        start = len(values) - len(touched) - has_head
+        head = values[start] if has_head else item.head
+        arg_values = values[start + has_head :]
+        del values[start:]
+        values.append(_substituted_node(item, head, touched, arg_values, flatten_lists))
+    return values[0]
+
+
+def _substituted_node(
+    expr: Expression,
+    head: Element,
+    touched: tuple,
+    arg_values: list[Element],
+    flatten_lists: bool,
+) -> Element:
+    """expr with its head and touched arguments replaced (expr itself if unchanged)."""
+    old_args = expr.args
+    args: list[Element] | None = None
+    spliced: list[int] = []
+    for (i, arg_plan), new in zip(touched, arg_values, strict=True):
+        if new is not old_args[i]:
+            if args is None:
+                args = list(old_args)
+            args[i] = new
+            # Bound sequences (List[...]) are flattened into the arguments
+            if flatten_lists and isinstance(arg_plan, Symbol) and _is_list(new):
+                spliced.append(i)
+    if args is None:
+        if head is expr.head:
+            return expr
+        args = list(old_args)
+    if spliced:
+        flattened: list[Element] = []
+        last = 0
+        for i in spliced:
+            flattened.extend(args[last:i])
+            flattened.extend(args[i].args)
+            last = i + 1
+        flattened.extend(args[last:])
+        args = flattened
+    if head is not expr.head:
+        return Expression(head, *args, _attrs=expr.attributes)
+    return Expression._from_parts(head, tuple(args), expr.attributes)
+
+
+def _is_list(elem: Element) -> bool:
+    """Whether elem is a List[...] expression."""
+    return isinstance(elem, Expression) and elem.head == _List
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -794,16 +1110,21 @@ def find_matches(
     """
     Find all subexpressions that match a pattern.
 
-    Traverses the expression tree and yields each subexpression
-    that matches the pattern along with its bindings.
+    Traverses the expression tree (pre-order, heads excluded) and yields
+    each subexpression that matches the pattern along with its bindings.
+    Subtrees whose symbol mask lacks a symbol the pattern requires are
+    skipped without being visited.
     """
-    result = match(pattern, expr, evaluator=evaluator)
-    if result.success:
-        yield (expr, result.bindings)
+    from .compiler import compile_pattern
 
-    if is_expr(expr):
-        for arg in expr.args:
-            yield from find_matches(pattern, arg, evaluator)
+    compiled = compile_pattern(pattern)
+    required = compiled.symbols
+    for subexpr in preorder(expr, enter=lambda e: not required & ~e.symbol_mask):
+        if required & ~symbol_mask_of(subexpr):
+            continue
+        result = compiled.match(subexpr, evaluator=evaluator)
+        if result.success:
+            yield (subexpr, result.bindings)
 
 
 def find_all_matches(
@@ -824,5 +1145,16 @@ def count_matches(
 ) -> int:
     """
     Count how many subexpressions match a pattern.
+
+    Like find_matches(), but each subexpression is only tested, so no
+    bindings are built.
     """
-    return sum(1 for _ in find_matches(pattern, expr, evaluator))
+    from .compiler import compile_pattern
+
+    compiled = compile_pattern(pattern)
+    required = compiled.symbols
+    count = 0
+    for subexpr in preorder(expr, enter=lambda e: not required & ~e.symbol_mask):
+        if not required & ~symbol_mask_of(subexpr) and compiled.matches(subexpr, evaluator):
+            count += 1
+    return count
@@ -0,0 +1,154 @@
+"""
+Search - Pattern queries over the subexpressions of a tree.
+
+search() visits the subexpressions of an expression in the order of the
+Wolfram Language level functions (depth first, each node after its head
+and arguments) and yields those that match a pattern, with their
+positions. It is the engine of Cases, Position, Count, FreeQ and MemberQ.
+
+Levels:
+    A subexpression at position (i1, ..., ik) is at level k; the whole
+    expression is at level 0 and a head is at position (..., 0). A level
+    bound n >= 0 means level n; a bound -n means the subexpressions of
+    depth n (atoms have depth 1, f[x] has depth 2). levels=(low, high)
+    selects the subexpressions within both bounds; either bound may be
+    INFINITY.
+
+Pruning:
+    The symbols every match must contain come from the compiled pattern.
+    A subtree whose symbol mask lacks any of them holds no match and is
+    skipped, and so is every level below the highest one searched, so a
+    FreeQ for a symbol absent from a large tree costs one mask test.
+
+With bind=False the search only tests each subexpression (see
+CompiledPattern.matches) and builds no bindings.
+
+Usage:
+    from minimatic.pattern.search import search
+
+    [pos for pos, _, _ in search(blank(Integer), expr, (1, INFINITY))]
+    any(search(x, expr, ALL_LEVELS, heads=True, bind=False))
+"""
+
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING
+
+from minimatic.core.expression import Expression, symbol_mask_of
+from minimatic.core.walk import postorder
+
+from .bindings import Bindings
+from .compiler import CompiledPattern, compile_pattern
+
+if TYPE_CHECKING:
+    from minimatic.core.atoms import Element
+
+Evaluator = Callable[["Element"], "Element"]
+
+INFINITY = float("inf")
+"""Unbounded level."""
+
+ALL_LEVELS = (0, INFINITY)
+"""Level bounds of every subexpression, the expression itself included."""
+
+
+def search(
+    pattern: Element,
+    expr: Element,
+    levels: tuple[int | float, int | float] = ALL_LEVELS,
+    heads: bool = False,
+    evaluator: Evaluator | None = None,
+    bind: bool = True,
+) -> Iterator[tuple[tuple[int, ...], Element, Bindings | None]]:
+    """
+    Find the subexpressions of an expression that match a pattern.
+
+    Args:
+        pattern: The pattern to match.
+        expr: The expression to search.
+        levels: (low, high) level bounds, see the module docstring.
+        heads: Also search the heads of expressions.
+        evaluator: Evaluation callback for Condition and PatternTest.
+        bind: Whether to yield the bindings of each match (None if not).
+
+    Yields:
+        (position, subexpression, bindings) for each match, in level order.
+    """
+    compiled = compile_pattern(pattern)
+    for position, item in candidates(compiled, expr, levels, heads):
+        if bind:
+            result = compiled.match(item, evaluator=evaluator)
+            if result.success:
+                yield position, item, result.bindings
+        elif compiled.matches(item, evaluator):
+            yield position, item, None
+
+
+def candidates(
+    compiled: CompiledPattern,
+    expr: Element,
+    levels: tuple[int | float, int | float] = ALL_LEVELS,
+    heads: bool = False,
+) -> Iterator[tuple[tuple[int, ...], Element]]:
+    """
+    The subexpressions search() matches against a compiled pattern: those
+    within the level bounds whose symbol masks have every symbol the
+    pattern needs, with their positions, in level order.
+
+    For callers that match each subexpression themselves (as the search
+    built-ins do, to evaluate Conditions and PatternTests on the
+    evaluator's explicit stack).
+    """
+    required = compiled.symbols
+    low, high = levels
+    depths = _depths(expr, heads) if low < 0 or high < 0 else None
+
+    stack: list[tuple[Element, tuple[int, ...], bool]] = [(expr, (), False)]
+    while stack:
+        item, position, expanded = stack.pop()
+        if not expanded:
+            if required & ~symbol_mask_of(item):
+                continue
+            if isinstance(item, Expression) and _descend(item, len(position), high):
+                stack.append((item, position, True))
+                args = item.args
+                for i in range(len(args), 0, -1):
+                    stack.append((args[i - 1], (*position, i), False))
+                if heads:
+                    stack.append((item.head, (*position, 0), False))
+                continue
+        if depths is not None:
+            depth = depths.get(id(item), 1) if isinstance(item, Expression) else 1
+            if not _within(len(position), depth, low, high):
+                continue
+        elif not low <= len(position) <= high:
+            continue
+        yield position, item
+
+
+def _descend(expr: Expression, level: int, high: int | float) -> bool:
+    """Whether any subexpression of expr can be within the high bound."""
+    if high >= 0:
+        return level < high
+    # Depth of expr is at most its cached argument depth + 1
+    return bool(expr.args) and expr.depth >= -high
+
+
+def _within(level: int, depth: int, low: int | float, high: int | float) -> bool:
+    """Whether a subexpression at level with depth is within the bounds."""
+    if (level < low) if low >= 0 else (depth > -low):
+        return False
+    return (level <= high) if high >= 0 else (depth >= -high)
+
+
+def _depths(expr: Element, heads: bool) -> dict[int, int]:
+    """Depth of every expression in a tree, by id."""
+    depths: dict[int, int] = {}
+    for item in postorder(expr, heads):
+        if isinstance(item, Expression):
+            deepest = 0
+            for arg in item.args:
+                arg_depth = depths[id(arg)] if isinstance(arg, Expression) else 1
+                if arg_depth > deepest:
+                    deepest = arg_depth
+            depths[id(item)] = deepest + 1
+    return depths
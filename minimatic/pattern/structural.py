@@ -407,7 +407,12 @@ def is_pattern_construct(obj: object) -> bool:
     """
     if not is_expr(obj):
         return False
-    return obj.head in (
+    head = obj.head
+    return isinstance(head, Symbol) and head in _CONSTRUCT_HEADS
+
+
+_CONSTRUCT_HEADS = frozenset(
+    {
         Pattern,
         Condition,
         Alternatives,
@@ -421,7 +426,8 @@ def is_pattern_construct(obj: object) -> bool:
         Blank,
         BlankSequence,
         BlankNullSequence,
-    )
+    }
+)
 
 
 # PATTERN UTILITIES
@@ -533,7 +539,7 @@ def collect_pattern_names(pat: Element) -> set[Symbol]:
     """
     Collect all named pattern variables in a pattern.
 
-    Recursively traverses the pattern to find all Pattern[name, _]
+    Traverses the pattern to find all Pattern[name, _]
     constructs and returns the set of bound names.
 
     Args:
@@ -550,8 +556,9 @@ def collect_pattern_names(pat: Element) -> set[Symbol]:
         {Symbol("x"), Symbol("y")}
     """
     names: set[Symbol] = set()
-
-    def collect(p: Element) -> None:
+    stack = [pat]
+    while stack:
+        p = stack.pop()
         if is_pattern(p):
             name = pattern_name(p)
             if name is not None:
@@ -559,10 +566,7 @@ def collect_pattern_names(pat: Element) -> set[Symbol]:
             # Also check nested pattern
             inner = pattern_blank(p)
             if inner is not None:
-                collect(inner)
+                stack.append(inner)
         elif is_expr(p):
-            for arg in p.args:
-                collect(arg)
-
-    collect(pat)
+            stack.extend(p.args)
     return names
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import math
+
+import pytest
+
 # Force registration of builtins
 import minimatic.builtins.arithmetic  # noqa: F401
 from minimatic.core.expression import Expression, is_expr
+from minimatic.core.packed import is_packed, pack_values
 from minimatic.core.symbol import Symbol
 from minimatic.eval.evaluator import evaluate
 
@@ -20,6 +25,7 @@ Exp = Symbol("Exp")
 Log = Symbol("Log")
 Sum = Symbol("Sum")
 Product = Symbol("Product")
+List = Symbol("List")
 
 
 class TestPlus:
@@ -219,3 +225,88 @@ class TestSumExtended:
             Expression(Product, i, Expression(Symbol("List"), i, 2, 4)), ctx
         )
         assert result == 24
+
+
+class TestPackedKernels:
+    def test_plus_packed_arrays(self, ctx):
+        result = evaluate(Expression(Plus, pack_values([1.0, 2.0]), pack_values([0.5, 0.25])), ctx)
+        assert is_packed(result)
+        assert result == Expression(List, 1.5, 2.25)
+
+    def test_plus_scalar_broadcast(self, ctx):
+        result = evaluate(Expression(Plus, pack_values([1, 2, 3]), 10), ctx)
+        assert is_packed(result)
+        assert result.typecode == "q"
+        assert result.args == (11, 12, 13)
+
+    def test_times_many_arguments(self, ctx):
+        a = pack_values([1.0, 2.0])
+        result = evaluate(Expression(Times, a, a, 2), ctx)
+        assert is_packed(result)
+        assert result.args == (2.0, 8.0)
+
+    def test_power(self, ctx):
+        result = evaluate(Expression(Power, pack_values([1.5, 2.5]), 2), ctx)
+        assert is_packed(result)
+        assert result == Expression(List, 2.25, 6.25)
+
+    def test_unary_functions(self, ctx):
+        values = pack_values([1.0, 4.0])
+        assert evaluate(Expression(Sqrt, values), ctx).args == (1.0, 2.0)
+        assert evaluate(Expression(Abs, pack_values([-1, 2])), ctx).args == (1, 2)
+        assert evaluate(Expression(Exp, pack_values([0.0])), ctx).args == (1.0,)
+        assert evaluate(Expression(Log, values), ctx).args[0] == 0.0
+
+    def test_matches_unpacked_threading(self, ctx):
+        values = [0.5, 1.5, 2.5]
+        packed = evaluate(Expression(Times, pack_values(values), 3), ctx)
+        unpacked = evaluate(Expression(Times, Expression(List, *values), 3), ctx)
+        assert packed == unpacked
+
+    @pytest.mark.parametrize(
+        "head, args",
+        [
+            (Sqrt, [[4, 2]]),
+            (Sqrt, [[4.0, 2.5, 0.0]]),
+            (Power, [[4.0, 2.0, -1.0], 2]),
+            (Power, [[0, 2, 3], [1.0, 0.5, -1.0]]),
+            (Times, [[0.0, -0.0, 2.5], 3]),
+            (Times, [[0.5, 4.0], [2.0, 0.25]]),
+            (Times, [[1e308, 3.0], [10.0, 1e-308], [1e-308, 0.5]]),
+            (Plus, [[-0.0, 0.1], [-0.0, 0.2], [-0.0, 1e16]]),
+            (Plus, [[1, 2], [3, 4], 2.5]),
+            (Log, [[1, 2.0]]),
+            (Abs, [[-1, 2]]),
+        ],
+    )
+    def test_same_results_as_threading(self, ctx, head, args):
+        packed = [pack_values(a) if isinstance(a, list) else a for a in args]
+        unpacked = [Expression(List, *a) if isinstance(a, list) else a for a in args]
+        result = evaluate(Expression(head, *packed), ctx)
+        expected = evaluate(Expression(head, *unpacked), ctx)
+        assert [(type(v), v) for v in result.args] == [(type(v), v) for v in expected.args]
+        assert [math.copysign(1, v) for v in result.args if v == 0] == [
+            math.copysign(1, v) for v in expected.args if v == 0
+        ]
+
+    def test_down_values_apply_to_elements(self, ctx):
+        ctx.add_down_value(Sqrt, Expression(Sqrt, 4), "two")
+        result = evaluate(Expression(Sqrt, pack_values([4, 9])), ctx)
+        assert result == Expression(List, "two", 3)
+
+    def test_domain_error_falls_back(self, ctx):
+        result = evaluate(Expression(Sqrt, pack_values([4.0, -4.0])), ctx)
+        assert not is_packed(result)
+        assert result.args[0] == 2
+        assert isinstance(result.args[1], complex)
+
+    def test_symbolic_argument_falls_back(self, ctx):
+        x = Symbol("x")
+        result = evaluate(Expression(Plus, pack_values([1, 2]), x), ctx)
+        assert not is_packed(result)
+        assert result.head == List
+        assert result.args[0] == Expression(Plus, 1, x)
+
+    def test_length_mismatch_unevaluated(self, ctx):
+        expr = Expression(Plus, pack_values([1, 2]), pack_values([1, 2, 3]))
+        assert evaluate(expr, ctx) == expr
@@ -2,11 +2,27 @@
 
 from __future__ import annotations
 
+import importlib
+import sys
+
+import pytest
+
 # Force registration of builtins
 import minimatic.builtins.control  # noqa: F401
+from minimatic.builtins.registry import builtin_attributes
+from minimatic.core.attributes import Protected, Temporary
 from minimatic.core.expression import Expression, is_expr
-from minimatic.core.symbol import Symbol
-from minimatic.eval.evaluator import evaluate
+from minimatic.core.symbol import Symbol, is_temporary, symbol_count, temporary_count
+from minimatic.eval.context import EvaluationContext
+from minimatic.eval.evaluator import (
+    RecursionLimitError,
+    _get_eval_state,
+    evaluate,
+    set_iteration_limit,
+    set_recursion_limit,
+)
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.structural import condition, pattern
 
 If = Symbol("If")
 Which = Symbol("Which")
@@ -43,6 +59,113 @@ Set = Symbol("Set")
 SetDelayed = Symbol("SetDelayed")
 
 
+class TestDefinitions:
+    def test_set_delayed_down_value(self, ctx):
+        f, x = Symbol("f"), Symbol("x")
+        evaluate(Expression(SetDelayed, Expression(f, pattern(x)), Expression(Plus, x, 1)), ctx)
+        assert evaluate(Expression(f, 2), ctx) == 3
+
+    def test_set_down_value_table(self, ctx):
+        f = Symbol("f")
+        for i in range(200):
+            assert evaluate(Expression(Set, Expression(f, i), i * i), ctx) == i * i
+        assert evaluate(Expression(f, 150), ctx) == 22500
+        assert evaluate(Expression(f, 200), ctx) == Expression(f, 200)
+
+    def test_specific_value_before_patterns(self, ctx):
+        f, x = Symbol("f"), Symbol("x")
+        evaluate(
+            Expression(SetDelayed, Expression(f, pattern(x, blank(Symbol("Integer")))), 0), ctx
+        )
+        evaluate(Expression(Set, Expression(f, 1), "one"), ctx)
+        assert evaluate(Expression(f, 1), ctx) == "one"
+        assert evaluate(Expression(f, 2), ctx) == 0
+
+    def test_memoized_fibonacci(self, ctx):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        fib, n = Symbol("fib"), Symbol("n")
+        evaluate(Expression(Set, Expression(fib, 0), 0), ctx)
+        evaluate(Expression(Set, Expression(fib, 1), 1), ctx)
+        # fib[n_] := fib[n] = fib[n - 1] + fib[n - 2]
+        recursive = Expression(
+            Plus,
+            Expression(fib, Expression(Plus, n, -1)),
+            Expression(fib, Expression(Plus, n, -2)),
+        )
+        memo = Expression(Set, Expression(fib, n), recursive)
+        evaluate(Expression(SetDelayed, Expression(fib, pattern(n)), memo), ctx)
+        # Without the stored values this takes about 10 ** 31 calls
+        assert evaluate(Expression(fib, 150), ctx) == 9969216677189303386214405760200
+        # fib[0] ... fib[150] and fib[n_]
+        assert len(ctx.get_down_values(fib)) == 152
+
+    def test_same_left_hand_side_replaced(self, ctx):
+        f = Symbol("f")
+        evaluate(Expression(Set, Expression(f, 1), "one"), ctx)
+        evaluate(Expression(Set, Expression(f, 1), "uno"), ctx)
+        assert evaluate(Expression(f, 1), ctx) == "uno"
+        assert len(ctx.get_down_values(f)) == 1
+
+    def test_set_delayed_sub_value(self, ctx):
+        f, x, y = Symbol("f"), Symbol("x"), Symbol("y")
+        lhs = Expression(Expression(f, pattern(x)), pattern(y))
+        evaluate(Expression(SetDelayed, lhs, Expression(List, x, y)), ctx)
+        assert evaluate(Expression(Expression(f, 1), 2), ctx) == Expression(List, 1, 2)
+
+    def test_condition_on_left_hand_side(self, ctx):
+        import minimatic.builtins.comparison  # noqa: F401
+
+        f, x = Symbol("f"), Symbol("x")
+        # f[x_] /; x > 0 := 7
+        lhs = condition(Expression(f, pattern(x)), Expression(Symbol("Greater"), x, 0))
+        assert evaluate(Expression(SetDelayed, lhs, 7), ctx) == Symbol("Null")
+        assert evaluate(Expression(f, 3), ctx) == 7
+        assert evaluate(Expression(f, -1), ctx) == Expression(f, -1)
+        assert ctx.get_down_values(Symbol("Condition")) == []
+
+    def test_set_evaluates_left_hand_side_arguments(self, ctx):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        f, g, x = Symbol("f"), Symbol("g"), Symbol("x")
+        evaluate(Expression(Set, Expression(f, Expression(Plus, 1, 1)), 3), ctx)
+        assert evaluate(Expression(f, 2), ctx) == 3
+        # Pattern arguments are left alone, even for a symbol with a value
+        evaluate(Expression(Set, x, 5), ctx)
+        evaluate(Expression(Set, Expression(g, pattern(x)), 1), ctx)
+        assert evaluate(Expression(g, 7), ctx) == 1
+
+    def test_set_list_left_hand_side_unevaluated(self, ctx):
+        a, b = Symbol("a"), Symbol("b")
+        expr = Expression(Set, Expression(List, a, b), Expression(List, 1, 2))
+        assert evaluate(expr, ctx) == expr
+        assert ctx.get_down_values(List) == []
+        assert evaluate(Expression(List, a, b), ctx) == Expression(List, a, b)
+
+    def test_list_protected_as_builtin(self, ctx):
+        assert Protected in builtin_attributes(List)
+        x = Symbol("x")
+        expr = Expression(SetDelayed, Expression(List, pattern(x)), x)
+        assert evaluate(expr, ctx) == expr
+        assert ctx.get_down_values(List) == []
+
+    def test_builtin_head_unevaluated(self, ctx):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        x, y = Symbol("x"), Symbol("y")
+        expr = Expression(SetDelayed, Expression(Plus, pattern(x), pattern(y)), 0)
+        assert evaluate(expr, ctx) == expr
+        assert ctx.get_down_values(Plus) == []
+        assert evaluate(Expression(Plus, 1, 2), ctx) == 3
+
+    def test_protected_head_unevaluated(self, ctx):
+        h = Symbol("h")
+        ctx.set_attributes(h, frozenset({Protected}))
+        expr = Expression(Set, Expression(h, 1), 2)
+        assert evaluate(expr, ctx) == expr
+        assert ctx.get_down_values(h) == []
+
+
 class TestIf:
     def test_if_true_branch(self, ctx):
         result = evaluate(Expression(If, True, 1, 2), ctx)
@@ -77,6 +200,28 @@ class TestIf:
         result = evaluate(Expression(If, True, 1, Expression(Plus)), ctx)
         assert result == 1
 
+    def test_recursion_through_if_deeper_than_python_stack(self, ctx):
+        import minimatic.builtins.arithmetic  # noqa: F401
+        import minimatic.builtins.comparison  # noqa: F401
+
+        f, n = Symbol("f"), Symbol("n")
+        # f[n_] := If[n == 0, 0, 1 + f[n - 1]]
+        body = Expression(
+            If,
+            Expression(Symbol("Equal"), n, 0),
+            0,
+            Expression(Plus, 1, Expression(f, Expression(Plus, n, -1))),
+        )
+        ctx.add_down_value(f, Expression(f, pattern(n)), body)
+        depth = 2 * sys.getrecursionlimit()
+        old_recursion = set_recursion_limit(4 * depth)
+        old_iteration = set_iteration_limit(10 * depth)
+        try:
+            assert evaluate(Expression(f, depth), ctx) == depth
+        finally:
+            set_recursion_limit(old_recursion)
+            set_iteration_limit(old_iteration)
+
 
 class TestWhich:
     def test_which_first_match(self, ctx):
@@ -460,6 +605,76 @@ class TestModule:
         # x becomes a gensym, should be a Symbol
         assert is_expr(result) or isinstance(result, Symbol)
 
+    def test_module_locals_are_temporary(self, ctx):
+        x = Symbol("x")
+        local = evaluate(Expression(Module, Expression(List, x), x), ctx)
+        assert is_temporary(local)
+        assert Temporary in ctx.get_attributes(local)
+
+    def test_module_locals_change_no_version(self, ctx):
+        x = Symbol("x")
+        expr = Expression(Module, Expression(List, x), Expression(Hold, x))
+        before = EvaluationContext.definitions_version
+        evaluate(expr, ctx)
+        assert EvaluationContext.definitions_version == before
+
+    def test_caches_cleared_between_evaluations_only(self, ctx, monkeypatch):
+        symbol_module = importlib.import_module("minimatic.core.symbol")
+        collections = []
+        collector = symbol_module._collector
+
+        def recording_collector(keep_caches):
+            collections.append((_get_eval_state().recursion_depth, keep_caches))
+            return collector(keep_caches)
+
+        monkeypatch.setattr(symbol_module, "_collector", recording_collector)
+        monkeypatch.setattr(symbol_module, "_MIN_COLLECT_THRESHOLD", 1)
+        monkeypatch.setattr(symbol_module, "_collect_threshold", 1)
+        x = Symbol("x")
+        y = Symbol("y")
+        inner = Expression(Module, Expression(List, Expression(Set, y, 2)), Expression(Plus, x, y))
+        expr = Expression(Module, Expression(List, Expression(Set, x, 1)), inner)
+        for _ in range(3):
+            assert evaluate(expr, ctx) == 3
+        # Module collects mid-evaluation, keeping the caches in use
+        assert any(depth > 0 for depth, _ in collections)
+        assert all(depth == 0 for depth, keep_caches in collections if not keep_caches)
+
+    def test_module_in_loop_runs_in_flat_memory(self, ctx, monkeypatch):
+        # Soak test: collect whenever 64 temporaries accumulate
+        symbol_module = importlib.import_module("minimatic.core.symbol")
+        monkeypatch.setattr(symbol_module, "_MIN_COLLECT_THRESHOLD", 64)
+        monkeypatch.setattr(symbol_module, "_collect_threshold", 64)
+        x = Symbol("x")
+        sizes = []
+        for n in range(2000):
+            body = Expression(Plus, x, 1)
+            expr = Expression(Module, Expression(List, Expression(Set, x, n)), body)
+            assert evaluate(expr, ctx) == n + 1
+            if n % 500 == 499:
+                sizes.append((temporary_count(), len(ctx._values), symbol_count()))
+        assert all(temporaries <= 128 and values <= 128 for temporaries, values, _ in sizes)
+        assert len({ids for _, _, ids in sizes}) == 1
+
+    def test_module_in_language_loop_runs_in_flat_memory(self, ctx, monkeypatch):
+        # Soak test: the locals of a Module inside one long Do are
+        # collected while the loop runs
+        symbol_module = importlib.import_module("minimatic.core.symbol")
+        monkeypatch.setattr(symbol_module, "_MIN_COLLECT_THRESHOLD", 64)
+        monkeypatch.setattr(symbol_module, "_collect_threshold", 64)
+        x = Symbol("x")
+        i = Symbol("i")
+        body = Expression(Module, Expression(List, Expression(Set, x, i)), Expression(Plus, x, 1))
+
+        def loop(n):
+            assert evaluate(Expression(Do, body, Expression(List, i, 1, n)), ctx) == Symbol("Null")
+            return temporary_count(), len(ctx._values), symbol_count()
+
+        _, _, ids = loop(1000)
+        temporaries, values, ids_after = loop(10000)
+        assert temporaries <= 128 and values <= 128
+        assert ids_after <= ids + 128
+
 
 class TestBlock:
     def test_block_basic(self, ctx):
@@ -505,6 +720,49 @@ class TestBlock:
         )
         assert result == 30
 
+    def test_recursion_through_block_deeper_than_python_stack(self, ctx):
+        import minimatic.builtins.arithmetic  # noqa: F401
+        import minimatic.builtins.comparison  # noqa: F401
+
+        f, n, m = Symbol("f"), Symbol("n"), Symbol("m")
+        # f[n_] := Block[{m = n}, If[m == 0, 0, 1 + f[m - 1]]]
+        body = Expression(
+            Block,
+            Expression(List, Expression(Set, m, n)),
+            Expression(
+                If,
+                Expression(Symbol("Equal"), m, 0),
+                0,
+                Expression(Plus, 1, Expression(f, Expression(Plus, m, -1))),
+            ),
+        )
+        ctx.add_down_value(f, Expression(f, pattern(n)), body)
+        depth = 2 * sys.getrecursionlimit()
+        old_recursion = set_recursion_limit(8 * depth)
+        old_iteration = set_iteration_limit(10 * depth)
+        try:
+            assert evaluate(Expression(f, depth), ctx) == depth
+        finally:
+            set_recursion_limit(old_recursion)
+            set_iteration_limit(old_iteration)
+        assert evaluate(m, ctx) == m
+
+    def test_block_restores_value_when_body_fails(self, ctx):
+        g, k, x = Symbol("g"), Symbol("k"), Symbol("x")
+        # g[k_] := 1 + g[k] never returns
+        ctx.add_down_value(g, Expression(g, pattern(k)), Expression(Plus, 1, Expression(g, k)))
+        evaluate(Expression(Set, x, 1), ctx)
+        old_recursion = set_recursion_limit(50)
+        try:
+            with pytest.raises(RecursionLimitError):
+                evaluate(
+                    Expression(Block, Expression(List, Expression(Set, x, 2)), Expression(g, x)),
+                    ctx,
+                )
+        finally:
+            set_recursion_limit(old_recursion)
+        assert evaluate(x, ctx) == 1
+
 
 class TestWith:
     def test_with_basic(self, ctx):
@@ -550,6 +808,34 @@ class TestWith:
         assert result == 100
 
 
+class TestPredicates:
+    @pytest.mark.parametrize(
+        "head, args",
+        [
+            (TrueQ, (True,)),
+            (SameQ, (1, 1)),
+            (UnsameQ, (1, 2)),
+            (NumericQ, (1,)),
+            (AtomQ, (1,)),
+            (HeadQ, (Expression(Symbol("f"), 1), Symbol("f"))),
+            (ListQ, (Expression(List),)),
+            (StringQ, ("s",)),
+            (IntegerQ, (1,)),
+            (RealQ, (1.5,)),
+        ],
+        ids=str,
+    )
+    def test_arguments_evaluated_on_explicit_stack(self, ctx, monkeypatch, head, args):
+        # A predicate yields its arguments instead of calling evaluate() again
+        import minimatic.eval
+
+        def reentered(*_):
+            raise AssertionError("evaluate() re-entered")
+
+        monkeypatch.setattr(minimatic.eval, "evaluate", reentered)
+        assert evaluate(Expression(head, *args), ctx) is True
+
+
 class TestTrueQ:
     def test_trueq_true(self, ctx):
         result = evaluate(Expression(TrueQ, True), ctx)
@@ -9,10 +9,15 @@ from minimatic.builtins.registry import (
     builtin_attributes,
     clear_registry,
     get_builtin,
+    get_packed_kernel,
     has_builtin,
+    register_attributes,
+    register_builtin,
+    register_packed,
 )
-from minimatic.core.attributes import Flat, Listable, NumericFunction, Orderless
+from minimatic.core.attributes import Flat, Listable, NumericFunction, Orderless, Protected
 from minimatic.core.symbol import Symbol
+from minimatic.eval.context import EvaluationContext
 
 
 class TestRegistry:
@@ -23,6 +28,12 @@ class TestRegistry:
     def test_no_builtin(self):
         assert not has_builtin(Symbol("Unknown"))
 
+    def test_registration_bumps_versions(self):
+        before = EvaluationContext.attributes_version, EvaluationContext.definitions_version
+        register_builtin(Symbol("RegistrationProbe"))(lambda expr, context: expr)
+        after = EvaluationContext.attributes_version, EvaluationContext.definitions_version
+        assert after[0] > before[0] and after[1] > before[1]
+
 
 class TestBuiltinAttributes:
     def test_plus_attributes(self):
@@ -49,6 +60,18 @@ class TestBuiltinAttributes:
     def test_unknown_attributes(self):
         assert builtin_attributes(Symbol("Unknown")) == frozenset()
 
+    def test_builtins_are_protected(self):
+        assert Protected in builtin_attributes(Symbol("Plus"))
+        probe = Symbol("ProtectedProbe")
+        register_builtin(probe, attributes={Listable})(lambda expr, context: expr)
+        assert builtin_attributes(probe) == frozenset({Listable, Protected})
+
+    def test_attributes_without_implementation(self):
+        inert = Symbol("InertProbe")
+        register_attributes(inert, {Orderless})
+        assert builtin_attributes(inert) == frozenset({Orderless, Protected})
+        assert not has_builtin(inert)
+
 
 class TestGetBuiltin:
     def test_get_builtin(self):
@@ -112,15 +135,41 @@ class TestBuiltinRegistry:
         assert builtin is not None
 
 
+class TestPackedKernels:
+    def test_arithmetic_kernels_registered(self):
+        for name in ("Plus", "Times", "Power", "Sqrt", "Exp", "Log", "Abs"):
+            assert get_packed_kernel(Symbol(name)) is not None
+
+    def test_no_kernel(self):
+        assert get_packed_kernel(Symbol("Subtract")) is None
+
+    def test_register_packed(self):
+        from minimatic.builtins.registry import _packed_kernels
+
+        f = Symbol("PackedTestFn")
+        try:
+
+            @register_packed(f)
+            def kernel(args):
+                return None
+
+            assert get_packed_kernel(f) is kernel
+        finally:
+            _packed_kernels.pop(f, None)
+
+
 class TestClearRegistry:
     def test_clear_and_restore(self):
         # Save current state
-        from minimatic.builtins.registry import _registry
+        from minimatic.builtins.registry import _packed_kernels, _registry
 
         saved = dict(_registry)
+        saved_kernels = dict(_packed_kernels)
         try:
             clear_registry()
             assert not has_builtin(Symbol("Plus"))
+            assert get_packed_kernel(Symbol("Plus")) is None
         finally:
             # Restore registry
             _registry.update(saved)
+            _packed_kernels.update(saved_kernels)
@@ -0,0 +1,178 @@
+"""Tests for Structure builtins module."""
+
+from __future__ import annotations
+
+import sys
+
+# Force registration of builtins
+import minimatic.builtins.comparison  # noqa: F401
+import minimatic.builtins.control  # noqa: F401
+import minimatic.builtins.structure  # noqa: F401
+from minimatic.core.expression import Expression
+from minimatic.core.symbol import Symbol
+from minimatic.eval.context import EvaluationContext
+from minimatic.eval.evaluator import evaluate, set_iteration_limit, set_recursion_limit
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.structural import condition, pattern, pattern_test
+
+Cases = Symbol("Cases")
+Position = Symbol("Position")
+Count = Symbol("Count")
+FreeQ = Symbol("FreeQ")
+MemberQ = Symbol("MemberQ")
+List = Symbol("List")
+Rule = Symbol("Rule")
+RuleDelayed = Symbol("RuleDelayed")
+Hold = Symbol("Hold")
+Times = Symbol("Times")
+Greater = Symbol("Greater")
+Infinity = Symbol("Infinity")
+All = Symbol("All")
+Heads = Symbol("Heads")
+Integer = Symbol("Integer")
+f = Symbol("f")
+g = Symbol("g")
+x = Symbol("x")
+y = Symbol("y")
+n = Symbol("n")
+
+
+def lst(*args):
+    return Expression(List, *args)
+
+
+# {1, f[2, g[3]], x, "s"}
+DATA = lst(1, Expression(f, 2, Expression(g, 3)), x, "s")
+
+
+class TestCases:
+    def test_first_level_by_default(self):
+        result = evaluate(Expression(Cases, DATA, blank(Integer)))
+        assert result == lst(1)
+
+    def test_all_levels(self):
+        result = evaluate(Expression(Cases, DATA, blank(Integer), Infinity))
+        assert result == lst(1, 2, 3)
+
+    def test_exact_level(self):
+        result = evaluate(Expression(Cases, DATA, blank(Integer), lst(2)))
+        assert result == lst(2)
+
+    def test_rule(self):
+        rule = Expression(Rule, pattern(n, blank(Integer)), Expression(Times, n, 10))
+        result = evaluate(Expression(Cases, DATA, rule, Infinity))
+        assert result == lst(10, 20, 30)
+
+    def test_rule_delayed(self):
+        rule = Expression(RuleDelayed, Expression(g, pattern(n)), n)
+        result = evaluate(Expression(Cases, DATA, rule, Infinity))
+        assert result == lst(3)
+
+    def test_condition(self):
+        pat = condition(pattern(n, blank(Integer)), Expression(Greater, n, 1))
+        result = evaluate(Expression(Cases, DATA, pat, Infinity))
+        assert result == lst(2, 3)
+
+    def test_limit(self):
+        result = evaluate(Expression(Cases, DATA, blank(Integer), Infinity, 2))
+        assert result == lst(1, 2)
+
+    def test_invalid_level_spec(self):
+        expr = Expression(Cases, DATA, blank(Integer), "levels")
+        assert evaluate(expr) == expr
+
+
+class TestPosition:
+    def test_all_levels_by_default(self):
+        result = evaluate(Expression(Position, DATA, blank(Integer)))
+        assert result == lst(lst(1), lst(2, 1), lst(2, 2, 1))
+
+    def test_heads_by_default(self):
+        assert evaluate(Expression(Position, DATA, g)) == lst(lst(2, 2, 0))
+
+    def test_heads_option(self):
+        option = Expression(Rule, Heads, False)
+        assert evaluate(Expression(Position, DATA, g, All, option)) == lst()
+
+    def test_negative_level(self):
+        result = evaluate(Expression(Position, DATA, blank(), lst(-2)))
+        assert result == lst(lst(2, 2))
+
+
+class TestCount:
+    def test_first_level_by_default(self):
+        assert evaluate(Expression(Count, DATA, blank(Integer))) == 1
+
+    def test_level_range(self):
+        assert evaluate(Expression(Count, DATA, blank(Integer), lst(1, 2))) == 2
+        assert evaluate(Expression(Count, DATA, blank(Integer), 3)) == 3
+
+
+class TestFreeQ:
+    def test_free(self):
+        assert evaluate(Expression(FreeQ, DATA, y)) is True
+
+    def test_not_free(self):
+        assert evaluate(Expression(FreeQ, DATA, 3)) is False
+
+    def test_heads_searched(self):
+        assert evaluate(Expression(FreeQ, DATA, f)) is False
+
+    def test_held_expression(self):
+        held = Expression(Hold, Expression(Times, x, Expression(f, y)))
+        assert evaluate(Expression(FreeQ, held, y)) is False
+        assert evaluate(Expression(FreeQ, held, g)) is True
+
+    def test_level_spec(self):
+        assert evaluate(Expression(FreeQ, DATA, 3, 2)) is True
+
+
+class TestMemberQ:
+    def test_member(self):
+        assert evaluate(Expression(MemberQ, DATA, x)) is True
+
+    def test_only_first_level(self):
+        assert evaluate(Expression(MemberQ, DATA, 3)) is False
+        assert evaluate(Expression(MemberQ, DATA, 3, Infinity)) is True
+
+    def test_pattern(self):
+        assert evaluate(Expression(MemberQ, DATA, Expression(f, blank(), blank()))) is True
+
+
+class TestTests:
+    def test_each_test_evaluated_once(self):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        # check[v_] := (calls = calls + 1; v > 1)
+        check, calls, v = Symbol("check"), Symbol("calls"), Symbol("v")
+        ctx = EvaluationContext("test")
+        ctx.set_own_values(calls, [(calls, 0, None)])
+        body = Expression(
+            Symbol("CompoundExpression"),
+            Expression(Symbol("Set"), calls, Expression(Symbol("Plus"), calls, 1)),
+            Expression(Greater, v, 1),
+        )
+        ctx.add_down_value(check, Expression(check, pattern(v)), body)
+        result = evaluate(Expression(Cases, lst(1, 2, 3), pattern_test(blank(), check)), ctx)
+        assert result == lst(2, 3)
+        assert evaluate(calls, ctx) == 3
+
+    def test_tests_deeper_than_python_stack(self):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        # t[0] = True; t[k_] := MemberQ[{k - 1}, _?t]: each test nests
+        t, k = Symbol("t"), Symbol("k")
+        true = Symbol("True")
+        ctx = EvaluationContext("test")
+        ctx.add_down_value(t, Expression(t, 0), true)
+        previous = lst(Expression(Symbol("Plus"), k, -1))
+        test = pattern_test(blank(), t)
+        ctx.add_down_value(t, Expression(t, pattern(k)), Expression(MemberQ, previous, test))
+        depth = 2 * sys.getrecursionlimit()
+        old_recursion = set_recursion_limit(8 * depth)
+        old_iteration = set_iteration_limit(8 * depth)
+        try:
+            assert evaluate(Expression(t, depth), ctx) is True
+        finally:
+            set_recursion_limit(old_recursion)
+            set_iteration_limit(old_iteration)
@@ -2,20 +2,34 @@
 
 from __future__ import annotations
 
+import pickle
+import sys
+
 import pytest
 
+from minimatic.core import expression
 from minimatic.core.attributes import Flat, HoldAll, Orderless
 from minimatic.core.expression import (
     Expression,
     attrs_of,
+    depth_of,
     has_attr,
+    hash_consing,
+    hash_consing_enabled,
     head_of,
+    interned_count,
     is_expr,
+    leaf_count_of,
+    node_count_of,
+    sweep_interned,
+    symbol_bit,
+    symbol_mask_of,
     tail_of,
 )
 from minimatic.core.symbol import Symbol
 
 Plus = Symbol("Plus")
+Times = Symbol("Times")
 x = Symbol("x")
 y = Symbol("y")
 
@@ -53,6 +67,38 @@ class TestExpressionConstruction:
             Expression(Plus, 1, _attrs={"bad"})
 
 
+class TestTrustedConstruction:
+    def test_from_parts_equals_public_constructor(self):
+        attrs = frozenset({Flat})
+        trusted = Expression._from_parts(Plus, (x, 1, Expression(Plus, y)), attrs)
+        public = Expression(Plus, x, 1, Expression(Plus, y), _attrs=attrs)
+        assert trusted == public
+        assert hash(trusted) == hash(public)
+        assert (trusted.depth, trusted.leaf_count, trusted.node_count) == (
+            public.depth,
+            public.leaf_count,
+            public.node_count,
+        )
+
+    def test_from_parts_does_not_copy(self):
+        args = (x, 1, 2)
+        attrs = frozenset({Orderless})
+        expr = Expression._from_parts(Plus, args, attrs)
+        assert expr.args is args
+        assert expr.attributes is attrs
+
+    def test_from_parts_default_attributes(self):
+        assert Expression._from_parts(Plus, (x,)).attributes == frozenset()
+
+    def test_from_parts_respects_hash_consing(self):
+        with hash_consing():
+            assert Expression._from_parts(Plus, (x, 1)) is Expression(Plus, x, 1)
+
+    def test_transformations_share_tail(self):
+        expr = Expression(Plus, x, y, _attrs={Flat})
+        assert expr.without_attrs(Flat).args is expr.args
+
+
 class TestExpressionProperties:
     def test_len(self):
         assert len(Expression(Plus, 1, 2)) == 2
@@ -165,6 +211,196 @@ class TestExpressionEquality:
         b = Expression(Plus, 1, 2)
         assert hash(a) == hash(b)
 
+    def test_hash_is_cached(self):
+        expr = Expression(Plus, 1, Expression(Plus, x, y))
+        assert hash(expr) == hash(expr)
+        assert hash(expr) == hash(Expression(Plus, 1, Expression(Plus, x, y)))
+
+    def test_different_hash_is_not_equal(self):
+        a = Expression(Plus, Expression(Plus, 1, 2), 3)
+        b = Expression(Plus, Expression(Plus, 1, 4), 3)
+        assert hash(a) != hash(b)
+        assert a != b
+
+    def test_int_float_args_compare_equal(self):
+        assert Expression(Plus, 1) == Expression(Plus, 1.0)
+        assert hash(Expression(Plus, 1)) == hash(Expression(Plus, 1.0))
+
+    def test_unhashable_argument(self):
+        expr = Expression(Plus, {"a": 1})
+        assert expr == Expression(Plus, {"a": 1})
+        with pytest.raises(TypeError):
+            hash(expr)
+
+
+class TestExpressionMetadata:
+    def test_empty_expression(self):
+        expr = Expression(Plus)
+        assert expr.depth == 1
+        assert expr.leaf_count == 1
+        assert expr.node_count == 1
+
+    def test_flat_expression(self):
+        expr = Expression(Plus, 1, x, "s")
+        assert expr.depth == 1
+        assert expr.leaf_count == 3
+        assert expr.node_count == 4
+
+    def test_nested_expression(self):
+        expr = Expression(Plus, Expression(Plus, 1, Expression(Plus, x)), 2, Expression(Plus))
+        assert expr.depth == 3
+        assert expr.leaf_count == 4
+        assert expr.node_count == 7
+
+    def test_head_not_counted(self):
+        expr = Expression(Expression(Plus, 1, 2), x)
+        assert expr.depth == 1
+        assert expr.leaf_count == 1
+        assert expr.node_count == 2
+
+    def test_module_functions(self):
+        expr = Expression(Plus, Expression(Plus, 1, 2), 3)
+        assert depth_of(expr) == 2
+        assert leaf_count_of(expr) == 3
+        assert node_count_of(expr) == 5
+        assert depth_of(42) == 0
+        assert leaf_count_of(x) == 1
+        assert node_count_of("s") == 1
+
+
+class TestSymbolMask:
+    def test_symbols_and_heads(self):
+        expr = Expression(Plus, x, Expression(Times, y))
+        expected = symbol_bit(Plus) | symbol_bit(x) | symbol_bit(Times) | symbol_bit(y)
+        assert expr.symbol_mask == expected
+
+    def test_atoms_set_their_head(self):
+        expr = Expression(Plus, 1, 2.5, "s")
+        assert expr.symbol_mask & symbol_bit(Symbol("Integer"))
+        assert expr.symbol_mask & symbol_bit(Symbol("Real"))
+        assert expr.symbol_mask & symbol_bit(Symbol("String"))
+
+    def test_compound_head(self):
+        expr = Expression(Expression(Times, x), 1)
+        assert expr.symbol_mask & symbol_bit(x)
+        assert expr.symbol_mask & symbol_bit(Times)
+
+    def test_absent_symbol(self):
+        symbols = [Symbol(f"mask{i}") for i in range(100)]
+        expr = Expression(Plus, *symbols[:3])
+        absent = [s for s in symbols[3:] if not expr.symbol_mask & symbol_bit(s)]
+        assert absent
+
+    def test_module_function(self):
+        assert symbol_mask_of(x) == symbol_bit(x)
+        assert symbol_mask_of(7) == symbol_bit(Symbol("Integer"))
+        assert symbol_mask_of(Expression(Plus)) == symbol_bit(Plus)
+
+
+class TestHashConsing:
+    def test_disabled_by_default(self):
+        assert not hash_consing_enabled()
+        assert Expression(Plus, x, 1) is not Expression(Plus, x, 1)
+
+    def test_identical_nodes_are_shared(self):
+        with hash_consing():
+            a = Expression(Plus, Expression(Plus, x, 1), y)
+            b = Expression(Plus, Expression(Plus, x, 1), y)
+            assert a is b
+            assert a.args[0] is b.args[0]
+
+    def test_numeric_types_not_merged(self):
+        with hash_consing():
+            ints = Expression(Plus, 1, 0)
+            floats = Expression(Plus, 1.0, -0.0)
+            bools = Expression(Plus, True, 0)
+            assert ints is not floats
+            assert ints is not bools
+            assert floats.args == (1.0, -0.0)
+            assert type(bools.args[0]) is bool
+            # Structural equality is unchanged
+            assert ints == floats
+
+    def test_attributes_distinguish_nodes(self):
+        with hash_consing():
+            assert Expression(Plus, x, _attrs={Flat}) is not Expression(Plus, x)
+
+    def test_unhashable_argument_not_interned(self):
+        with hash_consing():
+            a = Expression(Plus, {"a": 1})
+            b = Expression(Plus, {"a": 1})
+            assert a is not b
+            assert a == b
+
+    @pytest.mark.skipif(
+        sys.implementation.name != "cpython", reason="sweeping reads CPython reference counts"
+    )
+    def test_dead_nodes_are_reclaimed(self):
+        with hash_consing():
+            kept = Expression(Plus, y, 2)
+            expr = Expression(Plus, x, Expression(Plus, x, 2))
+            assert interned_count() == 3
+            del expr
+            assert sweep_interned() == 2
+            assert interned_count() == 1
+            assert Expression(Plus, y, 2) is kept
+
+    def test_no_sweep_without_reference_counts(self, monkeypatch):
+        monkeypatch.setattr(expression, "_SWEEP_BY_REFCOUNT", False)
+        with hash_consing():
+            expr = Expression(Plus, x, 1)
+            del expr
+            assert sweep_interned() == 0
+            assert interned_count() == 1
+        assert interned_count() == 0
+
+    def test_context_manager_restores_mode(self):
+        with hash_consing():
+            assert hash_consing_enabled()
+        assert not hash_consing_enabled()
+        assert interned_count() == 0
+
+
+class TestExpressionPickle:
+    def test_round_trip(self):
+        expr = Expression(Plus, x, 1.5, Expression(Plus, "s"), _attrs={Flat})
+        result = pickle.loads(pickle.dumps(expr))
+        assert result == expr
+        assert result.attributes == frozenset({Flat})
+        assert result.depth == expr.depth
+
+
+class TestDeepExpressions:
+    """Trees deeper than the recursion limit."""
+
+    depth = sys.getrecursionlimit() * 5
+
+    def chain(self, leaf):
+        expr = leaf
+        for _ in range(self.depth):
+            expr = Expression(Plus, expr)
+        return expr
+
+    def test_equality(self):
+        assert self.chain(x) == self.chain(x)
+        assert self.chain(x) != self.chain(y)
+
+    def test_equality_against_shallow(self):
+        assert self.chain(x) != Expression(Plus, x)
+        assert Expression(Plus, x) != self.chain(x)
+
+    def test_str(self):
+        text = str(self.chain(x))
+        assert text == "Plus[" * self.depth + "x" + "]" * self.depth
+
+    def test_repr_with_attrs(self):
+        expr = Expression(Plus, self.chain(x), _attrs={Flat})
+        assert repr(expr).endswith("{attrs: Flat}")
+
+    def test_unhashable_leaf(self):
+        with pytest.raises(TypeError):
+            hash(self.chain({"a": 1}))
+
 
 class TestExpressionRepresentation:
     def test_str(self):
@@ -0,0 +1,132 @@
+"""Tests for PackedArray module."""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from minimatic.core.expression import Expression, hash_consing
+from minimatic.core.packed import PackedArray, is_packed, pack, pack_values, unpack
+from minimatic.core.symbol import Symbol
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.matcher import match
+
+List = Symbol("List")
+x = Symbol("x")
+
+
+class TestPacking:
+    def test_pack_integers(self):
+        packed = pack_values([1, 2, 3])
+        assert is_packed(packed)
+        assert packed.typecode == "q"
+        assert packed.args == (1, 2, 3)
+
+    def test_pack_reals(self):
+        packed = pack_values([1.5, 2.5])
+        assert packed.typecode == "d"
+        assert packed.args == (1.5, 2.5)
+
+    def test_mixed_numbers_not_packed(self):
+        result = pack_values([1, 2.5])
+        assert not is_packed(result)
+        assert type(result.args[0]) is int
+        assert match(Expression(List, blank(Symbol("Integer")), blank(Symbol("Real"))), result)
+
+    @pytest.mark.parametrize(
+        "values", [[1, x], [1, "a"], [True, False], [1, 2**70], [1j], []], ids=repr
+    )
+    def test_not_packable(self, values):
+        result = pack_values(values)
+        assert not is_packed(result)
+        assert result == Expression(List, *values)
+
+    def test_pack_expression(self):
+        packed = pack(Expression(List, 1.0, 2.0))
+        assert is_packed(packed)
+        assert pack(packed) is packed
+
+    def test_pack_leaves_other_expressions(self):
+        expr = Expression(Symbol("f"), 1, 2)
+        assert pack(expr) is expr
+        assert pack(5) == 5
+
+    def test_unpack(self):
+        unpacked = unpack(pack_values([1, 2]))
+        assert type(unpacked) is Expression
+        assert unpacked.args == (1, 2)
+
+    def test_invalid_buffer(self):
+        with pytest.raises(TypeError):
+            PackedArray(array("b", [1]))
+        with pytest.raises(ValueError):
+            PackedArray(array("d"))
+
+
+class TestPackedBehavesAsList:
+    def test_head_and_metadata(self):
+        packed = pack_values([1.0, 2.0, 3.0])
+        assert packed.head == List
+        assert len(packed) == 3
+        assert packed.depth == 1
+        assert packed.leaf_count == 3
+        assert packed.node_count == 4
+
+    def test_equality_and_hash_with_unpacked(self):
+        packed = pack_values([1.0, 2.0])
+        unpacked = Expression(List, 1.0, 2.0)
+        assert packed == unpacked
+        assert unpacked == packed
+        assert (packed != unpacked) is False
+        assert hash(packed) == hash(unpacked)
+        assert {unpacked: "v"}[packed] == "v"
+
+    def test_equality_between_packed(self):
+        assert pack_values([1, 2]) == pack_values([1.0, 2.0])
+        assert pack_values([1, 2]) != pack_values([1, 3])
+
+    def test_printing(self):
+        packed = pack_values([1, 2])
+        assert str(packed) == "List[1, 2]"
+        assert repr(packed) == repr(Expression(List, 1, 2))
+
+    def test_nested_in_expression(self):
+        f = Symbol("f")
+        outer = Expression(f, pack_values([1, 2]))
+        assert outer == Expression(f, Expression(List, 1, 2))
+        assert outer.depth == 2
+        with hash_consing():
+            assert Expression(f, pack_values([1, 2])) == outer
+
+    def test_parents_cache_their_hash(self):
+        f = Symbol("f")
+        outer = Expression(f, pack_values([1, 2]))
+        assert tuple.__getitem__(outer, 3) == hash(Expression(f, Expression(List, 1, 2)))
+        # Deeper than the recursion limit: every level hashes in O(1)
+        for _ in range(3000):
+            outer = Expression(f, outer)
+        assert tuple.__getitem__(outer, 3) is not None
+        assert hash(outer) == tuple.__getitem__(outer, 3)
+
+    def test_buffer_is_read_only(self):
+        view = pack_values([1.0]).buffer
+        with pytest.raises(TypeError):
+            view[0] = 2.0
+
+    def test_append_numeric_stays_packed(self):
+        packed = pack_values([1.0]).append(2.0)
+        assert is_packed(packed)
+        assert packed.args == (1.0, 2.0)
+
+    def test_insert_non_numeric_unpacks(self):
+        appended = pack_values([1, 2]).append(x)
+        prepended = pack_values([1, 2]).prepend("a")
+        assert not is_packed(appended)
+        assert appended.args == (1, 2, x)
+        assert not is_packed(prepended)
+        assert prepended.args == ("a", 1, 2)
+
+    def test_map_args(self):
+        assert is_packed(pack_values([1, 2]).map_args(lambda v: v * 2))
+        assert not is_packed(pack_values([1, 2]).map_args(lambda v: x))
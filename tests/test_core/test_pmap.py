@@ -0,0 +1,139 @@
+"""Tests for PMap module."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from minimatic.core.pmap import PMap, pmap
+
+
+class Key:
+    """Key with a chosen hash, to force trie collisions."""
+
+    def __init__(self, value, key_hash):
+        self.value = value
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        return self.key_hash
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and other.value == self.value
+
+    def __repr__(self):
+        return f"Key({self.value})"
+
+
+class TestPMapBasics:
+    def test_empty(self):
+        m = pmap()
+        assert len(m) == 0
+        assert not m
+        assert "a" not in m
+        assert m is pmap({})
+
+    def test_from_mapping_and_pairs(self):
+        assert PMap({"a": 1, "b": 2}) == PMap([("b", 2), ("a", 1)])
+
+    def test_getitem(self):
+        m = pmap({"a": 1})
+        assert m["a"] == 1
+        with pytest.raises(KeyError):
+            m["b"]
+
+    def test_get_default(self):
+        m = pmap({"a": None})
+        assert m.get("a", 0) is None
+        assert m.get("b", 0) == 0
+
+    def test_unhashable_not_contained(self):
+        assert [] not in pmap({"a": 1})
+
+    def test_views(self):
+        m = pmap({"a": 1, "b": 2})
+        assert sorted(m) == ["a", "b"]
+        assert sorted(m.keys()) == ["a", "b"]
+        assert sorted(m.values()) == [1, 2]
+        assert sorted(m.items()) == [("a", 1), ("b", 2)]
+        assert ("a", 1) in m.items()
+
+
+class TestPMapUpdates:
+    def test_set_is_persistent(self):
+        m = pmap({"a": 1})
+        m2 = m.set("b", 2)
+        assert dict(m) == {"a": 1}
+        assert dict(m2) == {"a": 1, "b": 2}
+
+    def test_set_same_value_returns_self(self):
+        m = pmap({"a": 1})
+        assert m.set("a", 1) is m
+
+    def test_set_replaces(self):
+        m = pmap({"a": 1}).set("a", 2)
+        assert m["a"] == 2
+        assert len(m) == 1
+
+    def test_delete(self):
+        m = pmap({"a": 1, "b": 2})
+        assert dict(m.delete("a")) == {"b": 2}
+        assert m.delete("c") is m
+        assert len(m.delete("a").delete("b")) == 0
+
+    def test_update(self):
+        m = pmap({"a": 1}).update({"b": 2, "a": 3})
+        assert dict(m) == {"a": 3, "b": 2}
+
+    def test_hash_collisions(self):
+        keys = [Key(i, i % 3) for i in range(30)]
+        m = pmap()
+        for i, key in enumerate(keys):
+            m = m.set(key, i)
+        assert len(m) == 30
+        assert all(m[key] == i for i, key in enumerate(keys))
+        for key in keys[::2]:
+            m = m.delete(key)
+        assert len(m) == 15
+        assert all(m[key] == i for i, key in enumerate(keys) if i % 2)
+        assert Key(0, 0) not in m
+
+    def test_random_operations_match_dict(self):
+        rng = random.Random(7)
+        reference = {}
+        m = pmap()
+        history = []
+        for _ in range(2000):
+            value = rng.randrange(200)
+            # Odd values spread over the trie, even values collide
+            key = Key(value, -value << 40 if value % 2 else value % 5)
+            if rng.random() < 0.6:
+                m = m.set(key, value)
+                reference[key] = value
+            else:
+                m = m.delete(key)
+                reference.pop(key, None)
+            history.append((m, dict(reference)))
+            assert len(m) == len(reference)
+        for old, snapshot in history[::50]:
+            assert dict(old.items()) == snapshot
+
+
+class TestPMapEquality:
+    def test_equal_regardless_of_order(self):
+        m1 = pmap().set("a", 1).set("b", 2)
+        m2 = pmap().set("b", 2).set("a", 1)
+        assert m1 == m2
+        assert hash(m1) == hash(m2)
+
+    def test_not_equal(self):
+        assert pmap({"a": 1}) != pmap({"a": 2})
+        assert pmap({"a": 1}) != pmap({"a": 1, "b": 2})
+
+    def test_equal_to_dict(self):
+        assert pmap({"a": 1}) == {"a": 1}
+
+    def test_usable_as_key(self):
+        cache = {pmap({"a": 1}): "hit"}
+        assert cache[pmap().set("a", 1)] == "hit"
@@ -0,0 +1,160 @@
+"""Tests for Printer module."""
+
+from __future__ import annotations
+
+import io
+import sys
+
+import pytest
+
+from minimatic.core.expression import Expression
+from minimatic.core.packed import pack_values
+from minimatic.core.printer import (
+    INPUT_FORM,
+    TRUNCATED,
+    format_expression,
+    write_expression,
+)
+from minimatic.core.symbol import Symbol
+
+f = Symbol("f")
+g = Symbol("g")
+x = Symbol("x")
+y = Symbol("y")
+List = Symbol("List")
+Plus = Symbol("Plus")
+Times = Symbol("Times")
+Power = Symbol("Power")
+Rule = Symbol("Rule")
+Equal = Symbol("Equal")
+
+
+class TestFullForm:
+    def test_matches_str(self):
+        expr = Expression(f, x, 1, 2.5, "s", Expression(g, Expression(List, y)), None)
+        assert format_expression(expr) == str(expr)
+
+    def test_atoms(self):
+        assert format_expression(x) == "x"
+        assert format_expression(42) == "42"
+        assert format_expression("s") == "'s'"
+
+    def test_expression_head(self):
+        expr = Expression(Expression(f, x), y)
+        assert format_expression(expr) == "f[x][y]"
+
+    def test_no_arguments(self):
+        assert format_expression(Expression(f)) == "f[]"
+
+    def test_packed_array(self):
+        assert format_expression(pack_values([1, 2, 3])) == "List[1, 2, 3]"
+
+    def test_writes_to_stream(self):
+        stream = io.StringIO()
+        count = write_expression(Expression(f, x, 1), stream)
+        assert stream.getvalue() == "f[x, 1]"
+        assert count == len("f[x, 1]")
+
+    def test_deep_expression(self):
+        depth = sys.getrecursionlimit() * 5
+        expr = x
+        for _ in range(depth):
+            expr = Expression(f, expr)
+        assert format_expression(expr) == "f[" * depth + "x" + "]" * depth
+        assert str(expr) == format_expression(expr)
+
+    def test_unknown_form(self):
+        with pytest.raises(ValueError, match="Unknown form"):
+            format_expression(x, form="TreeForm")
+
+    def test_negative_limit(self):
+        with pytest.raises(ValueError, match="max_chars"):
+            format_expression(x, max_chars=-1)
+
+
+class TestInputForm:
+    def fmt(self, expr):
+        return format_expression(expr, form=INPUT_FORM)
+
+    def test_list(self):
+        assert self.fmt(Expression(List, 1, Expression(List, x))) == "{1, {x}}"
+
+    def test_infix_operators(self):
+        assert self.fmt(Expression(Plus, x, y, 1)) == "x + y + 1"
+        assert self.fmt(Expression(Times, 2, x)) == "2*x"
+        assert self.fmt(Expression(Rule, x, 1)) == "x -> 1"
+        assert self.fmt(Expression(Equal, x, y)) == "x == y"
+
+    def test_precedence(self):
+        expr = Expression(Times, Expression(Plus, x, 1), y)
+        assert self.fmt(expr) == "(x + 1)*y"
+        expr = Expression(Plus, Expression(Times, 2, x), y)
+        assert self.fmt(expr) == "2*x + y"
+
+    def test_power_associates_right(self):
+        assert self.fmt(Expression(Power, x, Expression(Power, y, 2))) == "x^y^2"
+        assert self.fmt(Expression(Power, Expression(Power, x, y), 2)) == "(x^y)^2"
+
+    def test_negative_base(self):
+        assert self.fmt(Expression(Power, -2, x)) == "(-2)^x"
+
+    def test_single_argument_stays_full_form(self):
+        assert self.fmt(Expression(Plus, x)) == "Plus[x]"
+        assert self.fmt(Expression(Power, x, y, 2)) == "Power[x, y, 2]"
+
+    def test_operator_inside_full_form(self):
+        assert self.fmt(Expression(f, Expression(Plus, x, 1))) == "f[x + 1]"
+
+
+class TestLimits:
+    def test_max_elements(self):
+        expr = Expression(List, *range(100))
+        assert format_expression(expr, max_elements=3) == "List[0, 1, 2, <<97>>]"
+        assert format_expression(expr, form=INPUT_FORM, max_elements=2) == "{0, 1, <<98>>}"
+
+    def test_max_elements_zero(self):
+        assert format_expression(Expression(f, 1, 2), max_elements=0) == "f[<<2>>]"
+
+    def test_max_elements_disables_infix(self):
+        expr = Expression(Plus, x, y, 1)
+        assert format_expression(expr, form=INPUT_FORM, max_elements=1) == "Plus[x, <<2>>]"
+
+    def test_max_depth(self):
+        expr = Expression(f, Expression(g, x, Expression(f, y)), 1)
+        assert format_expression(expr, max_depth=1) == "f[g[<<2>>], 1]"
+        assert format_expression(expr, max_depth=2) == "f[g[x, f[<<1>>]], 1]"
+        assert format_expression(expr, max_depth=0) == "f[<<2>>]"
+
+    def test_max_depth_empty_expression(self):
+        assert format_expression(Expression(f, Expression(g)), max_depth=1) == "f[g[]]"
+
+    def test_max_chars(self):
+        expr = Expression(List, *range(1000))
+        text = format_expression(expr, max_chars=20)
+        assert text == str(expr)[:20] + TRUNCATED
+
+    def test_max_chars_not_reached(self):
+        expr = Expression(f, x)
+        assert format_expression(expr, max_chars=6) == "f[x]"
+
+    def test_max_chars_stops_walking(self):
+        class Counting(io.StringIO):
+            writes = 0
+
+            def write(self, text):
+                Counting.writes += 1
+                return super().write(text)
+
+        stream = Counting()
+        count = write_expression(Expression(List, *range(10**5)), stream, max_chars=10)
+        assert count == 10 + len(TRUNCATED)
+        assert Counting.writes == 1
+
+    def test_large_output_written_in_chunks(self):
+        stream = io.StringIO()
+        expr = Expression(List, *range(10**4))
+        writes = []
+        stream.write = lambda text: writes.append(text) or len(text)
+        write_expression(expr, stream)
+        assert len(writes) > 1
+        assert "".join(writes) == str(expr)
@@ -0,0 +1,216 @@
+"""Tests for Store module."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from minimatic.core.attributes import Flat, HoldAll, Orderless
+from minimatic.core.expression import Expression
+from minimatic.core.packed import is_packed, pack_values
+from minimatic.core.store import (
+    ExpressionStore,
+    StoredExpression,
+    StoreFormatError,
+    open_store,
+    write_store,
+)
+from minimatic.core.symbol import Symbol
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.matcher import count_matches, find_matches
+
+f = Symbol("f")
+g = Symbol("g")
+x = Symbol("x")
+
+
+def _round_trip(tmp_path, element, **kwargs):
+    path = tmp_path / "tree.mms"
+    write_store(element, path)
+    return open_store(path, **kwargs)
+
+
+def _chain(depth):
+    expr = x
+    for _ in range(depth):
+        expr = Expression(f, expr)
+    return expr
+
+
+def _chain_around(expr, depth):
+    for _ in range(depth):
+        expr = Expression(g, expr)
+    return expr
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize(
+        "value",
+        [0, -1, 2**70, 1.5, -0.0, 3 + 4j, "héllo", None, True, False],
+        ids=repr,
+    )
+    def test_atom_root(self, tmp_path, value):
+        with _round_trip(tmp_path, value) as store:
+            assert store.root == value
+            assert type(store.root) is type(value)
+
+    def test_symbol_root_is_interned(self, tmp_path):
+        sym = Symbol("storeSymbol")
+        with _round_trip(tmp_path, sym) as store:
+            assert store.root is sym
+
+    def test_nested_expression(self, tmp_path):
+        expr = Expression(f, 1, -2.5, "s", Expression(g, x, None), Expression(Expression(f, x), 3j))
+        with _round_trip(tmp_path, expr) as store:
+            root = store.root
+            assert isinstance(root, StoredExpression)
+            assert root == expr
+            assert expr == root
+            assert hash(root) == hash(expr)
+
+    def test_attributes(self, tmp_path):
+        custom = Symbol("StoreCustomAttribute")
+        expr = Expression(f, Expression(g, x, _attrs=frozenset({Flat, Orderless, HoldAll, custom})))
+        with _round_trip(tmp_path, expr) as store:
+            assert store.root.args[0].attributes == {Flat, Orderless, HoldAll, custom}
+
+    def test_packed_array(self, tmp_path):
+        expr = Expression(f, pack_values([1, -2, 3]), pack_values([0.5, 1.5]))
+        with _round_trip(tmp_path, expr) as store:
+            ints, reals = store.root.args
+            assert is_packed(ints) and ints.typecode == "q"
+            assert is_packed(reals) and reals.typecode == "d"
+            assert store.root == expr
+
+    def test_metadata(self, tmp_path):
+        expr = Expression(f, Expression(g, x, 1), 2)
+        with _round_trip(tmp_path, expr) as store:
+            root = store.root
+            assert (root.depth, root.leaf_count, root.node_count) == (
+                expr.depth,
+                expr.leaf_count,
+                expr.node_count,
+            )
+
+    def test_deep_tree(self, tmp_path):
+        depth = 20000
+        expr = _chain(depth)
+        with _round_trip(tmp_path, expr) as store:
+            node = store.root
+            assert node.depth == expr.depth
+            for _ in range(depth):
+                node = node.args[0]
+            assert node == x
+
+    def test_unsupported_value(self, tmp_path):
+        with pytest.raises(TypeError):
+            write_store(Expression(f, object()), tmp_path / "bad.mms")
+
+    def test_pickles_as_plain_expression(self, tmp_path):
+        expr = Expression(f, Expression(g, x))
+        with _round_trip(tmp_path, expr) as store:
+            restored = pickle.loads(pickle.dumps(store.root))
+        assert type(restored) is Expression
+        assert restored == expr
+
+
+class TestLaziness:
+    def test_open_decodes_nothing(self, tmp_path):
+        expr = Expression(f, *(Expression(g, i) for i in range(100)))
+        with _round_trip(tmp_path, expr) as store:
+            root = store.root
+            assert root.node_count == expr.node_count
+            assert store.cached_records == 0
+
+    def test_access_decodes_only_touched_records(self, tmp_path):
+        expr = Expression(f, *(Expression(g, Expression(f, i)) for i in range(100)))
+        with _round_trip(tmp_path, expr) as store:
+            child = store.root.args[5]
+            assert store.cached_records == 1
+            assert child.args[0].head == f
+            assert store.cached_records == 3
+
+    def test_wrapping_root_decodes_nothing(self, tmp_path):
+        expr = Expression(f, *(Expression(g, i) for i in range(100)))
+        with _round_trip(tmp_path, expr) as store:
+            wrapped = Expression(g, store.root, 1)
+            assert wrapped.node_count == expr.node_count + 2
+            assert store.cached_records == 0
+            assert hash(wrapped) == hash(Expression(g, expr, 1))
+            assert wrapped == Expression(g, expr, 1)
+
+    def test_hash_around_root_is_cached(self, tmp_path):
+        expr = Expression(f, *(Expression(g, i) for i in range(100)))
+        expected = _chain_around(expr, 2000)
+        with _round_trip(tmp_path, expr) as store:
+            wrapped = _chain_around(store.root, 2000)
+            assert store.cached_records == 0
+            assert hash(wrapped) == hash(expected)
+            # Every level now holds its hash: hashing again decodes nothing
+            store._cache.clear()
+            assert hash(wrapped) == hash(expected)
+            assert hash(Expression(f, wrapped)) == hash(Expression(f, expected))
+            assert store.cached_records == 0
+
+    def test_hash_of_deep_stored_tree(self, tmp_path):
+        expr = _chain(3000)
+        with _round_trip(tmp_path, expr) as store:
+            root = store.root
+            assert hash(root) == hash(expr)
+            store._cache.clear()
+            assert hash(root) == hash(expr)
+            assert store.cached_records == 0
+
+    def test_cache_is_bounded(self, tmp_path):
+        expr = Expression(f, *(Expression(g, i) for i in range(100)))
+        with _round_trip(tmp_path, expr, cache_size=10) as store:
+            assert [arg.args[0] for arg in store.root.args] == list(range(100))
+            assert store.cached_records == 10
+
+    def test_shared_subtree_written_once(self, tmp_path):
+        shared = Expression(g, *range(1000))
+        path_shared = tmp_path / "shared.mms"
+        path_single = tmp_path / "single.mms"
+        write_store(Expression(f, shared, shared, shared), path_shared)
+        write_store(Expression(f, shared), path_single)
+        assert path_shared.stat().st_size < path_single.stat().st_size + 16
+
+
+class TestPatternQueries:
+    def test_count_matches(self, tmp_path):
+        expr = Expression(f, *(Expression(g, i, Expression(g, x)) for i in range(50)))
+        pattern = Expression(g, blank())
+        with _round_trip(tmp_path, expr, cache_size=8) as store:
+            assert count_matches(pattern, store.root) == count_matches(pattern, expr)
+            assert store.cached_records <= 8
+
+    def test_find_matches_bindings(self, tmp_path):
+        expr = Expression(f, Expression(g, 1), Expression(g, 2))
+        pattern = Expression(g, blank())
+        with _round_trip(tmp_path, expr) as store:
+            found = [match for match, _ in find_matches(pattern, store.root)]
+            assert found == [Expression(g, 1), Expression(g, 2)]
+
+
+class TestErrors:
+    def test_bad_magic(self, tmp_path):
+        path = tmp_path / "bad.mms"
+        path.write_bytes(b"XXXX" + bytes(32))
+        with pytest.raises(StoreFormatError):
+            open_store(path)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.mms"
+        path.write_bytes(b"")
+        with pytest.raises(StoreFormatError):
+            ExpressionStore(path)
+
+    def test_bad_version(self, tmp_path):
+        path = tmp_path / "tree.mms"
+        write_store(Expression(f, x), path)
+        data = bytearray(path.read_bytes())
+        data[3] = 99
+        path.write_bytes(bytes(data))
+        with pytest.raises(StoreFormatError):
+            open_store(path)
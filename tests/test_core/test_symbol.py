@@ -2,15 +2,27 @@
 
 from __future__ import annotations
 
+import importlib
+import pickle
+
 import pytest
 
 from minimatic.core.symbol import (
     Symbol,
+    clear_symbol_cache,
     gensym,
     is_symbol,
+    is_temporary,
+    sweep_temporaries,
     symbol,
+    symbol_count,
+    symbol_from_id,
+    temporary_count,
 )
 
+# The module (minimatic.core.symbol is also the name of a function)
+symbol_module = importlib.import_module("minimatic.core.symbol")
+
 
 class TestSymbolCreation:
     def test_create_symbol(self):
@@ -46,6 +58,10 @@ class TestSymbolInterning:
         b = symbol("foo")
         assert a is b
 
+    def test_pickle_interns(self):
+        a = Symbol("x")
+        assert pickle.loads(pickle.dumps(a)) is a
+
 
 class TestSymbolEquality:
     def test_equal_same_name(self):
@@ -65,6 +81,49 @@ class TestSymbolEquality:
         assert hash(s) == hash(s)
 
 
+class TestSymbolIds:
+    def test_ids_are_dense_and_distinct(self, monkeypatch):
+        # No reclaimed IDs to reuse: new names get the next ones
+        monkeypatch.setattr(symbol_module, "_free_ids", [])
+        before = symbol_count()
+        a = Symbol("symbolIdTestA")
+        b = Symbol("symbolIdTestB")
+        assert (a.id, b.id) == (before, before + 1)
+        assert symbol_count() == before + 2
+
+    def test_reclaimed_ids_used_before_new_ones(self, monkeypatch):
+        monkeypatch.setattr(symbol_module, "_free_ids", [])
+        tmp = gensym()
+        freed = tmp.id
+        del tmp
+        assert sweep_temporaries() == 1
+        before = symbol_count()
+        assert Symbol("symbolIdTestReused").id == freed
+        assert symbol_count() == before
+
+    def test_same_name_same_id(self):
+        assert Symbol("x").id == symbol("x").id
+
+    def test_id_stable_across_cache_clear(self):
+        old = Symbol("x")
+        clear_symbol_cache()
+        new = Symbol("x")
+        assert new is not old
+        assert new.id == old.id
+        assert hash(new) == hash(old)
+        assert {old: 1}[new] == 1
+
+    def test_symbol_from_id(self):
+        s = Symbol("y")
+        assert symbol_from_id(s.id) is s
+
+    def test_symbol_from_unknown_id_raises(self):
+        with pytest.raises(IndexError):
+            symbol_from_id(symbol_count())
+        with pytest.raises(IndexError):
+            symbol_from_id(-1)
+
+
 class TestSymbolOrdering:
     def test_lt(self):
         assert Symbol("a") < Symbol("b")
@@ -116,6 +175,42 @@ class TestGensym:
         assert int(a.name[1:]) + 1 == int(b.name[1:])
 
 
+class TestTemporarySymbols:
+    def test_gensym_is_temporary(self):
+        assert is_temporary(gensym())
+        assert not is_temporary(Symbol("x"))
+
+    def test_lookup_by_name_finds_temporary(self):
+        tmp = gensym("tmp")
+        assert Symbol(tmp.name) is tmp
+        assert is_temporary(Symbol(tmp.name))
+
+    def test_unreferenced_temporaries_are_swept(self):
+        before = temporary_count()
+        for _ in range(10):
+            gensym()
+        kept = gensym()
+        assert sweep_temporaries() == 10
+        assert temporary_count() == before + 1
+        assert is_temporary(kept)
+
+    def test_reclaimed_ids_are_reused(self):
+        tmp = gensym()
+        name, freed = tmp.name, tmp.id
+        del tmp
+        assert sweep_temporaries() == 1
+        with pytest.raises(IndexError):
+            symbol_from_id(freed)
+        assert gensym().id == freed
+        assert Symbol(name).id != freed
+
+    def test_ids_of_live_symbols_not_reused(self):
+        kept = gensym()
+        sweep_temporaries()
+        assert all(gensym().id != kept.id for _ in range(5))
+        assert symbol_from_id(kept.id) is kept
+
+
 class TestSymbolRepresentation:
     def test_repr(self):
         assert repr(Symbol("x")) == 'Symbol("x")'
@@ -0,0 +1,147 @@
+"""Tests for Walk module."""
+
+from __future__ import annotations
+
+import sys
+
+from minimatic.core.attributes import Flat
+from minimatic.core.expression import Expression
+from minimatic.core.packed import pack_values
+from minimatic.core.symbol import Symbol
+from minimatic.core.walk import fold, postorder, preorder, rebuild, rebuild_node
+
+f = Symbol("f")
+g = Symbol("g")
+x = Symbol("x")
+y = Symbol("y")
+
+# Deeper than the recursion limit
+DEPTH = sys.getrecursionlimit() * 5
+
+
+def chain(depth, leaf=x):
+    """f[f[...f[leaf]...]] with `depth` levels."""
+    expr = leaf
+    for _ in range(depth):
+        expr = Expression(f, expr)
+    return expr
+
+
+class TestPreorder:
+    def test_parents_before_arguments(self):
+        inner = Expression(g, 1, 2)
+        expr = Expression(f, inner, x)
+        assert list(preorder(expr)) == [expr, inner, 1, 2, x]
+
+    def test_atom(self):
+        assert list(preorder(x)) == [x]
+
+    def test_heads(self):
+        expr = Expression(Expression(g, y), x)
+        assert list(preorder(expr, heads=True)) == [expr, expr.head, g, y, x]
+
+    def test_enter_prunes_subtrees(self):
+        inner = Expression(g, 1, 2)
+        expr = Expression(f, inner, Expression(f, 3))
+        visited = list(preorder(expr, enter=lambda e: e.head == f))
+        assert visited == [expr, inner, expr.args[1], 3]
+
+    def test_deep_tree(self):
+        assert sum(1 for _ in preorder(chain(DEPTH))) == DEPTH + 1
+
+
+class TestPostorder:
+    def test_arguments_before_parents(self):
+        inner = Expression(g, 1, 2)
+        expr = Expression(f, inner, x)
+        assert list(postorder(expr)) == [1, 2, inner, x, expr]
+
+    def test_heads(self):
+        expr = Expression(f, x)
+        assert list(postorder(expr, heads=True)) == [f, x, expr]
+
+    def test_deep_tree(self):
+        nodes = list(postorder(chain(DEPTH)))
+        assert nodes[0] == x
+        assert nodes[-1].depth == DEPTH
+
+
+class TestFold:
+    def test_values_bottom_up(self):
+        expr = Expression(f, 1, Expression(g, 2, 3))
+        total = fold(
+            expr, lambda atom: atom if isinstance(atom, int) else 0, lambda e, h, args: sum(args)
+        )
+        assert total == 6
+
+    def test_head_value_passed(self):
+        expr = Expression(f, Expression(g, x))
+        names = fold(expr, str, lambda e, head, args: head + "(" + ",".join(args) + ")")
+        assert names == "f(g(x))"
+
+    def test_enter_rejected_subtree_is_its_value(self):
+        inner = Expression(g, 2, 3)
+        values = fold(
+            Expression(f, 1, inner),
+            lambda atom: atom,
+            lambda e, h, args: args,
+            lambda e: e.head == f,
+        )
+        assert values == [1, inner]
+        assert values[1] is inner
+
+    def test_deep_tree(self):
+        assert fold(chain(DEPTH), lambda atom: 0, lambda e, h, args: args[0] + 1) == DEPTH
+
+
+class TestRebuild:
+    def test_substitutes_atoms(self):
+        expr = Expression(f, x, Expression(g, x, y))
+        result = rebuild(expr, lambda atom: 0 if atom == x else atom)
+        assert result == Expression(f, 0, Expression(g, 0, y))
+
+    def test_unchanged_tree_is_shared(self):
+        expr = Expression(f, x, Expression(g, y))
+        assert rebuild(expr, lambda atom: atom) is expr
+
+    def test_unchanged_subtrees_are_shared(self):
+        untouched = Expression(g, y, 1)
+        expr = Expression(f, untouched, x)
+        result = rebuild(expr, lambda atom: 0 if atom == x else atom)
+        assert result.args[0] is untouched
+
+    def test_attributes_preserved(self):
+        expr = Expression(f, x, _attrs={Flat})
+        assert rebuild(expr, lambda atom: 1 if atom == x else atom).attributes == frozenset({Flat})
+
+    def test_head_substitution(self):
+        expr = Expression(f, x)
+        assert rebuild(expr, lambda atom: g if atom == f else atom) == Expression(g, x)
+
+    def test_enter_keeps_subtrees(self):
+        held = Expression(g, x)
+        expr = Expression(f, x, held)
+        result = rebuild(expr, lambda atom: 0 if atom == x else atom, enter=lambda e: e.head != g)
+        assert result.args == (0, held)
+        assert result.args[1] is held
+
+    def test_custom_node(self):
+        expr = Expression(f, Expression(g, 1), 2)
+
+        def drop_g(node, head, args):
+            if head == g:
+                return args[0]
+            return rebuild_node(node, head, args)
+
+        assert rebuild(expr, lambda atom: atom, node=drop_g) == Expression(f, 1, 2)
+
+    def test_packed_array(self):
+        packed = pack_values([1, 2, 3])
+        assert rebuild(packed, lambda atom: atom) is packed
+        assert rebuild(
+            packed, lambda atom: atom * 2 if isinstance(atom, int) else atom
+        ) == pack_values([2, 4, 6])
+
+    def test_deep_tree(self):
+        result = rebuild(chain(DEPTH), lambda atom: y if atom == x else atom)
+        assert result == chain(DEPTH, y)
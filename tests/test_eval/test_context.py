@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
-from minimatic.core.symbol import Symbol
+from minimatic.core.attributes import Orderless, Temporary
+from minimatic.core.expression import Expression
+from minimatic.core.symbol import Symbol, gensym, is_temporary
 from minimatic.eval.context import (
     ContextChain,
     EvaluationContext,
     GlobalContext,
+    attributes_changed,
+    collect_temporaries,
+    definitions_changed,
     get_current_context,
     with_context,
 )
+from minimatic.eval.evaluator import evaluate
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.structural import pattern
 
 
 class TestEvaluationContext:
@@ -64,6 +72,77 @@ class TestAttributes:
         assert not ctx.has_attribute(x, Symbol("Orderless"))
 
 
+class TestDefinitionsVersion:
+    def test_changes_bump_version(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        changes = [
+            lambda: ctx.set_attributes(f, frozenset({Orderless})),
+            lambda: ctx.clear_attributes(f),
+            lambda: ctx.set_own_values(f, [(f, 1, None)]),
+            lambda: ctx.add_down_value(f, Expression(f, 1), "one"),
+            lambda: ctx.add_down_value(f, Expression(f, 1), "uno"),
+            lambda: ctx.clear_all_values(f),
+            definitions_changed,
+        ]
+        for change in changes:
+            before = EvaluationContext.definitions_version
+            change()
+            assert EvaluationContext.definitions_version > before
+
+    def test_shared_by_contexts(self):
+        parent = EvaluationContext("Parent")
+        child = EvaluationContext("Child", parent=parent)
+        before = child.definitions_version
+        parent.set_own_values(Symbol("x"), [])
+        assert child.definitions_version > before
+
+    def test_lookups_keep_version(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        ctx.add_down_value(f, Expression(f, 1), "one")
+        before = EvaluationContext.definitions_version
+        ctx.get_down_values(f)
+        ctx.get_down_value_candidates(f, Expression(f, 1))
+        ctx.get_attributes(f)
+        ctx.clear_attributes(f)
+        assert EvaluationContext.definitions_version == before
+
+
+class TestAttributeCache:
+    def test_attribute_changes_bump_version(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        for change in (
+            lambda: ctx.set_attributes(f, frozenset({Orderless})),
+            lambda: ctx.clear_attributes(f),
+            attributes_changed,
+        ):
+            before = EvaluationContext.attributes_version, EvaluationContext.definitions_version
+            change()
+            after = EvaluationContext.attributes_version, EvaluationContext.definitions_version
+            assert after[0] > before[0] and after[1] > before[1]
+
+    def test_value_changes_keep_attributes_version(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        before = EvaluationContext.attributes_version
+        ctx.set_own_values(f, [(f, 1, None)])
+        ctx.add_down_value(f, Expression(f, 1), "one")
+        assert EvaluationContext.attributes_version == before
+
+    def test_cache_kept_until_attributes_change(self):
+        parent = EvaluationContext("Parent")
+        child = EvaluationContext("Child", parent=parent)
+        f = Symbol("f")
+        cache = child.attribute_cache()
+        cache[f] = frozenset()
+        child.set_own_values(f, [])
+        assert child.attribute_cache() is cache
+        parent.set_attributes(f, frozenset({Orderless}))
+        assert child.attribute_cache() == {}
+
+
 class TestValueStorage:
     def test_own_values(self):
         ctx = EvaluationContext("Test")
@@ -117,6 +196,87 @@ class TestValueStorage:
         assert ctx.get_down_values(x) == []
 
 
+class TestDefinitionIndex:
+    def test_candidates_in_definition_order(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        x = Symbol("x")
+        for i in range(50):
+            ctx.add_down_value(f, Expression(f, i), i)
+        ctx.add_down_value(f, Expression(f, pattern(x, blank(Symbol("Integer")))), x)
+        ctx.add_down_value(f, Expression(f, pattern(x)), "any")
+        candidates = ctx.get_down_value_candidates(f, Expression(f, 70))
+        assert [replacement for _, replacement, _ in candidates] == [x, "any"]
+        assert len(ctx.get_down_value_candidates(f, Expression(f, "s"))) == 1
+
+    def test_specific_value_alone(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        x = Symbol("x")
+        ctx.add_down_value(f, Expression(f, pattern(x)), x)
+        for i in range(50):
+            ctx.add_down_value(f, Expression(f, i), i * i)
+        assert ctx.get_down_value_candidates(f, Expression(f, 7)) == [(Expression(f, 7), 49, None)]
+        ctx.get_down_values(f).append((Expression(f, 50), "fifty", None))
+        assert ctx.get_down_value_candidates(f, Expression(f, 50))[0][1] == "fifty"
+
+    def test_specific_value_with_condition_not_alone(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        x = Symbol("x")
+        ctx.add_down_value(f, Expression(f, 1), "one", Symbol("False"))
+        ctx.add_down_value(f, Expression(f, pattern(x)), x)
+        assert len(ctx.get_down_value_candidates(f, Expression(f, 1))) == 2
+
+    def test_same_pattern_replaced(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        ctx.add_down_value(f, Expression(f, 1), "one")
+        ctx.add_down_value(f, Expression(f, 2), "two")
+        ctx.add_down_value(f, Expression(f, 1), "uno")
+        assert ctx.get_down_values(f) == [
+            (Expression(f, 1), "uno", None),
+            (Expression(f, 2), "two", None),
+        ]
+
+    def test_list_changes_reindexed(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        ctx.add_down_value(f, Expression(f, 1), "one")
+        ctx.add_down_value(f, Expression(f, 2), "two")
+        ctx.get_down_values(f).append((Expression(f, 3), "three", None))
+        assert ctx.get_down_value_candidates(f, Expression(f, 3))[0][1] == "three"
+        ctx.set_down_values(f, [(Expression(f, 4), "four", None), (Expression(f, 5), "five", None)])
+        assert ctx.get_down_value_candidates(f, Expression(f, 1)) == []
+        assert ctx.get_down_value_candidates(f, Expression(f, 5))[0][1] == "five"
+
+    def test_added_where_defined(self):
+        parent = EvaluationContext("Parent")
+        child = EvaluationContext("Child", parent=parent)
+        f = Symbol("f")
+        parent.add_down_value(f, Expression(f, 1), "one")
+        child.add_down_value(f, Expression(f, 2), "two")
+        assert len(parent.get_down_values(f)) == 2
+        assert child.get_down_value_candidates(f, Expression(f, 2))[0][1] == "two"
+
+    def test_orderless_expression_gets_every_definition(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        ctx.add_down_value(f, Expression(f, 1, 2), "a")
+        ctx.add_down_value(f, Expression(f, 3), "b")
+        expr = Expression(f, 2, 1, _attrs={Orderless})
+        assert len(ctx.get_down_value_candidates(f, expr)) == 2
+
+    def test_sub_values(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        x = Symbol("x")
+        ctx.add_sub_value(f, Expression(Expression(f, pattern(x)), 1), "one")
+        ctx.add_sub_value(f, Expression(Expression(f, pattern(x)), 2), "two")
+        expr = Expression(Expression(f, 0), 2)
+        assert [entry[1] for entry in ctx.get_sub_value_candidates(f, expr)] == ["two"]
+
+
 class TestContextStack:
     def test_get_current_context(self):
         ctx = get_current_context()
@@ -156,3 +316,201 @@ class TestContextChain:
 
         with raises(KeyError):
             chain[Symbol("missing")]
+
+
+class TestFlattenedScopes:
+    def _chain(self, depth):
+        root = EvaluationContext("Root")
+        contexts = [root]
+        for level in range(depth):
+            contexts.append(EvaluationContext(f"Block{level}", parent=contexts[-1]))
+        return contexts
+
+    def test_deep_chain_sees_every_layer(self):
+        root, *_, middle, deepest = self._chain(50)
+        x, y = Symbol("x"), Symbol("y")
+        root.set_own_values(x, [(x, 1, None)])
+        middle.set_attributes(y, frozenset({Orderless}))
+        assert deepest.get_own_values(x) == [(x, 1, None)]
+        assert deepest.get_attributes(y) == frozenset({Orderless})
+        assert root.get_attributes(y) == frozenset()
+
+    def test_shadowing_and_unshadowing(self):
+        root, outer, inner = self._chain(2)
+        x = Symbol("x")
+        root.set_own_values(x, [(x, "root", None)])
+        outer.set_own_values(x, [(x, "outer", None)])
+        assert inner.get_own_values(x) == [(x, "outer", None)]
+        inner.set_own_values(x, [(x, "inner", None)])
+        assert inner.get_own_values(x) == [(x, "inner", None)]
+        inner.clear_all_values(x)
+        assert inner.get_own_values(x) == [(x, "outer", None)]
+        outer.clear_all_values(x)
+        assert inner.get_own_values(x) == [(x, "root", None)]
+
+    def test_parent_change_seen_by_child(self):
+        root, outer, inner = self._chain(2)
+        f, x = Symbol("f"), Symbol("x")
+        assert inner.get_down_values(f) == []
+        outer.add_down_value(f, Expression(f, pattern(x)), 1)
+        assert [entry[1] for entry in inner.get_down_values(f)] == [1]
+        outer.set_attributes(f, frozenset({Orderless}))
+        assert inner.has_attribute(f, Orderless)
+        outer.clear_attributes(f)
+        assert not inner.has_attribute(f, Orderless)
+
+    def test_in_place_updates_seen_by_child(self):
+        _, outer, inner = self._chain(2)
+        f = Symbol("f")
+        outer.add_down_value(f, Expression(f, 1), "one")
+        assert len(inner.get_down_values(f)) == 1
+        outer.add_down_value(f, Expression(f, 2), "two")
+        assert len(inner.get_down_values(f)) == 2
+
+    def test_sibling_scopes_independent(self):
+        root, outer, _ = self._chain(2)
+        sibling = EvaluationContext("Sibling", parent=outer)
+        x = Symbol("x")
+        sibling.set_own_values(x, [(x, 1, None)])
+        assert outer.get_own_values(x) == []
+        assert EvaluationContext("Other", parent=outer).get_own_values(x) == []
+
+    def test_child_definition_extends_parent_view(self):
+        _, outer, inner = self._chain(2)
+        symbols = [Symbol(f"s{n}") for n in range(1000)]
+        for sym in symbols:
+            outer.set_own_values(sym, [(sym, 1, None)])
+        x = Symbol("x")
+        assert inner.get_own_values(symbols[0])
+        inner.set_own_values(x, [(x, 2, None)])
+        # The child's view is the parent's plus one entry; the parent's is unchanged
+        assert len(inner._scope) == len(outer._scope) + 1 == 1001
+        assert outer.get_own_values(x) == []
+        assert inner.get_own_values(symbols[-1]) == [(symbols[-1], 1, None)]
+
+    def test_collected_from_chained_context(self):
+        _, outer, inner = self._chain(2)
+        tmp = gensym("tmp")
+        outer.set_attributes(tmp, frozenset({Temporary}))
+        outer.set_own_values(tmp, [(tmp, 1, None)])
+        assert inner.get_own_values(tmp)
+        name = tmp.name
+        del tmp
+        assert collect_temporaries() == 1
+        assert inner.get_own_values(Symbol(name)) == []
+
+
+class TestTemporaryCollection:
+    def _temporary(self, ctx, value):
+        tmp = gensym("tmp")
+        ctx.set_attributes(tmp, frozenset({Temporary}))
+        ctx.set_own_values(tmp, [(tmp, value, None)])
+        return tmp.name
+
+    def test_unreachable_definitions_removed(self):
+        ctx = EvaluationContext("Test")
+        name = self._temporary(ctx, 1)
+        assert collect_temporaries() == 1
+        assert ctx._values == {}
+        assert ctx._attributes == {}
+        assert not is_temporary(Symbol(name))
+
+    def test_referenced_symbol_kept(self):
+        ctx = EvaluationContext("Test")
+        tmp = Symbol(self._temporary(ctx, 1))
+        assert collect_temporaries() == 0
+        assert ctx.get_own_values(tmp) == [(tmp, 1, None)]
+
+    def test_symbol_in_live_expression_kept(self):
+        ctx = EvaluationContext("Test")
+        held = Expression(Symbol("Hold"), Symbol(self._temporary(ctx, 1)))
+        assert collect_temporaries() == 0
+        assert ctx.get_own_values(held.args[0])
+
+    def test_symbol_used_by_ordinary_definition_kept(self):
+        ctx = EvaluationContext("Test")
+        f = Symbol("f")
+        ctx.set_own_values(f, [(f, Symbol(self._temporary(ctx, 1)), None)])
+        assert collect_temporaries() == 0
+
+    def test_chain_of_temporaries(self):
+        ctx = EvaluationContext("Test")
+        inner = self._temporary(ctx, 1)
+        outer = self._temporary(ctx, Expression(Symbol("List"), Symbol(inner)))
+        kept = Symbol(outer)
+        assert collect_temporaries() == 0
+        del kept
+        assert collect_temporaries() == 2
+
+    def test_definitions_in_every_context_removed(self):
+        outer = EvaluationContext("Outer")
+        inner = EvaluationContext("Inner", parent=outer)
+        tmp = gensym("tmp")
+        outer.set_attributes(tmp, frozenset({Temporary}))
+        inner.set_own_values(tmp, [(tmp, 1, None)])
+        del tmp
+        assert collect_temporaries() == 1
+        assert outer._attributes == {} and inner._values == {}
+
+    def test_set_temporary_changes_no_version(self):
+        ctx = EvaluationContext("Test")
+        tmp = gensym("tmp")
+        before = (EvaluationContext.definitions_version, EvaluationContext.attributes_version)
+        ctx.set_temporary(tmp)
+        after = (EvaluationContext.definitions_version, EvaluationContext.attributes_version)
+        assert after == before
+        assert ctx.get_attributes(tmp) == frozenset({Temporary})
+        del tmp
+        assert collect_temporaries() == 1
+
+    def test_temporary_attribute_on_ordinary_symbol(self):
+        ctx = EvaluationContext("Test")
+        x = Symbol("x")
+        ctx.set_attributes(x, frozenset({Temporary}))
+        ctx.set_own_values(x, [(x, 1, None)])
+        assert collect_temporaries() == 0
+        del x
+        assert collect_temporaries() == 1
+        assert ctx._values == {}
+
+    def test_indexed_definitions_removed(self):
+        ctx = EvaluationContext("Test")
+        tmp = gensym("tmp")
+        ctx.set_attributes(tmp, frozenset({Temporary}))
+        for i in range(3):
+            ctx.add_down_value(tmp, Expression(tmp, i), i)
+        assert ctx.get_down_value_candidates(tmp, Expression(tmp, 1))
+        del tmp
+        assert collect_temporaries() == 1
+        assert ctx._values == {}
+
+    def test_recycled_id_finds_no_stale_definitions(self):
+        ctx = EvaluationContext("Test")
+        tmp = gensym("tmp")
+        ctx.set_attributes(tmp, frozenset({Temporary, Orderless}))
+        ctx.set_own_values(tmp, [(tmp, 1, None)])
+        ctx.add_down_value(tmp, Expression(tmp, 1), 2)
+        assert ctx.get_attributes(tmp) == frozenset({Temporary, Orderless})
+        assert ctx.get_down_value_candidates(tmp, Expression(tmp, 1))
+        old_id = tmp.id
+        del tmp
+        assert collect_temporaries() == 1
+        fresh = gensym("tmp")
+        assert fresh.id == old_id
+        assert ctx.get_attributes(fresh) == frozenset()
+        assert ctx.get_own_values(fresh) == []
+        assert not ctx.get_down_value_candidates(fresh, Expression(fresh, 1))
+
+    def test_cached_temporary_keeps_its_id(self):
+        ctx = EvaluationContext("Test")
+        tmp = gensym("tmp")
+        ctx.set_temporary(tmp)
+        evaluate(Expression(tmp, 1), ctx)
+        name, old_id = tmp.name, tmp.id
+        del tmp
+        # The caches of the evaluation still hold the symbol, so its ID is
+        # not given to another one
+        collect_temporaries(keep_caches=True)
+        assert is_temporary(Symbol(name)) and Symbol(name).id == old_id
+        assert collect_temporaries() == 1
+        assert not is_temporary(Symbol(name))
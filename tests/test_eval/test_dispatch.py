@@ -0,0 +1,152 @@
+"""Tests for Dispatch module."""
+
+from __future__ import annotations
+
+from minimatic.core.expression import Expression
+from minimatic.core.symbol import Symbol
+from minimatic.eval.dispatch import (
+    VARIADIC,
+    argument_key,
+    build_index,
+    candidates,
+    exact_definition,
+    exact_key,
+    find_definition,
+    key_path,
+)
+from minimatic.pattern.blanks import blank, blank_null_seq, blank_seq
+from minimatic.pattern.structural import (
+    alternatives,
+    condition,
+    hold_pattern,
+    optional,
+    pattern,
+    verbatim,
+)
+
+f = Symbol("f")
+g = Symbol("g")
+a = Symbol("a")
+x = Symbol("x")
+y = Symbol("y")
+Integer = Symbol("Integer")
+Real = Symbol("Real")
+
+
+def definitions(*patterns):
+    return [(p, i, None) for i, p in enumerate(patterns)]
+
+
+class TestKeys:
+    def test_fixed_arity(self):
+        assert key_path(Expression(f, 1, pattern(x))) == [2, argument_key(1), None]
+
+    def test_variadic_stops_at_sequence(self):
+        path = key_path(Expression(f, 1, pattern(x, blank_seq()), 2))
+        assert path == [VARIADIC, argument_key(1)]
+        assert key_path(Expression(f, optional(pattern(x), 0)))[0] == VARIADIC
+
+    def test_not_keyed(self):
+        assert key_path(f) == []
+        assert key_path(pattern(x)) == []
+
+    def test_wrappers_unwrapped(self):
+        expected = key_path(Expression(f, 1))
+        assert key_path(hold_pattern(Expression(f, 1))) == expected
+        assert key_path(condition(Expression(f, 1), True)) == expected
+
+    def test_argument_keys(self):
+        assert argument_key(a) == argument_key(verbatim(a))
+        assert argument_key(pattern(x, blank(Integer))) == argument_key(blank(Integer))
+        assert argument_key(Expression(g, pattern(x))) == argument_key(verbatim(Expression(g)))
+        assert argument_key(blank()) is None
+        assert argument_key(alternatives(1, 2)) is None
+        assert argument_key(Expression(pattern(x), 1)) is None
+
+
+class TestCandidates:
+    def test_literal_arguments(self):
+        entries = definitions(*(Expression(f, i) for i in range(100)))
+        index = build_index(entries)
+        assert candidates(index, Expression(f, 42)) == [42]
+        assert candidates(index, Expression(f, 1000)) == []
+
+    def test_definition_order_preserved(self):
+        entries = definitions(
+            Expression(f, pattern(x)),
+            Expression(f, 1),
+            Expression(f, pattern(x, blank(Integer))),
+            Expression(f, pattern(x, blank(Real))),
+        )
+        index = build_index(entries)
+        assert candidates(index, Expression(f, 1)) == [0, 1, 2]
+        assert candidates(index, Expression(f, 2.5)) == [0, 3]
+
+    def test_arity(self):
+        entries = definitions(Expression(f, pattern(x)), Expression(f, pattern(x), pattern(y)))
+        index = build_index(entries)
+        assert candidates(index, Expression(f, 1, 2)) == [1]
+        assert candidates(index, Expression(f)) == []
+
+    def test_variadic(self):
+        entries = definitions(
+            Expression(f, 1, pattern(x, blank_null_seq())),
+            Expression(f, pattern(x)),
+            Expression(f, pattern(x, blank_seq())),
+        )
+        index = build_index(entries)
+        assert candidates(index, Expression(f, 1)) == [0, 1, 2]
+        assert candidates(index, Expression(f, 2, 3)) == [2]
+        assert candidates(index, Expression(f)) == [2]
+
+    def test_heads(self):
+        entries = definitions(Expression(f, Expression(g, pattern(x))), Expression(f, blank(g)))
+        index = build_index(entries)
+        assert candidates(index, Expression(f, Expression(g, 1))) == [0, 1]
+        assert candidates(index, Expression(f, Expression(a, 1))) == []
+
+    def test_numeric_literal_equality(self):
+        index = build_index(definitions(Expression(f, 1)))
+        assert candidates(index, Expression(f, 1.0)) == [0]
+
+    def test_unkeyed_always_candidates(self):
+        index = build_index(definitions(Expression(f, 1), f, pattern(x)))
+        assert candidates(index, Expression(f, 2)) == [1, 2]
+        assert candidates(index, a) == [1, 2]
+
+
+class TestFindDefinition:
+    def test_equal_pattern_found(self):
+        entries = definitions(Expression(f, 1), Expression(f, pattern(x)), Expression(f, 2))
+        index = build_index(entries)
+        assert find_definition(index, entries, Expression(f, pattern(x))) == 1
+        assert find_definition(index, entries, Expression(f, 2)) == 2
+        assert find_definition(index, entries, Expression(f, pattern(y))) is None
+
+
+class TestExactDefinition:
+    def test_specific_values(self):
+        entries = definitions(Expression(f, pattern(x)), *(Expression(f, i) for i in range(100)))
+        index = build_index(entries)
+        assert exact_definition(index, Expression(f, 42)) == 43
+        assert exact_definition(index, Expression(f, 42.0)) == 43
+        assert exact_definition(index, Expression(f, 100)) is None
+        assert exact_definition(index, Expression(g, 42)) is None
+        assert exact_definition(index, a) is None
+
+    def test_first_definition_wins(self):
+        index = build_index(definitions(Expression(f, 1), Expression(f, 1.0)))
+        assert exact_definition(index, Expression(f, 1)) == 0
+
+    def test_condition_not_exact(self):
+        index = build_index([(Expression(f, 1), a, True), (Expression(f, 2), a, None)])
+        assert exact_definition(index, Expression(f, 1)) is None
+        assert exact_definition(index, Expression(f, 2)) == 1
+
+    def test_keys(self):
+        assert exact_key(Expression(f, 1, Expression(g, a))) == Expression(f, 1, Expression(g, a))
+        assert exact_key(hold_pattern(Expression(f, 1))) == Expression(f, 1)
+        assert exact_key(Expression(Expression(f, 1), 2)) == Expression(Expression(f, 1), 2)
+        assert exact_key(Expression(f, pattern(x))) is None
+        assert exact_key(Expression(f, Expression(g, blank()))) is None
+        assert exact_key(f) is None
@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
+import sys
 import threading
 
 import pytest
 
-from minimatic.core.attributes import HoldAll, HoldFirst
+from minimatic.core.attributes import HoldAll, HoldFirst, Orderless
 from minimatic.core.expression import Expression
 from minimatic.core.symbol import Symbol
 from minimatic.eval.context import EvaluationContext
 from minimatic.eval.evaluator import (
     FixedPoint,
+    IterationLimitError,
     RecursionLimitError,
     _get_eval_state,
+    clear_evaluated_marks,
     evaluate,
     evaluate_iterated,
     get_iteration_limit,
@@ -21,6 +24,10 @@ from minimatic.eval.evaluator import (
     set_recursion_limit,
     try_evaluate,
 )
+from minimatic.eval.profile import profiling
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.compiler import clear_compiled_patterns, compiled_pattern_count
+from minimatic.pattern.structural import pattern
 
 Plus = Symbol("Plus")
 Times = Symbol("Times")
@@ -97,6 +104,26 @@ class TestEvaluateExpression:
         assert result.args[0] == inner or isinstance(result.args[0], Expression)
 
 
+class TestLiteralDefinitions:
+    def test_memoized_values_are_not_compiled(self):
+        f = Symbol("f")
+        ctx = EvaluationContext("test")
+        ctx.set_down_values(f, [(Expression(f, n), n * n, None) for n in range(100)])
+        ctx.set_own_values(x, [(x, 7, None)])
+        clear_compiled_patterns()
+        assert [evaluate(Expression(f, n), ctx) for n in range(100)] == [n * n for n in range(100)]
+        assert evaluate(x, ctx) == 7
+        assert compiled_pattern_count() == 0
+
+    def test_patterns_are_still_compiled(self):
+        f = Symbol("f")
+        ctx = EvaluationContext("test")
+        ctx.set_down_values(f, [(Expression(f, pattern(x, blank())), x, None)])
+        clear_compiled_patterns()
+        assert evaluate(Expression(f, 3), ctx) == 3
+        assert compiled_pattern_count() == 1
+
+
 class TestRecursionLimit:
     def test_recursion_limit_error(self):
         set_recursion_limit(5)
@@ -107,6 +134,89 @@ class TestRecursionLimit:
             evaluate(x, ctx)
 
 
+class TestExplicitStack:
+    @pytest.fixture
+    def down(self):
+        """down[0] = 0; down[n_Integer] := 1 + down[n - 1]: nests n deep."""
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        down, n = Symbol("down"), Symbol("n")
+        ctx = EvaluationContext("test")
+        ctx.add_down_value(down, Expression(down, 0), 0)
+        recursive = Expression(Plus, 1, Expression(down, Expression(Plus, n, -1)))
+        ctx.add_down_value(down, Expression(down, pattern(n, blank(Symbol("Integer")))), recursive)
+        return lambda depth: evaluate(Expression(down, depth), ctx)
+
+    def test_deeper_than_python_stack(self, down):
+        depth = 2 * sys.getrecursionlimit()
+        set_recursion_limit(4 * depth)
+        set_iteration_limit(4 * depth)
+        assert down(depth) == depth
+
+    def test_conditions_deeper_than_python_stack(self):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        # ok[0] = True; ok[n_] /; ok[n - 1] := True: each condition nests
+        ok, n = Symbol("ok"), Symbol("n")
+        true = Symbol("True")
+        ctx = EvaluationContext("test")
+        ctx.add_down_value(ok, Expression(ok, 0), true)
+        previous = Expression(ok, Expression(Plus, n, -1))
+        ctx.add_down_value(ok, Expression(ok, pattern(n)), true, previous)
+        depth = 2 * sys.getrecursionlimit()
+        set_recursion_limit(8 * depth)
+        set_iteration_limit(8 * depth)
+        assert evaluate(Expression(ok, depth), ctx) == true
+
+    def test_failed_condition_falls_through(self):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        f, g, h, n = Symbol("f"), Symbol("g"), Symbol("h"), Symbol("n")
+        false = Symbol("False")
+        ctx = EvaluationContext("test")
+        # f[n_] := "first" /; False; f[n_] := "second"
+        ctx.add_down_value(f, Expression(f, pattern(n)), "first", false)
+        ctx.add_down_value(f, Expression(f, pattern(n)), "second")
+        assert evaluate(Expression(f, 1), ctx) == "second"
+        # g[h] ^:= "up" /; False; g[h] := "down"
+        ctx.set_up_values(h, [(Expression(g, h), "up", false)])
+        ctx.add_down_value(g, Expression(g, h), "down")
+        assert evaluate(Expression(g, h), ctx) == "down"
+        # A failed condition on a built-in leaves the built-in to apply
+        ctx.add_down_value(Plus, Expression(Plus, pattern(n), 1), 0, false)
+        assert evaluate(Expression(Plus, 2, 1), ctx) == 3
+
+    def test_nesting_bounded_by_recursion_limit(self, down):
+        set_recursion_limit(50)
+        assert down(20) == 20
+        with pytest.raises(RecursionLimitError):
+            down(100)
+        assert _get_eval_state().recursion_depth == 0
+
+    def test_rewrites_loop_in_place(self):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        loop, n, done = Symbol("loop"), Symbol("n"), Symbol("done")
+        ctx = EvaluationContext("test")
+        ctx.add_down_value(loop, Expression(loop, 0), done)
+        rewrite = Expression(loop, Expression(Plus, n, -1))
+        ctx.add_down_value(loop, Expression(loop, pattern(n, blank(Symbol("Integer")))), rewrite)
+        set_recursion_limit(10)
+        # Two rewrites a step: loop[n] and n - 1
+        assert evaluate(Expression(loop, 400), ctx) == done
+        set_iteration_limit(100)
+        with pytest.raises(IterationLimitError):
+            evaluate(Expression(loop, 400), ctx)
+
+    def test_own_value_cycle_hits_recursion_limit(self):
+        y = Symbol("y")
+        ctx = EvaluationContext("test")
+        ctx.set_own_values(x, [(x, y, None)])
+        ctx.set_own_values(y, [(y, x, None)])
+        with pytest.raises(RecursionLimitError):
+            evaluate(Expression(Symbol("g"), x), ctx)
+
+
 class TestIterationLimit:
     def test_iteration_limit_get_set(self):
         old = get_iteration_limit()
@@ -114,6 +224,18 @@ class TestIterationLimit:
         assert get_iteration_limit() == 500
         set_iteration_limit(old)
 
+    def test_counted_per_expression(self):
+        step, n = Symbol("step"), Symbol("n")
+        ctx = EvaluationContext("test")
+        ctx.add_down_value(step, Expression(step, 0), 0)
+        ctx.add_down_value(step, Expression(step, Expression(Symbol("s"), pattern(n))), n)
+        calls = [Expression(step, Expression(Symbol("s"), 0)) for _ in range(50)]
+        set_iteration_limit(10)
+        # Fifty rewrites in all, two in a row at most
+        assert evaluate(Expression(Symbol("List"), *calls), ctx) == Expression(
+            Symbol("List"), *[0] * 50
+        )
+
 
 class TestFixedPoint:
     def test_fixed_point(self):
@@ -156,6 +278,115 @@ class TestTryEvaluate:
         assert result == "fallback"
 
 
+class TestResolvedAttributes:
+    def test_attributes_from_parent_context(self):
+        g, a, b = Symbol("g"), Symbol("a"), Symbol("b")
+        parent = EvaluationContext("parent")
+        child = EvaluationContext("child", parent=parent)
+        assert evaluate(Expression(g, b, a), child) == Expression(g, b, a)
+        parent.set_attributes(g, frozenset({Orderless}))
+        assert evaluate(Expression(g, b, a), child) == Expression(g, a, b)
+        parent.clear_attributes(g)
+        assert evaluate(Expression(g, b, a), child) == Expression(g, b, a)
+
+    def test_expression_attributes_added(self):
+        g, a = Symbol("g"), Symbol("a")
+        ctx = EvaluationContext("test")
+        ctx.set_own_values(a, [(a, 1, None)])
+        assert evaluate(Expression(g, a), ctx) == Expression(g, 1)
+        held = Expression(g, a, _attrs={HoldAll})
+        assert evaluate(held, ctx).args == (a,)
+
+    def test_builtin_attributes(self):
+        import minimatic.builtins.arithmetic  # noqa: F401
+
+        ctx = EvaluationContext("test")
+        a, b = Symbol("a"), Symbol("b")
+        assert evaluate(Expression(Plus, b, a), ctx) == Expression(Plus, a, b)
+
+
+class TestEvaluatedMarks:
+    def test_fixed_point_returned_without_rules(self):
+        f, g, a = Symbol("f"), Symbol("g"), Symbol("a")
+        ctx = EvaluationContext("test")
+        ctx.add_down_value(f, Expression(f, pattern(x)), a, Symbol("False"))
+        expr = Expression(g, Expression(f, 1))
+        with profiling() as profiler:
+            assert evaluate(expr, ctx) is expr
+            assert evaluate(expr, ctx) is expr
+        (record,) = profiler.rules(f)
+        assert record.attempts == 1
+
+    def test_definition_change_invalidates(self):
+        g = Symbol("g")
+        ctx = EvaluationContext("test")
+        expr = Expression(g, 1)
+        assert evaluate(expr, ctx) is expr
+        ctx.add_down_value(g, Expression(g, pattern(x)), 2)
+        assert evaluate(expr, ctx) == 2
+
+    def test_own_value_change_invalidates(self):
+        g = Symbol("g")
+        ctx = EvaluationContext("test")
+        expr = Expression(g, x)
+        assert evaluate(expr, ctx) is expr
+        ctx.set_own_values(x, [(x, 42, None)])
+        assert evaluate(expr, ctx) == Expression(g, 42)
+
+    def test_attribute_change_invalidates(self):
+        g, a, b = Symbol("g"), Symbol("a"), Symbol("b")
+        ctx = EvaluationContext("test")
+        expr = Expression(g, b, a)
+        assert evaluate(expr, ctx) is expr
+        ctx.set_attributes(g, frozenset({Orderless}))
+        assert evaluate(expr, ctx) == Expression(g, a, b)
+
+    def test_mark_belongs_to_context(self):
+        g = Symbol("g")
+        plain = EvaluationContext("plain")
+        defined = EvaluationContext("defined")
+        defined.add_down_value(g, Expression(g, pattern(x)), 2)
+        expr = Expression(g, 1)
+        assert evaluate(expr, plain) is expr
+        assert evaluate(expr, defined) == 2
+
+    def test_not_marked_when_evaluation_changes_definitions(self):
+        import minimatic.builtins.control  # noqa: F401
+
+        f, y = Symbol("f"), Symbol("y")
+        ctx = EvaluationContext("test")
+        # The condition assigns y and fails, leaving f[1] unevaluated
+        ctx.add_down_value(f, Expression(f, pattern(x)), 2, Expression(Symbol("Set"), y, 3))
+        expr = Expression(f, 1)
+        assert evaluate(expr, ctx) is expr
+        assert id(expr) not in ctx.evaluated_marks()
+
+    def test_clear_evaluated_marks(self):
+        expr = Expression(Symbol("g"), 1)
+        ctx = EvaluationContext("test")
+        evaluate(expr, ctx)
+        assert id(expr) in ctx.evaluated_marks()
+        clear_evaluated_marks()
+        assert id(expr) not in ctx.evaluated_marks()
+
+    def test_marks_released_when_definitions_change(self):
+        expr = Expression(Symbol("g"), 1)
+        ctx = EvaluationContext("test")
+        evaluate(expr, ctx)
+        ctx.set_own_values(x, [(x, 1, None)])
+        assert ctx.evaluated_marks() == {}
+
+    def test_module_keeps_marks(self):
+        import minimatic.builtins.control  # noqa: F401
+
+        ctx = EvaluationContext("test")
+        expr = Expression(Symbol("g"), 1)
+        evaluate(expr, ctx)
+        local = Expression(Symbol("List"), Expression(Symbol("Set"), x, 1))
+        evaluate(Expression(Symbol("Module"), local, x), ctx)
+        assert id(expr) in ctx.evaluated_marks()
+
+
 class TestThreadSafety:
     def test_eval_state_is_thread_local(self):
         """Each thread should have independent recursion depth."""
@@ -0,0 +1,218 @@
+"""Tests for Profile module."""
+
+from __future__ import annotations
+
+import pytest
+
+from minimatic.core.expression import Expression
+from minimatic.core.symbol import Symbol
+from minimatic.eval import profile
+from minimatic.eval.evaluator import evaluate
+from minimatic.eval.profile import (
+    COLUMNS,
+    RuleProfiler,
+    disable_profiling,
+    enable_profiling,
+    profiling,
+)
+from minimatic.eval.rules import RuleDelayed, RuleImmediate, apply_rule, try_rules
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.structural import pattern
+
+f = Symbol("f")
+g = Symbol("g")
+h = Symbol("h")
+a = Symbol("a")
+b = Symbol("b")
+x = Symbol("x")
+Integer = Symbol("Integer")
+_True = Symbol("True")
+_False = Symbol("False")
+
+
+@pytest.fixture(autouse=True)
+def _profiling_off():
+    """Leave profiling disabled after each test."""
+    yield
+    disable_profiling()
+
+
+class TestEnabling:
+    def test_off_by_default(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a)
+        assert profile.profiler is None
+        assert evaluate(Expression(f, 1), ctx) == a
+
+    def test_enable_disable(self):
+        profiler = enable_profiling()
+        assert profile.profiler is profiler
+        assert disable_profiling() is profiler
+        assert profile.profiler is None
+
+    def test_enable_into_existing(self):
+        profiler = RuleProfiler()
+        assert enable_profiling(profiler) is profiler
+
+    def test_context_manager_restores(self):
+        outer = enable_profiling()
+        with profiling() as inner:
+            assert profile.profiler is inner
+            assert inner is not outer
+        assert profile.profiler is outer
+
+    def test_nothing_recorded_when_off(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a)
+        profiler = enable_profiling()
+        disable_profiling()
+        evaluate(Expression(f, 1), ctx)
+        assert len(profiler) == 0
+
+
+class TestDefinitions:
+    def test_down_value_counters(self, ctx):
+        first = Expression(f, pattern(x, blank(Integer)))
+        second = Expression(f, pattern(x))
+        ctx.add_down_value(f, first, a)
+        ctx.add_down_value(f, second, b)
+        with profiling() as profiler:
+            assert evaluate(Expression(f, 1), ctx) == a
+            assert evaluate(Expression(f, "s"), ctx) == b
+        by_lhs = {p.lhs: p for p in profiler.rules(f)}
+        # The dispatch index rules f[x_Integer] out for f["s"]
+        assert by_lhs[first].attempts == 1
+        assert by_lhs[first].matches == 1
+        assert by_lhs[first].fires == 1
+        assert by_lhs[second].attempts == 1
+        assert by_lhs[second].fires == 1
+        assert by_lhs[first].kind == "DownValues"
+        assert by_lhs[first].owner == f
+
+    def test_condition_failures(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a, _False)
+        ctx.add_down_value(f, Expression(f, pattern(x, blank())), b, _True)
+        with profiling() as profiler:
+            assert evaluate(Expression(f, 1), ctx) == b
+        failed, fired = sorted(profiler.rules(f), key=lambda p: p.fires)
+        assert failed.matches == 1
+        assert failed.condition_failures == 1
+        assert failed.fires == 0
+        assert fired.condition_failures == 0
+        assert fired.fires == 1
+
+    def test_times_accumulate(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a, _True)
+        with profiling() as profiler:
+            for _ in range(3):
+                evaluate(Expression(f, 1), ctx)
+        (record,) = profiler.rules(f)
+        assert record.attempts == 3
+        assert record.match_time > 0
+        assert record.condition_time > 0
+        assert record.substitution_time > 0
+        assert record.total_time == pytest.approx(
+            record.match_time + record.condition_time + record.substitution_time
+        )
+
+    def test_own_values(self, ctx):
+        ctx.set_own_values(x, [(x, 42, None)])
+        with profiling() as profiler:
+            assert evaluate(x, ctx) == 42
+        (record,) = profiler.rules(x)
+        assert record.kind == "OwnValues"
+        assert record.fires == 1
+
+    def test_up_values(self, ctx):
+        lhs = Expression(f, Expression(g, pattern(x)))
+        ctx.set_up_values(g, [(lhs, a, None)])
+        with profiling() as profiler:
+            assert evaluate(Expression(f, Expression(g, 1)), ctx) == a
+        (record,) = profiler.rules(g)
+        assert record.kind == "UpValues"
+        assert profiler.rules(f) == []
+
+    def test_sub_values(self, ctx):
+        ctx.add_sub_value(f, Expression(Expression(f, pattern(x)), 2), a)
+        with profiling() as profiler:
+            assert evaluate(Expression(Expression(f, 1), 2), ctx) == a
+        (record,) = profiler.rules(f)
+        assert record.kind == "SubValues"
+
+    def test_same_results_as_unprofiled(self, ctx):
+        ctx.add_down_value(f, Expression(f, 0), 1)
+        ctx.add_down_value(f, Expression(f, pattern(x, blank(Integer))), Expression(g, x))
+        ctx.add_down_value(f, Expression(f, pattern(x)), b, _False)
+        exprs = [Expression(f, 0), Expression(f, 5), Expression(f, a)]
+        expected = [evaluate(e, ctx) for e in exprs]
+        with profiling():
+            assert [evaluate(e, ctx) for e in exprs] == expected
+
+
+class TestRules:
+    def test_apply_rule(self):
+        rule = RuleImmediate(Expression(h, pattern(x)), x)
+        with profiling() as profiler:
+            assert apply_rule(rule, Expression(h, 1)) == (1, True)
+            assert apply_rule(rule, Expression(g, 1)) == (Expression(g, 1), False)
+        (record,) = profiler.rules(h)
+        assert record.kind == "Rule"
+        assert record.attempts == 2
+        assert record.fires == 1
+
+    def test_delayed_and_callable(self):
+        delayed = RuleDelayed(Expression(h, pattern(x)), Expression(g, x))
+        native = RuleImmediate(pattern(x), lambda bindings: bindings[x])
+        assert profile.rule_owner(native.lhs) is None
+        with profiling() as profiler:
+            assert try_rules([delayed], Expression(h, 1)) == Expression(g, 1)
+            assert try_rules([native], 7) == 7
+        assert len(profiler) == 2
+        (unowned,) = [p for p in profiler.rules() if p.owner is None]
+        assert unowned.fires == 1
+
+    def test_rule_condition_failure(self):
+        rule = RuleImmediate(Expression(h, pattern(x)), x, condition=False)
+        with profiling() as profiler:
+            assert apply_rule(rule, Expression(h, 1)) == (Expression(h, 1), False)
+        (record,) = profiler.rules(h)
+        assert record.condition_failures == 1
+
+
+class TestExport:
+    def test_table_rows(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a)
+        with profiling() as profiler:
+            evaluate(Expression(f, 1), ctx)
+        (row,) = profiler.table(f)
+        assert len(row) == len(COLUMNS)
+        values = dict(zip(COLUMNS, row, strict=True))
+        assert values["symbol"] == f
+        assert values["kind"] == "DownValues"
+        assert values["attempts"] == 1
+
+    def test_sorted_by_total_time(self):
+        profiler = RuleProfiler()
+        cheap = profiler.profile(f, "Rule", Expression(f, 1))
+        costly = profiler.profile(f, "Rule", Expression(f, 2))
+        cheap.match_time = 0.001
+        costly.match_time = 0.5
+        assert profiler.rules() == [costly, cheap]
+
+    def test_profile_reused(self):
+        profiler = RuleProfiler()
+        lhs = Expression(f, pattern(x))
+        assert profiler.profile(f, "Rule", lhs) is profiler.profile(f, "Rule", lhs)
+
+    def test_format_table(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a)
+        with profiling() as profiler:
+            evaluate(Expression(f, 1), ctx)
+        lines = profiler.format_table().splitlines()
+        assert len(lines) == 3
+        assert "f[Pattern[x, Blank[]]]" in lines[2]
+
+    def test_reset(self, ctx):
+        ctx.add_down_value(f, Expression(f, pattern(x)), a)
+        with profiling() as profiler:
+            evaluate(Expression(f, 1), ctx)
+            profiler.reset()
+        assert len(profiler) == 0
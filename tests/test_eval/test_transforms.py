@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import sys
+
 from minimatic.core.attributes import Flat, Listable, Orderless
 from minimatic.core.expression import Expression
 from minimatic.core.symbol import Symbol
@@ -11,6 +13,7 @@ from minimatic.eval.transforms import (
     apply_flat,
     apply_listable,
     apply_orderless,
+    canonical_key,
     canonical_sort,
     flatten_sequences,
 )
@@ -77,6 +80,13 @@ class TestApplyFlat:
         result = apply_flat(outer, is_flat=False)
         assert result == outer
 
+    def test_flat_deep_nesting(self):
+        expr = 0
+        for k in range(1, sys.getrecursionlimit() * 5):
+            expr = Expression(Plus, expr, k)
+        result = apply_flat(expr, is_flat=True)
+        assert result.args == tuple(range(sys.getrecursionlimit() * 5))
+
     def test_flat_preserves_attrs(self):
         inner = Expression(Plus, 1, 2)
         outer = Expression(Plus, inner, 3, _attrs={Flat})
@@ -128,6 +138,50 @@ class TestCanonicalSort:
         assert result[0] == "hello"
         assert isinstance(result[1], Symbol)
 
+    def test_numbers_by_value(self):
+        assert canonical_sort((10, 9, -1.5, 2)) == (-1.5, 2, 9, 10)
+
+    def test_equal_numbers_ordered_by_type(self):
+        result = canonical_sort((1.0, 1))
+        assert type(result[0]) is int
+        assert type(result[1]) is float
+
+    def test_complex_by_real_then_imaginary(self):
+        assert canonical_sort((1 + 2j, 1 + 1j, 0.5)) == (0.5, 1 + 1j, 1 + 2j)
+
+    def test_expressions_after_atoms(self):
+        expr = Expression(Times, 2, x)
+        assert canonical_sort((expr, x, "s", 1)) == (1, "s", x, expr)
+
+    def test_expressions_head_first(self):
+        a = Expression(Times, 9, y)
+        b = Expression(Plus, 1, x)
+        assert canonical_sort((a, b)) == (b, a)
+
+    def test_expressions_argument_wise(self):
+        short = Expression(Plus, x)
+        long = Expression(Plus, x, 1)
+        later = Expression(Plus, y)
+        assert canonical_sort((later, long, short)) == (short, long, later)
+
+    def test_does_not_format_expressions(self, monkeypatch):
+        def fail(self):
+            raise AssertionError("str() called during sort")
+
+        monkeypatch.setattr(Expression, "__str__", fail)
+        monkeypatch.setattr(Expression, "__repr__", fail)
+        terms = tuple(Expression(Times, k, Symbol(f"v{k}")) for k in range(20, 0, -1))
+        assert canonical_sort(terms) == terms[::-1]
+
+    def test_shared_subtrees(self):
+        shared = Expression(Plus, x, y)
+        result = canonical_sort((Expression(Times, shared, 2), Expression(Times, shared, 1)))
+        assert [t.args[1] for t in result] == [1, 2]
+
+    def test_canonical_key_matches_sort(self):
+        elements = (Expression(Plus, x), 3, Symbol("a"), "s", None)
+        assert canonical_sort(elements) == tuple(sorted(elements, key=canonical_key))
+
 
 class TestApplyListable:
     def test_listable_single_list(self):
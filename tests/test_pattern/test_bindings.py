@@ -153,6 +153,41 @@ class TestBindingsEquality:
         s = {b1, b2}
         assert len(s) == 1
 
+    def test_equal_regardless_of_binding_order(self):
+        b1 = empty_bindings().bind(x, 1).bind(y, 2)
+        b2 = empty_bindings().bind(y, 2).bind(x, 1)
+        assert b1 == b2
+        assert hash(b1) == hash(b2)
+
+    def test_not_equal_to_dict(self):
+        assert Bindings({x: 1}) != {x: 1}
+
+
+class TestBindingsSharing:
+    def test_bind_keeps_parent(self):
+        names = [Symbol(f"v{i}") for i in range(100)]
+        chain = [empty_bindings()]
+        for i, name in enumerate(names):
+            chain.append(chain[-1].bind(name, i))
+        for size, b in enumerate(chain):
+            assert len(b) == size
+            assert dict(b.items()) == {name: i for i, name in enumerate(names[:size])}
+
+    def test_bind_same_value_returns_self(self):
+        b = Bindings({x: 1})
+        assert b.bind(x, 1) is b
+
+    def test_unbind_then_bind(self):
+        b = Bindings({x: 1, y: 2})
+        assert b.unbind(x).bind(x, 1) == b
+
+    def test_none_value(self):
+        b = empty_bindings().bind(x, None)
+        assert x in b
+        assert b.bind(x, None) is b
+        with pytest.raises(BindingConflict):
+            b.bind(x, 0)
+
 
 class TestBindingsCompatibility:
     def test_compatible(self):
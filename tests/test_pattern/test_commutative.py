@@ -0,0 +1,186 @@
+"""Tests for Commutative module."""
+
+from __future__ import annotations
+
+from itertools import permutations
+
+from minimatic.core.attributes import Flat, Orderless
+from minimatic.core.expression import Expression
+from minimatic.core.symbol import Symbol
+from minimatic.pattern.bindings import Bindings, empty_bindings
+from minimatic.pattern.blanks import blank, blank_null_seq, blank_seq
+from minimatic.pattern.commutative import match_commutative
+from minimatic.pattern.compiler import compile_pattern
+from minimatic.pattern.matcher import _match_sequence_impl, match, match_sequence
+from minimatic.pattern.structural import condition, optional, pattern, repeated
+
+Plus = Symbol("Plus")
+Times = Symbol("Times")
+Integer = Symbol("Integer")
+Symbol_ = Symbol("Symbol")
+List = Symbol("List")
+Greater = Symbol("Greater")
+f = Symbol("f")
+a = Symbol("a")
+b = Symbol("b")
+x = Symbol("x")
+y = Symbol("y")
+r = Symbol("r")
+
+ORDERLESS = frozenset({Orderless})
+AC = frozenset({Flat, Orderless})
+
+
+def solutions(patterns, exprs, evaluator=None):
+    return list(match_commutative(tuple(patterns), tuple(exprs), empty_bindings(), evaluator))
+
+
+def evaluator(expr):
+    if isinstance(expr, Expression) and expr.head == Greater:
+        left, right = expr.args
+        return Symbol("True") if left > right else Symbol("False")
+    return expr
+
+
+class TestSingles:
+    def test_first_solution_in_argument_order(self):
+        result = match(
+            Expression(Plus, pattern(x), pattern(y)), Expression(Plus, 2, 1), expr_attrs=ORDERLESS
+        )
+        assert (result[x], result[y]) == (2, 1)
+
+    def test_every_assignment_generated(self):
+        found = {(s[x], s[y]) for s in solutions([pattern(x), pattern(y)], [1, 2])}
+        assert found == {(1, 2), (2, 1)}
+
+    def test_heads_found_in_any_position(self):
+        pat = Expression(Plus, pattern(x, blank(Symbol_)), pattern(y, blank(Integer)))
+        result = match(pat, Expression(Plus, 3, a), expr_attrs=ORDERLESS)
+        assert (result[x], result[y]) == (a, 3)
+
+    def test_literals(self):
+        pat = Expression(Plus, 1, a, pattern(x))
+        assert match(pat, Expression(Plus, a, 5, 1), expr_attrs=ORDERLESS)[x] == 5
+        assert not match(pat, Expression(Plus, a, 5, 2), expr_attrs=ORDERLESS)
+
+    def test_literal_counts(self):
+        assert solutions([a, a, pattern(x)], [a, 1, a])
+        assert not solutions([a, a, pattern(x)], [a, 1, 2])
+
+    def test_argument_count(self):
+        assert not solutions([pattern(x), pattern(y)], [1, 2, 3])
+        assert not solutions([pattern(x), pattern(y)], [1])
+
+    def test_shared_names(self):
+        found = solutions([pattern(x), pattern(x), pattern(y)], [1, 2, 1])
+        assert found and all(s[x] == 1 and s[y] == 2 for s in found)
+        assert not solutions([pattern(x), pattern(x)], [1, 2])
+
+    def test_assignment_found_when_greedy_fails(self):
+        # x_ would take the only integer first; the assignment moves it
+        pat = [pattern(x), pattern(y, blank(Integer)), pattern(r, blank(Symbol_))]
+        result = solutions(pat, [3, a, Expression(f, 1)])[0]
+        assert (result[x], result[y], result[r]) == (Expression(f, 1), 3, a)
+
+    def test_condition_sees_other_names(self):
+        pat = [pattern(x), condition(pattern(y), Expression(Greater, y, x))]
+        found = solutions(pat, [5, 2], evaluator)
+        assert [(s[x], s[y]) for s in found] == [(2, 5)]
+
+
+class TestSequences:
+    def test_rest_in_sequence(self):
+        pat = Expression(Plus, pattern(x, blank(Integer)), pattern(r, blank_seq()))
+        result = match(pat, Expression(Plus, a, b, 7), expr_attrs=ORDERLESS)
+        assert result[x] == 7
+        assert result[r] == Expression(List, a, b)
+
+    def test_arguments_only_sequences_take(self):
+        pat = [pattern(x), pattern(y), pattern(r, blank_seq(Integer))]
+        found = solutions(pat, [1, a, 2, b, 3])
+        assert found
+        assert {found[0][x], found[0][y]} == {a, b}
+        assert found[0][r] == Expression(List, 1, 2, 3)
+
+    def test_several_sequences_partitioned(self):
+        pat = [pattern(x, blank_seq(Integer)), pattern(y, blank_seq(Symbol_))]
+        found = solutions(pat, [a, 1, b, 2])
+        assert [(s[x], s[y]) for s in found] == [(Expression(List, 1, 2), Expression(List, a, b))]
+
+    def test_shortest_first(self):
+        found = solutions([pattern(x, blank_seq()), pattern(y, blank_null_seq())], [1, 2])
+        assert found[0][x] == Expression(List, 1)
+        assert len(found) == 3
+
+    def test_first_solution_left_to_right(self):
+        g = Symbol("g")
+        z = Symbol("z")
+        pat = Expression(g, pattern(z, blank_seq()), blank())
+        result = match(pat, Expression(g, 1, 2, 3), expr_attrs=ORDERLESS)
+        assert result[z] == Expression(List, 1, 2)
+        pat = Expression(g, blank_null_seq(Integer), blank_seq(), pattern(y))
+        expr = Expression(g, 2, Symbol("c"), Symbol("c"))
+        assert match(pat, expr, expr_attrs=AC)[y] == Symbol("c")
+
+    def test_repeated(self):
+        assert solutions([pattern(x), repeated(blank(Integer))], [a, 1, 2])
+        assert not solutions([pattern(x), repeated(blank(Integer))], [a, b, 2])
+
+    def test_optional(self):
+        pat = [pattern(x, blank(Symbol_)), optional(pattern(y, blank(Integer)), 0)]
+        assert solutions(pat, [3, a])[0][y] == 3
+        assert solutions(pat, [a])[0][y] == 0
+
+    def test_bound_sequence_name(self):
+        bound = Bindings({r: Expression(List, 1, 2)})
+        pat = (pattern(x), pattern(r, blank_seq()))
+        assert list(match_commutative(pat, (1, a, 2), bound, None))[0][x] == a
+        assert not list(match_commutative(pat, (1, a, 3), bound, None))
+
+
+class TestAgainstPermutations:
+    def test_same_solutions_as_every_ordering(self):
+        pats = (pattern(x, blank(Integer)), pattern(y), pattern(r, blank_null_seq(Symbol_)))
+        exprs = (a, 1, b, 2, Expression(f, a))
+
+        def key(s):
+            return (s[x], s[y], tuple(sorted(map(str, s[r].args))))
+
+        expected = set()
+        for ordering in permutations(exprs):
+            for s in _match_sequence_impl(pats, ordering, empty_bindings(), None, False, False):
+                expected.add(key(s))
+        assert {key(s) for s in solutions(pats, exprs)} == expected
+
+    def test_match_sequence_orderless(self):
+        found = list(match_sequence((pattern(x), blank(Integer)), (1, a), orderless=True))
+        assert [s[x] for s in found] == [a]
+
+
+class TestLargeExpressions:
+    def test_many_terms(self):
+        terms = [Symbol(f"s{i}") for i in range(1000)]
+        pat = Expression(Plus, pattern(x, blank(Integer)), pattern(y), pattern(r, blank_seq()))
+        result = match(pat, Expression(Plus, *terms, 42), expr_attrs=AC)
+        assert result[x] == 42
+        assert len(result[r].args) == 999
+
+    def test_no_match_fails_fast(self):
+        # Three symbols for two single patterns; r__Integer takes none
+        terms = [a, b, Symbol("c"), *range(1000)]
+        pat = Expression(
+            Plus,
+            pattern(x, blank(Symbol_)),
+            pattern(y, blank(Symbol_)),
+            pattern(r, blank_seq(Integer)),
+        )
+        assert not match(pat, Expression(Plus, *terms), expr_attrs=AC)
+
+    def test_compiled_agrees(self):
+        pat = Expression(
+            Times, pattern(x, blank(Integer)), Expression(f, pattern(y)), pattern(r, blank_seq())
+        )
+        expr = Expression(Times, a, Expression(f, 1), b, 3, _attrs=ORDERLESS)
+        expected = match(pat, expr)
+        assert compile_pattern(pat).match(expr).bindings == expected.bindings
+        assert expected[y] == 1 and expected[x] == 3
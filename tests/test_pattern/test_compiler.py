@@ -0,0 +1,303 @@
+"""Tests for Compiler module."""
+
+from __future__ import annotations
+
+import pytest
+
+from minimatic.core.attributes import Flat, Orderless
+from minimatic.core.expression import Expression, symbol_bit, symbol_mask_of
+from minimatic.core.symbol import Symbol
+from minimatic.pattern import compiler
+from minimatic.pattern.bindings import Bindings
+from minimatic.pattern.blanks import blank, blank_null_seq, blank_seq
+from minimatic.pattern.compiler import (
+    clear_compiled_patterns,
+    compile_pattern,
+    compiled_pattern_count,
+)
+from minimatic.pattern.matcher import match
+from minimatic.pattern.structural import (
+    alternatives,
+    condition,
+    except_pattern,
+    hold_pattern,
+    optional,
+    pattern,
+    pattern_test,
+    repeated,
+    repeated_null,
+    verbatim,
+)
+
+f = Symbol("f")
+g = Symbol("g")
+Plus = Symbol("Plus")
+Integer = Symbol("Integer")
+Real = Symbol("Real")
+List = Symbol("List")
+x = Symbol("x")
+y = Symbol("y")
+z = Symbol("z")
+a = Symbol("a")
+b = Symbol("b")
+True_ = Symbol("True")
+False_ = Symbol("False")
+
+
+def evaluator(expr):
+    """Decide Greater[...] and IntegerQ[...] for conditions and tests."""
+    if isinstance(expr, Expression) and expr.head == Symbol("Greater"):
+        left, right = expr.args
+        if isinstance(left, int) and isinstance(right, int):
+            return True_ if left > right else False_
+    if isinstance(expr, Expression) and expr.head == Symbol("IntegerQ"):
+        return True_ if isinstance(expr.args[0], int) else False_
+    return expr
+
+
+PATTERNS = [
+    x,
+    3,
+    blank(),
+    blank(Integer),
+    pattern(x),
+    pattern(x, blank(Integer)),
+    Expression(f, pattern(x), pattern(x)),
+    Expression(f, pattern(x), pattern(y, blank(Real))),
+    Expression(f, blank_seq()),
+    Expression(f, pattern(x, blank_null_seq()), pattern(y)),
+    Expression(f, pattern(x), optional(pattern(y), 0)),
+    Expression(f, repeated(blank(Integer))),
+    Expression(f, repeated_null(a)),
+    Expression(pattern(x), pattern(y)),
+    Expression(f, alternatives(a, b, 1)),
+    Expression(f, alternatives(pattern(x, blank(Integer)), Expression(g, pattern(x)))),
+    Expression(f, except_pattern(a)),
+    Expression(f, except_pattern(a, blank(Symbol("Symbol")))),
+    Expression(f, verbatim(pattern(x))),
+    hold_pattern(Expression(f, pattern(x))),
+    condition(Expression(f, pattern(x)), Expression(Symbol("Greater"), x, 1)),
+    Expression(f, pattern_test(pattern(x), Symbol("IntegerQ"))),
+    Expression(f, Expression(g, a, 1)),
+    Expression(Plus, pattern(x, blank(Integer)), pattern(y)),
+]
+
+EXPRESSIONS = [
+    x,
+    3,
+    2.5,
+    a,
+    Expression(f),
+    Expression(f, 1),
+    Expression(f, 1, 1),
+    Expression(f, 1, 2),
+    Expression(f, 1, 2.5),
+    Expression(f, a),
+    Expression(f, a, a),
+    Expression(f, b),
+    Expression(f, Expression(g, 1)),
+    Expression(f, Expression(g, a, 1)),
+    Expression(f, pattern(x)),
+    Expression(g, 1, 2),
+    Expression(Plus, a, 2),
+]
+
+
+class TestAgreement:
+    @pytest.mark.parametrize("pat", PATTERNS, ids=str)
+    def test_same_result_as_match(self, pat):
+        compiled = compile_pattern(pat)
+        for expr in EXPRESSIONS:
+            expected = match(pat, expr, evaluator=evaluator)
+            result = compiled.match(expr, evaluator=evaluator)
+            assert bool(result) == bool(expected), expr
+            assert compiled.matches(expr, evaluator) == bool(expected), expr
+            if expected:
+                assert result.bindings == expected.bindings, expr
+                assert not compiled.symbols & ~symbol_mask_of(expr), expr
+
+    @pytest.mark.parametrize("attrs", [frozenset({Orderless}), frozenset({Flat})], ids=str)
+    def test_same_result_with_attributes(self, attrs):
+        pat = Expression(Plus, pattern(x, blank(Integer)), pattern(y))
+        expr = Expression(Plus, a, 2, _attrs=attrs)
+        expected = match(pat, expr)
+        result = compile_pattern(pat).match(expr)
+        assert bool(result) == bool(expected)
+        assert result.bindings == expected.bindings
+
+    def test_existing_bindings(self):
+        compiled = compile_pattern(Expression(f, pattern(x)))
+        assert compiled.match(Expression(f, 1), Bindings({x: 1}))
+        assert not compiled.match(Expression(f, 2), Bindings({x: 1}))
+
+    def test_condition_without_evaluator_fails(self):
+        compiled = compile_pattern(condition(pattern(x), Expression(Symbol("Greater"), x, 1)))
+        assert not compiled.match(5)
+        assert compiled.match(5, evaluator=evaluator)
+
+    def test_matches(self):
+        compiled = compile_pattern(Expression(f, blank(Integer)))
+        assert compiled.matches(Expression(f, 1))
+        assert not compiled.matches(Expression(f, 1.5))
+
+    def test_deeper_than_compiled_nodes(self):
+        depth = compiler.MAX_NODE_DEPTH * 40
+        pat, expr = pattern(x, blank(Integer)), 1
+        for _ in range(depth):
+            pat, expr = Expression(f, pat), Expression(f, expr)
+        compiled = compile_pattern(pat)
+        assert compiled.match(expr)[x] == 1
+        assert compiled.matches(expr)
+        assert not compiled.match(Expression(f, expr))
+
+
+class TestAnalysis:
+    def test_head_and_arity(self):
+        compiled = compile_pattern(Expression(f, pattern(x), optional(pattern(y), 0)))
+        assert compiled.head == f
+        assert (compiled.min_arity, compiled.max_arity) == (1, 2)
+
+    def test_unbounded_arity(self):
+        compiled = compile_pattern(Expression(f, blank(), blank_seq()))
+        assert (compiled.min_arity, compiled.max_arity) == (2, None)
+
+    def test_head_through_constructs(self):
+        pat = condition(pattern(z, Expression(g, blank())), True_)
+        assert compile_pattern(pat).head == g
+        assert compile_pattern(blank(Integer)).head == Integer
+        assert compile_pattern(blank()).head is None
+        assert compile_pattern(alternatives(Expression(f), Expression(g))).head is None
+
+    def test_names(self):
+        compiled = compile_pattern(Expression(f, pattern(x), Expression(g, pattern(y))))
+        assert compiled.names == frozenset({x, y})
+
+    def test_literal(self):
+        assert compile_pattern(Expression(f, a, Expression(g, 1))).literal
+        assert not compile_pattern(Expression(f, a, Expression(g, blank()))).literal
+
+
+class TestRequiredSymbols:
+    def required(self, pat):
+        return compile_pattern(pat).symbols
+
+    def test_literal_symbols(self):
+        assert self.required(Expression(f, a, blank())) == symbol_bit(f) | symbol_bit(a)
+
+    def test_blank_heads(self):
+        assert self.required(pattern(x, blank(Integer))) == symbol_bit(Integer)
+        assert self.required(blank_seq(g)) == symbol_bit(g)
+        assert self.required(blank_null_seq(g)) == 0
+        assert self.required(blank(Symbol("Symbol"))) == 0
+
+    def test_alternatives_need_common_symbols(self):
+        pat = alternatives(Expression(f, a), Expression(f, b))
+        assert self.required(pat) == symbol_bit(f)
+
+    def test_optional_parts_need_nothing(self):
+        pat = Expression(f, optional(pattern(x, blank(g)), 0), repeated_null(a), except_pattern(b))
+        assert self.required(pat) == symbol_bit(f)
+
+    def test_verbatim(self):
+        pat = verbatim(Expression(f, a))
+        assert self.required(pat) == symbol_bit(f) | symbol_bit(a)
+
+    def test_match_contains_required(self):
+        pat = condition(Expression(f, pattern(x, blank(g)), a), True_)
+        expr = Expression(f, Expression(g, 1), a)
+        assert match(pat, expr, evaluator=evaluator).success
+        assert not compile_pattern(pat).symbols & ~symbol_mask_of(expr)
+
+
+class TestMatchesWithoutBindings:
+    def test_names_erased(self):
+        compiled = compile_pattern(Expression(f, pattern(x, blank(Integer)), pattern(y)))
+        assert compiled.matches(Expression(f, 1, a))
+        assert not compiled.matches(Expression(f, a, 1))
+        assert compiled._test is not compiled._node
+
+    def test_repeated_name_kept(self):
+        compiled = compile_pattern(Expression(f, pattern(x), pattern(x)))
+        assert compiled.matches(Expression(f, 1, 1))
+        assert not compiled.matches(Expression(f, 1, 2))
+
+    def test_condition_keeps_names(self):
+        greater = Expression(Symbol("Greater"), x, 0)
+        compiled = compile_pattern(condition(pattern(x, blank(Integer)), greater))
+        assert compiled.matches(3, evaluator)
+        assert not compiled.matches(-3, evaluator)
+
+    def test_repeated_keeps_names(self):
+        compiled = compile_pattern(Expression(f, repeated(pattern(x))))
+        assert compiled.matches(Expression(f, 1, 1))
+        assert not compiled.matches(Expression(f, 1, 2))
+
+    def test_sequence_names_erased(self):
+        compiled = compile_pattern(Expression(f, pattern(x, blank_seq()), pattern(y, blank(g))))
+        assert compiled.matches(Expression(f, 1, 2, Expression(g)))
+        assert not compiled.matches(Expression(f, Expression(g)))
+
+
+NESTED_NAMES = [
+    Expression(f, blank(), pattern(y, pattern(z, blank_null_seq())), blank_null_seq()),
+    Expression(g, pattern(y, pattern(z, blank_seq())), alternatives(blank(Integer), a)),
+    Expression(f, pattern(x, pattern(y, blank_seq()))),
+    Expression(f, pattern(x, pattern(y, blank()))),
+]
+
+NESTED_EXPRESSIONS = [
+    Expression(f, 3, Expression(f), Expression(f, 1)),
+    Expression(f, 3, Expression(f)),
+    Expression(f, 2),
+    Expression(f, 1, 2),
+    Expression(g, 1, a, _attrs=frozenset({Orderless})),
+    Expression(g, Expression(f), 2, _attrs=frozenset({Orderless})),
+    Expression(g, 1, 2, 3, _attrs=frozenset({Orderless})),
+]
+
+
+class TestMatchesAgreesWithMatch:
+    @pytest.mark.parametrize("pat", NESTED_NAMES, ids=str)
+    def test_nested_names(self, pat):
+        compiled = compile_pattern(pat)
+        for expr in NESTED_EXPRESSIONS:
+            assert compiled.matches(expr) == bool(match(pat, expr)), expr
+
+
+class TestCache:
+    def test_same_object_reuses_compilation(self):
+        pat = Expression(f, pattern(x))
+        assert compile_pattern(pat) is compile_pattern(pat)
+
+    def test_equal_objects_compiled_separately(self):
+        first = compile_pattern(Expression(f, pattern(x)))
+        second = compile_pattern(Expression(f, pattern(x)))
+        assert first is not second
+        assert second.match(Expression(f, 1))[x] == 1
+
+    def test_clear(self):
+        compile_pattern(Expression(f, pattern(y)))
+        assert compiled_pattern_count() > 0
+        clear_compiled_patterns()
+        assert compiled_pattern_count() == 0
+
+    def test_bounded(self, monkeypatch):
+        monkeypatch.setattr(compiler, "MAX_COMPILED_PATTERNS", 4)
+        clear_compiled_patterns()
+        patterns = [Expression(f, i) for i in range(10)]
+        for pat in patterns:
+            compile_pattern(pat)
+        assert compiled_pattern_count() == 4
+
+    def test_evicts_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr(compiler, "MAX_COMPILED_PATTERNS", 3)
+        clear_compiled_patterns()
+        first, second, third, fourth = (Expression(f, pattern(x), i) for i in range(4))
+        kept = compile_pattern(first)
+        compile_pattern(second)
+        compile_pattern(third)
+        assert compile_pattern(first) is kept
+        compile_pattern(fourth)
+        assert compile_pattern(first) is kept
+        assert compiled_pattern_count() == 3
+        assert compiler._compiled.get(id(second)) is None
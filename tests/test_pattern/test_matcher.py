@@ -2,25 +2,33 @@
 
 from __future__ import annotations
 
+import sys
+
+import pytest
+
 from minimatic.core.attributes import Flat, Orderless
 from minimatic.core.expression import Expression
 from minimatic.core.symbol import Symbol
 from minimatic.pattern.bindings import Bindings, empty_bindings
 from minimatic.pattern.blanks import blank, blank_null_seq, blank_seq
 from minimatic.pattern.matcher import (
+    DEFAULT_MAX_DEPTH,
     NO_MATCH,
+    clear_template_plans,
     find_all_matches,
     match,
     match_sequence,
     matches,
     replace_with_bindings,
     success,
+    template_plan_count,
 )
 from minimatic.pattern.structural import (
     alternatives,
     condition,
     except_pattern,
     hold_pattern,
+    optional,
     pattern,
     pattern_test,
     repeated,
@@ -226,6 +234,65 @@ class TestMatchSequence:
         assert len(results) >= 1
 
 
+class TestSequencePruning:
+    def repeated_pair(self):
+        # {___, x_, ___, x_, ___}: two equal elements anywhere
+        return (
+            blank_null_seq(),
+            pattern(x),
+            blank_null_seq(),
+            pattern(x),
+            blank_null_seq(),
+        )
+
+    def test_repeated_pair_fails_on_distinct(self):
+        exprs = tuple(range(300))
+        assert list(match_sequence(self.repeated_pair(), exprs)) == []
+
+    def test_repeated_pair_found(self):
+        exprs = (*range(100), 42, *range(100, 200))
+        result = next(match_sequence(self.repeated_pair(), exprs))
+        assert result[x] == 42
+
+    def test_all_solutions_kept(self):
+        pat = (pattern(x, blank_null_seq()), pattern(y, blank_null_seq()))
+        results = list(match_sequence(pat, (1, 2, 3)))
+        assert [len(r[x].args) for r in results] == [0, 1, 2, 3]
+
+    def test_too_few_expressions(self):
+        pat = (pattern(x, blank_seq()), blank(Integer), pattern(y, blank_seq()))
+        assert list(match_sequence(pat, (1, 2))) == []
+
+    def test_too_many_expressions(self):
+        pat = (blank(), repeated_null(blank(Integer)), blank())
+        assert list(match_sequence(pat, (1, 2, 3, 4)))
+        assert list(match_sequence(pat, (1, "a", 3, 4))) == []
+
+    def test_required_heads(self):
+        pat = (blank_null_seq(), blank(Integer), blank_null_seq(), blank(Integer))
+        exprs = tuple(Symbol(f"s{i}") for i in range(200)) + (1,)
+        assert list(match_sequence(pat, exprs)) == []
+        assert len(list(match_sequence(pat, (1, *exprs)))) == 1
+
+    def test_optional_absent_at_end(self):
+        pat = (pattern(x, blank_null_seq()), optional(pattern(y, blank(Integer)), 0))
+        results = list(match_sequence(pat, (1, "a")))
+        assert len(results) == 1
+        assert results[0][y] == 0
+
+    def test_repeated_null_at_end(self):
+        pat = (pattern(x, blank_null_seq()), repeated_null(blank(Integer)))
+        results = list(match_sequence(pat, ("a", "b")))
+        assert len(results) == 1
+        assert results[0][x] == Expression(List, "a", "b")
+
+    def test_repeated_binding_consistent(self):
+        pat = (repeated(pattern(x)), pattern(y, blank_seq()))
+        results = list(match_sequence(pat, (1, 1, 2)))
+        assert [r[x] for r in results] == [1, 1]
+        assert [r[y] for r in results] == [Expression(List, 1, 2), Expression(List, 2)]
+
+
 class TestMatchFlat:
     def test_flat_attribute(self):
         from minimatic.pattern.structural import pattern as mk_pattern
@@ -251,6 +318,51 @@ class TestMatchOrderless:
         assert result[y] == 1
 
 
+class TestDeepPatterns:
+    def nest(self, inner, depth):
+        for _ in range(depth):
+            inner = Expression(Times, inner)
+        return inner
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 5
+        result = match(self.nest(pattern(x), depth), self.nest(1, depth))
+        assert result.success
+        assert result[x] == 1
+
+    def test_deep_mismatch(self):
+        depth = sys.getrecursionlimit() * 5
+        assert not match(self.nest(pattern(x, blank(Integer)), depth), self.nest("a", depth))
+        assert not match(self.nest(pattern(x), depth), self.nest(1, depth - 1))
+
+    def test_deep_sequence(self):
+        depth = sys.getrecursionlimit() * 5
+        pat = self.nest(Expression(List, pattern(x, blank_seq()), pattern(y)), depth)
+        result = match(pat, self.nest(Expression(List, 1, 2, 3), depth))
+        assert result[x] == Expression(List, 1, 2)
+        assert result[y] == 3
+
+    def test_deep_alternatives_and_condition(self):
+        depth = sys.getrecursionlimit() * 5
+        inner = condition(alternatives(pattern(x, blank(Integer)), pattern(y)), True)
+        result = match(self.nest(inner, depth), self.nest("a", depth), evaluator=lambda e: e)
+        assert result[y] == "a"
+        assert x not in result.bindings
+
+    def test_shared_name_across_levels(self):
+        inner = Expression(List, pattern(x), self.nest(pattern(x), 300))
+        assert match(inner, Expression(List, 1, self.nest(1, 300)))
+        assert not match(inner, Expression(List, 1, self.nest(2, 300)))
+
+    def test_max_depth_deprecated_and_ignored(self):
+        depth = DEFAULT_MAX_DEPTH * 2
+        with pytest.warns(DeprecationWarning):
+            result = match(self.nest(pattern(x), depth), self.nest(1, depth), None, None, 4)
+        assert result[x] == 1
+        with pytest.warns(DeprecationWarning):
+            assert match(pattern(x), 1, max_depth=DEFAULT_MAX_DEPTH)
+
+
 class TestReplaceWithBindings:
     def test_simple_replacement(self):
         b = Bindings({x: 42})
@@ -273,6 +385,57 @@ class TestReplaceWithBindings:
         result = replace_with_bindings(42, empty_bindings())
         assert result == 42
 
+    def test_unchanged_subtrees_shared(self):
+        untouched = Expression(Times, y, 2)
+        result = replace_with_bindings(Expression(Plus, untouched, x), Bindings({x: 1}))
+        assert result.args[1] == 1
+        assert result.args[0] is untouched
+
+    def test_literal_lists_kept(self):
+        b = Bindings({x: Expression(List, 1, 2)})
+        expr = Expression(Plus, Expression(List, y), x)
+        result = replace_with_bindings(expr, b)
+        assert result == Expression(Plus, Expression(List, y), 1, 2)
+
+    def test_no_bound_symbols_returns_input(self):
+        expr = Expression(Plus, Expression(Times, y, 2), z)
+        assert replace_with_bindings(expr, Bindings({x: 1})) is expr
+
+    def test_only_bound_paths_rebuilt(self):
+        left = Expression(Times, y, Expression(Plus, z, 1))
+        right = Expression(Times, 2, Expression(Plus, 3, x), y)
+        result = replace_with_bindings(Expression(List, left, right), Bindings({x: 1}))
+        assert result.args[0] is left
+        assert result.args[1].args[1] == Expression(Plus, 3, 1)
+        assert result.args[1].args[2] is y
+
+    def test_plan_reused(self):
+        clear_template_plans()
+        rest = Expression(Times, y, 2)
+        expr = Expression(Plus, x, rest)
+        assert replace_with_bindings(expr, Bindings({x: 1})) == Expression(Plus, 1, rest)
+        assert replace_with_bindings(expr, Bindings({x: 5})) == Expression(Plus, 5, rest)
+        assert template_plan_count() == 1
+        replace_with_bindings(expr, Bindings({x: 1, y: 3}))
+        assert template_plan_count() == 2
+
+    def test_plain_dict_bindings(self):
+        assert replace_with_bindings(Expression(Plus, x, 1), {x: 2}) == Expression(Plus, 2, 1)
+
+    def test_bound_head(self):
+        result = replace_with_bindings(Expression(x, 1), Bindings({x: Plus}))
+        assert result == Expression(Plus, 1)
+
+    def test_deep_expression(self):
+        expr = x
+        for _ in range(sys.getrecursionlimit() * 5):
+            expr = Expression(Times, expr)
+        result = replace_with_bindings(expr, Bindings({x: 1}), flatten_lists=False)
+        assert result.depth == expr.depth
+        while isinstance(result, Expression):
+            result = result.args[0]
+        assert result == 1
+
 
 class TestFindMatches:
     def test_find_in_expression(self):
@@ -285,6 +448,13 @@ class TestFindMatches:
         results = find_all_matches(blank(Integer), expr)
         assert len(results) == 0
 
+    def test_find_in_deep_expression(self):
+        expr = 1
+        for _ in range(sys.getrecursionlimit() * 5):
+            expr = Expression(Plus, expr)
+        results = find_all_matches(blank(Integer), expr)
+        assert [value for value, _ in results] == [1]
+
 
 class TestMatchResult:
     def test_bool_success(self):
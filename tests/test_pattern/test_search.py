@@ -0,0 +1,92 @@
+"""Tests for Search module."""
+
+from __future__ import annotations
+
+import sys
+
+from minimatic.core.expression import Expression
+from minimatic.core.symbol import Symbol
+from minimatic.pattern.blanks import blank
+from minimatic.pattern.search import ALL_LEVELS, INFINITY, search
+from minimatic.pattern.structural import condition, pattern
+
+f = Symbol("f")
+g = Symbol("g")
+h = Symbol("h")
+Integer = Symbol("Integer")
+x = Symbol("x")
+y = Symbol("y")
+
+# f[1, g[2, h[3]], x]
+EXPR = Expression(f, 1, Expression(g, 2, Expression(h, 3)), x)
+
+
+def positions(pat, expr=EXPR, levels=ALL_LEVELS, heads=False, **kwargs):
+    return [pos for pos, _, _ in search(pat, expr, levels, heads, **kwargs)]
+
+
+class TestLevelOrder:
+    def test_all_levels_post_order(self):
+        parts = [part for _, part, _ in search(blank(), EXPR)]
+        assert parts == [1, 2, 3, Expression(h, 3), EXPR.args[1], x, EXPR]
+
+    def test_heads(self):
+        assert positions(g, heads=True) == [(2, 0)]
+        assert positions(g) == []
+
+    def test_heads_come_first(self):
+        result = positions(blank(), Expression(f, 1), heads=True)
+        assert result == [(0,), (1,), ()]
+
+
+class TestLevels:
+    def test_single_level(self):
+        assert positions(blank(Integer), levels=(1, 1)) == [(1,)]
+        assert positions(blank(Integer), levels=(2, 2)) == [(2, 1)]
+
+    def test_range(self):
+        assert positions(blank(Integer), levels=(1, INFINITY)) == [(1,), (2, 1), (2, 2, 1)]
+        assert positions(blank(Integer), levels=(2, 3)) == [(2, 1), (2, 2, 1)]
+
+    def test_whole_expression(self):
+        assert positions(blank(f), levels=(0, 0)) == [()]
+        assert positions(blank(f), levels=(1, INFINITY)) == []
+
+    def test_negative_levels_count_depth(self):
+        # Level -1 holds the atoms, -2 the expressions of atoms
+        assert positions(blank(), levels=(-1, -1)) == [(1,), (2, 1), (2, 2, 1), (3,)]
+        assert positions(blank(), levels=(-2, -2)) == [(2, 2)]
+        assert positions(blank(), levels=(0, -3)) == [(2,), ()]
+
+    def test_empty_expressions_have_depth_one(self):
+        expr = Expression(f, Expression(g, Expression(h)))
+        assert positions(blank(), expr, levels=(-2, -2)) == [(1,)]
+
+
+class TestPruning:
+    def test_absent_symbol(self):
+        assert positions(y) == []
+        assert positions(Expression(g, blank(), blank())) == [(2,)]
+
+    def test_bindings(self):
+        result = list(search(Expression(h, pattern(y)), EXPR))
+        assert [(pos, bindings[y]) for pos, _, bindings in result] == [((2, 2), 3)]
+
+    def test_without_bindings(self):
+        result = list(search(Expression(h, pattern(y)), EXPR, bind=False))
+        assert result == [((2, 2), Expression(h, 3), None)]
+
+    def test_condition_uses_evaluator(self):
+        def evaluator(expr):
+            return expr.args[0] > 1
+
+        pat = condition(pattern(y, blank(Integer)), Expression(Symbol("Greater"), y, 1))
+        assert positions(pat) == []
+        assert positions(pat, evaluator=evaluator) == [(2, 1), (2, 2, 1)]
+
+    def test_deep_expression(self):
+        n = sys.getrecursionlimit() * 5
+        expr = 1
+        for _ in range(n):
+            expr = Expression(f, expr)
+        assert positions(blank(Integer), expr, levels=(1, INFINITY)) == [(1,) * n]